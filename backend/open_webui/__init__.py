@@ -84,6 +84,19 @@ def serve(
     )
 
 
+@app.command()
+def worker(
+    workers: int = 2,
+):
+    """Process queued file uploads without serving HTTP requests."""
+    import asyncio
+
+    from open_webui.main import app as webui_app
+    from open_webui.utils.file_jobs import run_file_processing_workers
+
+    asyncio.run(run_file_processing_workers(webui_app, workers))
+
+
 @app.command()
 def dev(
     host: str = "0.0.0.0",
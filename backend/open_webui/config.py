@@ -1892,6 +1892,34 @@ ENABLE_TITLE_GENERATION = PersistentConfig(
     os.environ.get("ENABLE_TITLE_GENERATION", "True").lower() == "true",
 )
 
+ENABLE_COMBINED_TASK_GENERATION = PersistentConfig(
+    "ENABLE_COMBINED_TASK_GENERATION",
+    "task.combined.enable",
+    os.environ.get("ENABLE_COMBINED_TASK_GENERATION", "False").lower() == "true",
+)
+
+COMBINED_TASK_GENERATION_PROMPT_TEMPLATE = PersistentConfig(
+    "COMBINED_TASK_GENERATION_PROMPT_TEMPLATE",
+    "task.combined.prompt_template",
+    os.environ.get("COMBINED_TASK_GENERATION_PROMPT_TEMPLATE", ""),
+)
+
+DEFAULT_COMBINED_TASK_GENERATION_PROMPT_TEMPLATE = """### Task:
+Based on the chat history, generate the following and return them together as one JSON object with only these keys: {{TASKS}}.
+### Guidelines:
+- "title": a concise, 3-5 word title with an emoji summarizing the chat history. It should clearly represent the main theme, without quotation marks or special formatting.
+- "tags": 1-3 broad tags categorizing the main themes (e.g. Science, Technology, Philosophy, Arts, Politics, Business, Health, Sports, Entertainment, Education), along with 1-3 more specific subtopic tags. If the chat is too short or too diverse, use only ["General"].
+- "follow_ups": 3-5 concise follow-up questions or prompts the user might naturally ask next, written from the user's point of view, directed to the assistant and not repeating what was already covered.
+- Use the chat's primary language; default to English if multilingual.
+- Prioritize accuracy over excessive creativity.
+- Your entire response must consist solely of a single, raw JSON object, without any markdown code fences, introductory or concluding text.
+### Output:
+JSON format: { "title": "your concise title here", "tags": ["tag1", "tag2", "tag3"], "follow_ups": ["Question 1?", "Question 2?", "Question 3?"] }
+### Chat History:
+<chat_history>
+{{MESSAGES:END:6}}
+</chat_history>"""
+
 
 ENABLE_SEARCH_QUERY_GENERATION = PersistentConfig(
     "ENABLE_SEARCH_QUERY_GENERATION",
@@ -2552,6 +2580,48 @@ CONTENT_EXTRACTION_ENGINE = PersistentConfig(
     os.environ.get("CONTENT_EXTRACTION_ENGINE", "").lower(),
 )
 
+# Reuse loader output for identical file bytes and extraction settings
+ENABLE_CONTENT_EXTRACTION_CACHE = (
+    os.environ.get("ENABLE_CONTENT_EXTRACTION_CACHE", "True").lower() == "true"
+)
+
+# Seconds an extraction cache entry is reused before the file is extracted again
+CONTENT_EXTRACTION_CACHE_TTL = int(
+    os.environ.get("CONTENT_EXTRACTION_CACHE_TTL", str(30 * 24 * 60 * 60))
+    or 30 * 24 * 60 * 60
+)
+
+# Files embedded in parallel by the background knowledge reindex job
+KNOWLEDGE_REINDEX_CONCURRENCY = int(os.getenv("KNOWLEDGE_REINDEX_CONCURRENCY", "4"))
+
+# Uploaded files are processed from a queue: "database" survives restarts and
+# is shared by all replicas, "memory" keeps jobs local to this process
+FILE_PROCESSING_QUEUE = os.getenv("FILE_PROCESSING_QUEUE", "database").lower()
+
+# Set to 0 on replicas that should only serve requests, and run
+# `open-webui worker` elsewhere. With local storage uploads are only processed
+# on the host that received them, so that needs a worker on the same host or
+# shared storage (s3, gcs, azure).
+FILE_PROCESSING_WORKERS = int(os.getenv("FILE_PROCESSING_WORKERS", "2"))
+FILE_PROCESSING_MAX_ATTEMPTS = int(os.getenv("FILE_PROCESSING_MAX_ATTEMPTS", "3"))
+FILE_PROCESSING_RETRY_BACKOFF = int(os.getenv("FILE_PROCESSING_RETRY_BACKOFF", "10"))
+FILE_PROCESSING_MAX_JOBS_PER_USER = int(
+    os.getenv("FILE_PROCESSING_MAX_JOBS_PER_USER", "2")
+)
+
+# Seconds without a heartbeat before a running job is handed to another worker
+FILE_PROCESSING_JOB_TIMEOUT = int(os.getenv("FILE_PROCESSING_JOB_TIMEOUT", "600"))
+
+# Concurrent jobs per extraction engine across all workers, e.g.
+# {"audio": 1, "mistral_ocr": 2}
+file_processing_engine_concurrency = os.getenv("FILE_PROCESSING_ENGINE_CONCURRENCY", "")
+try:
+    file_processing_engine_concurrency = json.loads(file_processing_engine_concurrency)
+except json.JSONDecodeError:
+    file_processing_engine_concurrency = {}
+
+FILE_PROCESSING_ENGINE_CONCURRENCY = file_processing_engine_concurrency
+
 DATALAB_MARKER_API_KEY = PersistentConfig(
     "DATALAB_MARKER_API_KEY",
     "rag.datalab_marker_api_key",
@@ -3138,6 +3208,20 @@ WEB_LOADER_TIMEOUT = PersistentConfig(
     os.getenv("WEB_LOADER_TIMEOUT", ""),
 )
 
+# Maximum concurrent connections to a single host within one crawl
+WEB_LOADER_CONCURRENT_REQUESTS_PER_HOST = int(
+    os.getenv("WEB_LOADER_CONCURRENT_REQUESTS_PER_HOST", "4")
+)
+
+# Seconds that web search results are shared between identical queries (0 disables)
+WEB_SEARCH_CACHE_TTL = int(os.getenv("WEB_SEARCH_CACHE_TTL", "3600"))
+
+# Seconds before a web-search-* vector collection is garbage collected
+WEB_SEARCH_COLLECTION_TTL = int(os.getenv("WEB_SEARCH_COLLECTION_TTL", "86400"))
+
+# Seconds a fetched page is served without revalidation (0 disables)
+WEB_FETCH_CACHE_TTL = int(os.getenv("WEB_FETCH_CACHE_TTL", "3600"))
+
 
 ENABLE_WEB_LOADER_SSL_VERIFICATION = PersistentConfig(
     "ENABLE_WEB_LOADER_SSL_VERIFICATION",
@@ -3780,6 +3864,13 @@ WHISPER_MULTILINGUAL = os.getenv("WHISPER_MULTILINGUAL", "False").lower() == "tr
 
 WHISPER_LANGUAGE = os.getenv("WHISPER_LANGUAGE", "").lower() or None
 
+# Number of concurrent transcriptions the local faster-whisper model can run;
+# long audio is split into this many chunks and transcribed in parallel.
+WHISPER_NUM_WORKERS = max(int(os.getenv("WHISPER_NUM_WORKERS", "1")), 1)
+
+# Maximum number of audio chunks sent concurrently to a remote STT engine
+AUDIO_STT_MAX_WORKERS = max(int(os.getenv("AUDIO_STT_MAX_WORKERS", "4")), 1)
+
 # Add Deepgram configuration
 DEEPGRAM_API_KEY = PersistentConfig(
     "DEEPGRAM_API_KEY",
@@ -73,6 +73,7 @@ class ERROR_MESSAGES(str, Enum):
         lambda err="": f"Invalid format. Please use the correct format{err}"
     )
     RATE_LIMIT_EXCEEDED = "API rate limit exceeded"
+    SERVER_BUSY = "The server is busy right now. Please try again in a few minutes."
 
     MODEL_NOT_FOUND = lambda name="": f"Model '{name}' was not found"
     OPENAI_NOT_FOUND = lambda name="": "OpenAI API was not found"
@@ -118,6 +119,7 @@ class TASKS(str, Enum):
     TITLE_GENERATION = "title_generation"
     FOLLOW_UP_GENERATION = "follow_up_generation"
     TAGS_GENERATION = "tags_generation"
+    COMBINED_TASK_GENERATION = "combined_task_generation"
     EMOJI_GENERATION = "emoji_generation"
     QUERY_GENERATION = "query_generation"
     IMAGE_PROMPT_GENERATION = "image_prompt_generation"
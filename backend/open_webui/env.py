@@ -363,6 +363,13 @@ ENABLE_QUERIES_CACHE = os.environ.get("ENABLE_QUERIES_CACHE", "False").lower() =
 
 RAG_SYSTEM_CONTEXT = os.environ.get("RAG_SYSTEM_CONTEXT", "False").lower() == "true"
 
+# Seconds between full rebuilds of the materialized evaluation leaderboard (0 disables)
+LEADERBOARD_REBUILD_INTERVAL = os.environ.get("LEADERBOARD_REBUILD_INTERVAL", "3600")
+try:
+    LEADERBOARD_REBUILD_INTERVAL = int(LEADERBOARD_REBUILD_INTERVAL)
+except ValueError:
+    LEADERBOARD_REBUILD_INTERVAL = 3600
+
 ####################################
 # REDIS
 ####################################
@@ -573,6 +580,32 @@ else:
     except Exception:
         MODELS_CACHE_TTL = 1
 
+# Seconds the model list of each connection is shared across users. Lists are
+# dropped early when connections or Ollama models are changed through the API,
+# on every worker when Redis is configured and only on the worker handling the
+# change otherwise.
+MODELS_CONNECTION_CACHE_TTL = int(
+    os.environ.get("MODELS_CONNECTION_CACHE_TTL", "60") or 60
+)
+
+# Ollama load balancing. A node that already has the model loaded is
+# preferred until it has this many more requests in flight than one that
+# would have to load it.
+OLLAMA_COLD_LOAD_PENALTY = int(os.environ.get("OLLAMA_COLD_LOAD_PENALTY", "4") or 4)
+
+# Consecutive failures after which an Ollama node is skipped for the cooldown
+OLLAMA_CIRCUIT_BREAKER_THRESHOLD = int(
+    os.environ.get("OLLAMA_CIRCUIT_BREAKER_THRESHOLD", "3") or 3
+)
+OLLAMA_CIRCUIT_BREAKER_COOLDOWN = int(
+    os.environ.get("OLLAMA_CIRCUIT_BREAKER_COOLDOWN", "30") or 30
+)
+
+# Seconds between refreshes of the models loaded on each node (/api/ps)
+OLLAMA_LOADED_MODELS_REFRESH_INTERVAL = int(
+    os.environ.get("OLLAMA_LOADED_MODELS_REFRESH_INTERVAL", "10") or 10
+)
+
 
 ####################################
 # CHAT
@@ -626,6 +659,64 @@ else:
         CHAT_STREAM_RESPONSE_CHUNK_MAX_BUFFER_SIZE = None
 
 
+# Admission control for chat tasks; 0 disables a limit. Tasks over a limit
+# wait in a queue that takes turns between users.
+CHAT_MAX_CONCURRENT_TASKS = int(os.environ.get("CHAT_MAX_CONCURRENT_TASKS", "0") or 0)
+CHAT_MAX_CONCURRENT_TASKS_PER_USER = int(
+    os.environ.get("CHAT_MAX_CONCURRENT_TASKS_PER_USER", "0") or 0
+)
+
+# Either a limit for every model or a JSON object such as {"llama3:70b": 2, "*": 8}
+CHAT_MAX_CONCURRENT_TASKS_PER_MODEL = os.environ.get(
+    "CHAT_MAX_CONCURRENT_TASKS_PER_MODEL", ""
+)
+
+try:
+    CHAT_MAX_CONCURRENT_TASKS_PER_MODEL = json.loads(
+        CHAT_MAX_CONCURRENT_TASKS_PER_MODEL
+    )
+    if isinstance(CHAT_MAX_CONCURRENT_TASKS_PER_MODEL, int):
+        CHAT_MAX_CONCURRENT_TASKS_PER_MODEL = {"*": CHAT_MAX_CONCURRENT_TASKS_PER_MODEL}
+    elif not isinstance(CHAT_MAX_CONCURRENT_TASKS_PER_MODEL, dict):
+        CHAT_MAX_CONCURRENT_TASKS_PER_MODEL = {}
+except Exception:
+    CHAT_MAX_CONCURRENT_TASKS_PER_MODEL = {}
+
+# Seconds a task may wait in the queue before it fails
+CHAT_TASK_QUEUE_TIMEOUT = int(os.environ.get("CHAT_TASK_QUEUE_TIMEOUT", "300") or 0)
+
+# Seconds a worker keeps a user's memory vectors in memory. Changes drop them
+# right away in every worker when Redis is configured; without it only in the
+# worker that made the change, and the TTL bounds how long the others may
+# answer from an outdated copy.
+MEMORY_INDEX_TTL = int(os.environ.get("MEMORY_INDEX_TTL", "300") or 300)
+
+# Seconds an autocompletion is kept to be served again while the user types
+# along the suggestion; 0 disables the cache.
+AUTOCOMPLETE_GENERATION_CACHE_TTL = int(
+    os.environ.get("AUTOCOMPLETE_GENERATION_CACHE_TTL", "120") or 120
+)
+
+
+####################################
+# CODE INTERPRETER
+####################################
+
+# Jupyter kernels kept started per server, so that runs do not wait for a
+# kernel to boot. Off by default (0), which starts a kernel for every run as
+# before; set it to e.g. 2 to enable the pool. Pooled kernels keep running
+# on the Jupyter server between runs.
+CODE_INTERPRETER_JUPYTER_KERNEL_POOL_SIZE = int(
+    os.environ.get("CODE_INTERPRETER_JUPYTER_KERNEL_POOL_SIZE", "0") or 0
+)
+
+# Runs a pooled kernel serves before it is replaced. With more than 1 the
+# namespace is reset between runs, but imported modules stay loaded.
+CODE_INTERPRETER_JUPYTER_KERNEL_MAX_USES = int(
+    os.environ.get("CODE_INTERPRETER_JUPYTER_KERNEL_MAX_USES", "1") or 1
+)
+
+
 ####################################
 # WEBSOCKET SUPPORT
 ####################################
@@ -911,6 +1002,12 @@ OTEL_LOGS_OTLP_SPAN_EXPORTER = os.environ.get(
     "OTEL_LOGS_OTLP_SPAN_EXPORTER", OTEL_OTLP_SPAN_EXPORTER
 ).lower()  # grpc or http
 
+# Seconds between refreshes of the user count gauges. With Redis, one replica
+# queries the database per interval and shares the counts with the others.
+OTEL_METRICS_USER_COUNTS_INTERVAL = int(
+    os.environ.get("OTEL_METRICS_USER_COUNTS_INTERVAL", "30") or 30
+)
+
 ####################################
 # TOOLS/FUNCTIONS PIP OPTIONS
 ####################################
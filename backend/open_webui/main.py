@@ -96,7 +96,10 @@ from open_webui.routers import (
     scim,
 )
 
+from open_webui.routers.evaluations import periodic_leaderboard_rebuild
+from open_webui.routers.users import periodic_user_activity_flush
 from open_webui.routers.retrieval import (
+    periodic_web_search_collection_cleanup,
     get_embedding_function,
     get_reranking_function,
     get_ef,
@@ -434,12 +437,14 @@ from open_webui.config import (
     ENABLE_TAGS_GENERATION,
     ENABLE_TITLE_GENERATION,
     ENABLE_FOLLOW_UP_GENERATION,
+    ENABLE_COMBINED_TASK_GENERATION,
     ENABLE_SEARCH_QUERY_GENERATION,
     ENABLE_RETRIEVAL_QUERY_GENERATION,
     ENABLE_AUTOCOMPLETE_GENERATION,
     TITLE_GENERATION_PROMPT_TEMPLATE,
     FOLLOW_UP_GENERATION_PROMPT_TEMPLATE,
     TAGS_GENERATION_PROMPT_TEMPLATE,
+    COMBINED_TASK_GENERATION_PROMPT_TEMPLATE,
     IMAGE_PROMPT_GENERATION_PROMPT_TEMPLATE,
     TOOLS_FUNCTION_CALLING_PROMPT_TEMPLATE,
     VOICE_MODE_PROMPT_TEMPLATE,
@@ -483,6 +488,7 @@ from open_webui.env import (
     RESET_CONFIG_ON_START,
     ENABLE_VERSION_UPDATE_CHECK,
     ENABLE_OTEL,
+    ENABLE_OTEL_METRICS,
     EXTERNAL_PWA_MANIFEST_URL,
     AIOHTTP_CLIENT_SESSION_SSL,
     ENABLE_STAR_SESSIONS_MIDDLEWARE,
@@ -528,6 +534,17 @@ from open_webui.utils.oauth import (
 )
 from open_webui.utils.security_headers import SecurityHeadersMiddleware
 from open_webui.utils.redis import get_redis_connection
+from open_webui.utils.admission import (
+    AdmissionController,
+    get_queue_position_emitter,
+)
+from open_webui.utils.code_interpreter import close_jupyter_kernel_pools
+from open_webui.utils.memory_index import MemoryIndexCache
+from open_webui.utils.file_jobs import run_file_processing_workers
+from open_webui.utils.file_status import (
+    init_file_status_events,
+    redis_file_status_listener,
+)
 
 from open_webui.tasks import (
     redis_task_command_listener,
@@ -616,17 +633,33 @@ async def lifespan(app: FastAPI):
         redis_cluster=REDIS_CLUSTER,
         async_mode=True,
     )
+    app.state.chat_admission = AdmissionController(redis=app.state.redis)
+    app.state.memory_indexes = MemoryIndexCache(redis=app.state.redis)
+
+    init_file_status_events(asyncio.get_running_loop())
 
     if app.state.redis is not None:
         app.state.redis_task_command_listener = asyncio.create_task(
             redis_task_command_listener(app)
         )
+        app.state.redis_file_status_listener = asyncio.create_task(
+            redis_file_status_listener(app.state.redis)
+        )
 
     if THREAD_POOL_SIZE and THREAD_POOL_SIZE > 0:
         limiter = anyio.to_thread.current_default_thread_limiter()
         limiter.total_tokens = THREAD_POOL_SIZE
 
     asyncio.create_task(periodic_usage_pool_cleanup())
+    asyncio.create_task(periodic_leaderboard_rebuild(app))
+    asyncio.create_task(periodic_user_activity_flush())
+    asyncio.create_task(periodic_web_search_collection_cleanup())
+    asyncio.create_task(run_file_processing_workers(app))
+
+    if ENABLE_OTEL and ENABLE_OTEL_METRICS:
+        from open_webui.utils.telemetry.metrics import periodic_user_counts_refresh
+
+        asyncio.create_task(periodic_user_counts_refresh(app))
 
     if app.state.config.ENABLE_BASE_MODELS_CACHE:
         await get_all_models(
@@ -651,9 +684,15 @@ async def lifespan(app: FastAPI):
 
     yield
 
+    Users.flush_last_active()
+    await close_jupyter_kernel_pools()
+
     if hasattr(app.state, "redis_task_command_listener"):
         app.state.redis_task_command_listener.cancel()
 
+    if hasattr(app.state, "redis_file_status_listener"):
+        app.state.redis_file_status_listener.cancel()
+
 
 app = FastAPI(
     title="Open WebUI",
@@ -679,6 +718,8 @@ app.state.config = AppConfig(
     redis_key_prefix=REDIS_KEY_PREFIX,
 )
 app.state.redis = None
+app.state.chat_admission = AdmissionController()
+app.state.memory_indexes = MemoryIndexCache()
 
 app.state.WEBUI_NAME = WEBUI_NAME
 app.state.LICENSE_METADATA = None
@@ -1232,6 +1273,7 @@ app.state.config.ENABLE_AUTOCOMPLETE_GENERATION = ENABLE_AUTOCOMPLETE_GENERATION
 app.state.config.ENABLE_TAGS_GENERATION = ENABLE_TAGS_GENERATION
 app.state.config.ENABLE_TITLE_GENERATION = ENABLE_TITLE_GENERATION
 app.state.config.ENABLE_FOLLOW_UP_GENERATION = ENABLE_FOLLOW_UP_GENERATION
+app.state.config.ENABLE_COMBINED_TASK_GENERATION = ENABLE_COMBINED_TASK_GENERATION
 
 
 app.state.config.TITLE_GENERATION_PROMPT_TEMPLATE = TITLE_GENERATION_PROMPT_TEMPLATE
@@ -1242,6 +1284,9 @@ app.state.config.IMAGE_PROMPT_GENERATION_PROMPT_TEMPLATE = (
 app.state.config.FOLLOW_UP_GENERATION_PROMPT_TEMPLATE = (
     FOLLOW_UP_GENERATION_PROMPT_TEMPLATE
 )
+app.state.config.COMBINED_TASK_GENERATION_PROMPT_TEMPLATE = (
+    COMBINED_TASK_GENERATION_PROMPT_TEMPLATE
+)
 
 app.state.config.TOOLS_FUNCTION_CALLING_PROMPT_TEMPLATE = (
     TOOLS_FUNCTION_CALLING_PROMPT_TEMPLATE
@@ -1710,8 +1755,16 @@ async def chat_completion(
             detail=str(e),
         )
 
-    async def process_chat(request, form_data, user, metadata, model):
+    async def process_chat(request, form_data, user, metadata, model, admit=False):
+        ticket = None
         try:
+            if admit:
+                ticket = await request.app.state.chat_admission.acquire(
+                    user.id,
+                    model_id,
+                    on_position=get_queue_position_emitter(metadata),
+                )
+
             form_data, metadata, events = await process_chat_payload(
                 request, form_data, user, metadata, model
             )
@@ -1776,6 +1829,9 @@ async def chat_completion(
                 except:
                     pass
         finally:
+            if ticket is not None:
+                await request.app.state.chat_admission.release(ticket)
+
             try:
                 if mcp_clients := metadata.get("mcp_clients"):
                     for client in reversed(mcp_clients.values()):
@@ -1792,7 +1848,7 @@ async def chat_completion(
         # Asynchronous Chat Processing
         task_id, _ = await create_task(
             request.app.state.redis,
-            process_chat(request, form_data, user, metadata, model),
+            process_chat(request, form_data, user, metadata, model, admit=True),
             id=metadata["chat_id"],
         )
         return {"status": True, "task_id": task_id}
@@ -2122,8 +2178,8 @@ async def get_current_usage(user=Depends(get_verified_user)):
             )
 
         return {
-            "model_ids": get_models_in_use(),
-            "user_count": Users.get_active_user_count(),
+            "model_ids": await get_models_in_use(),
+            "user_count": await asyncio.to_thread(Users.get_active_user_count),
         }
     except HTTPException:
         raise
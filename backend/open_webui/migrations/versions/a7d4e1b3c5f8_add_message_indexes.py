@@ -0,0 +1,36 @@
+"""Add message indexes
+
+Revision ID: a7d4e1b3c5f8
+Revises: f3a1c7d2e9b4
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "a7d4e1b3c5f8"
+down_revision = "f3a1c7d2e9b4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Message table indexes
+    op.create_index(
+        "message_channel_id_parent_id_created_at_idx",
+        "message",
+        ["channel_id", "parent_id", "created_at"],
+    )
+    op.create_index("message_parent_id_idx", "message", ["parent_id"])
+
+    # Message reaction table index
+    op.create_index(
+        "message_reaction_message_id_idx", "message_reaction", ["message_id"]
+    )
+
+
+def downgrade():
+    op.drop_index("message_reaction_message_id_idx", table_name="message_reaction")
+    op.drop_index("message_parent_id_idx", table_name="message")
+    op.drop_index("message_channel_id_parent_id_created_at_idx", table_name="message")
@@ -0,0 +1,57 @@
+"""Add channel last_message_at and member unread_count
+
+Revision ID: b2c9e6f4a1d7
+Revises: a7d4e1b3c5f8
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "b2c9e6f4a1d7"
+down_revision = "a7d4e1b3c5f8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "channel", sa.Column("last_message_at", sa.BigInteger(), nullable=True)
+    )
+    op.add_column(
+        "channel_member",
+        sa.Column(
+            "unread_count",
+            sa.BigInteger(),
+            nullable=False,
+            default=0,
+            server_default="0",
+        ),
+    )
+
+    # Backfill from the existing messages
+    op.execute(
+        """
+        UPDATE channel SET last_message_at = (
+            SELECT MAX(message.created_at) FROM message
+            WHERE message.channel_id = channel.id
+        )
+        """
+    )
+    op.execute(
+        """
+        UPDATE channel_member SET unread_count = (
+            SELECT COUNT(*) FROM message
+            WHERE message.channel_id = channel_member.channel_id
+            AND message.parent_id IS NULL
+            AND message.user_id != channel_member.user_id
+            AND message.created_at > COALESCE(channel_member.last_read_at, 0)
+        )
+        """
+    )
+
+
+def downgrade():
+    op.drop_column("channel_member", "unread_count")
+    op.drop_column("channel", "last_message_at")
@@ -0,0 +1,37 @@
+"""Add knowledge_reindex_job table
+
+Revision ID: c8e3f5a2d6b9
+Revises: b2c9e6f4a1d7
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "c8e3f5a2d6b9"
+down_revision = "b2c9e6f4a1d7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "knowledge_reindex_job",
+        sa.Column("id", sa.Text(), primary_key=True, unique=True),
+        sa.Column("user_id", sa.Text(), nullable=True),
+        sa.Column("status", sa.Text(), nullable=True),
+        sa.Column("total_files", sa.BigInteger(), nullable=True),
+        sa.Column("processed_files", sa.BigInteger(), nullable=True),
+        sa.Column("failed_files", sa.BigInteger(), nullable=True),
+        sa.Column("data", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("started_at", sa.BigInteger(), nullable=True),
+        sa.Column("finished_at", sa.BigInteger(), nullable=True),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_table("knowledge_reindex_job")
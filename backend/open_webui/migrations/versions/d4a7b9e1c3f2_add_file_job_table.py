@@ -0,0 +1,45 @@
+"""Add file_job table
+
+Revision ID: d4a7b9e1c3f2
+Revises: c8e3f5a2d6b9
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "d4a7b9e1c3f2"
+down_revision = "c8e3f5a2d6b9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "file_job",
+        sa.Column("id", sa.Text(), primary_key=True, unique=True),
+        sa.Column("file_id", sa.Text(), nullable=True),
+        sa.Column("user_id", sa.Text(), nullable=True),
+        sa.Column("engine", sa.Text(), nullable=True),
+        sa.Column("priority", sa.Integer(), nullable=True),
+        sa.Column("status", sa.Text(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=True),
+        sa.Column("max_attempts", sa.Integer(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("data", sa.JSON(), nullable=True),
+        sa.Column("hostname", sa.Text(), nullable=True),
+        sa.Column("run_after", sa.BigInteger(), nullable=True),
+        sa.Column("locked_by", sa.Text(), nullable=True),
+        sa.Column("locked_at", sa.BigInteger(), nullable=True),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+    )
+    op.create_index(
+        "file_job_status_run_after_idx", "file_job", ["status", "run_after"]
+    )
+
+
+def downgrade():
+    op.drop_index("file_job_status_run_after_idx", table_name="file_job")
+    op.drop_table("file_job")
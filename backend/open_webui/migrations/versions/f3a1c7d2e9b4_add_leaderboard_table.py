@@ -0,0 +1,32 @@
+"""Add leaderboard table
+
+Revision ID: f3a1c7d2e9b4
+Revises: c440947495f3, e4b8c2a91f23
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "f3a1c7d2e9b4"
+# Also merges the chat_file and gemini live branches into a single head
+down_revision = ("c440947495f3", "e4b8c2a91f23")
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "leaderboard",
+        sa.Column("model_id", sa.Text(), primary_key=True, unique=True),
+        sa.Column("rating", sa.Float(), nullable=True, default=1000.0),
+        sa.Column("won", sa.BigInteger(), nullable=True, default=0),
+        sa.Column("lost", sa.BigInteger(), nullable=True, default=0),
+        sa.Column("tags", sa.JSON(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_table("leaderboard")
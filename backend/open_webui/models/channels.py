@@ -60,6 +60,9 @@ class Channel(Base):
     deleted_at = Column(BigInteger, nullable=True)
     deleted_by = Column(Text, nullable=True)
 
+    # Denormalized, maintained by Messages on insert/delete
+    last_message_at = Column(BigInteger, nullable=True)
+
 
 class ChannelModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -89,6 +92,8 @@ class ChannelModel(BaseModel):
     deleted_at: Optional[int] = None  # timestamp in epoch (time_ns)
     deleted_by: Optional[str] = None
 
+    last_message_at: Optional[int] = None  # timestamp in epoch (time_ns)
+
 
 class ChannelMember(Base):
     __tablename__ = "channel_member"
@@ -116,6 +121,10 @@ class ChannelMember(Base):
 
     last_read_at = Column(BigInteger, nullable=True)
 
+    # Top-level messages from others since last_read_at, maintained by
+    # Messages on insert/delete and reset when the channel is read
+    unread_count = Column(BigInteger, nullable=False, default=0, server_default="0")
+
     created_at = Column(BigInteger)
     updated_at = Column(BigInteger)
 
@@ -145,6 +154,7 @@ class ChannelMemberModel(BaseModel):
     left_at: Optional[int] = None  # timestamp in epoch (time_ns)
 
     last_read_at: Optional[int] = None  # timestamp in epoch (time_ns)
+    unread_count: int = 0
 
     created_at: Optional[int] = None  # timestamp in epoch (time_ns)
     updated_at: Optional[int] = None  # timestamp in epoch (time_ns)
@@ -631,6 +641,43 @@ class ChannelTable:
                 for membership in memberships
             ]
 
+    def get_members_by_channel_ids(
+        self, channel_ids: list[str], db: Optional[Session] = None
+    ) -> list[ChannelMemberModel]:
+        if not channel_ids:
+            return []
+
+        with get_db_context(db) as db:
+            memberships = (
+                db.query(ChannelMember)
+                .filter(ChannelMember.channel_id.in_(channel_ids))
+                .all()
+            )
+            return [
+                ChannelMemberModel.model_validate(membership)
+                for membership in memberships
+            ]
+
+    def get_members_by_user_id_and_channel_ids(
+        self, user_id: str, channel_ids: list[str], db: Optional[Session] = None
+    ) -> list[ChannelMemberModel]:
+        if not channel_ids:
+            return []
+
+        with get_db_context(db) as db:
+            memberships = (
+                db.query(ChannelMember)
+                .filter(
+                    ChannelMember.user_id == user_id,
+                    ChannelMember.channel_id.in_(channel_ids),
+                )
+                .all()
+            )
+            return [
+                ChannelMemberModel.model_validate(membership)
+                for membership in memberships
+            ]
+
     def pin_channel(
         self,
         channel_id: str,
@@ -672,6 +719,7 @@ class ChannelTable:
                 return False
 
             membership.last_read_at = int(time.time_ns())
+            membership.unread_count = 0
             membership.updated_at = int(time.time_ns())
 
             db.commit()
@@ -998,6 +1046,20 @@ class ChannelTable:
             )
             return ChannelWebhookModel.model_validate(webhook) if webhook else None
 
+    def get_webhooks_by_ids(
+        self, webhook_ids: list[str], db: Optional[Session] = None
+    ) -> list[ChannelWebhookModel]:
+        if not webhook_ids:
+            return []
+
+        with get_db_context(db) as db:
+            webhooks = (
+                db.query(ChannelWebhook)
+                .filter(ChannelWebhook.id.in_(webhook_ids))
+                .all()
+            )
+            return [ChannelWebhookModel.model_validate(w) for w in webhooks]
+
     def get_webhook_by_id_and_token(
         self, webhook_id: str, token: str, db: Optional[Session] = None
     ) -> Optional[ChannelWebhookModel]:
@@ -296,7 +296,9 @@ class FeedbackTable:
         with get_db_context(db) as db:
             return [
                 LeaderboardFeedbackData(id=row.id, data=row.data)
-                for row in db.query(Feedback.id, Feedback.data).all()
+                for row in db.query(Feedback.id, Feedback.data)
+                .order_by(Feedback.created_at.asc())
+                .all()
             ]
 
     def get_model_evaluation_history(
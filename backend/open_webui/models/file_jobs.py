@@ -0,0 +1,317 @@
+import logging
+import time
+import uuid
+from typing import Optional
+
+from sqlalchemy.orm import Session
+from open_webui.internal.db import Base, get_db_context
+
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import BigInteger, Column, Index, Integer, Text, JSON, func
+
+log = logging.getLogger(__name__)
+
+####################
+# File Processing Job DB Schema
+####################
+
+
+class FileJob(Base):
+    __tablename__ = "file_job"
+
+    id = Column(Text, primary_key=True, unique=True)
+    file_id = Column(Text)
+    user_id = Column(Text)
+
+    # Extraction engine the job counts against, e.g. "audio" or "tika"
+    engine = Column(Text)
+    priority = Column(Integer, default=0)
+
+    # queued, running, failed
+    status = Column(Text)
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=3)
+    error = Column(Text, nullable=True)
+
+    # {"content_type", "file_path", "metadata"}
+    data = Column(JSON, nullable=True)
+    # Host that received the upload, the only one that can read it from
+    # local storage
+    hostname = Column(Text, nullable=True)
+
+    run_after = Column(BigInteger)
+    locked_by = Column(Text, nullable=True)
+    locked_at = Column(BigInteger, nullable=True)
+
+    created_at = Column(BigInteger)
+    updated_at = Column(BigInteger)
+
+    __table_args__ = (
+        # Claim query: next runnable job by priority and age
+        Index("file_job_status_run_after_idx", "status", "run_after"),
+    )
+
+
+class FileJobModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    file_id: str
+    user_id: str
+
+    engine: str
+    priority: int = 0
+
+    status: str
+    attempts: int = 0
+    max_attempts: int = 3
+    error: Optional[str] = None
+
+    data: Optional[dict] = None
+    hostname: Optional[str] = None
+
+    run_after: int  # timestamp in epoch
+    locked_by: Optional[str] = None
+    locked_at: Optional[int] = None  # timestamp in epoch
+
+    created_at: int  # timestamp in epoch
+    updated_at: int  # timestamp in epoch
+
+
+class FileJobTable:
+    def insert_new_job(
+        self,
+        file_id: str,
+        user_id: str,
+        engine: str,
+        priority: int = 0,
+        data: Optional[dict] = None,
+        max_attempts: int = 3,
+        hostname: Optional[str] = None,
+        db: Optional[Session] = None,
+    ) -> Optional[FileJobModel]:
+        with get_db_context(db) as db:
+            now = int(time.time())
+            job = FileJobModel(
+                **{
+                    "id": str(uuid.uuid4()),
+                    "file_id": file_id,
+                    "user_id": user_id,
+                    "engine": engine,
+                    "priority": priority,
+                    "status": "queued",
+                    "max_attempts": max_attempts,
+                    "data": data,
+                    "hostname": hostname,
+                    "run_after": now,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+            result = FileJob(**job.model_dump())
+            db.add(result)
+            db.commit()
+            db.refresh(result)
+            return FileJobModel.model_validate(result) if result else None
+
+    def get_job_by_id(
+        self, id: str, db: Optional[Session] = None
+    ) -> Optional[FileJobModel]:
+        with get_db_context(db) as db:
+            job = db.get(FileJob, id)
+            return FileJobModel.model_validate(job) if job else None
+
+    def get_runnable_jobs(
+        self,
+        limit: int = 50,
+        hostname: Optional[str] = None,
+        db: Optional[Session] = None,
+    ) -> list[FileJobModel]:
+        """Queued jobs that are due, only those received by hostname if given."""
+        with get_db_context(db) as db:
+            query = db.query(FileJob).filter(
+                FileJob.status == "queued",
+                FileJob.run_after <= int(time.time()),
+            )
+            if hostname is not None:
+                query = query.filter(FileJob.hostname == hostname)
+
+            jobs = (
+                query.order_by(FileJob.priority.desc(), FileJob.created_at.asc())
+                .limit(limit)
+                .all()
+            )
+            return [FileJobModel.model_validate(job) for job in jobs]
+
+    def get_running_counts(
+        self, db: Optional[Session] = None
+    ) -> tuple[dict[str, int], dict[str, int]]:
+        """Running jobs grouped by user and by engine."""
+        with get_db_context(db) as db:
+            by_user = dict(
+                db.query(FileJob.user_id, func.count(FileJob.id))
+                .filter(FileJob.status == "running")
+                .group_by(FileJob.user_id)
+                .all()
+            )
+            by_engine = dict(
+                db.query(FileJob.engine, func.count(FileJob.id))
+                .filter(FileJob.status == "running")
+                .group_by(FileJob.engine)
+                .all()
+            )
+            return by_user, by_engine
+
+    def claim_job(
+        self,
+        id: str,
+        worker_id: str,
+        max_jobs_per_user: Optional[int] = None,
+        max_jobs_per_engine: Optional[int] = None,
+        db: Optional[Session] = None,
+    ) -> Optional[FileJobModel]:
+        """
+        Move a queued job to running; only one worker can win the claim.
+        Claims committed by other workers at the same time are invisible to
+        a check made before the update, so the limits are checked once this
+        claim is committed, and a claim that went over one is handed back.
+        Of two racing claims at least the later one sees both, so the limits
+        hold, although both may back off until the next poll.
+        """
+        with get_db_context(db) as db:
+            now = int(time.time())
+            result = (
+                db.query(FileJob)
+                .filter(FileJob.id == id, FileJob.status == "queued")
+                .update(
+                    {
+                        "status": "running",
+                        "attempts": FileJob.attempts + 1,
+                        "locked_by": worker_id,
+                        "locked_at": now,
+                        "updated_at": now,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            if not result:
+                return None
+
+            job = db.get(FileJob, id)
+            if job is None:
+                return None
+
+            for column, limit in (
+                (FileJob.user_id, max_jobs_per_user),
+                (FileJob.engine, max_jobs_per_engine),
+            ):
+                if not limit:
+                    continue
+
+                running = (
+                    db.query(func.count(FileJob.id))
+                    .filter(
+                        FileJob.status == "running",
+                        column == getattr(job, column.key),
+                    )
+                    .scalar()
+                )
+                if running > limit:
+                    db.query(FileJob).filter(
+                        FileJob.id == id, FileJob.locked_by == worker_id
+                    ).update(
+                        {
+                            "status": "queued",
+                            "attempts": FileJob.attempts - 1,
+                            "locked_by": None,
+                            "locked_at": None,
+                            "updated_at": int(time.time()),
+                        },
+                        synchronize_session=False,
+                    )
+                    db.commit()
+                    return None
+
+            return FileJobModel.model_validate(job)
+
+    def retry_job(
+        self, id: str, run_after: int, error: str, db: Optional[Session] = None
+    ) -> bool:
+        with get_db_context(db) as db:
+            result = (
+                db.query(FileJob)
+                .filter(FileJob.id == id)
+                .update(
+                    {
+                        "status": "queued",
+                        "run_after": run_after,
+                        "error": error,
+                        "locked_by": None,
+                        "locked_at": None,
+                        "updated_at": int(time.time()),
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            return result > 0
+
+    def fail_job(self, id: str, error: str, db: Optional[Session] = None) -> bool:
+        with get_db_context(db) as db:
+            result = (
+                db.query(FileJob)
+                .filter(FileJob.id == id)
+                .update(
+                    {
+                        "status": "failed",
+                        "error": error,
+                        "locked_by": None,
+                        "locked_at": None,
+                        "updated_at": int(time.time()),
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            return result > 0
+
+    def delete_job_by_id(self, id: str, db: Optional[Session] = None) -> bool:
+        with get_db_context(db) as db:
+            db.query(FileJob).filter(FileJob.id == id).delete()
+            db.commit()
+            return True
+
+    def touch_job_by_id(self, id: str, db: Optional[Session] = None) -> bool:
+        with get_db_context(db) as db:
+            result = (
+                db.query(FileJob)
+                .filter(FileJob.id == id, FileJob.status == "running")
+                .update({"locked_at": int(time.time())}, synchronize_session=False)
+            )
+            db.commit()
+            return result > 0
+
+    def requeue_stale_jobs(
+        self, locked_before: int, db: Optional[Session] = None
+    ) -> int:
+        """Hand jobs whose worker died back to the queue."""
+        with get_db_context(db) as db:
+            result = (
+                db.query(FileJob)
+                .filter(FileJob.status == "running", FileJob.locked_at < locked_before)
+                .update(
+                    {
+                        "status": "queued",
+                        "locked_by": None,
+                        "locked_at": None,
+                        "updated_at": int(time.time()),
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            return result
+
+
+FileJobs = FileJobTable()
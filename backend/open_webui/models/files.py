@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Column, String, Text, JSON
+from open_webui.utils.file_status import publish_file_status
 
 log = logging.getLogger(__name__)
 
@@ -338,9 +339,17 @@ class FilesTable:
         with get_db_context(db) as db:
             try:
                 file = db.query(File).filter_by(id=id).first()
+                previous_status = (file.data or {}).get("status")
                 file.data = {**(file.data if file.data else {}), **data}
                 file.updated_at = int(time.time())
                 db.commit()
+
+                if "status" in data and (
+                    data["status"] != previous_status or data.get("error")
+                ):
+                    publish_file_status(
+                        id, data["status"], data.get("error"), user_id=file.user_id
+                    )
                 return FileModel.model_validate(file)
             except Exception as e:
 
@@ -0,0 +1,189 @@
+import logging
+import time
+import uuid
+from typing import Optional
+
+from sqlalchemy.orm import Session
+from open_webui.internal.db import Base, get_db_context
+
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import BigInteger, Column, Text, JSON, and_, or_
+
+log = logging.getLogger(__name__)
+
+# A running job that has not checkpointed for this long lost its worker
+REINDEX_JOB_STALE_AFTER = 5 * 60
+
+####################
+# Knowledge Reindex Job DB Schema
+####################
+
+
+class KnowledgeReindexJob(Base):
+    __tablename__ = "knowledge_reindex_job"
+
+    id = Column(Text, primary_key=True, unique=True)
+    user_id = Column(Text)
+
+    # pending, running, cancelling, cancelled, completed, failed
+    status = Column(Text)
+
+    total_files = Column(BigInteger, default=0)
+    processed_files = Column(BigInteger, default=0)
+    failed_files = Column(BigInteger, default=0)
+
+    # Checkpoint per knowledge base:
+    # {"in_place": bool, "knowledge_bases": [{"id", "file_ids", "status", "done": [file_id], "failed": {file_id: error}}]}
+    # where a knowledge base status is pending, running, swapping or completed
+    data = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+
+    started_at = Column(BigInteger, nullable=True)
+    finished_at = Column(BigInteger, nullable=True)
+
+    created_at = Column(BigInteger)
+    updated_at = Column(BigInteger)
+
+
+class KnowledgeReindexJobModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    user_id: str
+
+    status: str
+
+    total_files: int = 0
+    processed_files: int = 0
+    failed_files: int = 0
+
+    data: Optional[dict] = None
+    error: Optional[str] = None
+
+    started_at: Optional[int] = None  # timestamp in epoch
+    finished_at: Optional[int] = None  # timestamp in epoch
+
+    created_at: int  # timestamp in epoch
+    updated_at: int  # timestamp in epoch
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in ["pending", "running", "cancelling"]
+
+    @property
+    def is_stale(self) -> bool:
+        """Active according to the DB, but no worker has touched it recently."""
+        return (
+            self.is_active
+            and int(time.time()) - self.updated_at > REINDEX_JOB_STALE_AFTER
+        )
+
+
+####################
+# Forms
+####################
+
+
+class KnowledgeReindexJobResponse(KnowledgeReindexJobModel):
+    eta: Optional[int] = None  # seconds
+    stale: bool = False
+    # Knowledge bases return no search results until they are rebuilt
+    in_place: bool = False
+
+
+class KnowledgeReindexJobTable:
+    def insert_new_job(
+        self, user_id: str, data: dict, total_files: int, db: Optional[Session] = None
+    ) -> Optional[KnowledgeReindexJobModel]:
+        with get_db_context(db) as db:
+            now = int(time.time())
+            job = KnowledgeReindexJobModel(
+                **{
+                    "id": str(uuid.uuid4()),
+                    "user_id": user_id,
+                    "status": "pending",
+                    "total_files": total_files,
+                    "data": data,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+            result = KnowledgeReindexJob(**job.model_dump())
+            db.add(result)
+            db.commit()
+            db.refresh(result)
+            return KnowledgeReindexJobModel.model_validate(result) if result else None
+
+    def get_job_by_id(
+        self, id: str, db: Optional[Session] = None
+    ) -> Optional[KnowledgeReindexJobModel]:
+        with get_db_context(db) as db:
+            job = db.get(KnowledgeReindexJob, id)
+            return KnowledgeReindexJobModel.model_validate(job) if job else None
+
+    def get_latest_job(
+        self, db: Optional[Session] = None
+    ) -> Optional[KnowledgeReindexJobModel]:
+        with get_db_context(db) as db:
+            job = (
+                db.query(KnowledgeReindexJob)
+                .order_by(KnowledgeReindexJob.created_at.desc())
+                .first()
+            )
+            return KnowledgeReindexJobModel.model_validate(job) if job else None
+
+    def update_job_by_id(
+        self, id: str, updated: dict, db: Optional[Session] = None
+    ) -> Optional[KnowledgeReindexJobModel]:
+        with get_db_context(db) as db:
+            job = db.get(KnowledgeReindexJob, id)
+            if not job:
+                return None
+
+            for key, value in updated.items():
+                setattr(job, key, value)
+            job.updated_at = int(time.time())
+
+            db.commit()
+            db.refresh(job)
+            return KnowledgeReindexJobModel.model_validate(job)
+
+    def update_job_status_by_id(
+        self,
+        id: str,
+        status: str,
+        from_statuses: list[str],
+        include_stale: bool = False,
+        db: Optional[Session] = None,
+    ) -> bool:
+        """
+        Compare-and-set the status, so only one worker can claim a job.
+        With include_stale, active jobs whose worker went away also match.
+        """
+        with get_db_context(db) as db:
+            condition = KnowledgeReindexJob.status.in_(from_statuses)
+            if include_stale:
+                condition = or_(
+                    condition,
+                    and_(
+                        KnowledgeReindexJob.status.in_(
+                            ["pending", "running", "cancelling"]
+                        ),
+                        KnowledgeReindexJob.updated_at
+                        < int(time.time()) - REINDEX_JOB_STALE_AFTER,
+                    ),
+                )
+
+            result = (
+                db.query(KnowledgeReindexJob)
+                .filter(KnowledgeReindexJob.id == id, condition)
+                .update(
+                    {"status": status, "updated_at": int(time.time())},
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            return result > 0
+
+
+KnowledgeReindexJobs = KnowledgeReindexJobTable()
@@ -0,0 +1,158 @@
+import logging
+import time
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+from open_webui.internal.db import Base, get_db_context
+
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import BigInteger, Column, Float, Text, JSON
+from sqlalchemy.exc import IntegrityError
+
+log = logging.getLogger(__name__)
+
+
+####################
+# Leaderboard DB Schema
+####################
+
+
+class Leaderboard(Base):
+    """Materialized Elo ratings, maintained incrementally as feedback changes."""
+
+    __tablename__ = "leaderboard"
+
+    model_id = Column(Text, primary_key=True, unique=True)
+    rating = Column(Float, default=1000.0)
+    won = Column(BigInteger, default=0)
+    lost = Column(BigInteger, default=0)
+    tags = Column(JSON, nullable=True)  # {tag: count}
+    updated_at = Column(BigInteger)
+
+
+class LeaderboardModel(BaseModel):
+    model_id: str
+    rating: float = 1000.0
+    won: int = 0
+    lost: int = 0
+    tags: Optional[dict] = None
+    updated_at: Optional[int] = None
+
+    model_config = ConfigDict(from_attributes=True, protected_namespaces=())
+
+
+class LeaderboardTable:
+    def get_entries(self, db: Optional[Session] = None) -> list[LeaderboardModel]:
+        with get_db_context(db) as db:
+            return [
+                LeaderboardModel.model_validate(row)
+                for row in db.query(Leaderboard).all()
+            ]
+
+    def has_entries(self, db: Optional[Session] = None) -> bool:
+        with get_db_context(db) as db:
+            return db.query(Leaderboard.model_id).first() is not None
+
+    def update_entries(
+        self,
+        model_ids: list[str],
+        update: Callable[[dict[str, dict]], None],
+        db: Optional[Session] = None,
+    ) -> bool:
+        """
+        Read, update and write the entries of model_ids in one transaction.
+        update receives {model_id: {"rating", "won", "lost", "tags"}} for the
+        existing entries and changes or adds to it in place. The rows stay
+        locked until the commit, taken in model_id order so that concurrent
+        updates cannot deadlock, and so never overwrite each other's changes.
+        """
+        if not model_ids:
+            return True
+
+        # A concurrent update may insert a new model's entry first, the retry
+        # then locks it like any other
+        for attempt in range(2):
+            with get_db_context(db) as session:
+                try:
+                    rows = {
+                        row.model_id: row
+                        for row in session.query(Leaderboard)
+                        .filter(Leaderboard.model_id.in_(model_ids))
+                        .order_by(Leaderboard.model_id)
+                        .with_for_update()
+                        .all()
+                    }
+
+                    model_stats = {
+                        model_id: LeaderboardModel.model_validate(row).model_dump(
+                            include={"rating", "won", "lost", "tags"}
+                        )
+                        for model_id, row in rows.items()
+                    }
+                    update(model_stats)
+
+                    now = int(time.time())
+                    for model_id, stats in model_stats.items():
+                        row = rows.get(model_id)
+                        if row is None:
+                            session.add(
+                                Leaderboard(
+                                    **LeaderboardModel(
+                                        model_id=model_id, **stats
+                                    ).model_dump(exclude={"updated_at"}),
+                                    updated_at=now,
+                                )
+                            )
+                        else:
+                            row.rating = stats["rating"]
+                            row.won = stats["won"]
+                            row.lost = stats["lost"]
+                            row.tags = stats.get("tags")
+                            row.updated_at = now
+
+                    session.commit()
+                    return True
+                except IntegrityError as e:
+                    session.rollback()
+                    if attempt:
+                        log.exception(f"Error updating leaderboard entries: {e}")
+                except Exception as e:
+                    session.rollback()
+                    log.exception(f"Error updating leaderboard entries: {e}")
+                    return False
+        return False
+
+    def replace_entries(
+        self, entries: list[LeaderboardModel], db: Optional[Session] = None
+    ) -> bool:
+        """Swap the whole table for a fully recomputed one in a single transaction."""
+        try:
+            with get_db_context(db) as db:
+                now = int(time.time())
+                db.query(Leaderboard).delete()
+                db.add_all(
+                    [
+                        Leaderboard(
+                            **entry.model_dump(exclude={"updated_at"}),
+                            updated_at=now,
+                        )
+                        for entry in entries
+                    ]
+                )
+                db.commit()
+                return True
+        except Exception as e:
+            log.exception(f"Error rebuilding leaderboard: {e}")
+            return False
+
+    def delete_all_entries(self, db: Optional[Session] = None) -> bool:
+        try:
+            with get_db_context(db) as db:
+                db.query(Leaderboard).delete()
+                db.commit()
+                return True
+        except Exception:
+            return False
+
+
+Leaderboards = LeaderboardTable()
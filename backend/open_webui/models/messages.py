@@ -7,11 +7,11 @@ from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from open_webui.models.tags import TagModel, Tag, Tags
 from open_webui.models.users import Users, User, UserNameResponse
-from open_webui.models.channels import Channels, ChannelMember
+from open_webui.models.channels import Channels, Channel, ChannelMember
 
 
 from pydantic import BaseModel, ConfigDict, field_validator
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON
+from sqlalchemy import BigInteger, Boolean, Column, Index, String, Text, JSON
 from sqlalchemy import or_, func, select, and_, text
 from sqlalchemy.sql import exists
 
@@ -28,6 +28,11 @@ class MessageReaction(Base):
     name = Column(Text)
     created_at = Column(BigInteger)
 
+    __table_args__ = (
+        # WHERE message_id IN (...)
+        Index("message_reaction_message_id_idx", "message_id"),
+    )
+
 
 class MessageReactionModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -61,6 +66,18 @@ class Message(Base):
     created_at = Column(BigInteger)  # time_ns
     updated_at = Column(BigInteger)  # time_ns
 
+    __table_args__ = (
+        # WHERE channel_id = ... AND parent_id = ... ORDER BY created_at, id
+        Index(
+            "message_channel_id_parent_id_created_at_idx",
+            "channel_id",
+            "parent_id",
+            "created_at",
+        ),
+        # WHERE parent_id IN (...) GROUP BY parent_id
+        Index("message_parent_id_idx", "parent_id"),
+    )
+
 
 class MessageModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -114,6 +131,10 @@ class MessageUserSlimResponse(MessageUserResponse):
 
     @field_validator("data", mode="before")
     def convert_data_to_bool(cls, v):
+        # Already converted (e.g. re-validating a dumped response)
+        if isinstance(v, bool):
+            return v
+
         # No data or not a dict → False
         if not isinstance(v, dict):
             return False
@@ -170,40 +191,94 @@ class MessageTable:
             result = Message(**message.model_dump())
 
             db.add(result)
+            self._update_channel_counters_on_insert(result, db)
             db.commit()
             db.refresh(result)
             return MessageModel.model_validate(result) if result else None
 
-    def get_message_by_id(
-        self,
-        id: str,
-        include_thread_replies: Optional[bool] = True,
-        db: Optional[Session] = None,
-    ) -> Optional[MessageResponse]:
-        with get_db_context(db) as db:
-            message = db.get(Message, id)
-            if not message:
-                return None
+    def _update_channel_counters_on_insert(self, message: Message, db: Session):
+        """Bump last_message_at and the unread counters of the other members."""
+        db.query(Channel).filter(Channel.id == message.channel_id).update(
+            {Channel.last_message_at: message.created_at},
+            synchronize_session=False,
+        )
+
+        # Only top-level messages count as unread
+        if message.parent_id is None:
+            db.query(ChannelMember).filter(
+                ChannelMember.channel_id == message.channel_id,
+                ChannelMember.user_id != message.user_id,
+            ).update(
+                {ChannelMember.unread_count: ChannelMember.unread_count + 1},
+                synchronize_session=False,
+            )
 
-            reply_to_message = (
-                self.get_message_by_id(
-                    message.reply_to_id, include_thread_replies=False, db=db
-                )
-                if message.reply_to_id
-                else None
+    def _update_channel_counters_on_delete(self, messages: list[Message], db: Session):
+        """
+        Undo the unread increments of deleted messages for members that had
+        not read them yet, and recompute last_message_at if the latest
+        message of the channel went away. Must run after the delete is flushed.
+        """
+        for message in messages:
+            if message.parent_id is not None:
+                continue
+
+            db.query(ChannelMember).filter(
+                ChannelMember.channel_id == message.channel_id,
+                ChannelMember.user_id != message.user_id,
+                ChannelMember.unread_count > 0,
+                or_(
+                    ChannelMember.last_read_at.is_(None),
+                    ChannelMember.last_read_at < message.created_at,
+                ),
+            ).update(
+                {ChannelMember.unread_count: ChannelMember.unread_count - 1},
+                synchronize_session=False,
             )
 
-            reactions = self.get_reactions_by_message_id(id, db=db)
+        for channel_id in {message.channel_id for message in messages}:
+            latest = (
+                db.query(func.max(Message.created_at))
+                .filter(Message.channel_id == channel_id)
+                .scalar_subquery()
+            )
+            db.query(Channel).filter(Channel.id == channel_id).update(
+                {Channel.last_message_at: latest}, synchronize_session=False
+            )
 
-            thread_replies = []
-            if include_thread_replies:
-                thread_replies = self.get_thread_replies_by_message_id(id, db=db)
+    def _get_user_infos(
+        self, messages: list[Message], db: Session
+    ) -> dict[str, Optional[dict]]:
+        """
+        Resolve the author shown for each message, keyed by message id.
+        Webhook identities (in meta) take precedence over the user record;
+        webhooks and users are each loaded with a single IN-query.
+        """
+        webhook_ids = set()
+        user_ids = set()
+        for message in messages:
+            webhook_info = message.meta.get("webhook") if message.meta else None
+            if webhook_info and webhook_info.get("id"):
+                webhook_ids.add(webhook_info.get("id"))
+            else:
+                user_ids.add(message.user_id)
+
+        webhooks = {
+            webhook.id: webhook
+            for webhook in Channels.get_webhooks_by_ids(list(webhook_ids), db=db)
+        }
+        users = {
+            user.id: user
+            for user in (
+                Users.get_users_by_user_ids(list(user_ids), db=db) if user_ids else []
+            )
+        }
 
-            # Check if message was sent by webhook (webhook info in meta takes precedence)
+        user_infos = {}
+        for message in messages:
             webhook_info = message.meta.get("webhook") if message.meta else None
             if webhook_info and webhook_info.get("id"):
-                # Look up webhook by ID to get current name
-                webhook = Channels.get_webhook_by_id(webhook_info.get("id"), db=db)
+                webhook = webhooks.get(webhook_info.get("id"))
                 if webhook:
                     user_info = {
                         "id": webhook.id,
@@ -218,20 +293,101 @@ class MessageTable:
                         "role": "webhook",
                     }
             else:
-                user = Users.get_user_by_id(message.user_id, db=db)
-                user_info = user.model_dump() if user else None
+                user = users.get(message.user_id)
+                user_info = (
+                    UserNameResponse.model_validate(user.model_dump()).model_dump()
+                    if user
+                    else None
+                )
+            user_infos[message.id] = user_info
+        return user_infos
 
-            return MessageResponse.model_validate(
+    def _get_reply_to_responses(
+        self, messages: list[Message], db: Session
+    ) -> list[MessageReplyToResponse]:
+        """Attach authors and reply-to targets to a page of messages in bulk."""
+        reply_to_ids = {message.reply_to_id for message in messages}
+        reply_to_ids.discard(None)
+
+        reply_to_messages = (
+            db.query(Message).filter(Message.id.in_(reply_to_ids)).all()
+            if reply_to_ids
+            else []
+        )
+
+        user_infos = self._get_user_infos([*messages, *reply_to_messages], db)
+
+        reply_to_responses = {
+            message.id: MessageUserSlimResponse.model_validate(
                 {
                     **MessageModel.model_validate(message).model_dump(),
-                    "user": user_info,
+                    "user": user_infos.get(message.id),
+                }
+            )
+            for message in reply_to_messages
+        }
+
+        return [
+            MessageReplyToResponse.model_validate(
+                {
+                    **MessageModel.model_validate(message).model_dump(),
+                    "user": user_infos.get(message.id),
                     "reply_to_message": (
-                        reply_to_message.model_dump() if reply_to_message else None
-                    ),
-                    "latest_reply_at": (
-                        thread_replies[0].created_at if thread_replies else None
+                        reply_to_responses.get(message.reply_to_id)
+                        if message.reply_to_id
+                        else None
                     ),
-                    "reply_count": len(thread_replies),
+                }
+            )
+            for message in messages
+        ]
+
+    def _apply_cursor(
+        self,
+        query,
+        before: Optional[int] = None,
+        before_id: Optional[str] = None,
+    ):
+        """Keyset pagination on (created_at, id), newest first."""
+        if before is not None:
+            if before_id:
+                query = query.filter(
+                    or_(
+                        Message.created_at < before,
+                        and_(Message.created_at == before, Message.id < before_id),
+                    )
+                )
+            else:
+                query = query.filter(Message.created_at < before)
+        return query.order_by(Message.created_at.desc(), Message.id.desc())
+
+    def get_message_by_id(
+        self,
+        id: str,
+        include_thread_replies: Optional[bool] = True,
+        db: Optional[Session] = None,
+    ) -> Optional[MessageResponse]:
+        with get_db_context(db) as db:
+            message = db.get(Message, id)
+            if not message:
+                return None
+
+            response = self._get_reply_to_responses([message], db)[0]
+            reactions = self.get_reactions_by_message_ids([id], db=db).get(id, [])
+
+            reply_count, latest_reply_at = 0, None
+            if include_thread_replies:
+                reply_count, latest_reply_at = (
+                    self.get_thread_reply_stats_by_message_ids([id], db=db).get(
+                        id, (0, None)
+                    )
+                )
+
+            return MessageResponse.model_validate(
+                {
+                    **response.model_dump(),
+                    "latest_reply_at": latest_reply_at,
+                    "reply_count": reply_count,
                     "reactions": reactions,
                 }
             )
@@ -243,51 +399,33 @@ class MessageTable:
             all_messages = (
                 db.query(Message)
                 .filter_by(parent_id=id)
-                .order_by(Message.created_at.desc())
+                .order_by(Message.created_at.desc(), Message.id.desc())
                 .all()
             )
+            return self._get_reply_to_responses(all_messages, db)
 
-            messages = []
-            for message in all_messages:
-                reply_to_message = (
-                    self.get_message_by_id(
-                        message.reply_to_id, include_thread_replies=False, db=db
-                    )
-                    if message.reply_to_id
-                    else None
-                )
+    def get_thread_reply_stats_by_message_ids(
+        self, ids: list[str], db: Optional[Session] = None
+    ) -> dict[str, tuple[int, Optional[int]]]:
+        """Return {message_id: (reply_count, latest_reply_at)} in one grouped query."""
+        if not ids:
+            return {}
 
-                webhook_info = message.meta.get("webhook") if message.meta else None
-                user_info = None
-                if webhook_info and webhook_info.get("id"):
-                    webhook = Channels.get_webhook_by_id(webhook_info.get("id"), db=db)
-                    if webhook:
-                        user_info = {
-                            "id": webhook.id,
-                            "name": webhook.name,
-                            "role": "webhook",
-                        }
-                    else:
-                        user_info = {
-                            "id": webhook_info.get("id"),
-                            "name": "Deleted Webhook",
-                            "role": "webhook",
-                        }
-
-                messages.append(
-                    MessageReplyToResponse.model_validate(
-                        {
-                            **MessageModel.model_validate(message).model_dump(),
-                            "user": user_info,
-                            "reply_to_message": (
-                                reply_to_message.model_dump()
-                                if reply_to_message
-                                else None
-                            ),
-                        }
-                    )
+        with get_db_context(db) as db:
+            rows = (
+                db.query(
+                    Message.parent_id,
+                    func.count(Message.id),
+                    func.max(Message.created_at),
                 )
-            return messages
+                .filter(Message.parent_id.in_(ids))
+                .group_by(Message.parent_id)
+                .all()
+            )
+            return {
+                parent_id: (count, latest_reply_at)
+                for parent_id, count, latest_reply_at in rows
+            }
 
     def get_reply_user_ids_by_message_id(
         self, id: str, db: Optional[Session] = None
@@ -303,59 +441,26 @@ class MessageTable:
         channel_id: str,
         skip: int = 0,
         limit: int = 50,
+        before: Optional[int] = None,
+        before_id: Optional[str] = None,
         db: Optional[Session] = None,
     ) -> list[MessageReplyToResponse]:
+        """
+        Top-level messages of a channel, newest first. Pass the created_at and
+        id of the oldest message already loaded as before/before_id to page
+        with a keyset cursor; skip is only honoured when no cursor is given.
+        """
         with get_db_context(db) as db:
-            all_messages = (
-                db.query(Message)
-                .filter_by(channel_id=channel_id, parent_id=None)
-                .order_by(Message.created_at.desc())
-                .offset(skip)
-                .limit(limit)
-                .all()
+            query = self._apply_cursor(
+                db.query(Message).filter_by(channel_id=channel_id, parent_id=None),
+                before,
+                before_id,
             )
+            if before is None:
+                query = query.offset(skip)
 
-            messages = []
-            for message in all_messages:
-                reply_to_message = (
-                    self.get_message_by_id(
-                        message.reply_to_id, include_thread_replies=False, db=db
-                    )
-                    if message.reply_to_id
-                    else None
-                )
-
-                webhook_info = message.meta.get("webhook") if message.meta else None
-                user_info = None
-                if webhook_info and webhook_info.get("id"):
-                    webhook = Channels.get_webhook_by_id(webhook_info.get("id"), db=db)
-                    if webhook:
-                        user_info = {
-                            "id": webhook.id,
-                            "name": webhook.name,
-                            "role": "webhook",
-                        }
-                    else:
-                        user_info = {
-                            "id": webhook_info.get("id"),
-                            "name": "Deleted Webhook",
-                            "role": "webhook",
-                        }
-
-                messages.append(
-                    MessageReplyToResponse.model_validate(
-                        {
-                            **MessageModel.model_validate(message).model_dump(),
-                            "user": user_info,
-                            "reply_to_message": (
-                                reply_to_message.model_dump()
-                                if reply_to_message
-                                else None
-                            ),
-                        }
-                    )
-                )
-            return messages
+            all_messages = query.limit(limit).all()
+            return self._get_reply_to_responses(all_messages, db)
 
     def get_messages_by_parent_id(
         self,
@@ -363,6 +468,8 @@ class MessageTable:
         parent_id: str,
         skip: int = 0,
         limit: int = 50,
+        before: Optional[int] = None,
+        before_id: Optional[str] = None,
         db: Optional[Session] = None,
     ) -> list[MessageReplyToResponse]:
         with get_db_context(db) as db:
@@ -371,60 +478,21 @@ class MessageTable:
             if not message:
                 return []
 
-            all_messages = (
-                db.query(Message)
-                .filter_by(channel_id=channel_id, parent_id=parent_id)
-                .order_by(Message.created_at.desc())
-                .offset(skip)
-                .limit(limit)
-                .all()
+            query = self._apply_cursor(
+                db.query(Message).filter_by(channel_id=channel_id, parent_id=parent_id),
+                before,
+                before_id,
             )
+            if before is None:
+                query = query.offset(skip)
+
+            all_messages = query.limit(limit).all()
 
             # If length of all_messages is less than limit, then add the parent message
             if len(all_messages) < limit:
                 all_messages.append(message)
 
-            messages = []
-            for message in all_messages:
-                reply_to_message = (
-                    self.get_message_by_id(
-                        message.reply_to_id, include_thread_replies=False, db=db
-                    )
-                    if message.reply_to_id
-                    else None
-                )
-
-                webhook_info = message.meta.get("webhook") if message.meta else None
-                user_info = None
-                if webhook_info and webhook_info.get("id"):
-                    webhook = Channels.get_webhook_by_id(webhook_info.get("id"), db=db)
-                    if webhook:
-                        user_info = {
-                            "id": webhook.id,
-                            "name": webhook.name,
-                            "role": "webhook",
-                        }
-                    else:
-                        user_info = {
-                            "id": webhook_info.get("id"),
-                            "name": "Deleted Webhook",
-                            "role": "webhook",
-                        }
-
-                messages.append(
-                    MessageReplyToResponse.model_validate(
-                        {
-                            **MessageModel.model_validate(message).model_dump(),
-                            "user": user_info,
-                            "reply_to_message": (
-                                reply_to_message.model_dump()
-                                if reply_to_message
-                                else None
-                            ),
-                        }
-                    )
-                )
-            return messages
+            return self._get_reply_to_responses(all_messages, db)
 
     def get_last_message_by_channel_id(
         self, channel_id: str, db: Optional[Session] = None
@@ -538,18 +606,28 @@ class MessageTable:
     def get_reactions_by_message_id(
         self, id: str, db: Optional[Session] = None
     ) -> list[Reactions]:
+        return self.get_reactions_by_message_ids([id], db=db).get(id, [])
+
+    def get_reactions_by_message_ids(
+        self, ids: list[str], db: Optional[Session] = None
+    ) -> dict[str, list[Reactions]]:
+        if not ids:
+            return {}
+
         with get_db_context(db) as db:
             # JOIN User so all user info is fetched in one query
             results = (
                 db.query(MessageReaction, User)
                 .join(User, MessageReaction.user_id == User.id)
-                .filter(MessageReaction.message_id == id)
+                .filter(MessageReaction.message_id.in_(ids))
+                .order_by(MessageReaction.created_at.asc())
                 .all()
             )
 
-            reactions = {}
+            reactions_by_message = {}
 
             for reaction, user in results:
+                reactions = reactions_by_message.setdefault(reaction.message_id, {})
                 if reaction.name not in reactions:
                     reactions[reaction.name] = {
                         "name": reaction.name,
@@ -565,7 +643,10 @@ class MessageTable:
                 )
                 reactions[reaction.name]["count"] += 1
 
-            return [Reactions(**reaction) for reaction in reactions.values()]
+            return {
+                message_id: [Reactions(**reaction) for reaction in reactions.values()]
+                for message_id, reactions in reactions_by_message.items()
+            }
 
     def remove_reaction_by_id_and_user_id_and_name(
         self, id: str, user_id: str, name: str, db: Optional[Session] = None
@@ -585,17 +666,25 @@ class MessageTable:
 
     def delete_replies_by_id(self, id: str, db: Optional[Session] = None) -> bool:
         with get_db_context(db) as db:
+            replies = db.query(Message).filter_by(parent_id=id).all()
             db.query(Message).filter_by(parent_id=id).delete()
+            db.flush()
+
+            self._update_channel_counters_on_delete(replies, db)
             db.commit()
             return True
 
     def delete_message_by_id(self, id: str, db: Optional[Session] = None) -> bool:
         with get_db_context(db) as db:
+            message = db.get(Message, id)
             db.query(Message).filter_by(id=id).delete()
 
             # Delete all reactions to this message
             db.query(MessageReaction).filter_by(message_id=id).delete()
+            db.flush()
 
+            if message:
+                self._update_channel_counters_on_delete([message], db)
             db.commit()
             return True
 
@@ -1,3 +1,5 @@
+import logging
+import threading
 import time
 from typing import Optional
 
@@ -5,13 +7,16 @@ from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 
 
-from open_webui.env import DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL
+from open_webui.env import (
+    DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL,
+    REDIS_KEY_PREFIX,
+)
 
 from open_webui.models.chats import Chats
 from open_webui.models.groups import Groups, GroupMember
 from open_webui.models.channels import ChannelMember
 
-from open_webui.utils.misc import throttle
+from open_webui.utils.redis import get_redis_client
 
 
 from pydantic import BaseModel, ConfigDict
@@ -26,12 +31,19 @@ from sqlalchemy import (
     exists,
     select,
     cast,
+    update,
+    bindparam,
 )
 from sqlalchemy import or_, case
 from sqlalchemy.dialects.postgresql import JSONB
 
 import datetime
 
+log = logging.getLogger(__name__)
+
+# Users seen within this many seconds count as active
+USER_ACTIVE_WINDOW = 180
+
 ####################
 # User DB Schema
 ####################
@@ -235,6 +247,121 @@ class UserUpdateForm(BaseModel):
     password: Optional[str] = None
 
 
+class UserActivityBuffer:
+    """
+    Collects last-seen timestamps in memory and writes them to the user table
+    in one bulk UPDATE per flush, instead of one UPDATE per request. With Redis,
+    recent activity is also shared so every replica answers is_active and the
+    active user count without touching the database.
+    """
+
+    def __init__(self):
+        self._pending: dict[str, int] = {}
+        self._seen: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self._redis = get_redis_client()
+        self._redis_key = f"{REDIS_KEY_PREFIX}:users:last_active"
+
+    def record(self, user_id: str):
+        now = int(time.time())
+        with self._lock:
+            self._pending[user_id] = now
+            self._seen[user_id] = now
+
+    def get_recorded_at(self, user_id: str) -> Optional[int]:
+        """Last activity seen by this process only."""
+        return self._seen.get(user_id)
+
+    def get_last_active_at(self, user_id: str) -> Optional[int]:
+        return self.get_last_active_at_by_user_ids([user_id])[user_id]
+
+    def get_last_active_at_by_user_ids(
+        self, user_ids: list[str]
+    ) -> dict[str, Optional[int]]:
+        """
+        Last activity of each user, read from Redis in one ZMSCORE. The Redis
+        client is synchronous, so async callers run this in a thread.
+        """
+        last_active_at = {user_id: self._seen.get(user_id) for user_id in user_ids}
+        if self._redis is not None and user_ids:
+            try:
+                scores = self._redis.zmscore(self._redis_key, user_ids)
+                for user_id, score in zip(user_ids, scores):
+                    if score is not None:
+                        last_active_at[user_id] = max(
+                            last_active_at[user_id] or 0, int(score)
+                        )
+            except Exception as e:
+                log.debug(f"Failed to read user activity from Redis: {e}")
+        return last_active_at
+
+    def get_active_user_count(self, since: int) -> Optional[int]:
+        """
+        None when only the database knows about other replicas. Uses the
+        synchronous Redis client, so async callers run this in a thread.
+        """
+        if self._redis is None:
+            return None
+        try:
+            # Activity since the last flush is not in Redis yet, which is
+            # well within the window
+            return self._redis.zcount(self._redis_key, since, "+inf")
+        except Exception as e:
+            log.debug(f"Failed to count active users in Redis: {e}")
+            return None
+
+    def flush(self, db: Optional[Session] = None) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            cutoff = int(time.time()) - USER_ACTIVE_WINDOW
+            self._seen = {
+                user_id: ts for user_id, ts in self._seen.items() if ts >= cutoff
+            }
+
+        if not pending:
+            return 0
+
+        try:
+            with get_db_context(db) as db:
+                # Core UPDATE sent as one executemany. Unlike the ORM bulk
+                # UPDATE it does not fail when a user was deleted meanwhile,
+                # such ids simply match no row and are dropped.
+                table = User.__table__
+                db.execute(
+                    update(table)
+                    .where(table.c.id == bindparam("user_id"))
+                    .values(last_active_at=bindparam("ts")),
+                    [{"user_id": user_id, "ts": ts} for user_id, ts in pending.items()],
+                )
+                db.commit()
+        except Exception as e:
+            log.exception(f"Error flushing user activity: {e}")
+            with self._lock:
+                # Keep whatever is newer for the next attempt
+                for user_id, ts in pending.items():
+                    if self._pending.get(user_id, 0) < ts:
+                        self._pending[user_id] = ts
+            return 0
+
+        if self._redis is not None:
+            try:
+                pipe = self._redis.pipeline()
+                pipe.zadd(self._redis_key, pending)
+                pipe.zremrangebyscore(self._redis_key, "-inf", cutoff)
+                pipe.execute()
+            except Exception as e:
+                log.debug(f"Failed to share user activity through Redis: {e}")
+
+        return len(pending)
+
+
+# Seconds between bulk writes of user activity
+USER_ACTIVITY_FLUSH_INTERVAL = max(DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL or 5, 1)
+
+USER_ACTIVITY = UserActivityBuffer()
+
+
 class UsersTable:
     def insert_new_user(
         self,
@@ -567,21 +694,12 @@ class UsersTable:
         except Exception:
             return None
 
-    @throttle(DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL)
-    def update_last_active_by_id(
-        self, id: str, db: Optional[Session] = None
-    ) -> Optional[UserModel]:
-        try:
-            with get_db_context(db) as db:
-                db.query(User).filter_by(id=id).update(
-                    {"last_active_at": int(time.time())}
-                )
-                db.commit()
+    def update_last_active_by_id(self, id: str) -> None:
+        """Cheap enough to call on every request; written out by flush_last_active."""
+        USER_ACTIVITY.record(id)
 
-                user = db.query(User).filter_by(id=id).first()
-                return UserModel.model_validate(user)
-        except Exception:
-            return None
+    def flush_last_active(self, db: Optional[Session] = None) -> int:
+        return USER_ACTIVITY.flush(db=db)
 
     def update_user_oauth_by_id(
         self, id: str, provider: str, sub: str, db: Optional[Session] = None
@@ -732,22 +850,59 @@ class UsersTable:
                 return None
 
     def get_active_user_count(self, db: Optional[Session] = None) -> int:
+        # Consider user active if last_active_at within the last 3 minutes
+        three_minutes_ago = int(time.time()) - USER_ACTIVE_WINDOW
+
+        count = USER_ACTIVITY.get_active_user_count(three_minutes_ago)
+        if count is not None:
+            return count
+
         with get_db_context(db) as db:
-            # Consider user active if last_active_at within the last 3 minutes
-            three_minutes_ago = int(time.time()) - 180
             count = (
                 db.query(User).filter(User.last_active_at >= three_minutes_ago).count()
             )
             return count
 
     def is_user_active(self, user_id: str, db: Optional[Session] = None) -> bool:
-        with get_db_context(db) as db:
-            user = db.query(User).filter_by(id=user_id).first()
-            if user and user.last_active_at:
-                # Consider user active if last_active_at within the last 3 minutes
-                three_minutes_ago = int(time.time()) - 180
-                return user.last_active_at >= three_minutes_ago
-            return False
+        return self.is_users_active([user_id], db=db)[user_id]
+
+    def is_users_active(
+        self, user_ids: list[str], db: Optional[Session] = None
+    ) -> dict[str, bool]:
+        """
+        Whether each user is active, with one Redis round trip and one query
+        for the users Redis has not seen lately, instead of both per user.
+        """
+        three_minutes_ago = int(time.time()) - USER_ACTIVE_WINDOW
+
+        active = {
+            user_id: last_active_at is not None and last_active_at >= three_minutes_ago
+            for user_id, last_active_at in USER_ACTIVITY.get_last_active_at_by_user_ids(
+                user_ids
+            ).items()
+        }
+
+        unknown_ids = [
+            user_id for user_id, is_active in active.items() if not is_active
+        ]
+        if unknown_ids:
+            with get_db_context(db) as db:
+                active.update(
+                    (user_id, True)
+                    for (user_id,) in db.query(User.id).filter(
+                        User.id.in_(unknown_ids),
+                        User.last_active_at >= three_minutes_ago,
+                    )
+                )
+        return active
+
+    def is_user_model_active(self, user: UserModel) -> bool:
+        """Same as is_user_active, for a user record that is already loaded."""
+        last_active_at = max(
+            user.last_active_at or 0, USER_ACTIVITY.get_recorded_at(user.id) or 0
+        )
+        # Consider user active if last_active_at within the last 3 minutes
+        return last_active_at >= int(time.time()) - USER_ACTIVE_WINDOW
 
 
 Users = UsersTable()
@@ -0,0 +1,139 @@
+import hashlib
+import io
+import json
+import logging
+import os
+import time
+from typing import Optional
+
+from langchain_core.documents import Document
+
+from open_webui.config import CONTENT_EXTRACTION_CACHE_TTL, UPLOAD_DIR
+from open_webui.storage.provider import Storage
+from open_webui.utils.misc import calculate_sha256
+
+log = logging.getLogger(__name__)
+
+# Bump when the cached representation or loader post-processing changes
+EXTRACTION_CACHE_VERSION = "1"
+
+# Loader kwargs that only affect a given engine
+ENGINE_PARAM_PREFIXES = {
+    "external": "EXTERNAL_DOCUMENT_LOADER_",
+    "tika": "TIKA_",
+    "datalab_marker": "DATALAB_MARKER_",
+    "docling": "DOCLING_",
+    "document_intelligence": "DOCUMENT_INTELLIGENCE_",
+    "mineru": "MINERU_",
+    "mistral_ocr": "MISTRAL_OCR_",
+}
+
+# Loader kwargs that affect the built-in loaders, whatever the engine
+COMMON_PARAMS = ["PDF_EXTRACT_IMAGES"]
+
+
+def _is_secret(key: str) -> bool:
+    return key.endswith("_KEY") or key.endswith("_TOKEN")
+
+
+def get_engine_params(engine: str, kwargs: dict) -> dict:
+    """The loader settings that can change the output of the given engine."""
+    prefix = ENGINE_PARAM_PREFIXES.get(engine)
+    return {
+        key: value
+        for key, value in kwargs.items()
+        if key != "user"
+        and not _is_secret(key)
+        and (prefix is None or key.startswith(prefix) or key in COMMON_PARAMS)
+    }
+
+
+def get_extraction_cache_key(
+    file_path: str,
+    filename: str,
+    file_content_type: Optional[str],
+    engine: str,
+    kwargs: dict,
+) -> str:
+    """
+    Content-addressed key: sha256 of the file bytes plus everything that
+    decides which loader runs and how (engine, its parameters, extension
+    and content type).
+    """
+    file_hash = calculate_sha256(file_path, 1024 * 1024)
+    params = json.dumps(get_engine_params(engine, kwargs), sort_keys=True, default=str)
+    file_ext = filename.split(".")[-1].lower() if "." in filename else ""
+
+    return hashlib.sha256(
+        "\x1f".join(
+            [
+                EXTRACTION_CACHE_VERSION,
+                file_hash,
+                engine or "",
+                file_ext,
+                file_content_type or "",
+                params,
+            ]
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+def _get_cache_filename(key: str) -> str:
+    return f"extraction-{key}.json"
+
+
+def get_cached_documents(key: str) -> Optional[list[Document]]:
+    filename = _get_cache_filename(key)
+
+    # Uploads and downloads leave a local copy behind for remote providers
+    local_path = f"{UPLOAD_DIR}/{filename}"
+    try:
+        if not os.path.isfile(local_path):
+            local_path = Storage.get_file(Storage.get_file_path(filename))
+
+        with open(local_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception as e:
+        log.debug(f"Extraction cache miss for {key}: {e}")
+        return None
+
+    if int(time.time()) - data.get("created_at", 0) > CONTENT_EXTRACTION_CACHE_TTL:
+        log.debug(f"Extraction cache entry {key} expired")
+        delete_cached_documents(key)
+        return None
+
+    return [
+        Document(page_content=doc["page_content"], metadata=doc["metadata"])
+        for doc in data["documents"]
+    ]
+
+
+def set_cached_documents(key: str, docs: list[Document]) -> None:
+    data = json.dumps(
+        {
+            "version": EXTRACTION_CACHE_VERSION,
+            "created_at": int(time.time()),
+            "documents": [
+                {"page_content": doc.page_content, "metadata": doc.metadata}
+                for doc in docs
+            ],
+        },
+        default=str,
+    ).encode("utf-8")
+
+    try:
+        Storage.upload_file(io.BytesIO(data), _get_cache_filename(key), {})
+    except Exception as e:
+        log.warning(f"Failed to store extraction cache entry {key}: {e}")
+
+
+def delete_cached_documents(key: str) -> None:
+    """
+    Drop a cache entry, e.g. once the file it was extracted from is deleted.
+    Other files with the same bytes just miss the cache afterwards.
+    """
+    try:
+        # Also removes the local copy of remote providers
+        Storage.delete_file(Storage.get_file_path(_get_cache_filename(key)))
+    except Exception as e:
+        log.debug(f"Failed to delete extraction cache entry {key}: {e}")
@@ -126,6 +126,28 @@ class ChromaClient(VectorDBBase):
         except:
             return None
 
+    def get_items(
+        self, collection_name: str, filter: dict
+    ) -> Optional[list[VectorItem]]:
+        try:
+            collection = self.client.get_collection(name=collection_name)
+            result = collection.get(
+                where=filter or None,
+                include=["documents", "metadatas", "embeddings"],
+            )
+            return [
+                VectorItem(
+                    id=id,
+                    text=result["documents"][idx],
+                    vector=list(result["embeddings"][idx]),
+                    metadata=result["metadatas"][idx],
+                )
+                for idx, id in enumerate(result["ids"])
+            ]
+        except Exception as e:
+            log.debug(f"Error getting items from {collection_name}: {e}")
+            return None
+
     def get(self, collection_name: str) -> Optional[GetResult]:
         # Get all the items in the collection.
         collection = self.client.get_collection(name=collection_name)
@@ -677,6 +677,102 @@ class PgvectorClient(VectorDBBase):
             log.exception(f"Error during get: {e}")
             return None
 
+    def get_items(
+        self, collection_name: str, filter: Dict[str, Any]
+    ) -> Optional[List[VectorItem]]:
+        try:
+            if PGVECTOR_PGCRYPTO:
+                metadata_column = pgcrypto_decrypt(
+                    DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
+                )
+                stmt = select(
+                    DocumentChunk.id,
+                    DocumentChunk.vector,
+                    pgcrypto_decrypt(
+                        DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text
+                    ).label("text"),
+                    metadata_column.label("vmetadata"),
+                ).where(DocumentChunk.collection_name == collection_name)
+            else:
+                metadata_column = DocumentChunk.vmetadata
+                stmt = select(
+                    DocumentChunk.id,
+                    DocumentChunk.vector,
+                    DocumentChunk.text,
+                    DocumentChunk.vmetadata,
+                ).where(DocumentChunk.collection_name == collection_name)
+
+            for key, value in filter.items():
+                stmt = stmt.where(metadata_column[key].astext == str(value))
+
+            results = self.session.execute(stmt).all()
+            self.session.rollback()  # read-only transaction
+            return [
+                VectorItem(
+                    id=row.id,
+                    text=row.text or "",
+                    vector=list(row.vector),
+                    metadata=row.vmetadata,
+                )
+                for row in results
+            ]
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f"Error during get_items: {e}")
+            return None
+
+    def copy_items(
+        self,
+        source_collection_name: str,
+        target_collection_name: str,
+        filter: Dict[str, Any],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        if PGVECTOR_PGCRYPTO:
+            # Rows have to be decrypted and re-encrypted, go through Python
+            return super().copy_items(
+                source_collection_name, target_collection_name, filter, metadata
+            )
+
+        # Copy the rows server-side, vectors never leave the database
+        try:
+            params = {
+                "source": source_collection_name,
+                "target": target_collection_name,
+                "metadata": json.dumps(process_metadata(dict(metadata or {}))),
+            }
+            conditions = []
+            for idx, (key, value) in enumerate(filter.items()):
+                conditions.append(f"vmetadata->>:key_{idx} = :value_{idx}")
+                params[f"key_{idx}"] = key
+                params[f"value_{idx}"] = str(value)
+
+            result = self.session.execute(
+                text(
+                    f"""
+                    INSERT INTO document_chunk
+                    (id, vector, collection_name, text, vmetadata)
+                    SELECT
+                        gen_random_uuid()::text, vector, :target, text,
+                        vmetadata || CAST(:metadata AS JSONB)
+                    FROM document_chunk
+                    WHERE collection_name = :source
+                    {"".join(f" AND {condition}" for condition in conditions)}
+                    """
+                ),
+                params,
+            )
+            self.session.commit()
+            log.info(
+                f"Copied {result.rowcount} items from '{source_collection_name}' "
+                f"to '{target_collection_name}'"
+            )
+            return result.rowcount > 0
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f"Error during copy_items: {e}")
+            return False
+
     def delete(
         self,
         collection_name: str,
@@ -195,6 +195,38 @@ class QdrantClient(VectorDBBase):
             log.exception(f"Error querying a collection '{collection_name}': {e}")
             return None
 
+    def get_items(
+        self, collection_name: str, filter: dict
+    ) -> Optional[list[VectorItem]]:
+        if not self.has_collection(collection_name):
+            return None
+        try:
+            points = self.client.scroll(
+                collection_name=f"{self.collection_prefix}_{collection_name}",
+                scroll_filter=models.Filter(
+                    must=[
+                        models.FieldCondition(
+                            key=f"metadata.{key}", match=models.MatchValue(value=value)
+                        )
+                        for key, value in filter.items()
+                    ]
+                ),
+                limit=NO_LIMIT,
+                with_vectors=True,
+            )
+            return [
+                VectorItem(
+                    id=str(point.id),
+                    text=point.payload["text"],
+                    vector=point.vector,
+                    metadata=point.payload["metadata"],
+                )
+                for point in points[0]
+            ]
+        except Exception as e:
+            log.exception(f"Error getting items from '{collection_name}': {e}")
+            return None
+
     def get(self, collection_name: str) -> Optional[GetResult]:
         # Get all the items in the collection.
         points = self.client.scroll(
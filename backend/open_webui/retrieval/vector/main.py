@@ -1,3 +1,5 @@
+import uuid
+
 from pydantic import BaseModel
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional, Union
@@ -88,3 +90,42 @@ class VectorDBBase(ABC):
     def reset(self) -> None:
         """Reset the vector database by removing all collections or those matching a condition."""
         pass
+
+    def get_items(
+        self, collection_name: str, filter: Dict
+    ) -> Optional[List[VectorItem]]:
+        """
+        Retrieve items matching a metadata filter together with their vectors.
+        Returns None when the backend cannot read vectors back.
+        """
+        return None
+
+    def copy_items(
+        self,
+        source_collection_name: str,
+        target_collection_name: str,
+        filter: Dict,
+        metadata: Optional[Dict] = None,
+    ) -> bool:
+        """
+        Copy items (text, vector and metadata) matching a filter into another
+        collection under new ids, merging in the given metadata. Returns False
+        when nothing could be copied so that callers can re-embed instead.
+        """
+        items = self.get_items(source_collection_name, filter)
+        if not items:
+            return False
+
+        self.insert(
+            target_collection_name,
+            [
+                {
+                    "id": str(uuid.uuid4()),
+                    "text": item.text,
+                    "vector": item.vector,
+                    "metadata": {**(item.metadata or {}), **(metadata or {})},
+                }
+                for item in items
+            ],
+        )
+        return True
@@ -0,0 +1,303 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Sequence
+
+from open_webui.config import (
+    CACHE_DIR,
+    WEB_FETCH_CACHE_TTL,
+    WEB_SEARCH_CACHE_TTL,
+    WEB_SEARCH_COLLECTION_TTL,
+)
+from open_webui.env import REDIS_KEY_PREFIX
+from open_webui.utils.redis import get_redis_client
+
+log = logging.getLogger(__name__)
+
+# Upper bound for the in-process fallback store
+MEMORY_CACHE_MAX_ENTRIES = 1000
+
+# Pages larger than this are not worth keeping around
+MAX_CACHED_PAGE_SIZE = 2 * 1024 * 1024
+
+# Stale pages are kept this many TTLs longer so that they can be revalidated
+# with If-None-Match / If-Modified-Since instead of being downloaded again.
+PAGE_REVALIDATION_FACTOR = 4
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class WebSearchCache:
+    """
+    Shared TTL cache for web search results, fetched pages and the
+    web-search-* vector collections built from them.
+
+    Uses Redis when available so that every replica shares the same entries,
+    and falls back to a bounded in-process store otherwise.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        search_ttl: int,
+        collection_ttl: int,
+        fetch_ttl: int,
+        registry_dir: Optional[str] = None,
+    ):
+        """
+        :param redis_client: Async Redis client instance or None
+        :param search_ttl: Seconds search results and responses are reused
+        :param collection_ttl: Seconds before a web search collection expires
+        :param fetch_ttl: Seconds a fetched page is served without revalidation
+        :param registry_dir: Directory persisting the collection registry without Redis
+        """
+        self.r = redis_client
+        self.search_ttl = search_ttl
+        self.collection_ttl = collection_ttl
+        self.fetch_ttl = fetch_ttl
+        self.registry_dir = registry_dir
+
+        self._memory_store: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self._memory_collections: dict[str, float] = {}
+
+    def _key(self, *parts: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:web_search:{':'.join(parts)}"
+
+    ####################
+    # Storage
+    ####################
+
+    async def _get(self, key: str) -> Optional[Any]:
+        if self.r is not None:
+            try:
+                value = await self.r.get(key)
+                return json.loads(value) if value else None
+            except Exception as e:
+                log.debug(f"Web search cache read failed for {key}: {e}")
+
+        entry = self._memory_store.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.time():
+            self._memory_store.pop(key, None)
+            return None
+
+        self._memory_store.move_to_end(key)
+        return json.loads(value)
+
+    async def _set(self, key: str, value: Any, ttl: int) -> None:
+        data = json.dumps(value)
+
+        if self.r is not None:
+            try:
+                await self.r.set(key, data, ex=ttl)
+                return
+            except Exception as e:
+                log.debug(f"Web search cache write failed for {key}: {e}")
+
+        self._memory_store[key] = (time.time() + ttl, data)
+        self._memory_store.move_to_end(key)
+        while len(self._memory_store) > MEMORY_CACHE_MAX_ENTRIES:
+            self._memory_store.popitem(last=False)
+
+    ####################
+    # Search results
+    ####################
+
+    def get_search_key(
+        self, engine: str, queries: Sequence[str], params: Sequence[str] = ()
+    ) -> str:
+        """Stable key for a search, independent of query order, case and spacing."""
+        normalized = sorted({normalize_query(query) for query in queries})
+        return _digest(engine, *params, "", *normalized)
+
+    async def get_search_results(
+        self, engine: str, query: str, params: Sequence[str] = ()
+    ) -> Optional[list[dict]]:
+        if self.search_ttl <= 0:
+            return None
+        return await self._get(
+            self._key("results", self.get_search_key(engine, [query], params))
+        )
+
+    async def set_search_results(
+        self,
+        engine: str,
+        query: str,
+        results: list[dict],
+        params: Sequence[str] = (),
+    ) -> None:
+        if self.search_ttl <= 0:
+            return
+        await self._set(
+            self._key("results", self.get_search_key(engine, [query], params)),
+            results,
+            self.search_ttl,
+        )
+
+    async def get_response(self, search_key: str) -> Optional[dict]:
+        if self.search_ttl <= 0:
+            return None
+        return await self._get(self._key("response", search_key))
+
+    async def set_response(self, search_key: str, response: dict) -> None:
+        if self.search_ttl <= 0:
+            return
+
+        ttl = self.search_ttl
+        if response.get("collection_names") and self.collection_ttl > 0:
+            # Never point at a collection that is about to be collected
+            ttl = min(ttl, self.collection_ttl)
+        await self._set(self._key("response", search_key), response, ttl)
+
+    ####################
+    # Fetched pages
+    ####################
+
+    async def get_page(self, url: str) -> Optional[dict]:
+        """Return {"text", "etag", "last_modified", "fetched_at"} for a cached URL."""
+        if self.fetch_ttl <= 0:
+            return None
+        return await self._get(self._key("page", _digest(url)))
+
+    async def set_page(
+        self,
+        url: str,
+        text: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        if self.fetch_ttl <= 0 or len(text) > MAX_CACHED_PAGE_SIZE:
+            return
+
+        await self._set(
+            self._key("page", _digest(url)),
+            {
+                "text": text,
+                "etag": etag,
+                "last_modified": last_modified,
+                "fetched_at": int(time.time()),
+            },
+            self.fetch_ttl * PAGE_REVALIDATION_FACTOR,
+        )
+
+    def is_page_fresh(self, page: dict) -> bool:
+        return time.time() - page.get("fetched_at", 0) < self.fetch_ttl
+
+    ####################
+    # Collections
+    ####################
+
+    async def register_collection(self, collection_name: str) -> None:
+        """Schedule a web search collection for garbage collection."""
+        if self.collection_ttl <= 0:
+            return
+
+        expires_at = time.time() + self.collection_ttl
+        if self.r is not None:
+            try:
+                await self.r.zadd(
+                    self._key("collections"), {collection_name: expires_at}
+                )
+                return
+            except Exception as e:
+                log.debug(f"Failed to register collection {collection_name}: {e}")
+
+        if self.registry_dir and self._register_collection_file(
+            collection_name, expires_at
+        ):
+            return
+        self._memory_collections[collection_name] = expires_at
+
+    async def pop_expired_collections(self) -> list[str]:
+        """
+        Remove and return the collections whose TTL has passed. With Redis,
+        each name is handed to exactly one replica.
+        """
+        now = time.time()
+
+        if self.r is not None:
+            try:
+                key = self._key("collections")
+                expired = []
+                for name in await self.r.zrangebyscore(key, 0, now):
+                    if await self.r.zrem(key, name):
+                        expired.append(name)
+                return expired
+            except Exception as e:
+                log.debug(f"Failed to read expired collections: {e}")
+
+        expired = [
+            name
+            for name, expires_at in self._memory_collections.items()
+            if expires_at <= now
+        ]
+        for name in expired:
+            del self._memory_collections[name]
+        if self.registry_dir:
+            expired += self._pop_expired_collection_files(now)
+        return expired
+
+    def _register_collection_file(
+        self, collection_name: str, expires_at: float
+    ) -> bool:
+        """
+        Without Redis, worker processes share the registry through one file
+        per collection holding its expiry, so that none overwrites what
+        another registered, and removing a file hands its name to one worker.
+        """
+        path = os.path.join(self.registry_dir, collection_name)
+        try:
+            os.makedirs(self.registry_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(str(expires_at))
+            os.replace(tmp_path, path)
+            return True
+        except Exception as e:
+            log.warning(f"Failed to register collection {collection_name}: {e}")
+            return False
+
+    def _pop_expired_collection_files(self, now: float) -> list[str]:
+        expired = []
+        try:
+            entries = list(os.scandir(self.registry_dir))
+        except FileNotFoundError:
+            return expired
+
+        for entry in entries:
+            if entry.name.endswith(".tmp"):
+                continue
+            try:
+                with open(entry.path, "r") as f:
+                    expires_at = float(f.read() or 0)
+                if expires_at > now:
+                    continue
+                os.remove(entry.path)
+                expired.append(entry.name)
+            except FileNotFoundError:
+                # Taken by another worker
+                continue
+            except Exception as e:
+                log.debug(f"Failed to read collection registry entry {entry.name}: {e}")
+        return expired
+
+
+WEB_SEARCH_CACHE = WebSearchCache(
+    get_redis_client(async_mode=True),
+    search_ttl=WEB_SEARCH_CACHE_TTL,
+    collection_ttl=WEB_SEARCH_COLLECTION_TTL,
+    fetch_ttl=WEB_FETCH_CACHE_TTL,
+    registry_dir=f"{CACHE_DIR}/web_search/collections",
+)
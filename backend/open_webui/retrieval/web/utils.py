@@ -2,6 +2,7 @@ import asyncio
 import logging
 import socket
 import ssl
+import time as time_module
 import urllib.parse
 import urllib.request
 from datetime import datetime, time, timedelta
@@ -19,6 +20,7 @@ from typing import (
 
 from fastapi.concurrency import run_in_threadpool
 import aiohttp
+from aiohttp.abc import AbstractResolver, ResolveResult
 import certifi
 import validators
 from langchain_community.document_loaders import PlaywrightURLLoader, WebBaseLoader
@@ -27,6 +29,7 @@ from langchain_core.documents import Document
 
 from open_webui.retrieval.loaders.tavily import TavilyLoader
 from open_webui.retrieval.loaders.external_web import ExternalWebLoader
+from open_webui.retrieval.web.cache import WEB_SEARCH_CACHE
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.config import (
     ENABLE_RAG_LOCAL_WEB_FETCH,
@@ -42,56 +45,111 @@ from open_webui.config import (
     EXTERNAL_WEB_LOADER_URL,
     EXTERNAL_WEB_LOADER_API_KEY,
     WEB_FETCH_FILTER_LIST,
+    WEB_LOADER_CONCURRENT_REQUESTS_PER_HOST,
 )
 from open_webui.utils.misc import is_string_allowed
 
 log = logging.getLogger(__name__)
 
 
+# Resolved addresses are cached briefly so that repeated fetches from the
+# same host skip DNS; SafeResolver connects to exactly these addresses.
+DNS_CACHE_TTL = 60
+DNS_CACHE_MAX_ENTRIES = 1024
+_dns_cache: dict[str, tuple[float, list[str], list[str]]] = {}
+
+
+def _get_cached_resolution(hostname: str) -> Optional[tuple[list[str], list[str]]]:
+    entry = _dns_cache.get(hostname)
+    if entry is None:
+        return None
+
+    expires_at, ipv4_addresses, ipv6_addresses = entry
+    if expires_at < time_module.monotonic():
+        _dns_cache.pop(hostname, None)
+        return None
+    return ipv4_addresses, ipv6_addresses
+
+
+def _cache_resolution(hostname: str, addr_info) -> tuple[list[str], list[str]]:
+    # Extract IP addresses from address information
+    ipv4_addresses = list(
+        dict.fromkeys(info[4][0] for info in addr_info if info[0] == socket.AF_INET)
+    )
+    ipv6_addresses = list(
+        dict.fromkeys(info[4][0] for info in addr_info if info[0] == socket.AF_INET6)
+    )
+
+    if len(_dns_cache) >= DNS_CACHE_MAX_ENTRIES:
+        _dns_cache.clear()
+    _dns_cache[hostname] = (
+        time_module.monotonic() + DNS_CACHE_TTL,
+        ipv4_addresses,
+        ipv6_addresses,
+    )
+    return ipv4_addresses, ipv6_addresses
+
+
 def resolve_hostname(hostname):
+    cached = _get_cached_resolution(hostname)
+    if cached is not None:
+        return cached
+
     # Get address information
     addr_info = socket.getaddrinfo(hostname, None)
+    return _cache_resolution(hostname, addr_info)
 
-    # Extract IP addresses from address information
-    ipv4_addresses = [info[4][0] for info in addr_info if info[0] == socket.AF_INET]
-    ipv6_addresses = [info[4][0] for info in addr_info if info[0] == socket.AF_INET6]
 
-    return ipv4_addresses, ipv6_addresses
+async def aresolve_hostname(hostname):
+    """Non-blocking resolve_hostname sharing the same TTL cache."""
+    cached = _get_cached_resolution(hostname)
+    if cached is not None:
+        return cached
 
+    addr_info = await asyncio.get_running_loop().getaddrinfo(hostname, None)
+    return _cache_resolution(hostname, addr_info)
 
-def validate_url(url: Union[str, Sequence[str]]):
-    if isinstance(url, str):
-        if isinstance(validators.url(url), validators.ValidationError):
+
+def check_resolved_addresses(ipv4_addresses: list[str], ipv6_addresses: list[str]):
+    """Raise if any resolved address is private and local web fetch is disabled."""
+    if ENABLE_RAG_LOCAL_WEB_FETCH:
+        return
+
+    for ip in ipv4_addresses:
+        if validators.ipv4(ip, private=True):
+            raise ValueError(ERROR_MESSAGES.INVALID_URL)
+    for ip in ipv6_addresses:
+        if validators.ipv6(ip, private=True):
             raise ValueError(ERROR_MESSAGES.INVALID_URL)
 
-        parsed_url = urllib.parse.urlparse(url)
 
-        # Protocol validation - only allow http/https
-        if parsed_url.scheme not in ["http", "https"]:
-            log.warning(
-                f"Blocked non-HTTP(S) protocol: {parsed_url.scheme} in URL: {url}"
-            )
+def _validate_url_format(url: str) -> urllib.parse.ParseResult:
+    if isinstance(validators.url(url), validators.ValidationError):
+        raise ValueError(ERROR_MESSAGES.INVALID_URL)
+
+    parsed_url = urllib.parse.urlparse(url)
+
+    # Protocol validation - only allow http/https
+    if parsed_url.scheme not in ["http", "https"]:
+        log.warning(f"Blocked non-HTTP(S) protocol: {parsed_url.scheme} in URL: {url}")
+        raise ValueError(ERROR_MESSAGES.INVALID_URL)
+
+    # Blocklist check using unified filtering logic
+    if WEB_FETCH_FILTER_LIST:
+        if not is_string_allowed(url, WEB_FETCH_FILTER_LIST):
+            log.warning(f"URL blocked by filter list: {url}")
             raise ValueError(ERROR_MESSAGES.INVALID_URL)
 
-        # Blocklist check using unified filtering logic
-        if WEB_FETCH_FILTER_LIST:
-            if not is_string_allowed(url, WEB_FETCH_FILTER_LIST):
-                log.warning(f"URL blocked by filter list: {url}")
-                raise ValueError(ERROR_MESSAGES.INVALID_URL)
+    return parsed_url
+
+
+def validate_url(url: Union[str, Sequence[str]]):
+    if isinstance(url, str):
+        parsed_url = _validate_url_format(url)
 
         if not ENABLE_RAG_LOCAL_WEB_FETCH:
             # Local web fetch is disabled, filter out any URLs that resolve to private IP addresses
-            parsed_url = urllib.parse.urlparse(url)
-            # Get IPv4 and IPv6 addresses
-            ipv4_addresses, ipv6_addresses = resolve_hostname(parsed_url.hostname)
-            # Check if any of the resolved addresses are private
-            # This is technically still vulnerable to DNS rebinding attacks, as we don't control WebBaseLoader
-            for ip in ipv4_addresses:
-                if validators.ipv4(ip, private=True):
-                    raise ValueError(ERROR_MESSAGES.INVALID_URL)
-            for ip in ipv6_addresses:
-                if validators.ipv6(ip, private=True):
-                    raise ValueError(ERROR_MESSAGES.INVALID_URL)
+            check_resolved_addresses(*resolve_hostname(parsed_url.hostname))
         return True
     elif isinstance(url, Sequence):
         return all(validate_url(u) for u in url)
@@ -99,6 +157,15 @@ def validate_url(url: Union[str, Sequence[str]]):
         return False
 
 
+async def avalidate_url(url: str) -> bool:
+    """Async validate_url for a single URL; DNS resolution does not block the loop."""
+    parsed_url = _validate_url_format(url)
+
+    if not ENABLE_RAG_LOCAL_WEB_FETCH:
+        check_resolved_addresses(*await aresolve_hostname(parsed_url.hostname))
+    return True
+
+
 def safe_validate_urls(url: Sequence[str]) -> Sequence[str]:
     valid_urls = []
     for u in url:
@@ -111,6 +178,61 @@ def safe_validate_urls(url: Sequence[str]) -> Sequence[str]:
     return valid_urls
 
 
+async def asafe_validate_urls(url: Sequence[str]) -> Sequence[str]:
+    async def _validate(u):
+        try:
+            return await avalidate_url(u)
+        except Exception as e:
+            log.debug(f"Invalid URL {u}: {str(e)}")
+            return False
+
+    results = await asyncio.gather(*[_validate(u) for u in url])
+    return [u for u, valid in zip(url, results) if valid]
+
+
+class SafeResolver(AbstractResolver):
+    """
+    aiohttp resolver that goes through the TTL cache and refuses private
+    addresses (unless local web fetch is enabled). The addresses that pass
+    the check are the ones the connection is made to, so a DNS answer that
+    changes between validation and fetch cannot redirect the request.
+    """
+
+    async def resolve(
+        self, host: str, port: int = 0, family: int = socket.AF_INET
+    ) -> List[ResolveResult]:
+        try:
+            ipv4_addresses, ipv6_addresses = await aresolve_hostname(host)
+            check_resolved_addresses(ipv4_addresses, ipv6_addresses)
+        except ValueError as e:
+            # aiohttp only converts OSError into a connection error
+            raise OSError(f"Blocked address for {host}: {e}")
+
+        addresses = []
+        if family in (socket.AF_INET, socket.AF_UNSPEC):
+            addresses += [(socket.AF_INET, ip) for ip in ipv4_addresses]
+        if family in (socket.AF_INET6, socket.AF_UNSPEC):
+            addresses += [(socket.AF_INET6, ip) for ip in ipv6_addresses]
+
+        if not addresses:
+            raise OSError(f"Could not resolve host {host}")
+
+        return [
+            {
+                "hostname": host,
+                "host": ip,
+                "port": port,
+                "family": address_family,
+                "proto": 0,
+                "flags": socket.AI_NUMERICHOST,
+            }
+            for address_family, ip in addresses
+        ]
+
+    async def close(self) -> None:
+        pass
+
+
 def extract_metadata(soup, url):
     metadata = {"source": url}
     if title := soup.find("title"):
@@ -559,39 +681,118 @@ class SafeWebBaseLoader(WebBaseLoader):
         """
         super().__init__(*args, **kwargs)
         self.trust_env = trust_env
+        self._client_session: Optional[aiohttp.ClientSession] = None
+
+    def _create_client_session(self) -> aiohttp.ClientSession:
+        """
+        One connection pool for a whole crawl, with a per-host limit. Without a
+        proxy, hosts are resolved through SafeResolver so the fetch connects to
+        the validated addresses; with a proxy the proxy does the resolution.
+        """
+        connector = aiohttp.TCPConnector(
+            limit_per_host=WEB_LOADER_CONCURRENT_REQUESTS_PER_HOST,
+            resolver=None if self.trust_env else SafeResolver(),
+        )
+        return aiohttp.ClientSession(connector=connector, trust_env=self.trust_env)
+
+    async def fetch_all(self, urls: List[str]) -> Any:
+        """Fetch all urls concurrently over a shared connection pool."""
+        async with self._create_client_session() as session:
+            self._client_session = session
+            try:
+                return await super().fetch_all(urls)
+            finally:
+                self._client_session = None
 
     async def _fetch(
         self, url: str, retries: int = 3, cooldown: int = 2, backoff: float = 1.5
     ) -> str:
-        async with aiohttp.ClientSession(trust_env=self.trust_env) as session:
-            for i in range(retries):
-                try:
-                    kwargs: Dict = dict(
-                        headers=self.session.headers,
-                        cookies=self.session.cookies.get_dict(),
-                    )
-                    if not self.session.verify:
-                        kwargs["ssl"] = False
-
-                    async with session.get(
-                        url,
-                        **(self.requests_kwargs | kwargs),
-                        allow_redirects=False,
-                    ) as response:
-                        if self.raise_for_status:
-                            response.raise_for_status()
-                        return await response.text()
-                except aiohttp.ClientConnectionError as e:
-                    if i == retries - 1:
-                        raise
-                    else:
-                        log.warning(
-                            f"Error fetching {url} with attempt "
-                            f"{i + 1}/{retries}: {e}. Retrying..."
+        # Serve fresh pages from the shared cache and revalidate stale ones
+        cached_page = await WEB_SEARCH_CACHE.get_page(url)
+        if cached_page and WEB_SEARCH_CACHE.is_page_fresh(cached_page):
+            return cached_page["text"]
+
+        if self._client_session is not None:
+            return await self._fetch_with_session(
+                self._client_session, url, cached_page, retries, cooldown, backoff
+            )
+
+        async with self._create_client_session() as session:
+            return await self._fetch_with_session(
+                session, url, cached_page, retries, cooldown, backoff
+            )
+
+    async def _fetch_with_session(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        cached_page: Optional[dict],
+        retries: int,
+        cooldown: int,
+        backoff: float,
+    ) -> str:
+        headers = dict(self.session.headers)
+        if cached_page:
+            if cached_page.get("etag"):
+                headers["If-None-Match"] = cached_page["etag"]
+            if cached_page.get("last_modified"):
+                headers["If-Modified-Since"] = cached_page["last_modified"]
+
+        for i in range(retries):
+            try:
+                kwargs: Dict = dict(
+                    headers=headers,
+                    cookies=self.session.cookies.get_dict(),
+                )
+                if not self.session.verify:
+                    kwargs["ssl"] = False
+
+                async with session.get(
+                    url,
+                    **(self.requests_kwargs | kwargs),
+                    allow_redirects=False,
+                ) as response:
+                    if cached_page and response.status == 304:
+                        await WEB_SEARCH_CACHE.set_page(
+                            url,
+                            cached_page["text"],
+                            etag=cached_page.get("etag"),
+                            last_modified=cached_page.get("last_modified"),
+                        )
+                        return cached_page["text"]
+
+                    if self.raise_for_status:
+                        response.raise_for_status()
+                    text = await response.text()
+
+                    if response.status == 200:
+                        await WEB_SEARCH_CACHE.set_page(
+                            url,
+                            text,
+                            etag=response.headers.get("ETag"),
+                            last_modified=response.headers.get("Last-Modified"),
                         )
-                        await asyncio.sleep(cooldown * backoff**i)
+                    return text
+            except aiohttp.ClientConnectionError as e:
+                if i == retries - 1:
+                    raise
+                else:
+                    log.warning(
+                        f"Error fetching {url} with attempt "
+                        f"{i + 1}/{retries}: {e}. Retrying..."
+                    )
+                    await asyncio.sleep(cooldown * backoff**i)
         raise ValueError("retry count exceeded")
 
+    def _get_parser(self, url: str, parser: Union[str, None] = None) -> str:
+        if parser is None:
+            if url.endswith(".xml"):
+                parser = "xml"
+            else:
+                parser = self.default_parser
+            self._check_parser(parser)
+        return parser
+
     def _unpack_fetch_results(
         self, results: Any, urls: List[str], parser: Union[str, None] = None
     ) -> List[Any]:
@@ -601,21 +802,26 @@ class SafeWebBaseLoader(WebBaseLoader):
         final_results = []
         for i, result in enumerate(results):
             url = urls[i]
-            if parser is None:
-                if url.endswith(".xml"):
-                    parser = "xml"
-                else:
-                    parser = self.default_parser
-                self._check_parser(parser)
+            parser = self._get_parser(url, parser)
             final_results.append(BeautifulSoup(result, parser, **self.bs_kwargs))
         return final_results
 
+    def _parse_document(self, html: str, url: str) -> Document:
+        """Parse a fetched page into a Document. CPU-bound, runs off the event loop."""
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html, self._get_parser(url), **self.bs_kwargs)
+        text = soup.get_text(**self.bs_get_text_kwargs)
+        return Document(page_content=text, metadata=extract_metadata(soup, url))
+
     async def ascrape_all(
         self, urls: List[str], parser: Union[str, None] = None
     ) -> List[Any]:
         """Async fetch all urls, then return soups for all results."""
         results = await self.fetch_all(urls)
-        return self._unpack_fetch_results(results, urls, parser=parser)
+        return await run_in_threadpool(
+            self._unpack_fetch_results, results, urls, parser=parser
+        )
 
     def lazy_load(self) -> Iterator[Document]:
         """Lazy load text from the url(s) in web_path with error handling."""
@@ -634,38 +840,27 @@ class SafeWebBaseLoader(WebBaseLoader):
 
     async def alazy_load(self) -> AsyncIterator[Document]:
         """Async lazy load text from the url(s) in web_path."""
-        results = await self.ascrape_all(self.web_paths)
-        for path, soup in zip(self.web_paths, results):
-            text = soup.get_text(**self.bs_get_text_kwargs)
-            metadata = {"source": path}
-            if title := soup.find("title"):
-                metadata["title"] = title.get_text()
-            if description := soup.find("meta", attrs={"name": "description"}):
-                metadata["description"] = description.get(
-                    "content", "No description found."
-                )
-            if html := soup.find("html"):
-                metadata["language"] = html.get("lang", "No language found.")
-            yield Document(page_content=text, metadata=metadata)
+        results = await self.fetch_all(self.web_paths)
+        documents = await asyncio.gather(
+            *[
+                run_in_threadpool(self._parse_document, html, path)
+                for path, html in zip(self.web_paths, results)
+            ]
+        )
+        for document in documents:
+            yield document
 
     async def aload(self) -> list[Document]:
         """Load data into Document objects."""
         return [document async for document in self.alazy_load()]
 
 
-def get_web_loader(
-    urls: Union[str, Sequence[str]],
+def _create_web_loader(
+    safe_urls: Sequence[str],
     verify_ssl: bool = True,
     requests_per_second: int = 2,
     trust_env: bool = False,
 ):
-    # Check if the URLs are valid
-    safe_urls = safe_validate_urls([urls] if isinstance(urls, str) else urls)
-
-    if not safe_urls:
-        log.warning(f"All provided URLs were blocked or invalid: {urls}")
-        raise ValueError(ERROR_MESSAGES.INVALID_URL)
-
     web_loader_args = {
         "web_paths": safe_urls,
         "verify_ssl": verify_ssl,
@@ -731,3 +926,35 @@ def get_web_loader(
             f"Invalid WEB_LOADER_ENGINE: {WEB_LOADER_ENGINE.value}. "
             "Please set it to 'safe_web', 'playwright', 'firecrawl', or 'tavily'."
         )
+
+
+def get_web_loader(
+    urls: Union[str, Sequence[str]],
+    verify_ssl: bool = True,
+    requests_per_second: int = 2,
+    trust_env: bool = False,
+):
+    # Check if the URLs are valid
+    safe_urls = safe_validate_urls([urls] if isinstance(urls, str) else urls)
+
+    if not safe_urls:
+        log.warning(f"All provided URLs were blocked or invalid: {urls}")
+        raise ValueError(ERROR_MESSAGES.INVALID_URL)
+
+    return _create_web_loader(safe_urls, verify_ssl, requests_per_second, trust_env)
+
+
+async def aget_web_loader(
+    urls: Union[str, Sequence[str]],
+    verify_ssl: bool = True,
+    requests_per_second: int = 2,
+    trust_env: bool = False,
+):
+    """get_web_loader for async callers; URLs are validated without blocking on DNS."""
+    safe_urls = await asafe_validate_urls([urls] if isinstance(urls, str) else urls)
+
+    if not safe_urls:
+        log.warning(f"All provided URLs were blocked or invalid: {urls}")
+        raise ValueError(ERROR_MESSAGES.INVALID_URL)
+
+    return _create_web_loader(safe_urls, verify_ssl, requests_per_second, trust_env)
@@ -6,8 +6,6 @@ import uuid
 import html
 import base64
 from functools import lru_cache
-from pydub import AudioSegment
-from pydub.silence import split_on_silence
 from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
@@ -37,6 +35,11 @@ from open_webui.utils.misc import strict_match_mime_type
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_permission
 from open_webui.utils.headers import include_user_info_headers
+from open_webui.utils.audio import (
+    convert_audio_to_mp3,
+    prepare_audio_chunk_arrays,
+    prepare_audio_chunk_files,
+)
 from open_webui.config import (
     WHISPER_MODEL_AUTO_UPDATE,
     WHISPER_COMPUTE_TYPE,
@@ -45,6 +48,8 @@ from open_webui.config import (
     CACHE_DIR,
     WHISPER_LANGUAGE,
     WHISPER_MULTILINGUAL,
+    WHISPER_NUM_WORKERS,
+    AUDIO_STT_MAX_WORKERS,
     ELEVENLABS_API_BASE_URL,
 )
 
@@ -78,7 +83,6 @@ SPEECH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 #
 ##########################################
 
-from pydub import AudioSegment
 from pydub.utils import mediainfo
 
 
@@ -112,19 +116,6 @@ def is_audio_conversion_required(file_path):
         return False
 
 
-def convert_audio_to_mp3(file_path):
-    """Convert audio file to mp3 format."""
-    try:
-        output_path = os.path.splitext(file_path)[0] + ".mp3"
-        audio = AudioSegment.from_file(file_path)
-        audio.export(output_path, format="mp3")
-        log.info(f"Converted {file_path} to {output_path}")
-        return output_path
-    except Exception as e:
-        log.error(f"Error converting audio file: {e}")
-        return None
-
-
 def set_faster_whisper_model(model: str, auto_update: bool = False):
     whisper_model = None
     if model:
@@ -136,6 +127,7 @@ def set_faster_whisper_model(model: str, auto_update: bool = False):
             "compute_type": WHISPER_COMPUTE_TYPE,
             "download_root": WHISPER_MODEL_DIR,
             "local_files_only": not auto_update,
+            "num_workers": WHISPER_NUM_WORKERS,
         }
 
         try:
@@ -581,7 +573,7 @@ async def speech(request: Request, user=Depends(get_verified_user)):
         return FileResponse(file_path)
 
 
-def transcription_handler(request, file_path, metadata, user=None):
+def transcription_handler(request, file_path, metadata, user=None, audio=None):
     filename = os.path.basename(file_path)
     file_dir = os.path.dirname(file_path)
     id = filename.split(".")[0]
@@ -601,7 +593,7 @@ def transcription_handler(request, file_path, metadata, user=None):
 
         model = request.app.state.faster_whisper_model
         segments, info = model.transcribe(
-            file_path,
+            audio if audio is not None else file_path,
             beam_size=5,
             vad_filter=WHISPER_VAD_FILTER,
             language=languages[0],
@@ -615,10 +607,11 @@ def transcription_handler(request, file_path, metadata, user=None):
         transcript = "".join([segment.text for segment in list(segments)])
         data = {"text": transcript.strip()}
 
-        # save the transcript to a json file
-        transcript_file = f"{file_dir}/{id}.json"
-        with open(transcript_file, "w") as f:
-            json.dump(data, f)
+        if audio is None:
+            # save the transcript to a json file
+            transcript_file = f"{file_dir}/{id}.json"
+            with open(transcript_file, "w") as f:
+                json.dump(data, f)
 
         log.debug(data)
         return data
@@ -1048,18 +1041,26 @@ def transcribe(
 ):
     log.info(f"transcribe: {file_path} {metadata}")
 
-    if is_audio_conversion_required(file_path):
-        file_path = convert_audio_to_mp3(file_path)
-
-    try:
-        file_path = compress_audio(file_path)
-    except Exception as e:
-        log.exception(e)
-
-    # Always produce a list of chunk paths (could be one entry if small)
+    # The audio is decoded at most once: faster-whisper decodes the original
+    # file itself, while remote engines get chunks produced from a single
+    # 16 kHz mono decode that are each encoded exactly once.
+    chunk_paths = []
+    chunk_arrays = []
     try:
-        chunk_paths = split_audio(file_path, MAX_FILE_SIZE)
-        print(f"Chunk paths: {chunk_paths}")
+        if request.app.state.config.STT_ENGINE == "":
+            max_workers = WHISPER_NUM_WORKERS
+            if max_workers > 1:
+                chunk_arrays = prepare_audio_chunk_arrays(file_path, max_workers)
+            else:
+                chunk_paths = [file_path]
+        else:
+            max_workers = AUDIO_STT_MAX_WORKERS
+            chunk_paths = prepare_audio_chunk_files(
+                file_path,
+                MAX_FILE_SIZE,
+                conversion_required=is_audio_conversion_required(file_path),
+            )
+        log.debug(f"Chunk paths: {chunk_paths}")
     except Exception as e:
         log.exception(e)
         raise HTTPException(
@@ -1069,15 +1070,31 @@ def transcribe(
 
     results = []
     try:
-        with ThreadPoolExecutor() as executor:
-            # Submit tasks for each chunk_path
-            futures = [
-                executor.submit(
-                    transcription_handler, request, chunk_path, metadata, user
-                )
-                for chunk_path in chunk_paths
-            ]
-            # Gather results as they complete
+        num_chunks = len(chunk_arrays) or len(chunk_paths)
+        # Bounded by what the backend can actually run in parallel: a local
+        # model only has WHISPER_NUM_WORKERS workers to share between threads.
+        with ThreadPoolExecutor(max_workers=min(num_chunks, max_workers)) as executor:
+            # Submit tasks for each chunk
+            if chunk_arrays:
+                futures = [
+                    executor.submit(
+                        transcription_handler,
+                        request,
+                        file_path,
+                        metadata,
+                        user,
+                        chunk_array,
+                    )
+                    for chunk_array in chunk_arrays
+                ]
+            else:
+                futures = [
+                    executor.submit(
+                        transcription_handler, request, chunk_path, metadata, user
+                    )
+                    for chunk_path in chunk_paths
+                ]
+            # Gather results in chunk order
             for future in futures:
                 try:
                     results.append(future.result())
@@ -1100,68 +1117,6 @@ def transcribe(
     }
 
 
-def compress_audio(file_path):
-    if os.path.getsize(file_path) > MAX_FILE_SIZE:
-        id = os.path.splitext(os.path.basename(file_path))[
-            0
-        ]  # Handles names with multiple dots
-        file_dir = os.path.dirname(file_path)
-
-        audio = AudioSegment.from_file(file_path)
-        audio = audio.set_frame_rate(16000).set_channels(1)  # Compress audio
-
-        compressed_path = os.path.join(file_dir, f"{id}_compressed.mp3")
-        audio.export(compressed_path, format="mp3", bitrate="32k")
-        # log.debug(f"Compressed audio to {compressed_path}")  # Uncomment if log is defined
-
-        return compressed_path
-    else:
-        return file_path
-
-
-def split_audio(file_path, max_bytes, format="mp3", bitrate="32k"):
-    """
-    Splits audio into chunks not exceeding max_bytes.
-    Returns a list of chunk file paths. If audio fits, returns list with original path.
-    """
-    file_size = os.path.getsize(file_path)
-    if file_size <= max_bytes:
-        return [file_path]  # Nothing to split
-
-    audio = AudioSegment.from_file(file_path)
-    duration_ms = len(audio)
-    orig_size = file_size
-
-    approx_chunk_ms = max(int(duration_ms * (max_bytes / orig_size)) - 1000, 1000)
-    chunks = []
-    start = 0
-    i = 0
-
-    base, _ = os.path.splitext(file_path)
-
-    while start < duration_ms:
-        end = min(start + approx_chunk_ms, duration_ms)
-        chunk = audio[start:end]
-        chunk_path = f"{base}_chunk_{i}.{format}"
-        chunk.export(chunk_path, format=format, bitrate=bitrate)
-
-        # Reduce chunk duration if still too large
-        while os.path.getsize(chunk_path) > max_bytes and (end - start) > 5000:
-            end = start + ((end - start) // 2)
-            chunk = audio[start:end]
-            chunk.export(chunk_path, format=format, bitrate=bitrate)
-
-        if os.path.getsize(chunk_path) > max_bytes:
-            os.remove(chunk_path)
-            raise Exception("Audio chunk cannot be reduced below max file size.")
-
-        chunks.append(chunk_path)
-        start = end
-        i += 1
-
-    return chunks
-
-
 @router.post("/transcriptions")
 def transcription(
     request: Request,
@@ -7,6 +7,7 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status, BackgroundTasks
 from fastapi.responses import Response, StreamingResponse, FileResponse
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from pydantic import field_validator
 
@@ -98,7 +99,6 @@ class ChannelListItemResponse(ChannelModel):
     user_ids: Optional[list[str]] = None  # 'dm' channels only
     users: Optional[list[UserIdNameStatusResponse]] = None  # 'dm' channels only
 
-    last_message_at: Optional[int] = None  # timestamp in epoch (time_ns)
     unread_count: int = 0
 
 
@@ -118,46 +118,50 @@ async def get_channels(
         )
 
     channels = Channels.get_channels_by_user_id(user.id, db=db)
-    channel_list = []
-    for channel in channels:
-        last_message = Messages.get_last_message_by_channel_id(channel.id, db=db)
-        last_message_at = last_message.created_at if last_message else None
 
-        channel_member = Channels.get_member_by_channel_and_user_id(
-            channel.id, user.id, db=db
+    # last_message_at and unread counts are denormalized, so the whole list
+    # is served from a few set-based queries instead of several per channel
+    memberships = {
+        member.channel_id: member
+        for member in Channels.get_members_by_user_id_and_channel_ids(
+            user.id, [channel.id for channel in channels], db=db
         )
-        unread_count = (
-            Messages.get_unread_message_count(
-                channel.id, user.id, channel_member.last_read_at, db=db
-            )
-            if channel_member
-            else 0
+    }
+
+    dm_member_ids = {}
+    for member in Channels.get_members_by_channel_ids(
+        [channel.id for channel in channels if channel.type == "dm"], db=db
+    ):
+        dm_member_ids.setdefault(member.channel_id, []).append(member.user_id)
+
+    dm_users = {
+        dm_user.id: UserIdNameStatusResponse(
+            **{
+                **dm_user.model_dump(),
+                "is_active": Users.is_user_model_active(dm_user),
+            }
+        )
+        for dm_user in Users.get_users_by_user_ids(
+            list({uid for uids in dm_member_ids.values() for uid in uids}), db=db
         )
+    }
+
+    channel_list = []
+    for channel in channels:
+        channel_member = memberships.get(channel.id)
 
         user_ids = None
         users = None
         if channel.type == "dm":
-            user_ids = [
-                member.user_id
-                for member in Channels.get_members_by_channel_id(channel.id, db=db)
-            ]
-            users = [
-                UserIdNameStatusResponse(
-                    **{
-                        **user.model_dump(),
-                        "is_active": Users.is_user_active(user.id, db=db),
-                    }
-                )
-                for user in Users.get_users_by_user_ids(user_ids, db=db)
-            ]
+            user_ids = dm_member_ids.get(channel.id, [])
+            users = [dm_users[uid] for uid in user_ids if uid in dm_users]
 
         channel_list.append(
             ChannelListItemResponse(
                 **channel.model_dump(),
                 user_ids=user_ids,
                 users=users,
-                last_message_at=last_message_at,
-                unread_count=unread_count,
+                unread_count=channel_member.unread_count if channel_member else 0,
             )
         )
 
@@ -376,21 +380,27 @@ async def get_channel_by_id(
             for member in Channels.get_members_by_channel_id(channel.id, db=db)
         ]
 
+        users = Users.get_users_by_user_ids(user_ids, db=db)
+        active = await run_in_threadpool(
+            Users.is_users_active, [user.id for user in users], db=db
+        )
         users = [
             UserIdNameStatusResponse(
                 **{
                     **user.model_dump(),
-                    "is_active": Users.is_user_active(user.id, db=db),
+                    "is_active": active[user.id],
                 }
             )
-            for user in Users.get_users_by_user_ids(user_ids, db=db)
+            for user in users
         ]
 
         channel_member = Channels.get_member_by_channel_and_user_id(
             channel.id, user.id, db=db
         )
-        unread_count = Messages.get_unread_message_count(
-            channel.id, user.id, channel_member.last_read_at if channel_member else None
+        unread_count = (
+            channel_member.unread_count
+            if channel_member
+            else Messages.get_unread_message_count(channel.id, user.id, db=db)
         )
 
         return ChannelFullResponse(
@@ -428,8 +438,10 @@ async def get_channel_by_id(
         channel_member = Channels.get_member_by_channel_and_user_id(
             channel.id, user.id, db=db
         )
-        unread_count = Messages.get_unread_message_count(
-            channel.id, user.id, channel_member.last_read_at if channel_member else None
+        unread_count = (
+            channel_member.unread_count
+            if channel_member
+            else Messages.get_unread_message_count(channel.id, user.id, db=db)
         )
 
         return ChannelFullResponse(
@@ -494,11 +506,12 @@ async def get_channel_members_by_id(
         users = Users.get_users_by_user_ids(user_ids, db=db)
         total = len(users)
 
+        active = await run_in_threadpool(
+            Users.is_users_active, [user.id for user in users], db=db
+        )
         return {
             "users": [
-                UserModelResponse(
-                    **user.model_dump(), is_active=Users.is_user_active(user.id, db=db)
-                )
+                UserModelResponse(**user.model_dump(), is_active=active[user.id])
                 for user in users
             ],
             "total": total,
@@ -529,11 +542,12 @@ async def get_channel_members_by_id(
         users = result["users"]
         total = result["total"]
 
+        active = await run_in_threadpool(
+            Users.is_users_active, [user.id for user in users], db=db
+        )
         return {
             "users": [
-                UserModelResponse(
-                    **user.model_dump(), is_active=Users.is_user_active(user.id, db=db)
-                )
+                UserModelResponse(**user.model_dump(), is_active=active[user.id])
                 for user in users
             ],
             "total": total,
@@ -785,6 +799,8 @@ async def get_channel_messages(
     id: str,
     skip: int = 0,
     limit: int = 50,
+    before: Optional[int] = None,
+    before_id: Optional[str] = None,
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
 ):
@@ -812,37 +828,29 @@ async def get_channel_messages(
             id, user.id, db=db
         )  # Ensure user is a member of the channel
 
-    message_list = Messages.get_messages_by_channel_id(id, skip, limit, db=db)
+    message_list = Messages.get_messages_by_channel_id(
+        id, skip, limit, before=before, before_id=before_id, db=db
+    )
 
     if not message_list:
         return []
 
-    # Batch fetch all users in a single query (fixes N+1 problem)
-    user_ids = list(set(m.user_id for m in message_list))
-    users = {u.id: u for u in Users.get_users_by_user_ids(user_ids, db=db)}
+    # Batch fetch thread stats and reactions for the whole page (fixes N+1 problem)
+    message_ids = [m.id for m in message_list]
+    thread_stats = Messages.get_thread_reply_stats_by_message_ids(message_ids, db=db)
+    reactions = Messages.get_reactions_by_message_ids(message_ids, db=db)
 
     messages = []
     for message in message_list:
-        thread_replies = Messages.get_thread_replies_by_message_id(message.id, db=db)
-        latest_thread_reply_at = (
-            thread_replies[0].created_at if thread_replies else None
-        )
-
-        # Use message.user if present (for webhooks), otherwise look up by user_id
-        user_info = message.user
-        if user_info is None and message.user_id in users:
-            user_info = UserNameResponse(**users[message.user_id].model_dump())
+        reply_count, latest_reply_at = thread_stats.get(message.id, (0, None))
 
         messages.append(
             MessageUserResponse(
                 **{
                     **message.model_dump(),
-                    "reply_count": len(thread_replies),
-                    "latest_reply_at": latest_thread_reply_at,
-                    "reactions": Messages.get_reactions_by_message_id(
-                        message.id, db=db
-                    ),
-                    "user": user_info,
+                    "reply_count": reply_count,
+                    "latest_reply_at": latest_reply_at,
+                    "reactions": reactions.get(message.id, []),
                 }
             )
         )
@@ -898,6 +906,10 @@ async def get_pinned_channel_messages(
     user_ids = list(set(m.user_id for m in message_list))
     users = {u.id: u for u in Users.get_users_by_user_ids(user_ids, db=db)}
 
+    reactions = Messages.get_reactions_by_message_ids(
+        [m.id for m in message_list], db=db
+    )
+
     messages = []
     for message in message_list:
         # Check for webhook identity in meta
@@ -917,9 +929,7 @@ async def get_pinned_channel_messages(
             MessageWithReactionsResponse(
                 **{
                     **message.model_dump(),
-                    "reactions": Messages.get_reactions_by_message_id(
-                        message.id, db=db
-                    ),
+                    "reactions": reactions.get(message.id, []),
                     "user": user_info,
                 }
             )
@@ -1254,7 +1264,7 @@ async def post_new_message(
         except Exception as e:
             log.debug(e)
 
-        active_user_ids = get_user_ids_from_room(f"channel:{channel.id}")
+        active_user_ids = await get_user_ids_from_room(f"channel:{channel.id}")
 
         # NOTE: We intentionally do NOT pass db to background_handler.
         # Background tasks should manage their own short-lived sessions to avoid
@@ -1466,6 +1476,8 @@ async def get_channel_thread_messages(
     message_id: str,
     skip: int = 0,
     limit: int = 50,
+    before: Optional[int] = None,
+    before_id: Optional[str] = None,
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
 ):
@@ -1490,33 +1502,25 @@ async def get_channel_thread_messages(
             )
 
     message_list = Messages.get_messages_by_parent_id(
-        id, message_id, skip, limit, db=db
+        id, message_id, skip, limit, before=before, before_id=before_id, db=db
     )
 
     if not message_list:
         return []
 
-    # Batch fetch all users in a single query (fixes N+1 problem)
-    user_ids = list(set(m.user_id for m in message_list))
-    users = {u.id: u for u in Users.get_users_by_user_ids(user_ids, db=db)}
+    reactions = Messages.get_reactions_by_message_ids(
+        [m.id for m in message_list], db=db
+    )
 
     messages = []
     for message in message_list:
-        # Use message.user if present (for webhooks), otherwise look up by user_id
-        user_info = message.user
-        if user_info is None and message.user_id in users:
-            user_info = UserNameResponse(**users[message.user_id].model_dump())
-
         messages.append(
             MessageUserResponse(
                 **{
                     **message.model_dump(),
                     "reply_count": 0,
                     "latest_reply_at": None,
-                    "reactions": Messages.get_reactions_by_message_id(
-                        message.id, db=db
-                    ),
-                    "user": user_info,
+                    "reactions": reactions.get(message.id, []),
                 }
             )
         )
@@ -23,6 +23,7 @@ from open_webui.models.chats import (
     MessageStats,
 )
 from open_webui.models.tags import TagModel, Tags
+from open_webui.storage.images import externalize_images
 from open_webui.models.folders import Folders
 from open_webui.internal.db import get_session
 
@@ -601,6 +602,7 @@ async def create_new_chat(
     db: Session = Depends(get_session),
 ):
     try:
+        form_data.chat = await externalize_images(form_data.chat)
         chat = Chats.insert_new_chat(user.id, form_data, db=db)
         return ChatResponse(**chat.model_dump())
     except Exception as e:
@@ -622,6 +624,8 @@ async def import_chats(
     db: Session = Depends(get_session),
 ):
     try:
+        for chat_import_form in form_data.chats:
+            chat_import_form.chat = await externalize_images(chat_import_form.chat)
         chats = Chats.import_chats(user.id, form_data.chats, db=db)
         return chats
     except Exception as e:
@@ -953,7 +957,7 @@ async def update_chat_by_id(
 ):
     chat = Chats.get_chat_by_id_and_user_id(id, user.id, db=db)
     if chat:
-        updated_chat = {**chat.chat, **form_data.chat}
+        updated_chat = {**chat.chat, **(await externalize_images(form_data.chat))}
         chat = Chats.update_chat_by_id(id, updated_chat, db=db)
         return ChatResponse(**chat.model_dump())
     else:
@@ -996,7 +1000,7 @@ async def update_chat_message_by_id(
         id,
         message_id,
         {
-            "content": form_data.content,
+            "content": await externalize_images(form_data.content),
         },
         db=db,
     )
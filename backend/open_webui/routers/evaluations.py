@@ -1,5 +1,7 @@
 from typing import Optional
+import asyncio
 import logging
+import threading
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
@@ -17,8 +19,10 @@ from open_webui.models.feedbacks import (
     ModelHistoryResponse,
     Feedbacks,
 )
+from open_webui.models.leaderboard import LeaderboardModel, Leaderboards
 
 from open_webui.constants import ERROR_MESSAGES
+from open_webui.env import LEADERBOARD_REBUILD_INTERVAL, REDIS_KEY_PREFIX
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.internal.db import get_session
 from sqlalchemy.orm import Session
@@ -69,6 +73,68 @@ def _get_embedding_model():
     return _embedding_model
 
 
+K_FACTOR = 32  # Standard Elo K-factor for rating volatility
+
+
+def _get_or_create_stats(model_stats: dict, model_id: str) -> dict:
+    if model_id not in model_stats:
+        model_stats[model_id] = {"rating": 1000.0, "won": 0, "lost": 0}
+    return model_stats[model_id]
+
+
+def _apply_elo_update(
+    model_stats: dict, data: dict, weight: float = 1.0, revert: bool = False
+) -> None:
+    """
+    Apply a single feedback to model_stats in place.
+
+    With revert=True the feedback's effect is undone. Elo depends on match
+    order, so reverting with today's ratings is an approximation; the
+    periodic full rebuild brings the ratings back to the exact replay.
+    """
+    winner_id = data.get("model_id")
+    rating_value = str(data.get("rating", ""))
+    if not winner_id or rating_value not in ("1", "-1"):
+        return
+
+    won = rating_value == "1"
+    sign = -1 if revert else 1
+
+    for opponent_id in data.get("sibling_model_ids") or []:
+        winner = _get_or_create_stats(model_stats, winner_id)
+        opponent = _get_or_create_stats(model_stats, opponent_id)
+        expected = 1 / (1 + 10 ** ((opponent["rating"] - winner["rating"]) / 400))
+
+        winner["rating"] += sign * K_FACTOR * ((1 if won else 0) - expected) * weight
+        opponent["rating"] += (
+            sign * K_FACTOR * ((0 if won else 1) - (1 - expected)) * weight
+        )
+
+        if won:
+            winner["won"] += sign
+            opponent["lost"] += sign
+        else:
+            winner["lost"] += sign
+            opponent["won"] += sign
+
+
+def _apply_tag_counts(model_stats: dict, data: dict, revert: bool = False) -> None:
+    """Add (or remove) a feedback's tags to the per-model tag counts."""
+    model_id = data.get("model_id")
+    tags = data.get("tags") or []
+    if not model_id or not tags:
+        return
+
+    stats = _get_or_create_stats(model_stats, model_id)
+    tag_counts = stats["tags"] = stats.get("tags") or {}
+    for tag in tags:
+        count = tag_counts.get(tag, 0) + (-1 if revert else 1)
+        if count > 0:
+            tag_counts[tag] = count
+        else:
+            tag_counts.pop(tag, None)
+
+
 def _calculate_elo(
     feedbacks: list[LeaderboardFeedbackData], similarities: dict = None
 ) -> dict:
@@ -85,42 +151,20 @@ def _calculate_elo(
 
     Returns: {model_id: {"rating": float, "won": int, "lost": int}}
     """
-    K_FACTOR = 32  # Standard Elo K-factor for rating volatility
     model_stats = {}
 
-    def get_or_create_stats(model_id):
-        if model_id not in model_stats:
-            model_stats[model_id] = {"rating": 1000.0, "won": 0, "lost": 0}
-        return model_stats[model_id]
-
     for feedback in feedbacks:
-        data = feedback.data or {}
-        winner_id = data.get("model_id")
-        rating_value = str(data.get("rating", ""))
-        if not winner_id or rating_value not in ("1", "-1"):
-            continue
-
-        won = rating_value == "1"
         weight = similarities.get(feedback.id, 1.0) if similarities else 1.0
+        _apply_elo_update(model_stats, feedback.data or {}, weight)
 
-        for opponent_id in data.get("sibling_model_ids") or []:
-            winner = get_or_create_stats(winner_id)
-            opponent = get_or_create_stats(opponent_id)
-            expected = 1 / (1 + 10 ** ((opponent["rating"] - winner["rating"]) / 400))
-
-            winner["rating"] += K_FACTOR * ((1 if won else 0) - expected) * weight
-            opponent["rating"] += (
-                K_FACTOR * ((0 if won else 1) - (1 - expected)) * weight
-            )
+    return model_stats
 
-            if won:
-                winner["won"] += 1
-                opponent["lost"] += 1
-            else:
-                winner["lost"] += 1
-                opponent["won"] += 1
 
-    return model_stats
+def _top_tags(tag_counts: dict, limit: int = 5) -> list[dict]:
+    return [
+        {"tag": tag, "count": count}
+        for tag, count in sorted(tag_counts.items(), key=lambda x: -x[1])[:limit]
+    ]
 
 
 def _get_top_tags(feedbacks: list[LeaderboardFeedbackData], limit: int = 5) -> dict:
@@ -133,26 +177,45 @@ def _get_top_tags(feedbacks: list[LeaderboardFeedbackData], limit: int = 5) -> d
 
     Returns: {model_id: [{"tag": str, "count": int}, ...]}
     """
-    from collections import defaultdict
-
-    tag_counts = defaultdict(lambda: defaultdict(int))
-
+    model_stats = {}
     for feedback in feedbacks:
-        data = feedback.data or {}
-        model_id = data.get("model_id")
-        if model_id:
-            for tag in data.get("tags", []):
-                tag_counts[model_id][tag] += 1
+        _apply_tag_counts(model_stats, feedback.data or {})
 
     return {
-        model_id: [
-            {"tag": tag, "count": count}
-            for tag, count in sorted(tags.items(), key=lambda x: -x[1])[:limit]
-        ]
-        for model_id, tags in tag_counts.items()
+        model_id: _top_tags(stats["tags"], limit)
+        for model_id, stats in model_stats.items()
+        if stats.get("tags")
     }
 
 
+# Tag embeddings are cached for the lifetime of the process and the matrix is
+# only extended with tags that have not been encoded yet, so topic queries
+# cost one encode of the query plus the occasional new tag.
+_tag_embedding_lock = threading.Lock()
+_tag_embedding_index: dict[str, int] = {}
+_tag_embedding_matrix = None
+
+
+def _get_tag_embeddings(embedding_model, tags: list[str]):
+    global _tag_embedding_matrix
+    import numpy as np
+
+    with _tag_embedding_lock:
+        new_tags = [tag for tag in tags if tag not in _tag_embedding_index]
+        if new_tags:
+            new_embeddings = np.asarray(embedding_model.encode(new_tags))
+            if _tag_embedding_matrix is None:
+                _tag_embedding_matrix = new_embeddings
+            else:
+                _tag_embedding_matrix = np.vstack(
+                    [_tag_embedding_matrix, new_embeddings]
+                )
+            for tag in new_tags:
+                _tag_embedding_index[tag] = len(_tag_embedding_index)
+
+        return _tag_embedding_matrix[[_tag_embedding_index[tag] for tag in tags]]
+
+
 def _compute_similarities(feedbacks: list[LeaderboardFeedbackData], query: str) -> dict:
     """
     Compute how relevant each feedback is to a search query.
@@ -184,7 +247,7 @@ def _compute_similarities(feedbacks: list[LeaderboardFeedbackData], query: str)
         return {}
 
     try:
-        tag_embeddings = embedding_model.encode(all_tags)
+        tag_embeddings = _get_tag_embeddings(embedding_model, all_tags)
         query_embedding = embedding_model.encode([query])[0]
     except Exception as e:
         log.error(f"Embedding error: {e}")
@@ -210,6 +273,84 @@ def _compute_similarities(feedbacks: list[LeaderboardFeedbackData], query: str)
     }
 
 
+####################
+# Materialized leaderboard
+####################
+
+
+def update_leaderboard(
+    removed: Optional[list[dict]] = None,
+    added: Optional[list[dict]] = None,
+    db: Optional[Session] = None,
+):
+    """Fold created, updated or deleted feedback data into the leaderboard table."""
+    removed = [data for data in (removed or []) if data]
+    added = [data for data in (added or []) if data]
+
+    model_ids = set()
+    for data in removed + added:
+        if data.get("model_id"):
+            model_ids.add(data["model_id"])
+        model_ids.update(data.get("sibling_model_ids") or [])
+
+    if not model_ids:
+        return
+
+    def apply(model_stats: dict):
+        for data in removed:
+            _apply_elo_update(model_stats, data, revert=True)
+            _apply_tag_counts(model_stats, data, revert=True)
+        for data in added:
+            _apply_elo_update(model_stats, data)
+            _apply_tag_counts(model_stats, data)
+
+    # Feedback changes arriving at the same time update the same rows, which
+    # stay locked from the read to the write
+    Leaderboards.update_entries(sorted(model_ids), apply, db=db)
+
+
+def rebuild_leaderboard(db: Optional[Session] = None) -> list[LeaderboardModel]:
+    """Replay the full feedback history and replace the leaderboard table."""
+    feedbacks = Feedbacks.get_feedbacks_for_leaderboard(db=db)
+
+    model_stats = _calculate_elo(feedbacks)
+    for feedback in feedbacks:
+        _apply_tag_counts(model_stats, feedback.data or {})
+
+    entries = [
+        LeaderboardModel(model_id=model_id, **stats)
+        for model_id, stats in model_stats.items()
+    ]
+    Leaderboards.replace_entries(entries, db=db)
+    return entries
+
+
+async def periodic_leaderboard_rebuild(app):
+    """
+    Periodically rebuild the leaderboard to correct drift from reverted or
+    concurrent incremental updates. With Redis, only one replica rebuilds
+    per interval.
+    """
+    if LEADERBOARD_REBUILD_INTERVAL <= 0:
+        return
+
+    while True:
+        try:
+            redis = getattr(app.state, "redis", None)
+            if redis is None or await redis.set(
+                f"{REDIS_KEY_PREFIX}:leaderboard:rebuild",
+                app.state.instance_id,
+                nx=True,
+                ex=LEADERBOARD_REBUILD_INTERVAL,
+            ):
+                log.debug("Rebuilding evaluation leaderboard")
+                await run_in_threadpool(rebuild_leaderboard)
+        except Exception as e:
+            log.exception(f"Error rebuilding leaderboard: {e}")
+
+        await asyncio.sleep(LEADERBOARD_REBUILD_INTERVAL)
+
+
 class LeaderboardEntry(BaseModel):
     model_id: str
     rating: int
@@ -230,16 +371,25 @@ async def get_leaderboard(
     db: Session = Depends(get_session),
 ):
     """Get model leaderboard with Elo ratings. Query filters by tag similarity."""
-    feedbacks = Feedbacks.get_feedbacks_for_leaderboard(db=db)
-
-    similarities = None
     if query and query.strip():
+        # Topic-weighted ratings depend on the query, so they are replayed
+        feedbacks = Feedbacks.get_feedbacks_for_leaderboard(db=db)
         similarities = await run_in_threadpool(
             _compute_similarities, feedbacks, query.strip()
         )
 
-    elo_stats = _calculate_elo(feedbacks, similarities)
-    tags_by_model = _get_top_tags(feedbacks)
+        elo_stats = _calculate_elo(feedbacks, similarities)
+        tags_by_model = _get_top_tags(feedbacks)
+    else:
+        if Leaderboards.has_entries(db=db):
+            leaderboard = Leaderboards.get_entries(db=db)
+        else:
+            leaderboard = await run_in_threadpool(rebuild_leaderboard)
+
+        elo_stats = {entry.model_id: entry.model_dump() for entry in leaderboard}
+        tags_by_model = {
+            entry.model_id: _top_tags(entry.tags or {}) for entry in leaderboard
+        }
 
     entries = sorted(
         [
@@ -252,6 +402,7 @@ async def get_leaderboard(
                 top_tags=tags_by_model.get(mid, []),
             )
             for mid, s in elo_stats.items()
+            if s["won"] + s["lost"] > 0
         ],
         key=lambda e: e.rating,
         reverse=True,
@@ -334,6 +485,8 @@ async def delete_all_feedbacks(
     user=Depends(get_admin_user), db: Session = Depends(get_session)
 ):
     success = Feedbacks.delete_all_feedbacks(db=db)
+    if success:
+        Leaderboards.delete_all_entries(db=db)
     return success
 
 
@@ -357,7 +510,10 @@ async def get_feedbacks(
 async def delete_feedbacks(
     user=Depends(get_verified_user), db: Session = Depends(get_session)
 ):
+    feedbacks = Feedbacks.get_feedbacks_by_user_id(user.id, db=db)
     success = Feedbacks.delete_feedbacks_by_user_id(user.id, db=db)
+    if success:
+        update_leaderboard(removed=[feedback.data for feedback in feedbacks], db=db)
     return success
 
 
@@ -403,6 +559,7 @@ async def create_feedback(
             detail=ERROR_MESSAGES.DEFAULT(),
         )
 
+    update_leaderboard(added=[feedback.data], db=db)
     return feedback
 
 
@@ -432,6 +589,8 @@ async def update_feedback_by_id(
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
 ):
+    previous = Feedbacks.get_feedback_by_id(id=id, db=db)
+
     if user.role == "admin":
         feedback = Feedbacks.update_feedback_by_id(id=id, form_data=form_data, db=db)
     else:
@@ -444,6 +603,8 @@ async def update_feedback_by_id(
             status_code=status.HTTP_404_NOT_FOUND, detail=ERROR_MESSAGES.NOT_FOUND
         )
 
+    if previous and previous.data != feedback.data:
+        update_leaderboard(removed=[previous.data], added=[feedback.data], db=db)
     return feedback
 
 
@@ -451,6 +612,8 @@ async def update_feedback_by_id(
 async def delete_feedback_by_id(
     id: str, user=Depends(get_verified_user), db: Session = Depends(get_session)
 ):
+    feedback = Feedbacks.get_feedback_by_id(id=id, db=db)
+
     if user.role == "admin":
         success = Feedbacks.delete_feedback_by_id(id=id, db=db)
     else:
@@ -463,4 +626,6 @@ async def delete_feedback_by_id(
             status_code=status.HTTP_404_NOT_FOUND, detail=ERROR_MESSAGES.NOT_FOUND
         )
 
+    if feedback:
+        update_leaderboard(removed=[feedback.data], db=db)
     return success
@@ -2,6 +2,7 @@ import logging
 import os
 import uuid
 import json
+import time
 from pathlib import Path
 from typing import Optional
 from urllib.parse import quote
@@ -41,13 +42,20 @@ from open_webui.models.groups import Groups
 
 
 from open_webui.routers.retrieval import ProcessFileForm, process_file
+from open_webui.retrieval.loaders.cache import delete_cached_documents
 from open_webui.routers.audio import transcribe
 
+from open_webui.storage.images import IMAGES
 from open_webui.storage.provider import Storage
 
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access
+from open_webui.utils.file_jobs import enqueue_file_processing
+from open_webui.utils.file_status import (
+    subscribe_file_status,
+    unsubscribe_file_status,
+)
 from open_webui.utils.misc import strict_match_mime_type
 from pydantic import BaseModel
 
@@ -55,6 +63,9 @@ log = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Seconds between comments sent on an idle file status stream
+FILE_STATUS_KEEPALIVE_INTERVAL = 30
+
 
 ############################
 # Check if the current user has access to a file through any knowledge bases the user may be in.
@@ -115,6 +126,57 @@ def has_access_to_file(
 ############################
 
 
+def process_file_by_content_type(
+    request,
+    file_id: str,
+    content_type: Optional[str],
+    file_path: str,
+    file_metadata: dict,
+    user,
+    db: Optional[Session] = None,
+):
+    """Transcribe or extract an uploaded file; raises when processing fails."""
+    if content_type:
+        stt_supported_content_types = getattr(
+            request.app.state.config, "STT_SUPPORTED_CONTENT_TYPES", []
+        )
+
+        if strict_match_mime_type(stt_supported_content_types, content_type):
+            file_path_processed = Storage.get_file(file_path)
+            result = transcribe(request, file_path_processed, file_metadata, user)
+
+            process_file(
+                request,
+                ProcessFileForm(file_id=file_id, content=result.get("text", "")),
+                user=user,
+                db=db,
+            )
+        elif (not content_type.startswith(("image/", "video/"))) or (
+            request.app.state.config.CONTENT_EXTRACTION_ENGINE == "external"
+        ):
+            process_file(
+                request,
+                ProcessFileForm(file_id=file_id),
+                user=user,
+                db=db,
+            )
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File type {content_type} is not supported for processing",
+            )
+    else:
+        log.info(
+            f"File type {content_type} is not provided, but trying to process anyway"
+        )
+        process_file(
+            request,
+            ProcessFileForm(file_id=file_id),
+            user=user,
+            db=db,
+        )
+
+
 def process_uploaded_file(
     request,
     file,
@@ -126,51 +188,15 @@ def process_uploaded_file(
 ):
     def _process_handler(db_session):
         try:
-            if file.content_type:
-                stt_supported_content_types = getattr(
-                    request.app.state.config, "STT_SUPPORTED_CONTENT_TYPES", []
-                )
-
-                if strict_match_mime_type(
-                    stt_supported_content_types, file.content_type
-                ):
-                    file_path_processed = Storage.get_file(file_path)
-                    result = transcribe(
-                        request, file_path_processed, file_metadata, user
-                    )
-
-                    process_file(
-                        request,
-                        ProcessFileForm(
-                            file_id=file_item.id, content=result.get("text", "")
-                        ),
-                        user=user,
-                        db=db_session,
-                    )
-                elif (not file.content_type.startswith(("image/", "video/"))) or (
-                    request.app.state.config.CONTENT_EXTRACTION_ENGINE == "external"
-                ):
-                    process_file(
-                        request,
-                        ProcessFileForm(file_id=file_item.id),
-                        user=user,
-                        db=db_session,
-                    )
-                else:
-                    raise Exception(
-                        f"File type {file.content_type} is not supported for processing"
-                    )
-            else:
-                log.info(
-                    f"File type {file.content_type} is not provided, but trying to process anyway"
-                )
-                process_file(
-                    request,
-                    ProcessFileForm(file_id=file_item.id),
-                    user=user,
-                    db=db_session,
-                )
-
+            process_file_by_content_type(
+                request,
+                file_item.id,
+                file.content_type,
+                file_path,
+                file_metadata,
+                user,
+                db=db_session,
+            )
         except Exception as e:
             log.error(f"Error processing file: {file_item.id}")
             Files.update_file_data_by_id(
@@ -302,12 +328,13 @@ def upload_file_handler(
 
         if process:
             if background_tasks and process_in_background:
-                background_tasks.add_task(
-                    process_uploaded_file,
+                # Picked up by the file processing workers, possibly on
+                # another replica
+                enqueue_file_processing(
                     request,
-                    file,
-                    file_path,
                     file_item,
+                    file.content_type,
+                    file_path,
                     file_metadata,
                     user,
                 )
@@ -442,6 +469,30 @@ async def delete_all_files(
         )
 
 
+############################
+# Get Stored Image
+############################
+
+
+@router.get("/images/{name}")
+async def get_stored_image(name: str, user=Depends(get_verified_user)):
+    """
+    Images moved out of chats into the content-addressed store. The name is
+    the sha256 of the image, so the response never changes.
+    """
+    file_path = await asyncio.to_thread(IMAGES.get_local_path, name)
+    if file_path is None or not os.path.isfile(file_path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ERROR_MESSAGES.NOT_FOUND,
+        )
+
+    return FileResponse(
+        file_path,
+        headers={"Cache-Control": "private, max-age=31536000, immutable"},
+    )
+
+
 ############################
 # Get File By Id
 ############################
@@ -495,32 +546,60 @@ async def get_file_process_status(
         if stream:
             MAX_FILE_PROCESSING_DURATION = 3600 * 2
 
+            def get_status_event(file_id) -> dict:
+                file_item = Files.get_file_by_id(file_id)  # Creates own session
+                if not file_item:
+                    return {"status": "not_found"}
+
+                data = file_item.data or {}
+                event = {"status": data.get("status")}
+                if event["status"] == "failed":
+                    event["error"] = data.get("error")
+                return event
+
             async def event_stream(file_id):
                 # NOTE: We intentionally do NOT capture the request's db session here.
-                # Each poll creates its own short-lived session to avoid holding a
-                # connection for hours. A WebSocket push would be more efficient.
-                for _ in range(MAX_FILE_PROCESSING_DURATION):
-                    file_item = Files.get_file_by_id(file_id)  # Creates own session
-                    if file_item:
-                        data = file_item.model_dump().get("data", {})
-                        status = data.get("status")
-
-                        if status:
-                            event = {"status": status}
-                            if status == "failed":
-                                event["error"] = data.get("error")
-
+                # Status changes are pushed by whoever processes the file. The DB
+                # is read after subscribing so no transition is missed, and again
+                # whenever the stream goes idle, as events from other replicas or
+                # worker processes only arrive when Redis is configured.
+                queue = subscribe_file_status(file_id)
+                try:
+                    event = get_status_event(file_id)
+                    if event["status"] == "not_found":
+                        yield f"data: {json.dumps(event)}\n\n"
+                        return
+                    if event["status"] is None:
+                        # Legacy
+                        return
+
+                    last_status = None
+                    deadline = time.monotonic() + MAX_FILE_PROCESSING_DURATION
+                    while True:
+                        if event is not None and event["status"] != last_status:
+                            last_status = event["status"]
                             yield f"data: {json.dumps(event)}\n\n"
-                            if status in ("completed", "failed"):
+                            if event["status"] in ("completed", "failed", "not_found"):
                                 break
-                        else:
-                            # Legacy
+
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
                             break
-                    else:
-                        yield f"data: {json.dumps({'status': 'not_found'})}\n\n"
-                        break
 
-                    await asyncio.sleep(1)
+                        try:
+                            message = await asyncio.wait_for(
+                                queue.get(),
+                                timeout=min(FILE_STATUS_KEEPALIVE_INTERVAL, remaining),
+                            )
+                            event = {"status": message["status"]}
+                            if message["status"] == "failed":
+                                event["error"] = message.get("error")
+                        except asyncio.TimeoutError:
+                            # Keeps proxies from closing an idle stream
+                            yield ": keep-alive\n\n"
+                            event = get_status_event(file_id)
+                finally:
+                    unsubscribe_file_status(file_id, queue)
 
             return StreamingResponse(
                 event_stream(file.id),
@@ -830,6 +909,8 @@ async def delete_file_by_id(
             try:
                 Storage.delete_file(file.path)
                 VECTOR_DB_CLIENT.delete(collection_name=f"file-{id}")
+                if (file.meta or {}).get("extraction_cache_key"):
+                    delete_cached_documents(file.meta["extraction_cache_key"])
             except Exception as e:
                 log.exception(e)
                 log.error("Error deleting files")
@@ -20,6 +20,7 @@ from open_webui.env import ENABLE_FORWARD_USER_INFO_HEADERS
 
 from open_webui.models.chats import Chats
 from open_webui.routers.files import upload_file_handler, get_file_content_by_id
+from open_webui.socket.main import get_event_emitter
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_permission
 from open_webui.utils.headers import include_user_info_headers
@@ -535,6 +536,21 @@ def upload_image(request, image_data, content_type, metadata, user, db=None):
     return file_item, url
 
 
+def get_image_event_emitter(metadata: dict, user):
+    """Emitter for progress of images generated for a chat message, if any."""
+    if user is None or not metadata.get("chat_id") or not metadata.get("message_id"):
+        return None
+
+    return get_event_emitter(
+        {
+            "user_id": user.id,
+            "chat_id": metadata["chat_id"],
+            "message_id": metadata["message_id"],
+        },
+        update_db=False,
+    )
+
+
 @router.post("/generations")
 async def generate_images(
     request: Request, form_data: CreateImageForm, user=Depends(get_verified_user)
@@ -749,9 +765,9 @@ async def image_generations(
             res = await comfyui_create_image(
                 model,
                 form_data,
-                user.id,
                 request.app.state.config.COMFYUI_BASE_URL,
                 request.app.state.config.COMFYUI_API_KEY,
+                event_emitter=get_image_event_emitter(metadata, user),
             )
             log.debug(f"res: {res}")
 
@@ -1090,9 +1106,9 @@ async def image_edits(
             res = await comfyui_edit_image(
                 model,
                 form_data,
-                user.id,
                 request.app.state.config.IMAGES_EDIT_COMFYUI_BASE_URL,
                 request.app.state.config.IMAGES_EDIT_COMFYUI_API_KEY,
+                event_emitter=get_image_event_emitter(metadata, user),
             )
             log.debug(f"res: {res}")
 
@@ -18,6 +18,10 @@ from open_webui.models.knowledge import (
     KnowledgeUserResponse,
 )
 from open_webui.models.files import Files, FileModel, FileMetadataResponse
+from open_webui.models.knowledge_reindex import (
+    KnowledgeReindexJobResponse,
+    KnowledgeReindexJobs,
+)
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
 from open_webui.routers.retrieval import (
     process_file,
@@ -30,6 +34,12 @@ from open_webui.storage.provider import Storage
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.utils.auth import get_verified_user, get_admin_user
 from open_webui.utils.access_control import has_access, has_permission
+from open_webui.utils.knowledge_reindex import (
+    create_reindex_job,
+    get_job_response,
+    start_reindex_job,
+    supports_shadow_collections,
+)
 
 
 from open_webui.config import BYPASS_ADMIN_ACCESS_CONTROL
@@ -273,67 +283,117 @@ async def create_new_knowledge(
 ############################
 
 
-@router.post("/reindex", response_model=bool)
+@router.get("/reindex/config")
+async def get_reindex_config(user=Depends(get_admin_user)):
+    # Without shadow collections knowledge bases return no results while rebuilt
+    return {"atomic": supports_shadow_collections()}
+
+
+@router.post("/reindex", response_model=KnowledgeReindexJobResponse)
 async def reindex_knowledge_files(
     request: Request,
-    user=Depends(get_verified_user),
-    db: Session = Depends(get_session),
+    in_place: bool = Query(False),
+    user=Depends(get_admin_user),
 ):
-    if user.role != "admin":
+    """
+    Start rebuilding every knowledge base in the background. Vector DBs that
+    cannot read vectors back only support in_place rebuilds, which leave each
+    knowledge base empty until its files are indexed again.
+    """
+    job = KnowledgeReindexJobs.get_latest_job()
+    if job is not None and job.is_active and not job.is_stale:
+        return get_job_response(job)
+
+    if not in_place and not supports_shadow_collections():
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=ERROR_MESSAGES.UNAUTHORIZED,
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT(
+                "The vector database cannot rebuild knowledge bases without downtime, reindex them in place instead"
+            ),
         )
 
-    knowledge_bases = Knowledges.get_knowledge_bases(db=db)
+    job = create_reindex_job(user.id, in_place)
+    if job is None or not KnowledgeReindexJobs.update_job_status_by_id(
+        job.id, "running", ["pending"]
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT("Failed to start reindexing"),
+        )
 
-    log.info(f"Starting reindexing for {len(knowledge_bases)} knowledge bases")
+    log.info(
+        f"Starting {'in-place ' if in_place else ''}reindex job {job.id} for {job.total_files} files"
+    )
+    start_reindex_job(request, job, user)
+    return get_job_response(job)
 
-    for knowledge_base in knowledge_bases:
-        try:
-            files = Knowledges.get_files_by_id(knowledge_base.id, db=db)
-            try:
-                if VECTOR_DB_CLIENT.has_collection(collection_name=knowledge_base.id):
-                    VECTOR_DB_CLIENT.delete_collection(
-                        collection_name=knowledge_base.id
-                    )
-            except Exception as e:
-                log.error(f"Error deleting collection {knowledge_base.id}: {str(e)}")
-                continue  # Skip, don't raise
-
-            failed_files = []
-            for file in files:
-                try:
-                    await run_in_threadpool(
-                        process_file,
-                        request,
-                        ProcessFileForm(
-                            file_id=file.id, collection_name=knowledge_base.id
-                        ),
-                        user=user,
-                        db=db,
-                    )
-                except Exception as e:
-                    log.error(
-                        f"Error processing file {file.filename} (ID: {file.id}): {str(e)}"
-                    )
-                    failed_files.append({"file_id": file.id, "error": str(e)})
-                    continue
 
-        except Exception as e:
-            log.error(f"Error processing knowledge base {knowledge_base.id}: {str(e)}")
-            # Don't raise, just continue
-            continue
+@router.get("/reindex/status", response_model=Optional[KnowledgeReindexJobResponse])
+async def get_reindex_status(user=Depends(get_admin_user)):
+    job = KnowledgeReindexJobs.get_latest_job()
+    return get_job_response(job) if job else None
 
-        if failed_files:
-            log.warning(
-                f"Failed to process {len(failed_files)} files in knowledge base {knowledge_base.id}"
-            )
-            for failed in failed_files:
-                log.warning(f"File ID: {failed['file_id']}, Error: {failed['error']}")
 
-    log.info(f"Reindexing completed.")
-    return True
+@router.get("/reindex/{job_id}", response_model=KnowledgeReindexJobResponse)
+async def get_reindex_job_by_id(job_id: str, user=Depends(get_admin_user)):
+    job = KnowledgeReindexJobs.get_job_by_id(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ERROR_MESSAGES.NOT_FOUND,
+        )
+    return get_job_response(job)
+
+
+@router.post("/reindex/{job_id}/cancel", response_model=KnowledgeReindexJobResponse)
+async def cancel_reindex_job_by_id(job_id: str, user=Depends(get_admin_user)):
+    job = KnowledgeReindexJobs.get_job_by_id(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ERROR_MESSAGES.NOT_FOUND,
+        )
+
+    if job.is_stale:
+        # Nothing is running it anymore, so there is nobody to wait for
+        KnowledgeReindexJobs.update_job_status_by_id(
+            job_id, "cancelled", [], include_stale=True
+        )
+    else:
+        # The worker stops after the files it is currently processing
+        KnowledgeReindexJobs.update_job_status_by_id(
+            job_id, "cancelling", ["pending", "running"]
+        )
+
+    return get_job_response(KnowledgeReindexJobs.get_job_by_id(job_id))
+
+
+@router.post("/reindex/{job_id}/resume", response_model=KnowledgeReindexJobResponse)
+async def resume_reindex_job_by_id(
+    request: Request, job_id: str, user=Depends(get_admin_user)
+):
+    job = KnowledgeReindexJobs.get_job_by_id(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ERROR_MESSAGES.NOT_FOUND,
+        )
+
+    # Only one replica can win the claim on a stale job
+    if not KnowledgeReindexJobs.update_job_status_by_id(
+        job_id, "running", ["cancelled", "failed"], include_stale=True
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT("Reindex job cannot be resumed"),
+        )
+
+    job = KnowledgeReindexJobs.update_job_by_id(
+        job_id, {"error": None, "finished_at": None}
+    )
+    log.info(f"Resuming reindex job {job.id}")
+    start_reindex_job(request, job, user)
+    return get_job_response(job)
 
 
 ############################
@@ -1,7 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel
 import logging
-import asyncio
 from typing import Optional
 
 from open_webui.models.memories import Memories, MemoryModel
@@ -23,6 +22,50 @@ async def get_embeddings(request: Request):
     return {"result": await request.app.state.EMBEDDING_FUNCTION("hello world")}
 
 
+async def upsert_memories_to_vector_db(
+    request: Request, memories: list[MemoryModel], user
+):
+    """
+    Embed memories with a single call to the embedding function, which
+    batches them by RAG_EMBEDDING_BATCH_SIZE, and upsert them all at once.
+    Drops the user's memory index so that the next query sees the change.
+    """
+    if memories:
+        vectors = await request.app.state.EMBEDDING_FUNCTION(
+            [memory.content for memory in memories], user=user
+        )
+
+        # Failed batches are left out of the result, so vectors would no
+        # longer line up with their memories
+        if (
+            not isinstance(vectors, list)
+            or len(vectors) != len(memories)
+            or any(vector is None for vector in vectors)
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=ERROR_MESSAGES.DEFAULT("Failed to embed memories"),
+            )
+
+        VECTOR_DB_CLIENT.upsert(
+            collection_name=f"user-memory-{user.id}",
+            items=[
+                {
+                    "id": memory.id,
+                    "text": memory.content,
+                    "vector": vector,
+                    "metadata": {
+                        "created_at": memory.created_at,
+                        "updated_at": memory.updated_at,
+                    },
+                }
+                for memory, vector in zip(memories, vectors)
+            ],
+        )
+
+    await request.app.state.memory_indexes.invalidate(user.id)
+
+
 ############################
 # GetMemories
 ############################
@@ -86,20 +129,7 @@ async def add_memory(
         )
 
     memory = Memories.insert_new_memory(user.id, form_data.content, db=db)
-
-    vector = await request.app.state.EMBEDDING_FUNCTION(memory.content, user=user)
-
-    VECTOR_DB_CLIENT.upsert(
-        collection_name=f"user-memory-{user.id}",
-        items=[
-            {
-                "id": memory.id,
-                "text": memory.content,
-                "vector": vector,
-                "metadata": {"created_at": memory.created_at},
-            }
-        ],
-    )
+    await upsert_memories_to_vector_db(request, [memory], user)
 
     return memory
 
@@ -141,6 +171,12 @@ async def query_memory(
 
     vector = await request.app.state.EMBEDDING_FUNCTION(form_data.content, user=user)
 
+    # Memories are few per user, so they are searched in process when the
+    # vector DB can hand their vectors over
+    index = await request.app.state.memory_indexes.get(user.id)
+    if index is not None:
+        return index.search(vector, form_data.k)
+
     results = VECTOR_DB_CLIENT.search(
         collection_name=f"user-memory-{user.id}",
         vectors=[vector],
@@ -176,30 +212,7 @@ async def reset_memory_from_vector_db(
     VECTOR_DB_CLIENT.delete_collection(f"user-memory-{user.id}")
 
     memories = Memories.get_memories_by_user_id(user.id, db=db)
-
-    # Generate vectors in parallel
-    vectors = await asyncio.gather(
-        *[
-            request.app.state.EMBEDDING_FUNCTION(memory.content, user=user)
-            for memory in memories
-        ]
-    )
-
-    VECTOR_DB_CLIENT.upsert(
-        collection_name=f"user-memory-{user.id}",
-        items=[
-            {
-                "id": memory.id,
-                "text": memory.content,
-                "vector": vectors[idx],
-                "metadata": {
-                    "created_at": memory.created_at,
-                    "updated_at": memory.updated_at,
-                },
-            }
-            for idx, memory in enumerate(memories)
-        ],
-    )
+    await upsert_memories_to_vector_db(request, memories, user)
 
     return True
 
@@ -236,6 +249,7 @@ async def delete_memory_by_user_id(
             VECTOR_DB_CLIENT.delete_collection(f"user-memory-{user.id}")
         except Exception as e:
             log.error(e)
+        await request.app.state.memory_indexes.invalidate(user.id)
         return True
 
     return False
@@ -275,22 +289,7 @@ async def update_memory_by_id(
         raise HTTPException(status_code=404, detail="Memory not found")
 
     if form_data.content is not None:
-        vector = await request.app.state.EMBEDDING_FUNCTION(memory.content, user=user)
-
-        VECTOR_DB_CLIENT.upsert(
-            collection_name=f"user-memory-{user.id}",
-            items=[
-                {
-                    "id": memory.id,
-                    "text": memory.content,
-                    "vector": vector,
-                    "metadata": {
-                        "created_at": memory.created_at,
-                        "updated_at": memory.updated_at,
-                    },
-                }
-            ],
-        )
+        await upsert_memories_to_vector_db(request, [memory], user)
 
     return memory
 
@@ -327,6 +326,7 @@ async def delete_memory_by_id(
         VECTOR_DB_CLIENT.delete(
             collection_name=f"user-memory-{user.id}", ids=[memory_id]
         )
+        await request.app.state.memory_indexes.invalidate(user.id)
         return True
 
     return False
@@ -1,12 +1,7 @@
-# TODO: Implement a more intelligent load balancing mechanism for distributing requests among multiple backend instances.
-# Current implementation uses a simple round-robin approach (random.choice). Consider incorporating algorithms like weighted round-robin,
-# least connections, or least response time for better resource utilization and performance optimization.
-
 import asyncio
 import json
 import logging
 import os
-import random
 import re
 import time
 from datetime import datetime
@@ -37,7 +32,7 @@ from fastapi import (
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, ConfigDict, validator
-from starlette.background import BackgroundTask
+from starlette.background import BackgroundTask, BackgroundTasks
 from sqlalchemy.orm import Session
 
 from open_webui.internal.db import get_session
@@ -54,6 +49,8 @@ from open_webui.utils.payload import (
 )
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access
+from open_webui.utils.model_cache import MODEL_LISTS, send_model_list_request
+from open_webui.utils.balancer import OLLAMA_BALANCER
 
 
 from open_webui.config import (
@@ -121,7 +118,12 @@ async def send_post_request(
     content_type: Optional[str] = None,
     user: UserModel = None,
     metadata: Optional[dict] = None,
+    base_url: Optional[str] = None,
 ):
+    # base_url is the node the request counts against for load balancing
+    if base_url:
+        OLLAMA_BALANCER.start_request(base_url)
+    streaming = False
 
     r = None
     try:
@@ -168,21 +170,31 @@ async def send_post_request(
             if content_type:
                 response_headers["Content-Type"] = content_type
 
+            async def cleanup():
+                if base_url:
+                    OLLAMA_BALANCER.finish_request(base_url)
+                await cleanup_response(r, session)
+
+            streaming = True
             return StreamingResponse(
                 r.content,
                 status_code=r.status,
                 headers=response_headers,
-                background=BackgroundTask(
-                    cleanup_response, response=r, session=session
-                ),
+                background=BackgroundTask(cleanup),
             )
         else:
             res = await r.json()
             return res
 
     except HTTPException as e:
+        if base_url:
+            OLLAMA_BALANCER.finish_request(base_url, failed=e.status_code >= 500)
+            base_url = None
         raise e  # Re-raise HTTPException to be handled by FastAPI
     except Exception as e:
+        if base_url:
+            OLLAMA_BALANCER.finish_request(base_url, failed=not r or r.status >= 500)
+            base_url = None
         detail = f"Ollama: {e}"
 
         raise HTTPException(
@@ -190,6 +202,8 @@ async def send_post_request(
             detail=detail if e else "Open WebUI: Server Connection Error",
         )
     finally:
+        if base_url and not streaming:
+            OLLAMA_BALANCER.finish_request(base_url)
         if not stream:
             await cleanup_response(r, session)
 
@@ -299,6 +313,8 @@ async def update_config(
         if key in keys
     }
 
+    await MODEL_LISTS.invalidate()
+
     return {
         "ENABLE_OLLAMA_API": request.app.state.config.ENABLE_OLLAMA_API,
         "OLLAMA_BASE_URLS": request.app.state.config.OLLAMA_BASE_URLS,
@@ -306,6 +322,27 @@ async def update_config(
     }
 
 
+_loaded_models_refresh: Optional[asyncio.Task] = None
+
+
+def select_ollama_url_idx(request: Request, model: dict) -> int:
+    """Pick one of the nodes serving model, preferring warm and idle ones."""
+    global _loaded_models_refresh
+
+    if OLLAMA_BALANCER.needs_refresh() and (
+        _loaded_models_refresh is None or _loaded_models_refresh.done()
+    ):
+        _loaded_models_refresh = asyncio.create_task(
+            get_ollama_loaded_models(request, user=None)
+        )
+
+    urls = request.app.state.config.OLLAMA_BASE_URLS
+    return OLLAMA_BALANCER.select(
+        {idx: urls[idx] for idx in model.get("urls", []) if idx < len(urls)},
+        model.get("model"),
+    )
+
+
 def merge_ollama_models_lists(model_lists):
     merged_models = {}
 
@@ -325,7 +362,11 @@ def merge_ollama_models_lists(model_lists):
 
 @cached(
     ttl=MODELS_CACHE_TTL,
-    key=lambda _, user: f"ollama_all_models_{user.id}" if user else "ollama_all_models",
+    key_builder=lambda _, request, user=None: (
+        f"ollama_all_models_{user.id}"
+        if user and ENABLE_FORWARD_USER_INFO_HEADERS
+        else "ollama_all_models"
+    ),
 )
 async def get_all_models(request: Request, user: UserModel = None):
     log.info("get_all_models()")
@@ -335,7 +376,11 @@ async def get_all_models(request: Request, user: UserModel = None):
             if (str(idx) not in request.app.state.config.OLLAMA_API_CONFIGS) and (
                 url not in request.app.state.config.OLLAMA_API_CONFIGS  # Legacy support
             ):
-                request_tasks.append(send_get_request(f"{url}/api/tags", user=user))
+                request_tasks.append(
+                    send_model_list_request(
+                        send_get_request, f"{url}/api/tags", user=user
+                    )
+                )
             else:
                 api_config = request.app.state.config.OLLAMA_API_CONFIGS.get(
                     str(idx),
@@ -349,7 +394,9 @@ async def get_all_models(request: Request, user: UserModel = None):
 
                 if enable:
                     request_tasks.append(
-                        send_get_request(f"{url}/api/tags", key, user=user)
+                        send_model_list_request(
+                            send_get_request, f"{url}/api/tags", key, user=user
+                        )
                     )
                 else:
                     request_tasks.append(asyncio.ensure_future(asyncio.sleep(0, None)))
@@ -424,6 +471,21 @@ async def get_all_models(request: Request, user: UserModel = None):
     return models
 
 
+# Merged lists are built from the connection lists
+MODEL_LISTS.register(get_all_models.cache)
+
+
+async def invalidate_models_cache_after(response):
+    # Streamed pulls and creates change the model list once they finish
+    if isinstance(response, StreamingResponse) and response.background:
+        response.background = BackgroundTasks(
+            [response.background, BackgroundTask(MODEL_LISTS.invalidate)]
+        )
+    else:
+        await MODEL_LISTS.invalidate()
+    return response
+
+
 async def get_filtered_models(models, user, db=None):
     # Filter models based on user access control
     filtered_models = []
@@ -522,22 +584,35 @@ async def get_ollama_loaded_models(request: Request, user=Depends(get_admin_user
 
         responses = await asyncio.gather(*request_tasks)
 
+        # Node health and loaded models for load balancing
+        loaded_models = {}
         for idx, response in enumerate(responses):
-            if response:
-                url = request.app.state.config.OLLAMA_BASE_URLS[idx]
-                api_config = request.app.state.config.OLLAMA_API_CONFIGS.get(
-                    str(idx),
-                    request.app.state.config.OLLAMA_API_CONFIGS.get(
-                        url, {}
-                    ),  # Legacy support
-                )
+            url = request.app.state.config.OLLAMA_BASE_URLS[idx]
+            api_config = request.app.state.config.OLLAMA_API_CONFIGS.get(
+                str(idx),
+                request.app.state.config.OLLAMA_API_CONFIGS.get(
+                    url, {}
+                ),  # Legacy support
+            )
+
+            if not api_config.get("enable", True):
+                continue
 
+            if response:
                 prefix_id = api_config.get("prefix_id", None)
 
                 for model in response.get("models", []):
                     if prefix_id:
                         model["model"] = f"{prefix_id}.{model['model']}"
 
+            loaded_models[url] = (
+                [model["model"] for model in response.get("models", [])]
+                if response
+                else None
+            )
+
+        OLLAMA_BALANCER.set_loaded_models(loaded_models)
+
         models = {
             "models": merge_ollama_models_lists(
                 map(
@@ -715,12 +790,13 @@ async def pull_model(
     # Admin should be able to pull models from any source
     payload = {**form_data, "insecure": True}
 
-    return await send_post_request(
+    response = await send_post_request(
         url=f"{url}/api/pull",
         payload=json.dumps(payload),
         key=get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS),
         user=user,
     )
+    return await invalidate_models_cache_after(response)
 
 
 class PushModelForm(BaseModel):
@@ -779,12 +855,13 @@ async def create_model(
     log.debug(f"form_data: {form_data}")
     url = request.app.state.config.OLLAMA_BASE_URLS[url_idx]
 
-    return await send_post_request(
+    response = await send_post_request(
         url=f"{url}/api/create",
         payload=form_data.model_dump_json(exclude_none=True).encode(),
         key=get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS),
         user=user,
     )
+    return await invalidate_models_cache_after(response)
 
 
 class CopyModelForm(BaseModel):
@@ -831,6 +908,7 @@ async def copy_model(
             data=form_data.model_dump_json(exclude_none=True).encode(),
         )
         r.raise_for_status()
+        await MODEL_LISTS.invalidate()
 
         log.debug(f"r.text: {r.text}")
         return True
@@ -897,6 +975,7 @@ async def delete_model(
             json=form_data,
         )
         r.raise_for_status()
+        await MODEL_LISTS.invalidate()
 
         log.debug(f"r.text: {r.text}")
         return True
@@ -936,7 +1015,7 @@ async def show_model_info(
             detail=ERROR_MESSAGES.MODEL_NOT_FOUND(model),
         )
 
-    url_idx = random.choice(models[model]["urls"])
+    url_idx = select_ollama_url_idx(request, models[model])
 
     url = request.app.state.config.OLLAMA_BASE_URLS[url_idx]
     key = get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS)
@@ -1006,7 +1085,7 @@ async def embed(
             model = f"{model}:latest"
 
         if model in models:
-            url_idx = random.choice(models[model]["urls"])
+            url_idx = select_ollama_url_idx(request, models[model])
         else:
             raise HTTPException(
                 status_code=400,
@@ -1088,7 +1167,7 @@ async def embeddings(
             model = f"{model}:latest"
 
         if model in models:
-            url_idx = random.choice(models[model]["urls"])
+            url_idx = select_ollama_url_idx(request, models[model])
         else:
             raise HTTPException(
                 status_code=400,
@@ -1176,7 +1255,7 @@ async def generate_completion(
             model = f"{model}:latest"
 
         if model in models:
-            url_idx = random.choice(models[model]["urls"])
+            url_idx = select_ollama_url_idx(request, models[model])
         else:
             raise HTTPException(
                 status_code=400,
@@ -1198,6 +1277,7 @@ async def generate_completion(
         payload=form_data.model_dump_json(exclude_none=True).encode(),
         key=get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS),
         user=user,
+        base_url=url,
     )
 
 
@@ -1243,7 +1323,7 @@ async def get_ollama_url(request: Request, model: str, url_idx: Optional[int] =
                 status_code=400,
                 detail=ERROR_MESSAGES.MODEL_NOT_FOUND(model),
             )
-        url_idx = random.choice(models[model].get("urls", []))
+        url_idx = select_ollama_url_idx(request, models[model])
     url = request.app.state.config.OLLAMA_BASE_URLS[url_idx]
     return url, url_idx
 
@@ -1342,6 +1422,7 @@ async def generate_chat_completion(
         content_type="application/x-ndjson",
         user=user,
         metadata=metadata,
+        base_url=url,
     )
 
 
@@ -1452,6 +1533,7 @@ async def generate_openai_completion(
         key=get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS),
         user=user,
         metadata=metadata,
+        base_url=url,
     )
 
 
@@ -1538,6 +1620,7 @@ async def generate_openai_chat_completion(
         key=get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS),
         user=user,
         metadata=metadata,
+        base_url=url,
     )
 
 
@@ -1806,6 +1889,7 @@ async def upload_model(
 
                 if create_resp.ok:
                     log.info(f"API SUCCESS!")  # DEBUG
+                    await MODEL_LISTS.invalidate()
                     done_msg = {
                         "done": True,
                         "blob": f"sha256:{file_hash}",
@@ -51,6 +51,7 @@ from open_webui.utils.misc import (
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access
+from open_webui.utils.model_cache import MODEL_LISTS, send_model_list_request
 from open_webui.utils.headers import include_user_info_headers
 
 
@@ -260,6 +261,8 @@ async def update_config(
         if key in keys
     }
 
+    await MODEL_LISTS.invalidate()
+
     return {
         "ENABLE_OPENAI_API": request.app.state.config.ENABLE_OPENAI_API,
         "OPENAI_API_BASE_URLS": request.app.state.config.OPENAI_API_BASE_URLS,
@@ -366,7 +369,8 @@ async def get_all_models_responses(request: Request, user: UserModel) -> list:
             url not in request.app.state.config.OPENAI_API_CONFIGS  # Legacy support
         ):
             request_tasks.append(
-                send_get_request(
+                send_model_list_request(
+                    send_get_request,
                     f"{url}/models",
                     request.app.state.config.OPENAI_API_KEYS[idx],
                     user=user,
@@ -386,7 +390,8 @@ async def get_all_models_responses(request: Request, user: UserModel) -> list:
             if enable:
                 if len(model_ids) == 0:
                     request_tasks.append(
-                        send_get_request(
+                        send_model_list_request(
+                            send_get_request,
                             f"{url}/models",
                             request.app.state.config.OPENAI_API_KEYS[idx],
                             user=user,
@@ -471,7 +476,11 @@ async def get_filtered_models(models, user, db=None):
 
 @cached(
     ttl=MODELS_CACHE_TTL,
-    key=lambda _, user: f"openai_all_models_{user.id}" if user else "openai_all_models",
+    key_builder=lambda _, request, user=None: (
+        f"openai_all_models_{user.id}"
+        if user and ENABLE_FORWARD_USER_INFO_HEADERS
+        else "openai_all_models"
+    ),
 )
 async def get_all_models(request: Request, user: UserModel) -> dict[str, list]:
     log.info("get_all_models()")
@@ -539,6 +548,10 @@ async def get_all_models(request: Request, user: UserModel) -> dict[str, list]:
     return {"data": list(models.values())}
 
 
+# Merged lists are built from the connection lists
+MODEL_LISTS.register(get_all_models.cache)
+
+
 @router.get("/models")
 @router.get("/models/{url_idx}")
 async def get_models(
@@ -47,11 +47,17 @@ from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
 
 # Document loaders
 from open_webui.retrieval.loaders.main import Loader
+from open_webui.retrieval.loaders.cache import (
+    get_cached_documents,
+    get_extraction_cache_key,
+    set_cached_documents,
+)
 from open_webui.retrieval.loaders.youtube import YoutubeLoader
 
 # Web search engines
 from open_webui.retrieval.web.main import SearchResult
-from open_webui.retrieval.web.utils import get_web_loader
+from open_webui.retrieval.web.utils import aget_web_loader
+from open_webui.retrieval.web.cache import WEB_SEARCH_CACHE
 from open_webui.retrieval.web.ollama import search_ollama_cloud
 from open_webui.retrieval.web.perplexity_search import search_perplexity_search
 from open_webui.retrieval.web.brave import search_brave
@@ -105,6 +111,7 @@ from open_webui.config import (
     DEFAULT_LOCALE,
     RAG_EMBEDDING_CONTENT_PREFIX,
     RAG_EMBEDDING_QUERY_PREFIX,
+    ENABLE_CONTENT_EXTRACTION_CACHE,
 )
 from open_webui.env import (
     DEVICE_TYPE,
@@ -1571,10 +1578,77 @@ def save_docs_to_vector_db(
         raise e
 
 
+def _is_current_embedding_config(request: Request, embedding_config) -> bool:
+    expected = {
+        "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
+        "model": request.app.state.config.RAG_EMBEDDING_MODEL,
+    }
+    # Some backends stringify nested metadata on insert
+    if isinstance(embedding_config, str):
+        return embedding_config == str(expected)
+    return embedding_config == expected
+
+
+def copy_file_vectors_to_collection(
+    request: Request,
+    file,
+    collection_name: str,
+    metadata: dict,
+    check_duplicate: bool = True,
+) -> bool:
+    """
+    Attach an already processed file to another collection by copying the
+    chunks and vectors of its file-{id} collection instead of splitting and
+    embedding it again. Returns False when the file collection is missing,
+    was embedded with a different engine/model, or the vector DB cannot copy
+    vectors, in which case the caller falls back to a full re-embed.
+    """
+    source_collection_name = f"file-{file.id}"
+    if source_collection_name == collection_name:
+        return False
+
+    result = VECTOR_DB_CLIENT.query(
+        collection_name=source_collection_name,
+        filter={"file_id": file.id},
+        limit=1,
+    )
+    if result is None or not result.ids or len(result.ids[0]) == 0:
+        return False
+
+    if not _is_current_embedding_config(
+        request, (result.metadatas[0][0] or {}).get("embedding_config")
+    ):
+        log.info(f"embedding config of {source_collection_name} differs, re-embedding")
+        return False
+
+    if check_duplicate:
+        # Same duplicate check as save_docs_to_vector_db
+        existing = VECTOR_DB_CLIENT.query(
+            collection_name=collection_name,
+            filter={"hash": metadata["hash"]},
+            limit=1,
+        )
+        if existing is not None and existing.ids and len(existing.ids[0]) > 0:
+            log.info(f"Document with hash {metadata['hash']} already exists")
+            raise ValueError(ERROR_MESSAGES.DUPLICATE_CONTENT)
+
+    copied = VECTOR_DB_CLIENT.copy_items(
+        source_collection_name,
+        collection_name,
+        filter={"file_id": file.id},
+        metadata=metadata,
+    )
+    if copied:
+        log.info(f"copied vectors of {source_collection_name} to {collection_name}")
+    return copied
+
+
 class ProcessFileForm(BaseModel):
     file_id: str
     content: Optional[str] = None
     collection_name: Optional[str] = None
+    # Copy vectors from the file collection instead of embedding again
+    reuse_vectors: bool = True
 
 
 @router.post("/process/file")
@@ -1631,6 +1705,38 @@ def process_file(
                 # Check if the file has already been processed and save the content
                 # Usage: /knowledge/{id}/file/add, /knowledge/{id}/file/update
 
+                text_content = file.data.get("content", "")
+                hash = calculate_sha256_string(text_content)
+
+                if (
+                    form_data.reuse_vectors
+                    and not request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL
+                    and copy_file_vectors_to_collection(
+                        request,
+                        file,
+                        collection_name,
+                        metadata={
+                            "file_id": file.id,
+                            "name": file.filename,
+                            "hash": hash,
+                        },
+                    )
+                ):
+                    Files.update_file_metadata_by_id(
+                        file.id, {"collection_name": collection_name}, db=db
+                    )
+                    Files.update_file_data_by_id(
+                        file.id, {"status": "completed"}, db=db
+                    )
+                    Files.update_file_hash_by_id(file.id, hash, db=db)
+
+                    return {
+                        "status": True,
+                        "collection_name": collection_name,
+                        "filename": file.filename,
+                        "content": text_content,
+                    }
+
                 result = VECTOR_DB_CLIENT.query(
                     collection_name=f"file-{file.id}", filter={"file_id": file.id}
                 )
@@ -1696,9 +1802,35 @@ def process_file(
                         MINERU_API_TIMEOUT=request.app.state.config.MINERU_API_TIMEOUT,
                         MINERU_PARAMS=request.app.state.config.MINERU_PARAMS,
                     )
-                    docs = loader.load(
-                        file.filename, file.meta.get("content_type"), file_path
-                    )
+
+                    docs = None
+                    cache_key = None
+                    if ENABLE_CONTENT_EXTRACTION_CACHE:
+                        # Identical bytes with identical loader settings give
+                        # identical output, skip the (slow) extraction engine
+                        cache_key = get_extraction_cache_key(
+                            file_path,
+                            file.filename,
+                            file.meta.get("content_type"),
+                            loader.engine,
+                            loader.kwargs,
+                        )
+                        docs = get_cached_documents(cache_key)
+                        if docs is not None:
+                            log.info(f"extraction cache hit for file {file.id}")
+
+                        # Lets deleting the file drop the entry as well
+                        if file.meta.get("extraction_cache_key") != cache_key:
+                            Files.update_file_metadata_by_id(
+                                file.id, {"extraction_cache_key": cache_key}, db=db
+                            )
+
+                    if docs is None:
+                        docs = loader.load(
+                            file.filename, file.meta.get("content_type"), file_path
+                        )
+                        if cache_key and docs:
+                            set_cached_documents(cache_key, docs)
 
                     docs = [
                         Document(
@@ -2231,10 +2363,55 @@ async def process_web_search(
     urls = []
     result_items = []
 
-    try:
-        logging.debug(
-            f"trying to web search with {request.app.state.config.WEB_SEARCH_ENGINE, form_data.queries}"
+    engine = request.app.state.config.WEB_SEARCH_ENGINE
+    # Settings that change what a search returns are part of the cache key
+    search_params = (
+        str(request.app.state.config.WEB_SEARCH_RESULT_COUNT),
+        ",".join(request.app.state.config.WEB_SEARCH_DOMAIN_FILTER_LIST or []),
+    )
+    # as are those that change how the results are loaded and embedded
+    response_params = search_params + (
+        str(request.app.state.config.BYPASS_WEB_SEARCH_WEB_LOADER),
+        str(request.app.state.config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL),
+        request.app.state.config.WEB_LOADER_ENGINE or "",
+        request.app.state.config.RAG_EMBEDDING_ENGINE or "",
+        request.app.state.config.RAG_EMBEDDING_MODEL or "",
+    )
+    search_key = WEB_SEARCH_CACHE.get_search_key(
+        engine, form_data.queries, response_params
+    )
+
+    cached_response = await WEB_SEARCH_CACHE.get_response(search_key)
+    if cached_response:
+        collection_names = cached_response.get("collection_names") or []
+        if all(
+            [
+                await run_in_threadpool(VECTOR_DB_CLIENT.has_collection, name)
+                for name in collection_names
+            ]
+        ):
+            log.debug(f"Using cached web search results for {form_data.queries}")
+            return cached_response
+
+    async def search(query):
+        results = await WEB_SEARCH_CACHE.get_search_results(
+            engine, query, search_params
         )
+        if results is not None:
+            return [SearchResult(**result) for result in results]
+
+        results = await run_in_threadpool(search_web, request, engine, query, user)
+        if results:
+            await WEB_SEARCH_CACHE.set_search_results(
+                engine,
+                query,
+                [dict(result) for result in results if result],
+                search_params,
+            )
+        return results
+
+    try:
+        logging.debug(f"trying to web search with {engine, form_data.queries}")
 
         # Use semaphore to limit concurrent requests based on WEB_SEARCH_CONCURRENT_REQUESTS
         # 0 or None = unlimited (previous behavior), positive number = limited concurrency
@@ -2247,27 +2424,12 @@ async def process_web_search(
 
             async def search_with_limit(query):
                 async with semaphore:
-                    return await run_in_threadpool(
-                        search_web,
-                        request,
-                        request.app.state.config.WEB_SEARCH_ENGINE,
-                        query,
-                        user,
-                    )
+                    return await search(query)
 
             search_tasks = [search_with_limit(query) for query in form_data.queries]
         else:
             # Unlimited parallel execution (previous behavior)
-            search_tasks = [
-                run_in_threadpool(
-                    search_web,
-                    request,
-                    request.app.state.config.WEB_SEARCH_ENGINE,
-                    query,
-                    user,
-                )
-                for query in form_data.queries
-            ]
+            search_tasks = [search(query) for query in form_data.queries]
 
         search_results = await asyncio.gather(*search_tasks)
 
@@ -2315,7 +2477,7 @@ async def process_web_search(
                 if hasattr(result, "snippet") and result.snippet is not None
             ]
         else:
-            loader = get_web_loader(
+            loader = await aget_web_loader(
                 urls,
                 verify_ssl=request.app.state.config.ENABLE_WEB_LOADER_SSL_VERIFICATION,
                 requests_per_second=request.app.state.config.WEB_LOADER_CONCURRENT_REQUESTS,
@@ -2331,7 +2493,7 @@ async def process_web_search(
         ]  # only keep the search results that have been loaded
 
         if request.app.state.config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL:
-            return {
+            response = {
                 "status": True,
                 "collection_name": None,
                 "filenames": urls,
@@ -2345,13 +2507,12 @@ async def process_web_search(
                 ],
                 "loaded_count": len(docs),
             }
+            await WEB_SEARCH_CACHE.set_response(search_key, response)
+            return response
         else:
-            # Create a single collection for all documents
-            collection_name = (
-                f"web-search-{calculate_sha256_string('-'.join(form_data.queries))}"[
-                    :63
-                ]
-            )
+            # Create a single collection for all documents, shared by every
+            # identical search until it expires
+            collection_name = f"web-search-{search_key}"[:63]
 
             try:
                 await run_in_threadpool(
@@ -2362,16 +2523,22 @@ async def process_web_search(
                     overwrite=True,
                     user=user,
                 )
+                await WEB_SEARCH_CACHE.register_collection(collection_name)
+                saved = True
             except Exception as e:
                 log.debug(f"error saving docs: {e}")
+                saved = False
 
-            return {
+            response = {
                 "status": True,
                 "collection_names": [collection_name],
                 "items": result_items,
                 "filenames": urls,
                 "loaded_count": len(docs),
             }
+            if saved:
+                await WEB_SEARCH_CACHE.set_response(search_key, response)
+            return response
     except Exception as e:
         log.exception(e)
         raise HTTPException(
@@ -2380,6 +2547,26 @@ async def process_web_search(
         )
 
 
+WEB_SEARCH_COLLECTION_CLEANUP_INTERVAL = 10 * 60
+
+
+async def periodic_web_search_collection_cleanup():
+    """Delete web-search-* collections whose TTL has passed."""
+    while True:
+        await asyncio.sleep(WEB_SEARCH_COLLECTION_CLEANUP_INTERVAL)
+        try:
+            for collection_name in await WEB_SEARCH_CACHE.pop_expired_collections():
+                if await run_in_threadpool(
+                    VECTOR_DB_CLIENT.has_collection, collection_name
+                ):
+                    log.debug(f"Deleting expired collection {collection_name}")
+                    await run_in_threadpool(
+                        VECTOR_DB_CLIENT.delete_collection, collection_name
+                    )
+        except Exception as e:
+            log.exception(f"Error cleaning up web search collections: {e}")
+
+
 class QueryDocForm(BaseModel):
     collection_name: str
     query: str
@@ -2637,6 +2824,7 @@ async def process_files_batch(
     file_results: List[BatchProcessFilesResult] = []
     file_errors: List[BatchProcessFilesResult] = []
     file_updates: List[FileUpdateForm] = []
+    prepared_results: List[BatchProcessFilesResult] = []
 
     # Prepare all documents first
     all_docs: List[Document] = []
@@ -2644,6 +2832,29 @@ async def process_files_batch(
     for file in form_data.files:
         try:
             text_content = file.data.get("content", "")
+            hash = calculate_sha256_string(text_content)
+
+            # Already processed files are attached by copying their vectors
+            if not request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL and (
+                await run_in_threadpool(
+                    copy_file_vectors_to_collection,
+                    request,
+                    file,
+                    collection_name,
+                    {"file_id": file.id, "name": file.filename, "hash": hash},
+                    False,
+                )
+            ):
+                Files.update_file_by_id(
+                    id=file.id,
+                    form_data=FileUpdateForm(hash=hash, data={"content": text_content}),
+                    db=db,
+                )
+                file_results.append(
+                    BatchProcessFilesResult(file_id=file.id, status="completed")
+                )
+                continue
+
             docs: List[Document] = [
                 Document(
                     page_content=text_content.replace("<br/>", "\n"),
@@ -2661,11 +2872,11 @@ async def process_files_batch(
 
             file_updates.append(
                 FileUpdateForm(
-                    hash=calculate_sha256_string(text_content),
+                    hash=hash,
                     data={"content": text_content},
                 )
             )
-            file_results.append(
+            prepared_results.append(
                 BatchProcessFilesResult(file_id=file.id, status="prepared")
             )
 
@@ -2688,7 +2899,7 @@ async def process_files_batch(
             )
 
             # Update all files with collection name
-            for file_update, file_result in zip(file_updates, file_results):
+            for file_update, file_result in zip(file_updates, prepared_results):
                 Files.update_file_by_id(
                     id=file_result.file_id, form_data=file_update, db=db
                 )
@@ -2698,10 +2909,12 @@ async def process_files_batch(
             log.error(
                 f"process_files_batch: Error saving documents to vector DB: {str(e)}"
             )
-            for file_result in file_results:
+            for file_result in prepared_results:
                 file_result.status = "failed"
                 file_errors.append(
                     BatchProcessFilesResult(file_id=file_result.file_id, error=str(e))
                 )
 
-    return BatchProcessFilesResponse(results=file_results, errors=file_errors)
+    return BatchProcessFilesResponse(
+        results=file_results + prepared_results, errors=file_errors
+    )
@@ -3,6 +3,8 @@ from fastapi.responses import JSONResponse, RedirectResponse
 
 from pydantic import BaseModel
 from typing import Optional
+import asyncio
+import json
 import logging
 import re
 
@@ -14,11 +16,19 @@ from open_webui.utils.task import (
     image_prompt_generation_template,
     autocomplete_generation_template,
     tags_generation_template,
+    combined_task_generation_template,
     emoji_generation_template,
     moa_response_generation_template,
 )
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.autocomplete import (
+    AUTOCOMPLETIONS,
+    get_autocomplete_context_key,
+    get_autocomplete_text,
+)
+from open_webui.utils.misc import openai_chat_completion_message_template
 from open_webui.constants import TASKS
+from open_webui.tasks import create_task, stop_item_tasks
 
 from open_webui.routers.pipelines import process_pipeline_inlet_filter
 
@@ -28,6 +38,7 @@ from open_webui.config import (
     DEFAULT_TITLE_GENERATION_PROMPT_TEMPLATE,
     DEFAULT_FOLLOW_UP_GENERATION_PROMPT_TEMPLATE,
     DEFAULT_TAGS_GENERATION_PROMPT_TEMPLATE,
+    DEFAULT_COMBINED_TASK_GENERATION_PROMPT_TEMPLATE,
     DEFAULT_IMAGE_PROMPT_GENERATION_PROMPT_TEMPLATE,
     DEFAULT_QUERY_GENERATION_PROMPT_TEMPLATE,
     DEFAULT_AUTOCOMPLETE_GENERATION_PROMPT_TEMPLATE,
@@ -63,6 +74,8 @@ async def get_task_config(request: Request, user=Depends(get_verified_user)):
         "ENABLE_FOLLOW_UP_GENERATION": request.app.state.config.ENABLE_FOLLOW_UP_GENERATION,
         "ENABLE_TAGS_GENERATION": request.app.state.config.ENABLE_TAGS_GENERATION,
         "ENABLE_TITLE_GENERATION": request.app.state.config.ENABLE_TITLE_GENERATION,
+        "ENABLE_COMBINED_TASK_GENERATION": request.app.state.config.ENABLE_COMBINED_TASK_GENERATION,
+        "COMBINED_TASK_GENERATION_PROMPT_TEMPLATE": request.app.state.config.COMBINED_TASK_GENERATION_PROMPT_TEMPLATE,
         "ENABLE_SEARCH_QUERY_GENERATION": request.app.state.config.ENABLE_SEARCH_QUERY_GENERATION,
         "ENABLE_RETRIEVAL_QUERY_GENERATION": request.app.state.config.ENABLE_RETRIEVAL_QUERY_GENERATION,
         "QUERY_GENERATION_PROMPT_TEMPLATE": request.app.state.config.QUERY_GENERATION_PROMPT_TEMPLATE,
@@ -83,6 +96,8 @@ class TaskConfigForm(BaseModel):
     FOLLOW_UP_GENERATION_PROMPT_TEMPLATE: str
     ENABLE_FOLLOW_UP_GENERATION: bool
     ENABLE_TAGS_GENERATION: bool
+    ENABLE_COMBINED_TASK_GENERATION: Optional[bool] = None
+    COMBINED_TASK_GENERATION_PROMPT_TEMPLATE: Optional[str] = None
     ENABLE_SEARCH_QUERY_GENERATION: bool
     ENABLE_RETRIEVAL_QUERY_GENERATION: bool
     QUERY_GENERATION_PROMPT_TEMPLATE: str
@@ -123,6 +138,16 @@ async def update_task_config(
         form_data.TAGS_GENERATION_PROMPT_TEMPLATE
     )
     request.app.state.config.ENABLE_TAGS_GENERATION = form_data.ENABLE_TAGS_GENERATION
+
+    if form_data.ENABLE_COMBINED_TASK_GENERATION is not None:
+        request.app.state.config.ENABLE_COMBINED_TASK_GENERATION = (
+            form_data.ENABLE_COMBINED_TASK_GENERATION
+        )
+    if form_data.COMBINED_TASK_GENERATION_PROMPT_TEMPLATE is not None:
+        request.app.state.config.COMBINED_TASK_GENERATION_PROMPT_TEMPLATE = (
+            form_data.COMBINED_TASK_GENERATION_PROMPT_TEMPLATE
+        )
+
     request.app.state.config.ENABLE_SEARCH_QUERY_GENERATION = (
         form_data.ENABLE_SEARCH_QUERY_GENERATION
     )
@@ -153,6 +178,8 @@ async def update_task_config(
         "ENABLE_TAGS_GENERATION": request.app.state.config.ENABLE_TAGS_GENERATION,
         "ENABLE_FOLLOW_UP_GENERATION": request.app.state.config.ENABLE_FOLLOW_UP_GENERATION,
         "FOLLOW_UP_GENERATION_PROMPT_TEMPLATE": request.app.state.config.FOLLOW_UP_GENERATION_PROMPT_TEMPLATE,
+        "ENABLE_COMBINED_TASK_GENERATION": request.app.state.config.ENABLE_COMBINED_TASK_GENERATION,
+        "COMBINED_TASK_GENERATION_PROMPT_TEMPLATE": request.app.state.config.COMBINED_TASK_GENERATION_PROMPT_TEMPLATE,
         "ENABLE_SEARCH_QUERY_GENERATION": request.app.state.config.ENABLE_SEARCH_QUERY_GENERATION,
         "ENABLE_RETRIEVAL_QUERY_GENERATION": request.app.state.config.ENABLE_RETRIEVAL_QUERY_GENERATION,
         "QUERY_GENERATION_PROMPT_TEMPLATE": request.app.state.config.QUERY_GENERATION_PROMPT_TEMPLATE,
@@ -391,6 +418,112 @@ async def generate_chat_tags(
         )
 
 
+COMBINED_TASK_SCHEMAS = {
+    "title": {"type": "string"},
+    "tags": {"type": "array", "items": {"type": "string"}},
+    "follow_ups": {"type": "array", "items": {"type": "string"}},
+}
+
+
+@router.post("/combined/completions")
+async def generate_combined_tasks(
+    request: Request, form_data: dict, user=Depends(get_verified_user)
+):
+    """
+    Title, tags and follow-ups in one structured-output call. form_data["tasks"]
+    lists the keys to generate: "title", "tags" and/or "follow_ups".
+    """
+
+    if not request.app.state.config.ENABLE_COMBINED_TASK_GENERATION:
+        return JSONResponse(
+            status_code=status.HTTP_200_OK,
+            content={"detail": "Combined task generation is disabled"},
+        )
+
+    tasks = [
+        task for task in form_data.get("tasks", []) if task in COMBINED_TASK_SCHEMAS
+    ]
+    if not tasks:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No tasks to generate",
+        )
+
+    if getattr(request.state, "direct", False) and hasattr(request.state, "model"):
+        models = {
+            request.state.model["id"]: request.state.model,
+        }
+    else:
+        models = request.app.state.MODELS
+
+    model_id = form_data["model"]
+    if model_id not in models:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+
+    # Check if the user has a custom task model
+    # If the user has a custom task model, use that model
+    task_model_id = get_task_model_id(
+        model_id,
+        request.app.state.config.TASK_MODEL,
+        request.app.state.config.TASK_MODEL_EXTERNAL,
+        models,
+    )
+
+    log.debug(
+        f"generating chat {', '.join(tasks)} using model {task_model_id} for user {user.email} "
+    )
+
+    if request.app.state.config.COMBINED_TASK_GENERATION_PROMPT_TEMPLATE != "":
+        template = request.app.state.config.COMBINED_TASK_GENERATION_PROMPT_TEMPLATE
+    else:
+        template = DEFAULT_COMBINED_TASK_GENERATION_PROMPT_TEMPLATE
+
+    content = combined_task_generation_template(
+        template, form_data["messages"], tasks, user
+    )
+
+    payload = {
+        "model": task_model_id,
+        "messages": [{"role": "user", "content": content}],
+        "stream": False,
+        "response_format": {
+            "type": "json_schema",
+            "json_schema": {
+                "name": "chat_tasks",
+                "schema": {
+                    "type": "object",
+                    "properties": {task: COMBINED_TASK_SCHEMAS[task] for task in tasks},
+                    "required": tasks,
+                },
+            },
+        },
+        "metadata": {
+            **(request.state.metadata if hasattr(request.state, "metadata") else {}),
+            "task": str(TASKS.COMBINED_TASK_GENERATION),
+            "task_body": form_data,
+            "chat_id": form_data.get("chat_id", None),
+        },
+    }
+
+    # Process the payload through the pipeline
+    try:
+        payload = await process_pipeline_inlet_filter(request, payload, user, models)
+    except Exception as e:
+        raise e
+
+    try:
+        return await generate_chat_completion(request, form_data=payload, user=user)
+    except Exception as e:
+        log.error("Exception occurred", exc_info=True)
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"detail": "An internal error has occurred."},
+        )
+
+
 @router.post("/image_prompt/completions")
 async def generate_image_prompt(
     request: Request, form_data: dict, user=Depends(get_verified_user)
@@ -588,6 +721,14 @@ async def generate_autocompletion(
         models,
     )
 
+    context_key = get_autocomplete_context_key(task_model_id, type, messages)
+    suggestion = AUTOCOMPLETIONS.get(user.id, context_key, prompt)
+    if suggestion is not None:
+        log.debug(f"reusing autocompletion for user {user.email}")
+        return openai_chat_completion_message_template(
+            task_model_id, json.dumps({"text": suggestion})
+        )
+
     log.debug(
         f"generating autocompletion using model {task_model_id} for user {user.email}"
     )
@@ -617,8 +758,26 @@ async def generate_autocompletion(
     except Exception as e:
         raise e
 
+    # Only the latest text the user typed is worth completing, so a new
+    # request stops the generation still running for an older one
+    item_id = f"autocomplete:{user.id}"
+    await stop_item_tasks(request.app.state.redis, item_id)
+    _, task = await create_task(
+        request.app.state.redis,
+        generate_chat_completion(request, form_data=payload, user=user),
+        id=item_id,
+    )
+
     try:
-        return await generate_chat_completion(request, form_data=payload, user=user)
+        res = await asyncio.shield(task)
+    except asyncio.CancelledError:
+        if not task.cancelled():
+            # The client went away
+            task.cancel()
+            raise
+        return openai_chat_completion_message_template(
+            task_model_id, json.dumps({"text": ""})
+        )
     except Exception as e:
         log.error(f"Error generating chat completion: {e}")
         return JSONResponse(
@@ -626,6 +785,12 @@ async def generate_autocompletion(
             content={"detail": "An internal error has occurred."},
         )
 
+    if isinstance(res, dict):
+        suggestion = get_autocomplete_text(res)
+        if suggestion:
+            AUTOCOMPLETIONS.set(user.id, context_key, prompt, suggestion)
+    return res
+
 
 @router.post("/emoji/completions")
 async def generate_emoji(
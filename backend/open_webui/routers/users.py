@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Optional
 from sqlalchemy.orm import Session
@@ -6,6 +7,7 @@ import io
 
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import Response, StreamingResponse, FileResponse
 from pydantic import BaseModel, ConfigDict
 
@@ -26,6 +28,7 @@ from open_webui.models.users import (
     Users,
     UserSettings,
     UserUpdateForm,
+    USER_ACTIVITY_FLUSH_INTERVAL,
 )
 
 from open_webui.constants import ERROR_MESSAGES
@@ -47,6 +50,16 @@ log = logging.getLogger(__name__)
 router = APIRouter()
 
 
+async def periodic_user_activity_flush():
+    """Write the last active timestamps collected since the previous flush."""
+    while True:
+        await asyncio.sleep(USER_ACTIVITY_FLUSH_INTERVAL)
+        try:
+            await run_in_threadpool(Users.flush_last_active)
+        except Exception as e:
+            log.exception(f"Error flushing user activity: {e}")
+
+
 ############################
 # GetUsers
 ############################
@@ -468,7 +481,9 @@ async def get_user_by_id(
             **{
                 **user.model_dump(),
                 "groups": [{"id": group.id, "name": group.name} for group in groups],
-                "is_active": Users.is_user_active(user_id, db=db),
+                "is_active": await run_in_threadpool(
+                    Users.is_user_active, user_id, db=db
+                ),
             }
         )
     else:
@@ -542,7 +557,7 @@ async def get_user_active_status_by_id(
     user_id: str, user=Depends(get_verified_user), db: Session = Depends(get_session)
 ):
     return {
-        "active": Users.is_user_active(user_id, db=db),
+        "active": await run_in_threadpool(Users.is_user_active, user_id, db=db),
     }
 
 
@@ -1,5 +1,4 @@
 import asyncio
-import random
 
 import socketio
 import logging
@@ -7,11 +6,11 @@ import sys
 import time
 from typing import Dict, Set
 from redis import asyncio as aioredis
-import pycrdt as Y
 
 from open_webui.models.users import Users, UserNameResponse
 from open_webui.models.channels import Channels
 from open_webui.models.chats import Chats
+from open_webui.storage.images import externalize_images
 from open_webui.models.notes import Notes, NoteUpdateForm
 from open_webui.utils.redis import (
     get_sentinels_from_env,
@@ -28,7 +27,6 @@ from open_webui.env import (
     WEBSOCKET_MANAGER,
     WEBSOCKET_REDIS_URL,
     WEBSOCKET_REDIS_CLUSTER,
-    WEBSOCKET_REDIS_LOCK_TIMEOUT,
     WEBSOCKET_SENTINEL_PORT,
     WEBSOCKET_SENTINEL_HOSTS,
     REDIS_KEY_PREFIX,
@@ -39,7 +37,14 @@ from open_webui.env import (
     WEBSOCKET_SERVER_ENGINEIO_LOGGING,
 )
 from open_webui.utils.auth import decode_token
-from open_webui.socket.utils import RedisDict, RedisLock, YdocManager
+from open_webui.socket.utils import (
+    RedisDict,
+    RedisSessionPool,
+    RedisUsagePool,
+    SessionPool,
+    UsagePool,
+    YdocManager,
+)
 from open_webui.tasks import create_task, stop_item_tasks
 from open_webui.utils.redis import get_redis_connection
 from open_webui.utils.access_control import has_access, get_users_with_access
@@ -124,94 +129,45 @@ if WEBSOCKET_MANAGER == "redis":
         redis_cluster=WEBSOCKET_REDIS_CLUSTER,
     )
 
-    SESSION_POOL = RedisDict(
-        f"{REDIS_KEY_PREFIX}:session_pool",
-        redis_url=WEBSOCKET_REDIS_URL,
-        redis_sentinels=redis_sentinels,
-        redis_cluster=WEBSOCKET_REDIS_CLUSTER,
-    )
-    USAGE_POOL = RedisDict(
-        f"{REDIS_KEY_PREFIX}:usage_pool",
-        redis_url=WEBSOCKET_REDIS_URL,
-        redis_sentinels=redis_sentinels,
-        redis_cluster=WEBSOCKET_REDIS_CLUSTER,
-    )
-
-    clean_up_lock = RedisLock(
-        redis_url=WEBSOCKET_REDIS_URL,
-        lock_name=f"{REDIS_KEY_PREFIX}:usage_cleanup_lock",
-        timeout_secs=WEBSOCKET_REDIS_LOCK_TIMEOUT,
-        redis_sentinels=redis_sentinels,
-        redis_cluster=WEBSOCKET_REDIS_CLUSTER,
-    )
-    aquire_func = clean_up_lock.aquire_lock
-    renew_func = clean_up_lock.renew_lock
-    release_func = clean_up_lock.release_lock
+    SESSION_POOL = RedisSessionPool(f"{REDIS_KEY_PREFIX}:session_pool", REDIS)
+    USAGE_POOL = RedisUsagePool(f"{REDIS_KEY_PREFIX}:usage_pool:models", REDIS)
 else:
     MODELS = {}
 
-    SESSION_POOL = {}
-    USAGE_POOL = {}
-
-    aquire_func = release_func = renew_func = lambda: True
+    SESSION_POOL = SessionPool()
+    USAGE_POOL = UsagePool()
 
 
 YDOC_MANAGER = YdocManager(
-    redis=REDIS,
+    # Updates are stored as raw bytes
+    redis=(
+        get_redis_connection(
+            redis_url=WEBSOCKET_REDIS_URL,
+            redis_sentinels=get_sentinels_from_env(
+                WEBSOCKET_SENTINEL_HOSTS, WEBSOCKET_SENTINEL_PORT
+            ),
+            redis_cluster=WEBSOCKET_REDIS_CLUSTER,
+            async_mode=True,
+            decode_responses=False,
+        )
+        if WEBSOCKET_MANAGER == "redis"
+        else None
+    ),
     redis_key_prefix=f"{REDIS_KEY_PREFIX}:ydoc:documents",
 )
 
 
 async def periodic_usage_pool_cleanup():
-    max_retries = 2
-    retry_delay = random.uniform(
-        WEBSOCKET_REDIS_LOCK_TIMEOUT / 2, WEBSOCKET_REDIS_LOCK_TIMEOUT
-    )
-    for attempt in range(max_retries + 1):
-        if aquire_func():
-            break
-        else:
-            if attempt < max_retries:
-                log.debug(
-                    f"Cleanup lock already exists. Retry {attempt + 1} after {retry_delay}s..."
-                )
-                await asyncio.sleep(retry_delay)
-            else:
-                log.warning(
-                    "Failed to acquire cleanup lock after retries. Skipping cleanup."
-                )
-                return
-
-    log.debug("Running periodic_cleanup")
-    try:
-        while True:
-            if not renew_func():
-                log.error(f"Unable to renew cleanup lock. Exiting usage pool cleanup.")
-                raise Exception("Unable to renew usage pool cleanup lock.")
-
-            now = int(time.time())
-            send_usage = False
-            for model_id, connections in list(USAGE_POOL.items()):
-                # Creating a list of sids to remove if they have timed out
-                expired_sids = [
-                    sid
-                    for sid, details in connections.items()
-                    if now - details["updated_at"] > TIMEOUT_DURATION
-                ]
-
-                for sid in expired_sids:
-                    del connections[sid]
-
-                if not connections:
-                    log.debug(f"Cleaning up model {model_id} from usage pool")
-                    del USAGE_POOL[model_id]
-                else:
-                    USAGE_POOL[model_id] = connections
-
-                send_usage = True
-            await asyncio.sleep(TIMEOUT_DURATION)
-    finally:
-        release_func()
+    """
+    Drop models that have not been used for a while. Expiry is a single
+    idempotent command, so every replica can run it without a lock.
+    """
+    while True:
+        try:
+            await USAGE_POOL.cleanup(int(time.time()) - TIMEOUT_DURATION)
+        except Exception as e:
+            log.debug(f"Error cleaning up usage pool: {e}")
+        await asyncio.sleep(TIMEOUT_DURATION)
 
 
 app = socketio.ASGIApp(
@@ -220,14 +176,13 @@ app = socketio.ASGIApp(
 )
 
 
-def get_models_in_use():
+async def get_models_in_use():
     # List models that are currently in use
-    models_in_use = list(USAGE_POOL.keys())
-    return models_in_use
+    return await USAGE_POOL.get_models_in_use(int(time.time()) - TIMEOUT_DURATION)
 
 
-def get_user_id_from_session_pool(sid):
-    user = SESSION_POOL.get(sid)
+async def get_user_id_from_session_pool(sid):
+    user = await SESSION_POOL.get(sid)
     if user:
         return user["id"]
     return None
@@ -242,18 +197,11 @@ def get_session_ids_from_room(room):
     return [session_id[0] for session_id in active_session_ids]
 
 
-def get_user_ids_from_room(room):
+async def get_user_ids_from_room(room):
     active_session_ids = get_session_ids_from_room(room)
 
-    active_user_ids = list(
-        set(
-            [
-                SESSION_POOL.get(session_id)["id"]
-                for session_id in active_session_ids
-                if SESSION_POOL.get(session_id) is not None
-            ]
-        )
-    )
+    users = await SESSION_POOL.get_many(active_session_ids)
+    active_user_ids = list(set([user["id"] for user in users if user is not None]))
     return active_user_ids
 
 
@@ -291,16 +239,9 @@ async def enter_room_for_users(room: str, user_ids: list[str]):
 
 @sio.on("usage")
 async def usage(sid, data):
-    if sid in SESSION_POOL:
-        model_id = data["model"]
+    if await SESSION_POOL.get(sid) is not None:
         # Record the timestamp for the last update
-        current_time = int(time.time())
-
-        # Store the new usage data and task
-        USAGE_POOL[model_id] = {
-            **(USAGE_POOL[model_id] if model_id in USAGE_POOL else {}),
-            sid: {"updated_at": current_time},
-        }
+        await USAGE_POOL.touch(data["model"], int(time.time()))
 
 
 @sio.event
@@ -313,8 +254,8 @@ async def connect(sid, environ, auth):
             user = Users.get_user_by_id(data["id"])
 
         if user:
-            SESSION_POOL[sid] = user.model_dump(
-                exclude=["date_of_birth", "bio", "gender"]
+            await SESSION_POOL.set(
+                sid, user.model_dump(exclude=["date_of_birth", "bio", "gender"])
             )
             await sio.enter_room(sid, f"user:{user.id}")
 
@@ -334,14 +275,17 @@ async def user_join(sid, data):
     if not user:
         return
 
-    SESSION_POOL[sid] = user.model_dump(
-        exclude=[
-            "profile_image_url",
-            "profile_banner_image_url",
-            "date_of_birth",
-            "bio",
-            "gender",
-        ]
+    await SESSION_POOL.set(
+        sid,
+        user.model_dump(
+            exclude=[
+                "profile_image_url",
+                "profile_banner_image_url",
+                "date_of_birth",
+                "bio",
+                "gender",
+            ]
+        ),
     )
 
     await sio.enter_room(sid, f"user:{user.id}")
@@ -357,7 +301,7 @@ async def user_join(sid, data):
 
 @sio.on("heartbeat")
 async def heartbeat(sid, data):
-    user = SESSION_POOL.get(sid)
+    user = await SESSION_POOL.get(sid)
     if user:
         Users.update_last_active_by_id(user["id"])
 
@@ -429,7 +373,7 @@ async def channel_events(sid, data):
     event_data = data["data"]
     event_type = event_data["type"]
 
-    user = SESSION_POOL.get(sid)
+    user = await SESSION_POOL.get(sid)
 
     if not user:
         return
@@ -449,10 +393,32 @@ async def channel_events(sid, data):
         Channels.update_member_last_read_at(data["channel_id"], user["id"])
 
 
+async def emit_document_state(sid, document_id, state_vector, active_session_ids):
+    """
+    Send the Yjs document state to a session. A client that sent its state
+    vector only receives the updates it is missing, flagged as a diff.
+    """
+    diff = bool(state_vector) and await YDOC_MANAGER.document_exists(document_id)
+    state_update = await YDOC_MANAGER.get_state(
+        document_id, bytes(state_vector) if diff else None
+    )
+
+    await sio.emit(
+        "ydoc:document:state",
+        {
+            "document_id": document_id,
+            "state": list(state_update),  # Convert bytes to list for JSON
+            "diff": diff,
+            "sessions": active_session_ids,
+        },
+        room=sid,
+    )
+
+
 @sio.on("ydoc:document:join")
 async def ydoc_document_join(sid, data):
     """Handle user joining a document"""
-    user = SESSION_POOL.get(sid)
+    user = await SESSION_POOL.get(sid)
 
     try:
         document_id = data["document_id"]
@@ -488,22 +454,8 @@ async def ydoc_document_join(sid, data):
 
         active_session_ids = get_session_ids_from_room(f"doc_{document_id}")
 
-        # Get the Yjs document state
-        ydoc = Y.Doc()
-        updates = await YDOC_MANAGER.get_updates(document_id)
-        for update in updates:
-            ydoc.apply_update(bytes(update))
-
-        # Encode the entire document state as an update
-        state_update = ydoc.get_update()
-        await sio.emit(
-            "ydoc:document:state",
-            {
-                "document_id": document_id,
-                "state": list(state_update),  # Convert bytes to list for JSON
-                "sessions": active_session_ids,
-            },
-            room=sid,
+        await emit_document_state(
+            sid, document_id, data.get("state_vector"), active_session_ids
         )
 
         # Notify other users about the new user
@@ -564,23 +516,8 @@ async def yjs_document_state(sid, data):
             log.warning(f"Document {document_id} not found")
             return
 
-        # Get the Yjs document state
-        ydoc = Y.Doc()
-        updates = await YDOC_MANAGER.get_updates(document_id)
-        for update in updates:
-            ydoc.apply_update(bytes(update))
-
-        # Encode the entire document state as an update
-        state_update = ydoc.get_update()
-
-        await sio.emit(
-            "ydoc:document:state",
-            {
-                "document_id": document_id,
-                "state": list(state_update),  # Convert bytes to list for JSON
-                "sessions": active_session_ids,
-            },
-            room=sid,
+        await emit_document_state(
+            sid, document_id, data.get("state_vector"), active_session_ids
         )
     except Exception as e:
         log.error(f"Error in yjs_document_state: {e}")
@@ -622,7 +559,7 @@ async def yjs_document_update(sid, data):
         async def debounced_save():
             await asyncio.sleep(0.5)
             await document_save_handler(
-                document_id, data.get("data", {}), SESSION_POOL.get(sid)
+                document_id, data.get("data", {}), await SESSION_POOL.get(sid)
             )
 
         if data.get("data"):
@@ -687,9 +624,7 @@ async def yjs_awareness_update(sid, data):
 
 @sio.event
 async def disconnect(sid):
-    if sid in SESSION_POOL:
-        user = SESSION_POOL[sid]
-        del SESSION_POOL[sid]
+    if await SESSION_POOL.delete(sid) is not None:
         await YDOC_MANAGER.remove_user_from_all_documents(sid)
     else:
         pass
@@ -733,6 +668,7 @@ def get_event_emitter(request_info, update_db=True):
                 if message:
                     content = message.get("content", "")
                     content += event_data.get("data", {}).get("content", "")
+                    content = await externalize_images(content)
 
                     Chats.upsert_message_to_chat_by_id_and_message_id(
                         request_info["chat_id"],
@@ -743,7 +679,9 @@ def get_event_emitter(request_info, update_db=True):
                     )
 
             if "type" in event_data and event_data["type"] == "replace":
-                content = event_data.get("data", {}).get("content", "")
+                content = await externalize_images(
+                    event_data.get("data", {}).get("content", "")
+                )
 
                 Chats.upsert_message_to_chat_by_id_and_message_id(
                     request_info["chat_id"],
@@ -776,7 +714,9 @@ def get_event_emitter(request_info, update_db=True):
                     request_info["message_id"],
                 )
 
-                files = event_data.get("data", {}).get("files", [])
+                files = await externalize_images(
+                    event_data.get("data", {}).get("files", [])
+                )
                 files.extend(message.get("files", []))
 
                 Chats.upsert_message_to_chat_by_id_and_message_id(
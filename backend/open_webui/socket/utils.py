@@ -117,111 +117,331 @@ class RedisDict:
         return self[key]
 
 
+class SessionPool:
+    """In-process session pool: sid -> user dict."""
+
+    def __init__(self):
+        self._sessions = {}
+
+    async def get(self, sid, default=None):
+        return self._sessions.get(sid, default)
+
+    async def get_many(self, sids: List[str]) -> List[Optional[dict]]:
+        return [self._sessions.get(sid) for sid in sids]
+
+    async def set(self, sid, value: dict):
+        self._sessions[sid] = value
+
+    async def delete(self, sid) -> Optional[dict]:
+        return self._sessions.pop(sid, None)
+
+
+class RedisSessionPool(SessionPool):
+    """
+    Session pool stored as one hash field per sid, so every operation only
+    touches the fields it needs and never blocks the event loop.
+    """
+
+    def __init__(self, name, redis):
+        self.name = name
+        self._redis = redis
+
+    async def get(self, sid, default=None):
+        value = await self._redis.hget(self.name, sid)
+        return json.loads(value) if value is not None else default
+
+    async def get_many(self, sids: List[str]) -> List[Optional[dict]]:
+        if not sids:
+            return []
+        values = await self._redis.hmget(self.name, sids)
+        return [json.loads(v) if v is not None else None for v in values]
+
+    async def set(self, sid, value: dict):
+        await self._redis.hset(self.name, sid, json.dumps(value))
+
+    async def delete(self, sid) -> Optional[dict]:
+        pipe = self._redis.pipeline()
+        pipe.hget(self.name, sid)
+        pipe.hdel(self.name, sid)
+        value, _ = await pipe.execute()
+        return json.loads(value) if value is not None else None
+
+
+class UsagePool:
+    """In-process record of when each model was last used."""
+
+    def __init__(self):
+        self._last_used = {}
+
+    async def touch(self, model_id: str, timestamp: int):
+        self._last_used[model_id] = timestamp
+
+    async def get_models_in_use(self, since: int) -> List[str]:
+        return [
+            model_id
+            for model_id, timestamp in list(self._last_used.items())
+            if timestamp >= since
+        ]
+
+    async def cleanup(self, before: int) -> int:
+        expired = [
+            model_id
+            for model_id, timestamp in list(self._last_used.items())
+            if timestamp < before
+        ]
+        for model_id in expired:
+            self._last_used.pop(model_id, None)
+        return len(expired)
+
+
+class RedisUsagePool(UsagePool):
+    """
+    Sorted set of model ids scored by their last usage, so recording usage,
+    listing models in use and expiring old entries are single commands.
+    """
+
+    def __init__(self, name, redis):
+        self.name = name
+        self._redis = redis
+
+    async def touch(self, model_id: str, timestamp: int):
+        await self._redis.zadd(self.name, {model_id: timestamp})
+
+    async def get_models_in_use(self, since: int) -> List[str]:
+        return await self._redis.zrangebyscore(self.name, since, "+inf")
+
+    async def cleanup(self, before: int) -> int:
+        return await self._redis.zremrangebyscore(self.name, "-inf", f"({before}")
+
+
+# Updates kept in the log before they are folded into the document snapshot
+YDOC_COMPACTION_THRESHOLD = 100
+
+# Seconds a replica may hold the compaction lock of a document
+YDOC_COMPACTION_LOCK_TIMEOUT = 30
+
+
+def merge_ydoc_updates(updates: List[bytes]) -> bytes:
+    """Fold updates into one, dropping the content of deleted items."""
+    ydoc = Y.Doc()
+    for update in updates:
+        if update:
+            ydoc.apply_update(update)
+    return ydoc.get_update()
+
+
 class YdocManager:
+    """
+    Binary Yjs update log per document, compacted into a snapshot every
+    `compaction_threshold` updates so that a join only replays a bounded
+    number of updates. The Redis client must not decode responses.
+
+    Documents joined by each session are indexed so that a disconnect only
+    touches the documents of that session.
+    """
+
     def __init__(
         self,
         redis=None,
         redis_key_prefix: str = f"{REDIS_KEY_PREFIX}:ydoc:documents",
+        compaction_threshold: int = YDOC_COMPACTION_THRESHOLD,
     ):
-        self._updates = {}
-        self._users = {}
+        self._snapshots: dict[str, bytes] = {}
+        self._updates: dict[str, list[bytes]] = {}
+        self._users: dict[str, set[str]] = {}
+        self._sessions: dict[str, set[str]] = {}
         self._redis = redis
         self._redis_key_prefix = redis_key_prefix
+        self._compaction_threshold = compaction_threshold
+
+    def _get_key(self, document_id: str, name: str) -> str:
+        return f"{self._redis_key_prefix}:{document_id}:{name}"
+
+    def _get_session_key(self, user_id: str) -> str:
+        return f"{self._redis_key_prefix}:session:{user_id}"
 
     async def append_to_updates(self, document_id: str, update: bytes):
         document_id = document_id.replace(":", "_")
+        update = bytes(update)
+
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            await self._redis.rpush(redis_key, json.dumps(list(update)))
+            length = await self._redis.rpush(self._get_key(document_id, "log"), update)
         else:
-            if document_id not in self._updates:
-                self._updates[document_id] = []
-            self._updates[document_id].append(update)
+            self._updates.setdefault(document_id, []).append(update)
+            length = len(self._updates[document_id])
 
-    async def get_updates(self, document_id: str) -> List[bytes]:
+        if length >= self._compaction_threshold:
+            await self.compact_document(document_id)
+
+    async def _get_snapshot_and_updates(
+        self, document_id: str
+    ) -> Tuple[Optional[bytes], List[bytes]]:
+        if self._redis:
+            pipe = self._redis.pipeline(transaction=True)
+            pipe.get(self._get_key(document_id, "snapshot"))
+            pipe.lrange(self._get_key(document_id, "log"), 0, -1)
+            snapshot, updates = await pipe.execute()
+            return snapshot, updates
+        else:
+            return self._snapshots.get(document_id), list(
+                self._updates.get(document_id, [])
+            )
+
+    async def compact_document(self, document_id: str):
+        """Merge the snapshot and the update log into a new snapshot."""
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            updates = await self._redis.lrange(redis_key, 0, -1)
-            return [bytes(json.loads(update)) for update in updates]
+            lock_key = self._get_key(document_id, "compacting")
+            if not await self._redis.set(
+                lock_key, 1, nx=True, ex=YDOC_COMPACTION_LOCK_TIMEOUT
+            ):
+                return
+
+            try:
+                snapshot, updates = await self._get_snapshot_and_updates(document_id)
+                if not updates:
+                    return
+
+                merged = merge_ydoc_updates([snapshot, *updates])
+
+                # Updates appended meanwhile stay in the log
+                pipe = self._redis.pipeline(transaction=True)
+                pipe.set(self._get_key(document_id, "snapshot"), merged)
+                pipe.ltrim(self._get_key(document_id, "log"), len(updates), -1)
+                await pipe.execute()
+            finally:
+                await self._redis.delete(lock_key)
         else:
-            return self._updates.get(document_id, [])
+            updates = self._updates.get(document_id)
+            if not updates:
+                return
+
+            self._snapshots[document_id] = merge_ydoc_updates(
+                [self._snapshots.get(document_id), *updates]
+            )
+            self._updates[document_id] = []
+
+    async def get_updates(self, document_id: str) -> List[bytes]:
+        document_id = document_id.replace(":", "_")
+
+        snapshot, updates = await self._get_snapshot_and_updates(document_id)
+        return [snapshot, *updates] if snapshot else updates
+
+    async def get_state(
+        self, document_id: str, state_vector: Optional[bytes] = None
+    ) -> bytes:
+        """
+        The document encoded as a single update. Given the state vector of a
+        client, only the changes the client is missing are encoded.
+        """
+        ydoc = Y.Doc()
+        for update in await self.get_updates(document_id):
+            ydoc.apply_update(update)
+
+        if state_vector:
+            return ydoc.get_update(bytes(state_vector))
+        return ydoc.get_update()
 
     async def document_exists(self, document_id: str) -> bool:
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            return await self._redis.exists(redis_key) > 0
+            return (
+                await self._redis.exists(
+                    self._get_key(document_id, "snapshot"),
+                    self._get_key(document_id, "log"),
+                )
+                > 0
+            )
         else:
-            return document_id in self._updates
+            return bool(
+                self._snapshots.get(document_id) or self._updates.get(document_id)
+            )
 
     async def get_users(self, document_id: str) -> List[str]:
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:users"
-            users = await self._redis.smembers(redis_key)
-            return list(users)
+            users = await self._redis.smembers(self._get_key(document_id, "users"))
+            return [
+                user.decode() if isinstance(user, bytes) else user for user in users
+            ]
         else:
-            return self._users.get(document_id, [])
+            return list(self._users.get(document_id, []))
 
     async def add_user(self, document_id: str, user_id: str):
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:users"
-            await self._redis.sadd(redis_key, user_id)
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.sadd(self._get_key(document_id, "users"), user_id)
+            pipe.sadd(self._get_session_key(user_id), document_id)
+            await pipe.execute()
         else:
-            if document_id not in self._users:
-                self._users[document_id] = set()
-            self._users[document_id].add(user_id)
+            self._users.setdefault(document_id, set()).add(user_id)
+            self._sessions.setdefault(user_id, set()).add(document_id)
 
     async def remove_user(self, document_id: str, user_id: str):
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:users"
-            await self._redis.srem(redis_key, user_id)
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.srem(self._get_key(document_id, "users"), user_id)
+            pipe.srem(self._get_session_key(user_id), document_id)
+            await pipe.execute()
         else:
-            if document_id in self._users and user_id in self._users[document_id]:
-                self._users[document_id].remove(user_id)
+            self._users.get(document_id, set()).discard(user_id)
+
+            documents = self._sessions.get(user_id)
+            if documents is not None:
+                documents.discard(document_id)
+                if not documents:
+                    del self._sessions[user_id]
 
     async def remove_user_from_all_documents(self, user_id: str):
+        """Leave every document the session joined, clearing abandoned ones."""
         if self._redis:
-            keys = []
-            async for key in self._redis.scan_iter(
-                match=f"{self._redis_key_prefix}:*", count=100
-            ):
-                keys.append(key)
-            for key in keys:
-                if key.endswith(":users"):
-                    await self._redis.srem(key, user_id)
-
-                    document_id = key.split(":")[-2]
-                    if len(await self.get_users(document_id)) == 0:
-                        await self.clear_document(document_id)
-
+            session_key = self._get_session_key(user_id)
+            pipe = self._redis.pipeline(transaction=True)
+            pipe.smembers(session_key)
+            pipe.delete(session_key)
+            documents, _ = await pipe.execute()
+            documents = [
+                document.decode() if isinstance(document, bytes) else document
+                for document in documents
+            ]
+
+            for document_id in documents:
+                users_key = self._get_key(document_id, "users")
+                pipe = self._redis.pipeline(transaction=True)
+                pipe.srem(users_key, user_id)
+                pipe.scard(users_key)
+                _, remaining = await pipe.execute()
+                if remaining == 0:
+                    await self.clear_document(document_id)
         else:
-            for document_id in list(self._users.keys()):
-                if user_id in self._users[document_id]:
-                    self._users[document_id].remove(user_id)
-                    if not self._users[document_id]:
-                        del self._users[document_id]
+            for document_id in self._sessions.pop(user_id, set()):
+                users = self._users.get(document_id)
+                if users is None:
+                    continue
 
-                        await self.clear_document(document_id)
+                users.discard(user_id)
+                if not users:
+                    await self.clear_document(document_id)
 
     async def clear_document(self, document_id: str):
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            await self._redis.delete(redis_key)
-            redis_users_key = f"{self._redis_key_prefix}:{document_id}:users"
-            await self._redis.delete(redis_users_key)
+            await self._redis.delete(
+                self._get_key(document_id, "snapshot"),
+                self._get_key(document_id, "log"),
+                self._get_key(document_id, "users"),
+                # Written as JSON lists by earlier versions
+                self._get_key(document_id, "updates"),
+            )
         else:
-            if document_id in self._updates:
-                del self._updates[document_id]
-            if document_id in self._users:
-                del self._users[document_id]
+            self._snapshots.pop(document_id, None)
+            self._updates.pop(document_id, None)
+            self._users.pop(document_id, None)
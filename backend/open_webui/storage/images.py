@@ -0,0 +1,133 @@
+import asyncio
+import base64
+import binascii
+import hashlib
+import io
+import logging
+import mimetypes
+import os
+import re
+from typing import Optional
+
+from open_webui.config import UPLOAD_DIR
+from open_webui.storage.provider import Storage, StorageProvider
+
+log = logging.getLogger(__name__)
+
+# Data URLs shorter than this stay inline
+MIN_EXTERNALIZED_IMAGE_LENGTH = 1024
+
+IMAGE_STORE_URL_PREFIX = "/api/v1/files/images/"
+
+DATA_URL_IMAGE_PATTERN = re.compile(
+    r"data:(image/[\w.+-]+);base64,([A-Za-z0-9+/]+={0,2})"
+)
+IMAGE_NAME_PATTERN = re.compile(r"([0-9a-f]{64})(\.\w+)?")
+IMAGE_STORE_URL_PATTERN = re.compile(
+    re.escape(IMAGE_STORE_URL_PREFIX) + IMAGE_NAME_PATTERN.pattern
+)
+
+
+class ImageStore:
+    """
+    Images stored once under the sha256 of their bytes. Chats reference them
+    by a stable URL instead of inlining them as data URLs, and only payloads
+    sent to a model get the bytes inlined again.
+
+    Known limitation: stored images are not reference counted, so deleting
+    a chat leaves its images behind (another chat may share them). They are
+    only removed when all uploaded files are deleted.
+    """
+
+    def __init__(self, storage: StorageProvider):
+        self.storage = storage
+        # Filenames known to be stored, to skip the existence check
+        self._stored: set[str] = set()
+
+    @staticmethod
+    def get_filename(digest: str, extension: str) -> str:
+        return f"image-{digest}{extension}"
+
+    def put(self, data: bytes, content_type: str) -> str:
+        """Store image bytes and return the URL that references them."""
+        digest = hashlib.sha256(data).hexdigest()
+        extension = mimetypes.guess_extension(content_type) or ""
+        filename = self.get_filename(digest, extension)
+
+        if filename not in self._stored:
+            if not self.storage.file_exists(self.storage.get_file_path(filename)):
+                self.storage.upload_file(
+                    io.BytesIO(data), filename, {"OpenWebUI-Content-Hash": digest}
+                )
+            self._stored.add(filename)
+
+        return f"{IMAGE_STORE_URL_PREFIX}{digest}{extension}"
+
+    def get_local_path(self, name: str) -> Optional[str]:
+        """Local path of a stored image by the name in its URL, e.g. <sha256>.png"""
+        match = IMAGE_NAME_PATTERN.fullmatch(name)
+        if not match:
+            return None
+
+        filename = self.get_filename(match.group(1), match.group(2) or "")
+        local_path = f"{UPLOAD_DIR}/{filename}"
+        if os.path.isfile(local_path):
+            return local_path
+
+        try:
+            return self.storage.get_file(self.storage.get_file_path(filename))
+        except Exception as e:
+            log.debug(f"Image {name} not found: {e}")
+            return None
+
+    def get_data_url(self, url: str) -> Optional[str]:
+        """Inline a stored image referenced by url, for providers that need bytes."""
+        match = IMAGE_STORE_URL_PATTERN.search(url)
+        if not match:
+            return None
+
+        local_path = self.get_local_path(f"{match.group(1)}{match.group(2) or ''}")
+        if local_path is None or not os.path.isfile(local_path):
+            return None
+
+        content_type, _ = mimetypes.guess_type(local_path)
+        with open(local_path, "rb") as f:
+            encoded = base64.b64encode(f.read()).decode("utf-8")
+        return f"data:{content_type or 'image/png'};base64,{encoded}"
+
+    def _replace_data_url(self, match: re.Match) -> str:
+        # SVG stays inline, as serving it from our origin would allow scripts
+        if len(match.group(0)) < MIN_EXTERNALIZED_IMAGE_LENGTH or "svg" in match.group(
+            1
+        ):
+            return match.group(0)
+        try:
+            return self.put(base64.b64decode(match.group(2)), match.group(1))
+        except (binascii.Error, ValueError) as e:
+            log.debug(f"Error decoding inline image: {e}")
+        except Exception as e:
+            log.warning(f"Error storing inline image: {e}")
+        return match.group(0)
+
+    def externalize(self, obj):
+        """Replace base64 image data URLs anywhere in obj with stored references."""
+        if isinstance(obj, str):
+            if "data:image/" not in obj:
+                return obj
+            return DATA_URL_IMAGE_PATTERN.sub(self._replace_data_url, obj)
+        elif isinstance(obj, dict):
+            return {key: self.externalize(value) for key, value in obj.items()}
+        elif isinstance(obj, list):
+            return [self.externalize(item) for item in obj]
+        return obj
+
+
+IMAGES = ImageStore(Storage)
+
+
+async def externalize_images(obj):
+    """
+    IMAGES.externalize off the event loop, as storing images is blocking I/O.
+    Called on chat content before it is saved, keeping the models free of it.
+    """
+    return await asyncio.to_thread(IMAGES.externalize, obj)
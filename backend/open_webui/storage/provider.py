@@ -57,6 +57,14 @@ class StorageProvider(ABC):
     def delete_file(self, file_path: str) -> None:
         pass
 
+    def get_file_path(self, filename: str) -> str:
+        """Path that upload_file returns for the given filename."""
+        return f"{UPLOAD_DIR}/{filename}"
+
+    def file_exists(self, file_path: str) -> bool:
+        """Whether a file was uploaded under the given path."""
+        return os.path.isfile(f"{UPLOAD_DIR}/{file_path.split('/')[-1]}")
+
 
 class LocalStorageProvider(StorageProvider):
     @staticmethod
@@ -213,6 +221,18 @@ class S3StorageProvider(StorageProvider):
         # Always delete from local storage
         LocalStorageProvider.delete_all_files()
 
+    def get_file_path(self, filename: str) -> str:
+        return f"s3://{self.bucket_name}/{os.path.join(self.key_prefix, filename)}"
+
+    def file_exists(self, file_path: str) -> bool:
+        try:
+            self.s3_client.head_object(
+                Bucket=self.bucket_name, Key=self._extract_s3_key(file_path)
+            )
+            return True
+        except ClientError:
+            return False
+
     # The s3 key is the name assigned to an object. It excludes the bucket name, but includes the internal path and the file name.
     def _extract_s3_key(self, full_file_path: str) -> str:
         return "/".join(full_file_path.split("//")[1].split("/")[1:])
@@ -248,6 +268,13 @@ class GCSStorageProvider(StorageProvider):
         except GoogleCloudError as e:
             raise RuntimeError(f"Error uploading file to GCS: {e}")
 
+    def get_file_path(self, filename: str) -> str:
+        return "gs://" + self.bucket_name + "/" + filename
+
+    def file_exists(self, file_path: str) -> bool:
+        filename = file_path.removeprefix("gs://").split("/")[1]
+        return self.bucket.blob(filename).exists()
+
     def get_file(self, file_path: str) -> str:
         """Handles downloading of the file from GCS storage."""
         try:
@@ -320,6 +347,13 @@ class AzureStorageProvider(StorageProvider):
         except Exception as e:
             raise RuntimeError(f"Error uploading file to Azure Blob Storage: {e}")
 
+    def get_file_path(self, filename: str) -> str:
+        return f"{self.endpoint}/{self.container_name}/{filename}"
+
+    def file_exists(self, file_path: str) -> bool:
+        filename = file_path.split("/")[-1]
+        return self.container_client.get_blob_client(filename).exists()
+
     def get_file(self, file_path: str) -> str:
         """Handles downloading of the file from Azure Blob Storage."""
         try:
@@ -0,0 +1,69 @@
+import base64
+import os
+
+import pytest
+
+from open_webui.storage import images, provider
+from open_webui.storage.images import IMAGE_STORE_URL_PREFIX, ImageStore
+from open_webui.utils import files
+
+
+def data_url(data: bytes, content_type: str = "image/png") -> str:
+    return f"data:{content_type};base64,{base64.b64encode(data).decode('utf-8')}"
+
+
+# Large enough to be externalized
+IMAGE = os.urandom(2048)
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    directory = tmp_path / "uploads"
+    directory.mkdir()
+    monkeypatch.setattr(provider, "UPLOAD_DIR", str(directory))
+    monkeypatch.setattr(images, "UPLOAD_DIR", str(directory))
+
+    store = ImageStore(provider.LocalStorageProvider())
+    monkeypatch.setattr(files, "IMAGES", store)
+    store.directory = directory
+    return store
+
+
+class TestImageStore:
+    def test_externalize_replaces_data_urls(self, store):
+        chat = {
+            "messages": [
+                {"content": f"![image]({data_url(IMAGE)})"},
+                {"files": [{"type": "image", "url": data_url(IMAGE)}]},
+            ]
+        }
+        result = store.externalize(chat)
+
+        url = result["messages"][1]["files"][0]["url"]
+        assert url.startswith(IMAGE_STORE_URL_PREFIX) and url.endswith(".png")
+        assert result["messages"][0]["content"] == f"![image]({url})"
+        assert "base64" not in str(result)
+
+    def test_identical_images_are_stored_once(self, store):
+        first = store.externalize(data_url(IMAGE))
+        second = ImageStore(store.storage).externalize(data_url(IMAGE))
+
+        assert first == second
+        assert len(list(store.directory.iterdir())) == 1
+
+    def test_svg_and_small_images_stay_inline(self, store):
+        svg = data_url(b"<svg>" + b" " * 2048 + b"</svg>", "image/svg+xml")
+        small = data_url(b"tiny")
+
+        assert store.externalize(svg) == svg
+        assert store.externalize(small) == small
+        assert list(store.directory.iterdir()) == []
+
+    def test_stored_image_is_inlined_again(self, store):
+        url = store.externalize(data_url(IMAGE))
+
+        assert files.get_image_base64_from_url(url) == data_url(IMAGE)
+        assert (
+            files.get_image_base64_from_url(f"{IMAGE_STORE_URL_PREFIX}{'0' * 64}.png")
+            is None
+        )
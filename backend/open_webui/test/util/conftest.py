@@ -0,0 +1,126 @@
+import importlib
+import pkgutil
+from contextlib import contextmanager
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from open_webui import models
+from open_webui.internal import db as internal_db
+from open_webui.retrieval.vector.main import GetResult, VectorDBBase, VectorItem
+
+
+@pytest_asyncio.fixture
+async def serve_app():
+    """Serve aiohttp applications on free local ports, returning their base URLs."""
+    servers: list[TestServer] = []
+
+    async def serve(app: web.Application) -> str:
+        server = TestServer(app, host="127.0.0.1")
+        await server.start_server()
+        servers.append(server)
+        return str(server.make_url("")).rstrip("/")
+
+    yield serve
+
+    for server in servers:
+        await server.close()
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """
+    An in-memory SQLite session used by every model method, whether it is
+    passed the session or opens its own, so tests never touch the real database.
+    """
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    # Every table, so foreign keys between models resolve
+    for module in pkgutil.iter_modules(models.__path__):
+        importlib.import_module(f"{models.__name__}.{module.name}")
+    internal_db.Base.metadata.create_all(engine)
+    # Configured like internal.db.SessionLocal
+    session = sessionmaker(
+        autocommit=False, autoflush=False, bind=engine, expire_on_commit=False
+    )()
+
+    @contextmanager
+    def get_db():
+        yield session
+
+    monkeypatch.setattr(internal_db, "get_db", get_db)
+    yield session
+
+    session.close()
+    engine.dispose()
+
+
+class MemoryVectorDB(VectorDBBase):
+    """A vector DB backend in memory; filters match metadata exactly."""
+
+    def __init__(self):
+        self.collections: dict[str, dict[str, VectorItem]] = {}
+
+    def _match(self, collection_name: str, filter: dict) -> list[VectorItem]:
+        return [
+            item
+            for item in self.collections.get(collection_name, {}).values()
+            if all(item.metadata.get(k) == v for k, v in (filter or {}).items())
+        ]
+
+    @staticmethod
+    def _result(items: list[VectorItem]) -> GetResult:
+        return GetResult(
+            ids=[[item.id for item in items]],
+            documents=[[item.text for item in items]],
+            metadatas=[[item.metadata for item in items]],
+        )
+
+    def has_collection(self, collection_name):
+        return collection_name in self.collections
+
+    def delete_collection(self, collection_name):
+        self.collections.pop(collection_name, None)
+
+    def insert(self, collection_name, items):
+        self.upsert(collection_name, items)
+
+    def upsert(self, collection_name, items):
+        collection = self.collections.setdefault(collection_name, {})
+        for item in items:
+            collection[item["id"]] = VectorItem(**item)
+
+    def search(self, collection_name, vectors, filter=None, limit=10):
+        raise NotImplementedError
+
+    def query(self, collection_name, filter, limit=None):
+        if collection_name not in self.collections:
+            return None
+        return self._result(self._match(collection_name, filter)[:limit])
+
+    def get(self, collection_name):
+        return self.query(collection_name, {})
+
+    def delete(self, collection_name, ids=None, filter=None):
+        for item in self._match(collection_name, filter):
+            if ids is None or item.id in ids:
+                del self.collections[collection_name][item.id]
+
+    def reset(self):
+        self.collections.clear()
+
+    def get_items(self, collection_name, filter):
+        return self._match(collection_name, filter)
+
+
+@pytest.fixture
+def vector_db():
+    return MemoryVectorDB()
@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from open_webui.constants import ERROR_MESSAGES
+from open_webui.utils.admission import AdmissionController
+
+
+def make_controller(**kwargs) -> AdmissionController:
+    kwargs = {
+        "limit": 0,
+        "user_limit": 0,
+        "model_limits": {},
+        "queue_timeout": 0,
+        **kwargs,
+    }
+    return AdmissionController(**kwargs)
+
+
+async def start(controller: AdmissionController, user_id: str, model_id: str = "m"):
+    """Acquire in the background and give it a chance to be admitted."""
+    task = asyncio.create_task(controller.acquire(user_id, model_id))
+    await asyncio.sleep(0.01)
+    return task
+
+
+class TestAdmissionLimits:
+    @pytest.mark.asyncio
+    async def test_global_limit_admits_next_on_release(self):
+        controller = make_controller(limit=2)
+        first = await start(controller, "a")
+        second = await start(controller, "b")
+        third = await start(controller, "c")
+
+        assert first.done() and second.done()
+        assert not third.done()
+
+        await controller.release(first.result())
+        await asyncio.sleep(0.01)
+        assert third.done()
+
+    @pytest.mark.asyncio
+    async def test_user_limit_only_holds_back_that_user(self):
+        controller = make_controller(user_limit=1)
+        first = await start(controller, "a")
+        second = await start(controller, "a")
+        other_user = await start(controller, "b")
+
+        assert first.done() and other_user.done()
+        assert not second.done()
+
+        await controller.release(first.result())
+        await asyncio.sleep(0.01)
+        assert second.done()
+
+    @pytest.mark.asyncio
+    async def test_model_limit_only_holds_back_that_model(self):
+        controller = make_controller(model_limits={"slow": 1})
+        first = await start(controller, "a", "slow")
+        second = await start(controller, "b", "slow")
+        other_model = await start(controller, "c", "fast")
+
+        assert first.done() and other_model.done()
+        assert not second.done()
+
+        await controller.release(first.result())
+        await asyncio.sleep(0.01)
+        assert second.done()
+
+
+class TestAdmissionQueue:
+    @pytest.mark.asyncio
+    async def test_users_take_turns(self):
+        controller = make_controller(limit=1)
+        running = (await start(controller, "x")).result()
+
+        tasks = {
+            name: await start(controller, name[0]) for name in ("a1", "a2", "a3", "b1")
+        }
+        # One ticket per user per round
+        queue = [ticket.user_id for ticket in controller.get_queue()]
+        assert queue == ["a", "b", "a", "a"]
+
+        order = []
+        for _ in tasks:
+            await controller.release(running)
+            await asyncio.sleep(0.01)
+            (name,) = [
+                name
+                for name, task in tasks.items()
+                if task.done() and name not in order
+            ]
+            order.append(name)
+            running = tasks[name].result()
+
+        assert order == ["a1", "b1", "a2", "a3"]
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout_raises_server_busy(self):
+        controller = make_controller(limit=1, queue_timeout=0.05)
+        running = (await start(controller, "a")).result()
+
+        with pytest.raises(Exception, match=ERROR_MESSAGES.SERVER_BUSY):
+            await controller.acquire("b", "m")
+        assert controller.get_queue() == []
+
+        await controller.release(running)
+        assert controller._slots == {}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_while_queued_does_not_leak_slots(self):
+        controller = make_controller(limit=1, user_limit=1)
+        running = (await start(controller, "a")).result()
+        queued = await start(controller, "b")
+
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        assert controller.get_queue() == []
+
+        await controller.release(running)
+        assert controller._slots == {}
+
+        # Both slots are free again
+        assert (await start(controller, "c")).done()
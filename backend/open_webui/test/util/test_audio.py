@@ -0,0 +1,114 @@
+import logging
+import os
+import shutil
+import time
+from unittest.mock import patch
+
+import pytest
+from pydub import AudioSegment
+from pydub.generators import Sine
+
+from open_webui.utils import audio as audio_utils
+from open_webui.utils.audio import (
+    PCM_SAMPLE_RATE,
+    find_split_points,
+    get_max_chunk_duration_ms,
+    prepare_audio_chunk_arrays,
+    prepare_audio_chunk_files,
+    split_audio_segments,
+)
+
+log = logging.getLogger(__name__)
+
+
+def make_speech_like_audio(duration_ms: int, burst_ms: int = 7000, gap_ms: int = 800):
+    """Alternate tone bursts and silence so that silence detection has work to do."""
+    burst = Sine(440).to_audio_segment(duration=burst_ms).apply_gain(-6)
+    gap = AudioSegment.silent(duration=gap_ms)
+    pattern = (burst + gap).set_frame_rate(PCM_SAMPLE_RATE).set_channels(1)
+    repeats = duration_ms // len(pattern) + 1
+    return (pattern * repeats)[:duration_ms]
+
+
+@pytest.fixture(scope="module")
+def long_fixture(tmp_path_factory):
+    """Two hours of synthetic audio written as WAV (no encoder needed)."""
+    path = tmp_path_factory.mktemp("audio") / "long_fixture.wav"
+    make_speech_like_audio(2 * 60 * 60 * 1000).export(str(path), format="wav")
+    return str(path)
+
+
+class TestAudioChunking:
+    def test_max_chunk_duration_fits_bitrate(self):
+        max_bytes = 20 * 1024 * 1024
+        duration_ms = get_max_chunk_duration_ms(max_bytes, "32k")
+
+        assert duration_ms / 1000 * 32000 / 8 < max_bytes
+
+    def test_short_audio_is_not_split(self):
+        audio = make_speech_like_audio(30 * 1000)
+
+        assert find_split_points(audio, 60 * 1000) == []
+
+    def test_split_points_land_in_silence(self):
+        audio = make_speech_like_audio(10 * 60 * 1000)
+        target_ms = 60 * 1000
+
+        chunks = split_audio_segments(audio, target_ms)
+        points = find_split_points(audio, target_ms)
+
+        assert sum(len(chunk) for chunk in chunks) == len(audio)
+        assert all(len(chunk) <= target_ms for chunk in chunks)
+        for point in points:
+            assert audio[point - 50 : point + 50].dBFS == -float("inf")
+
+    def test_small_supported_file_is_passed_through(self, tmp_path):
+        path = tmp_path / "short.wav"
+        make_speech_like_audio(5 * 1000).export(str(path), format="wav")
+
+        with patch.object(audio_utils.AudioSegment, "from_file") as from_file:
+            assert prepare_audio_chunk_files(str(path), 20 * 1024 * 1024) == [str(path)]
+            from_file.assert_not_called()
+
+    def test_long_fixture_decodes_once_for_local_model(self, long_fixture):
+        from_file = AudioSegment.from_file
+        with patch.object(
+            audio_utils.AudioSegment, "from_file", side_effect=from_file
+        ) as decode:
+            start = time.perf_counter()
+            arrays = prepare_audio_chunk_arrays(long_fixture, 4)
+            elapsed = time.perf_counter() - start
+
+        assert decode.call_count == 1
+        assert len(arrays) >= 4
+        assert sum(len(a) for a in arrays) == 2 * 60 * 60 * PCM_SAMPLE_RATE
+        log.info(f"prepare_audio_chunk_arrays (2h fixture): {elapsed:.2f}s")
+
+    @pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not found")
+    def test_long_fixture_decodes_and_encodes_once(self, long_fixture):
+        max_bytes = 5 * 1024 * 1024
+        from_file = AudioSegment.from_file
+        export = AudioSegment.export
+        with (
+            patch.object(
+                audio_utils.AudioSegment, "from_file", side_effect=from_file
+            ) as decode,
+            patch.object(
+                audio_utils.AudioSegment, "export", autospec=True, side_effect=export
+            ) as encode,
+        ):
+            start = time.perf_counter()
+            chunk_paths = prepare_audio_chunk_files(long_fixture, max_bytes)
+            elapsed = time.perf_counter() - start
+
+        try:
+            assert decode.call_count == 1
+            assert encode.call_count == len(chunk_paths)
+            assert all(os.path.getsize(p) <= max_bytes for p in chunk_paths)
+            log.info(
+                f"prepare_audio_chunk_files (2h fixture, {len(chunk_paths)} chunks): "
+                f"{elapsed:.2f}s"
+            )
+        finally:
+            for chunk_path in chunk_paths:
+                os.remove(chunk_path)
@@ -0,0 +1,105 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from open_webui.routers import tasks as tasks_router
+from open_webui.utils.autocomplete import AutocompleteCache, get_autocomplete_text
+
+
+def completion(text: str) -> dict:
+    return {"choices": [{"message": {"content": json.dumps({"text": text})}}]}
+
+
+class TestAutocompleteCache:
+    def test_suggestion_is_served_while_typing_along(self):
+        cache = AutocompleteCache(ttl=60)
+        cache.set("user", "chat", "The sun was setting", " over the horizon")
+
+        assert cache.get("user", "chat", "The sun was setting") == " over the horizon"
+        assert cache.get("user", "chat", "The sun was setting ov") == "er the horizon"
+        assert cache.get("user", "chat", "The sun was setting over the horizon") is None
+        assert cache.get("user", "chat", "The sun was setting under") is None
+        assert cache.get("user", "other chat", "The sun was setting") is None
+        assert cache.get("other user", "chat", "The sun was setting") is None
+
+    def test_missing_space_is_tolerated(self):
+        cache = AutocompleteCache(ttl=60)
+        cache.set("user", "chat", "Top-rated restaurants in", "New York City")
+
+        assert cache.get("user", "chat", "Top-rated restaurants in N") == "ew York City"
+
+    def test_text_is_parsed_like_the_frontend(self):
+        assert get_autocomplete_text(completion("with pink")) == "with pink"
+        assert get_autocomplete_text(completion("")) == ""
+        assert get_autocomplete_text({"choices": []}) is None
+
+
+@pytest.fixture
+def autocomplete(monkeypatch):
+    calls = []
+
+    async def generate_chat_completion(request, form_data, user):
+        calls.append(form_data)
+        await asyncio.sleep(0.1)
+        return completion(" world")
+
+    async def process_pipeline_inlet_filter(request, payload, user, models):
+        return payload
+
+    monkeypatch.setattr(
+        tasks_router, "generate_chat_completion", generate_chat_completion
+    )
+    monkeypatch.setattr(
+        tasks_router, "process_pipeline_inlet_filter", process_pipeline_inlet_filter
+    )
+    monkeypatch.setattr(tasks_router, "AUTOCOMPLETIONS", AutocompleteCache(ttl=60))
+
+    request = SimpleNamespace(
+        state=SimpleNamespace(),
+        app=SimpleNamespace(
+            state=SimpleNamespace(
+                redis=None,
+                MODELS={"llama3": {"id": "llama3"}},
+                config=SimpleNamespace(
+                    ENABLE_AUTOCOMPLETE_GENERATION=True,
+                    AUTOCOMPLETE_GENERATION_INPUT_MAX_LENGTH=-1,
+                    AUTOCOMPLETE_GENERATION_PROMPT_TEMPLATE="",
+                    TASK_MODEL="",
+                    TASK_MODEL_EXTERNAL="",
+                ),
+            )
+        ),
+    )
+    user = SimpleNamespace(id="user", email="user@example.com", name="User")
+
+    async def generate(prompt: str):
+        res = await tasks_router.generate_autocompletion(
+            request, {"model": "llama3", "prompt": prompt, "type": "General"}, user
+        )
+        return get_autocomplete_text(res)
+
+    return generate, calls
+
+
+class TestAutocompletion:
+    @pytest.mark.asyncio
+    async def test_superseded_generation_is_cancelled(self, autocomplete):
+        generate, calls = autocomplete
+
+        first = asyncio.create_task(generate("Hello"))
+        await asyncio.sleep(0.01)
+        second = await generate("Hello,")
+
+        assert await first == ""
+        assert second == " world"
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_cached_suggestion_skips_the_task_model(self, autocomplete):
+        generate, calls = autocomplete
+
+        assert await generate("Hello") == " world"
+        assert await generate("Hello wo") == "rld"
+        assert len(calls) == 1
@@ -0,0 +1,155 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from fastapi import HTTPException
+
+from open_webui.routers import ollama
+from open_webui.utils.balancer import OllamaLoadBalancer
+
+WARM = "http://warm"
+COLD = "http://cold"
+
+
+class FakeOllama:
+    """Just enough of the Ollama API: /api/ps and a slow /api/chat."""
+
+    def __init__(self, loaded_models: list[str], status: int = 200):
+        self.loaded_models = loaded_models
+        self.status = status
+        self.requests = 0
+
+        self.app = web.Application()
+        self.app.router.add_get("/api/ps", self.ps)
+        self.app.router.add_post("/api/chat", self.chat)
+
+    async def ps(self, request):
+        return web.json_response(
+            {"models": [{"model": model} for model in self.loaded_models]}
+        )
+
+    async def chat(self, request):
+        self.requests += 1
+        await asyncio.sleep(0.05)
+        if self.status != 200:
+            return web.json_response({"error": "out of memory"}, status=self.status)
+        return web.json_response({"message": {"role": "assistant", "content": "hi"}})
+
+
+@pytest_asyncio.fixture
+async def nodes(monkeypatch, serve_app):
+    servers = [FakeOllama(["llama3:latest"]), FakeOllama([])]
+    for server in servers:
+        server.url = await serve_app(server.app)
+
+    balancer = OllamaLoadBalancer(
+        cold_load_penalty=2, failure_threshold=2, cooldown=30, refresh_interval=60
+    )
+    monkeypatch.setattr(ollama, "OLLAMA_BALANCER", balancer)
+
+    request = SimpleNamespace(
+        app=SimpleNamespace(
+            state=SimpleNamespace(
+                config=SimpleNamespace(
+                    ENABLE_OLLAMA_API=True,
+                    OLLAMA_BASE_URLS=[server.url for server in servers],
+                    OLLAMA_API_CONFIGS={},
+                )
+            )
+        )
+    )
+    yield request, balancer, servers
+
+
+class TestOllamaLoadBalancer:
+    def test_prefers_node_with_model_loaded(self):
+        balancer = OllamaLoadBalancer(cold_load_penalty=2)
+        balancer.set_loaded_models({WARM: ["llama3:latest"], COLD: []})
+
+        assert balancer.select({0: WARM, 1: COLD}, "llama3:latest") == 0
+
+    def test_spills_over_to_cold_node_when_warm_node_is_busy(self):
+        balancer = OllamaLoadBalancer(cold_load_penalty=2)
+        balancer.set_loaded_models({WARM: ["llama3:latest"], COLD: []})
+
+        balancer.start_request(WARM)
+        assert balancer.select({0: WARM, 1: COLD}, "llama3:latest") == 0
+        balancer.start_request(WARM)
+        balancer.start_request(WARM)
+        assert balancer.select({0: WARM, 1: COLD}, "llama3:latest") == 1
+
+    def test_failing_node_is_ejected_until_cooldown(self):
+        balancer = OllamaLoadBalancer(failure_threshold=2, cooldown=30)
+        balancer.set_loaded_models({WARM: ["llama3:latest"], COLD: []})
+
+        balancer.record_failure(WARM)
+        assert balancer.is_available(WARM)
+        balancer.record_failure(WARM)
+        assert not balancer.is_available(WARM)
+        assert balancer.select({0: WARM, 1: COLD}, "llama3:latest") == 1
+
+        # After the cooldown one probe goes through, and success restores it
+        balancer.start_request(COLD)
+        balancer.nodes[WARM].ejected_until = 1
+        assert balancer.select({0: WARM, 1: COLD}, "llama3:latest") == 0
+        assert not balancer.is_available(WARM)
+        balancer.finish_request(WARM)
+        assert balancer.is_available(WARM)
+
+
+class TestOllamaRouting:
+    @pytest.mark.asyncio
+    async def test_loaded_models_and_in_flight_requests_drive_selection(self, nodes):
+        request, balancer, servers = nodes
+        await ollama.get_ollama_loaded_models(request, user=None)
+
+        model = {"model": "llama3:latest", "urls": [0, 1]}
+        payload = b'{"model": "llama3:latest", "messages": []}'
+
+        async def chat():
+            url_idx = ollama.select_ollama_url_idx(request, model)
+            url = request.app.state.config.OLLAMA_BASE_URLS[url_idx]
+            return await ollama.send_post_request(
+                f"{url}/api/chat", payload, stream=False, base_url=url
+            )
+
+        await asyncio.gather(*[chat() for _ in range(6)])
+
+        # The warm node takes requests until it is cold_load_penalty ahead,
+        # then both nodes share the load
+        assert servers[0].requests >= 3
+        assert servers[1].requests >= 2
+        assert all(node.in_flight == 0 for node in balancer.nodes.values())
+
+    @pytest.mark.asyncio
+    async def test_server_errors_eject_node(self, nodes):
+        request, balancer, servers = nodes
+        servers[0].status = 500
+        url = servers[0].url
+
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                await ollama.send_post_request(
+                    f"{url}/api/chat", b"{}", stream=False, base_url=url
+                )
+
+        assert not balancer.is_available(url)
+        assert (
+            ollama.select_ollama_url_idx(
+                request, {"model": "llama3:latest", "urls": [0, 1]}
+            )
+            == 1
+        )
+
+    @pytest.mark.asyncio
+    async def test_unreachable_node_fails_health_check(self, nodes):
+        request, balancer, servers = nodes
+        request.app.state.config.OLLAMA_BASE_URLS.append("http://127.0.0.1:1")
+
+        for _ in range(2):
+            await ollama.get_ollama_loaded_models(request, user=None)
+
+        assert not balancer.is_available("http://127.0.0.1:1")
+        assert balancer.is_available(servers[0].url)
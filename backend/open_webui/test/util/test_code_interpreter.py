@@ -0,0 +1,178 @@
+import asyncio
+import contextlib
+import io
+import time
+import traceback
+import uuid
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from open_webui.utils.code_interpreter import (
+    JupyterKernelPool,
+    close_jupyter_kernel_pools,
+    get_jupyter_kernel_pool,
+)
+
+
+class FakeJupyter:
+    """Kernel REST API and channels websocket, running code with exec."""
+
+    def __init__(self, startup_delay: float = 0.2):
+        self.startup_delay = startup_delay
+        self.kernels: dict[str, dict] = {}
+        self.started = 0
+
+        self.app = web.Application()
+        self.app.router.add_post("/api/kernels", self.create_kernel)
+        self.app.router.add_delete("/api/kernels/{id}", self.delete_kernel)
+        self.app.router.add_get("/api/kernels/{id}/channels", self.channels)
+
+    async def create_kernel(self, request):
+        await asyncio.sleep(self.startup_delay)
+        kernel_id = str(uuid.uuid4())
+        self.kernels[kernel_id] = {}
+        self.started += 1
+        return web.json_response({"id": kernel_id}, status=201)
+
+    async def delete_kernel(self, request):
+        self.kernels.pop(request.match_info["id"], None)
+        return web.Response(status=204)
+
+    async def channels(self, request):
+        namespace = self.kernels.get(request.match_info["id"])
+        if namespace is None:
+            raise web.HTTPNotFound()
+
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        async for message in ws:
+            data = message.json()
+            parent_header = {"msg_id": data["header"]["msg_id"]}
+            code = data["content"]["code"]
+
+            if code == "%reset -f":
+                namespace.clear()
+            else:
+                stdout = io.StringIO()
+                try:
+                    with contextlib.redirect_stdout(stdout):
+                        exec(code, namespace)
+                except Exception:
+                    await ws.send_json(
+                        {
+                            "parent_header": parent_header,
+                            "msg_type": "error",
+                            "content": {"traceback": [traceback.format_exc()]},
+                        }
+                    )
+                if stdout.getvalue():
+                    await ws.send_json(
+                        {
+                            "parent_header": parent_header,
+                            "msg_type": "stream",
+                            "content": {"name": "stdout", "text": stdout.getvalue()},
+                        }
+                    )
+
+            await ws.send_json(
+                {
+                    "parent_header": parent_header,
+                    "msg_type": "status",
+                    "content": {"execution_state": "idle"},
+                }
+            )
+        return ws
+
+
+@pytest_asyncio.fixture
+async def fake_jupyter(serve_app):
+    server = FakeJupyter()
+    server.base_url = await serve_app(server.app)
+    return server
+
+
+async def settle(pool: JupyterKernelPool):
+    while pool._tasks:
+        await asyncio.gather(*pool._tasks)
+
+
+class TestJupyterKernelPool:
+    @pytest.mark.asyncio
+    async def test_runs_use_warm_kernels(self, fake_jupyter):
+        pool = JupyterKernelPool(fake_jupyter.base_url, size=2, max_uses=1)
+        try:
+            result = await pool.execute("print(1 + 1)")
+            assert result.stdout == "2"
+            await settle(pool)
+
+            start = time.monotonic()
+            result = await pool.execute("print('warm')")
+            assert result.stdout == "warm"
+            assert time.monotonic() - start < fake_jupyter.startup_delay
+        finally:
+            await pool.close()
+
+        assert fake_jupyter.kernels == {}
+
+    @pytest.mark.asyncio
+    async def test_single_use_kernels_do_not_share_state(self, fake_jupyter):
+        pool = JupyterKernelPool(fake_jupyter.base_url, size=2, max_uses=1)
+        try:
+            await pool.execute("secret = 42")
+            await settle(pool)
+            result = await pool.execute("print(secret)")
+            assert "NameError" in result.stderr
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_reused_kernels_are_reset_and_recycled(self, fake_jupyter):
+        pool = JupyterKernelPool(fake_jupyter.base_url, size=1, max_uses=3)
+        try:
+            await pool.execute("secret = 42")
+            await settle(pool)
+            assert fake_jupyter.started == 1
+
+            result = await pool.execute("print(globals().get('secret'))")
+            assert result.stdout == "None"
+            await settle(pool)
+            assert fake_jupyter.started == 1
+
+            # Third run uses the kernel up, a fresh one takes its place
+            await pool.execute("pass")
+            await settle(pool)
+            assert fake_jupyter.started == 2
+            assert len(fake_jupyter.kernels) == 1
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_culled_kernel_is_replaced(self, fake_jupyter):
+        pool = JupyterKernelPool(fake_jupyter.base_url, size=1, max_uses=1)
+        try:
+            await pool.execute("pass")
+            await settle(pool)
+            fake_jupyter.kernels.clear()
+
+            result = await pool.execute("print('ok')")
+            assert result.stdout == "ok"
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_pool_of_old_credentials_is_closed(self, fake_jupyter):
+        try:
+            pool = get_jupyter_kernel_pool(fake_jupyter.base_url, "old")
+            await pool.execute("pass")
+            assert get_jupyter_kernel_pool(fake_jupyter.base_url, "old") is pool
+
+            new_pool = get_jupyter_kernel_pool(fake_jupyter.base_url, "new")
+            assert new_pool is not pool
+            await new_pool.execute("pass")
+        finally:
+            await asyncio.wait_for(close_jupyter_kernel_pools(), 5)
+
+        assert pool._closed
+        assert fake_jupyter.kernels == {}
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from open_webui.config import DEFAULT_COMBINED_TASK_GENERATION_PROMPT_TEMPLATE
+from open_webui.utils import middleware
+from open_webui.utils.task import combined_task_generation_template
+
+
+def completion(content: str) -> dict:
+    return {"choices": [{"message": {"role": "assistant", "content": content}}]}
+
+
+class TestCombinedTaskGeneration:
+    def test_template_lists_requested_keys(self):
+        content = combined_task_generation_template(
+            DEFAULT_COMBINED_TASK_GENERATION_PROMPT_TEMPLATE,
+            [{"role": "user", "content": "How do I bake bread?"}],
+            ["title", "follow_ups"],
+        )
+
+        assert 'only these keys: "title", "follow_ups".' in content
+        assert "How do I bake bread?" in content
+
+    @pytest.mark.asyncio
+    async def test_results_are_parsed_from_one_response(self, monkeypatch):
+        calls = []
+
+        async def generate_combined_tasks(request, form_data, user):
+            calls.append(form_data["tasks"])
+            return completion(
+                "```json\n"
+                + json.dumps(
+                    {
+                        "title": "🍞 Baking Bread",
+                        "tags": ["Food", "Baking"],
+                        "follow_ups": ["How long should it rise?"],
+                    }
+                )
+                + "\n```"
+            )
+
+        monkeypatch.setattr(
+            middleware, "generate_combined_tasks", generate_combined_tasks
+        )
+
+        results = await middleware.generate_combined_task_results(
+            None, {"tasks": ["title", "tags", "follow_ups"]}, None
+        )
+
+        assert calls == [["title", "tags", "follow_ups"]]
+        assert results == {
+            "title": "🍞 Baking Bread",
+            "tags": ["Food", "Baking"],
+            "follow_ups": ["How long should it rise?"],
+        }
+
+    @pytest.mark.asyncio
+    async def test_malformed_results_fall_back(self, monkeypatch):
+        responses = iter(
+            [
+                completion("Sure! Here is a title: Baking Bread"),
+                completion('{"title": "Baking Bread", "tags": "Food"}'),
+            ]
+        )
+
+        async def generate_combined_tasks(request, form_data, user):
+            return next(responses)
+
+        monkeypatch.setattr(
+            middleware, "generate_combined_tasks", generate_combined_tasks
+        )
+
+        assert await middleware.generate_combined_task_results(None, {}, None) == {}
+        # Only the valid part is used, tags are generated on their own
+        assert await middleware.generate_combined_task_results(None, {}, None) == {
+            "title": "Baking Bread"
+        }
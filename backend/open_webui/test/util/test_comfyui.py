@@ -0,0 +1,156 @@
+import asyncio
+import uuid
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from open_webui.utils.images import comfyui
+from open_webui.utils.images.comfyui import (
+    ComfyUIClient,
+    get_comfyui_client,
+    get_images,
+)
+
+WORKFLOW = {
+    "3": {"class_type": "KSampler", "inputs": {"steps": 2}},
+    "9": {"class_type": "SaveImage", "inputs": {}},
+}
+
+
+class FakeComfyUI:
+    """Just enough of the ComfyUI API: /prompt, /history and the websocket."""
+
+    def __init__(self, steps: int = 2, error: str = None):
+        self.steps = steps
+        self.error = error
+        self.sockets: dict[str, web.WebSocketResponse] = {}
+        self.history: dict[str, dict] = {}
+        self.connections = 0
+
+        self.app = web.Application()
+        self.app.router.add_get("/ws", self.ws)
+        self.app.router.add_post("/prompt", self.prompt)
+        self.app.router.add_get("/history/{prompt_id}", self.get_history)
+
+    async def ws(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connections += 1
+        self.sockets[request.query["clientId"]] = ws
+        async for _ in ws:
+            pass
+        return ws
+
+    async def prompt(self, request):
+        body = await request.json()
+        prompt_id = str(uuid.uuid4())
+        asyncio.create_task(self.execute(body["client_id"], prompt_id))
+        return web.json_response({"prompt_id": prompt_id})
+
+    async def execute(self, client_id: str, prompt_id: str):
+        ws = self.sockets[client_id]
+        for step in range(1, self.steps + 1):
+            await asyncio.sleep(0.01)
+            await ws.send_json(
+                {
+                    "type": "progress",
+                    "data": {"value": step, "max": self.steps, "prompt_id": prompt_id},
+                }
+            )
+
+        if self.error:
+            await ws.send_json(
+                {
+                    "type": "execution_error",
+                    "data": {"prompt_id": prompt_id, "exception_message": self.error},
+                }
+            )
+            return
+
+        self.history[prompt_id] = {
+            "status": {"completed": True},
+            "outputs": {
+                "9": {
+                    "images": [
+                        {
+                            "filename": f"{prompt_id}.png",
+                            "subfolder": "",
+                            "type": "output",
+                        }
+                    ]
+                }
+            },
+        }
+        await ws.send_json(
+            {"type": "executing", "data": {"node": None, "prompt_id": prompt_id}}
+        )
+
+    async def get_history(self, request):
+        prompt_id = request.match_info["prompt_id"]
+        return web.json_response(
+            {prompt_id: self.history[prompt_id]} if prompt_id in self.history else {}
+        )
+
+
+@pytest_asyncio.fixture
+async def fake_comfyui(serve_app):
+    server = FakeComfyUI()
+    server.base_url = await serve_app(server.app)
+    yield server
+
+    for client in comfyui.COMFYUI_CLIENTS.values():
+        await client.close()
+    comfyui.COMFYUI_CLIENTS.clear()
+
+
+class TestComfyUIClient:
+    @pytest.mark.asyncio
+    async def test_concurrent_prompts_share_one_websocket(self, fake_comfyui):
+        results = await asyncio.gather(
+            *[get_images(WORKFLOW, fake_comfyui.base_url, None) for _ in range(10)]
+        )
+
+        assert fake_comfyui.connections == 1
+        urls = {result["data"][0]["url"] for result in results}
+        assert len(urls) == 10
+        assert all(url.startswith(f"{fake_comfyui.base_url}/view?") for url in urls)
+
+    @pytest.mark.asyncio
+    async def test_progress_is_relayed_to_event_emitter(self, fake_comfyui):
+        events = []
+
+        async def event_emitter(event):
+            events.append(event)
+
+        await get_images(WORKFLOW, fake_comfyui.base_url, None, event_emitter)
+
+        assert [event["data"]["progress"] for event in events] == [50, 100]
+        assert all(event["type"] == "status" for event in events)
+
+    @pytest.mark.asyncio
+    async def test_execution_error_fails_only_its_prompt(self, fake_comfyui):
+        client = ComfyUIClient(fake_comfyui.base_url)
+        fake_comfyui.error = "Out of memory"
+        try:
+            with pytest.raises(Exception, match="Out of memory"):
+                await client.run(WORKFLOW)
+
+            fake_comfyui.error = None
+            history = await client.run(WORKFLOW)
+            assert history["status"]["completed"]
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_replaced_client_closes_after_its_last_prompt(self, fake_comfyui):
+        client = await get_comfyui_client(fake_comfyui.base_url, None)
+        running = asyncio.create_task(client.run(WORKFLOW))
+        while not client._prompts:
+            await asyncio.sleep(0.01)
+
+        replacement = await get_comfyui_client(fake_comfyui.base_url, "new-key")
+        assert replacement is not client and client.connected
+
+        assert (await running)["status"]["completed"]
+        assert client.retired and not client.connected
@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+
+import pytest
+
+from open_webui.constants import ERROR_MESSAGES
+from open_webui.routers import retrieval
+from open_webui.routers.retrieval import copy_file_vectors_to_collection
+
+EMBEDDING_CONFIG = {"engine": "", "model": "embedding-model"}
+FILE = SimpleNamespace(id="1")
+
+
+def make_request(model: str = "embedding-model"):
+    config = SimpleNamespace(RAG_EMBEDDING_ENGINE="", RAG_EMBEDDING_MODEL=model)
+    return SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(config=config)))
+
+
+@pytest.fixture
+def vectors(vector_db, monkeypatch):
+    monkeypatch.setattr(retrieval, "VECTOR_DB_CLIENT", vector_db)
+    vector_db.upsert(
+        "file-1",
+        [
+            {
+                "id": f"chunk-{i}",
+                "text": f"Chunk {i}",
+                "vector": [float(i), 1.0],
+                "metadata": {
+                    "file_id": "1",
+                    "name": "file.txt",
+                    "embedding_config": EMBEDDING_CONFIG,
+                },
+            }
+            for i in range(3)
+        ],
+    )
+    return vector_db
+
+
+def copy(collection_name: str, request=None, **kwargs) -> bool:
+    return copy_file_vectors_to_collection(
+        request or make_request(),
+        FILE,
+        collection_name,
+        {"file_id": "1", "name": "renamed.txt", "hash": "abc"},
+        **kwargs,
+    )
+
+
+class TestCopyFileVectors:
+    def test_copies_chunks_and_vectors_under_new_ids(self, vectors):
+        assert copy("knowledge")
+
+        source = vectors.get_items("file-1", {})
+        copied = vectors.get_items("knowledge", {})
+        assert [item.vector for item in copied] == [item.vector for item in source]
+        assert [item.text for item in copied] == [item.text for item in source]
+        assert not {item.id for item in copied} & {item.id for item in source}
+        assert all(
+            item.metadata["name"] == "renamed.txt" and item.metadata["hash"] == "abc"
+            for item in copied
+        )
+
+    def test_different_embedding_model_is_not_copied(self, vectors):
+        assert not copy("knowledge", make_request(model="other-model"))
+        assert not vectors.has_collection("knowledge")
+
+    def test_missing_file_collection_is_not_copied(self, vectors):
+        vectors.delete_collection("file-1")
+        assert not copy("knowledge")
+
+    def test_duplicate_content_is_refused(self, vectors):
+        assert copy("knowledge")
+
+        with pytest.raises(ValueError, match=ERROR_MESSAGES.DUPLICATE_CONTENT):
+            copy("knowledge")
+        # Batch processing skips the check
+        assert copy("knowledge", check_duplicate=False)
+        assert len(vectors.get_items("knowledge", {})) == 6
+
+    def test_backend_without_vector_reads_is_not_copied(self, vectors, monkeypatch):
+        monkeypatch.setattr(vectors, "get_items", lambda *args: None)
+        assert not copy("knowledge")
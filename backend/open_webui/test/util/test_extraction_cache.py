@@ -0,0 +1,68 @@
+import os
+import time
+
+import pytest
+from langchain_core.documents import Document
+
+from open_webui.retrieval.loaders import cache as cache_module
+from open_webui.retrieval.loaders.cache import (
+    delete_cached_documents,
+    get_cached_documents,
+    get_extraction_cache_key,
+    set_cached_documents,
+)
+from open_webui.storage import provider
+from open_webui.storage.provider import LocalStorageProvider
+
+DOCS = [Document(page_content="Text", metadata={"page": 1})]
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(provider, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(cache_module, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(cache_module, "Storage", LocalStorageProvider())
+    return tmp_path
+
+
+@pytest.fixture
+def file_path(tmp_path):
+    path = tmp_path / "upload.pdf"
+    path.write_bytes(b"%PDF-1.4")
+    return str(path)
+
+
+class TestExtractionCacheKey:
+    def test_key_follows_the_settings_of_the_engine(self, file_path):
+        def key(engine="tika", **kwargs):
+            kwargs = {"TIKA_SERVER_URL": "http://tika", **kwargs}
+            return get_extraction_cache_key(
+                file_path, "doc.PDF", "application/pdf", engine, kwargs
+            )
+
+        assert key() == key(TIKA_API_KEY="secret", DOCLING_SERVER_URL="http://d")
+        assert key() != key(TIKA_SERVER_URL="http://other-tika")
+        assert key() != key(PDF_EXTRACT_IMAGES=True)
+        assert key() != key(engine="docling")
+
+
+class TestExtractionCache:
+    def test_round_trip_and_delete(self, upload_dir):
+        set_cached_documents("key", DOCS)
+        assert get_cached_documents("key") == DOCS
+
+        delete_cached_documents("key")
+        assert get_cached_documents("key") is None
+        assert os.listdir(upload_dir) == []
+
+    def test_expired_entry_is_removed(self, upload_dir, monkeypatch):
+        set_cached_documents("key", DOCS)
+
+        now = time.time()
+        monkeypatch.setattr(
+            cache_module.time,
+            "time",
+            lambda: now + cache_module.CONTENT_EXTRACTION_CACHE_TTL + 1,
+        )
+        assert get_cached_documents("key") is None
+        assert os.listdir(upload_dir) == []
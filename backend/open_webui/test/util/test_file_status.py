@@ -0,0 +1,80 @@
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from open_webui.models.files import File, Files
+from open_webui.routers import files as files_router
+from open_webui.utils import file_status
+from open_webui.utils.file_status import publish_file_status
+
+USER = SimpleNamespace(id="user", role="user")
+
+
+@pytest.fixture
+def file(db, monkeypatch):
+    # Events are delivered in process, as without Redis
+    monkeypatch.setattr(file_status, "get_redis_client", lambda: None)
+
+    now = int(time.time())
+    db.add(
+        File(
+            id="file",
+            user_id=USER.id,
+            filename="file.txt",
+            data={"status": "pending"},
+            meta={},
+            created_at=now,
+            updated_at=now,
+        )
+    )
+    db.commit()
+    return "file"
+
+
+async def read_stream(file_id: str, db) -> list:
+    response = await files_router.get_file_process_status(
+        file_id, stream=True, user=USER, db=db
+    )
+    chunks = []
+    async for chunk in response.body_iterator:
+        chunks.append(
+            json.loads(chunk[len("data: ") :]) if chunk.startswith("data: ") else chunk
+        )
+    return chunks
+
+
+class TestFileStatusStream:
+    @pytest.mark.asyncio
+    async def test_transition_during_the_first_read_is_not_missed(
+        self, db, file, monkeypatch
+    ):
+        get_file_by_id = Files.get_file_by_id
+
+        def get_file_then_complete(id, db=None):
+            # The file finishes right after the stream read its status
+            file_item = get_file_by_id(id, db=db)
+            publish_file_status(id, "completed")
+            return file_item
+
+        monkeypatch.setattr(
+            files_router.Files, "get_file_by_id", get_file_then_complete
+        )
+
+        assert await read_stream(file, db) == [
+            {"status": "pending"},
+            {"status": "completed"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_idle_stream_rereads_the_database(self, db, file, monkeypatch):
+        monkeypatch.setattr(files_router, "FILE_STATUS_KEEPALIVE_INTERVAL", 0.05)
+
+        # Finished elsewhere without an event reaching this process
+        Files.update_file_data_by_id(file, {"status": "failed", "error": "Broken"})
+        db.expire_all()
+
+        assert await read_stream(file, db) == [
+            {"status": "failed", "error": "Broken"},
+        ]
@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from open_webui.models.memories import MemoryModel
+from open_webui.routers import memories
+from open_webui.routers.memories import upsert_memories_to_vector_db
+from open_webui.utils import memory_index
+from open_webui.utils.memory_index import MemoryIndexCache
+
+USER = SimpleNamespace(id="user")
+
+
+def memory(id: str, content: str) -> MemoryModel:
+    return MemoryModel(
+        id=id, user_id=USER.id, content=content, created_at=0, updated_at=0
+    )
+
+
+def make_request(embed):
+    calls = []
+
+    async def embedding_function(texts, user=None):
+        calls.append(texts)
+        return embed(texts)
+
+    state = SimpleNamespace(
+        EMBEDDING_FUNCTION=embedding_function, memory_indexes=MemoryIndexCache()
+    )
+    return SimpleNamespace(app=SimpleNamespace(state=state)), calls
+
+
+@pytest.fixture
+def vectors(vector_db, monkeypatch):
+    monkeypatch.setattr(memories, "VECTOR_DB_CLIENT", vector_db)
+    monkeypatch.setattr(memory_index, "VECTOR_DB_CLIENT", vector_db)
+    return vector_db
+
+
+class TestUpsertMemories:
+    @pytest.mark.asyncio
+    async def test_embeds_once_and_invalidates_the_index(self, vectors):
+        request, calls = make_request(lambda texts: [[1.0, 0.0] for _ in texts])
+        indexes = request.app.state.memory_indexes
+        assert len(await indexes.get(USER.id)) == 0
+
+        await upsert_memories_to_vector_db(
+            request, [memory("a", "Likes tea"), memory("b", "Lives in Oslo")], USER
+        )
+
+        assert calls == [["Likes tea", "Lives in Oslo"]]
+        assert sorted(vectors.collections["user-memory-user"]) == ["a", "b"]
+        assert len(await indexes.get(USER.id)) == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "embed",
+        [
+            # A failed batch is left out of the result
+            lambda texts: [[1.0, 0.0]],
+            lambda texts: [[1.0, 0.0], None],
+        ],
+    )
+    async def test_refuses_vectors_that_do_not_line_up(self, vectors, embed):
+        request, _ = make_request(embed)
+
+        with pytest.raises(HTTPException) as e:
+            await upsert_memories_to_vector_db(
+                request, [memory("a", "Likes tea"), memory("b", "Lives in Oslo")], USER
+            )
+
+        assert e.value.status_code == 500
+        assert not vectors.has_collection("user-memory-user")
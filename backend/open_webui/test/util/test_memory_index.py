@@ -0,0 +1,111 @@
+import pytest
+
+from open_webui.retrieval.vector.main import VectorItem
+from open_webui.utils import memory_index
+from open_webui.utils.memory_index import MemoryIndex, MemoryIndexCache
+
+
+def item(id: str, vector: list[float]) -> VectorItem:
+    return VectorItem(
+        id=id, text=f"memory {id}", vector=vector, metadata={"created_at": 0}
+    )
+
+
+class FakeVectorDB:
+    def __init__(self, items: list[VectorItem]):
+        self.items = items
+        self.loads = 0
+
+    def has_collection(self, collection_name):
+        return True
+
+    def get_items(self, collection_name, filter):
+        self.loads += 1
+        return self.items
+
+
+class TestMemoryIndex:
+    def test_search_ranks_by_cosine_similarity(self):
+        index = MemoryIndex(
+            [item("a", [1, 0, 0]), item("b", [0, 3, 0]), item("c", [1, 1, 0])]
+        )
+
+        result = index.search([0, 2, 0], limit=2)
+
+        assert result.ids == [["b", "c"]]
+        assert result.documents == [["memory b", "memory c"]]
+        assert result.distances[0][0] == pytest.approx(1.0)
+        assert result.distances[0][1] == pytest.approx((1 + 2**-0.5) / 2)
+
+    def test_search_empty_index(self):
+        result = MemoryIndex([]).search([1, 0], limit=3)
+        assert result.ids == [[]]
+
+
+class FakeRedis:
+    """The few async Redis calls the cache makes, shared like a real server."""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    def pipeline(self):
+        redis = self
+
+        class Pipeline:
+            def __init__(self):
+                self.commands = []
+
+            def incr(self, key):
+                self.commands.append(key)
+
+            def expire(self, key, seconds):
+                pass
+
+            async def execute(self):
+                for key in self.commands:
+                    redis.values[key] = str(int(redis.values.get(key, 0)) + 1)
+
+        return Pipeline()
+
+
+class TestMemoryIndexCache:
+    @pytest.mark.asyncio
+    async def test_index_is_loaded_once_until_invalidated(self, monkeypatch):
+        vector_db = FakeVectorDB([item("a", [1, 0])])
+        monkeypatch.setattr(memory_index, "VECTOR_DB_CLIENT", vector_db)
+        cache = MemoryIndexCache(ttl=60)
+
+        assert len(await cache.get("user")) == 1
+        assert len(await cache.get("user")) == 1
+        assert vector_db.loads == 1
+
+        vector_db.items = [item("a", [1, 0]), item("b", [0, 1])]
+        await cache.invalidate("user")
+        assert (await cache.get("user")).search([0, 1]).ids == [["b"]]
+        assert vector_db.loads == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidation_reaches_other_workers_through_redis(self, monkeypatch):
+        vector_db = FakeVectorDB([item("a", [1, 0])])
+        monkeypatch.setattr(memory_index, "VECTOR_DB_CLIENT", vector_db)
+        redis = FakeRedis()
+        worker = MemoryIndexCache(redis, ttl=60)
+        other_worker = MemoryIndexCache(redis, ttl=60)
+
+        assert len(await worker.get("user")) == 1
+        vector_db.items = [item("a", [1, 0]), item("b", [0, 1])]
+        await other_worker.invalidate("user")
+
+        assert len(await worker.get("user")) == 2
+        assert len(await worker.get("user")) == 2
+        assert vector_db.loads == 2
+
+    @pytest.mark.asyncio
+    async def test_falls_back_when_vectors_cannot_be_read(self, monkeypatch):
+        vector_db = FakeVectorDB(None)
+        monkeypatch.setattr(memory_index, "VECTOR_DB_CLIENT", vector_db)
+
+        assert await MemoryIndexCache(ttl=60).get("user") is None
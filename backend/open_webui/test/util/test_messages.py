@@ -0,0 +1,128 @@
+from open_webui.models.channels import Channel, ChannelMember, Channels
+from open_webui.models.messages import Message, MessageForm, Messages
+
+
+def add_message(db, id: str, created_at: int, parent_id: str = None, **kwargs):
+    db.add(
+        Message(
+            id=id,
+            user_id="user",
+            channel_id="channel",
+            parent_id=parent_id,
+            content=id,
+            created_at=created_at,
+            updated_at=created_at,
+            **kwargs,
+        )
+    )
+    db.commit()
+
+
+def read_pages(get_page, limit: int) -> list[list[str]]:
+    """Follow the keyset cursor from the newest message to the end."""
+    pages, before, before_id = [], None, None
+    while True:
+        page = get_page(limit=limit, before=before, before_id=before_id)
+        pages.append([message.id for message in page])
+        if len(page) < limit:
+            return pages
+        before, before_id = page[-1].created_at, page[-1].id
+
+
+class TestMessagePages:
+    def test_ties_on_created_at_are_paged_by_id(self, db):
+        # Messages sent in the same nanosecond straddle the page boundaries
+        for id in ["a", "b", "c", "d", "e"]:
+            add_message(db, id, 200)
+        add_message(db, "newest", 300)
+        add_message(db, "oldest", 100)
+
+        pages = read_pages(
+            lambda **cursor: Messages.get_messages_by_channel_id(
+                "channel", db=db, **cursor
+            ),
+            limit=3,
+        )
+
+        assert pages == [["newest", "e", "d"], ["c", "b", "a"], ["oldest"]]
+
+    def test_cursor_without_id_skips_the_whole_timestamp(self, db):
+        add_message(db, "a", 100)
+        add_message(db, "b", 200)
+        add_message(db, "c", 200)
+
+        page = Messages.get_messages_by_channel_id("channel", before=200, db=db)
+        assert [message.id for message in page] == ["a"]
+
+    def test_thread_and_channel_pages_are_separate(self, db):
+        add_message(db, "parent", 100)
+        for idx in range(4):
+            add_message(db, f"reply-{idx}", 200 + idx, parent_id="parent")
+        add_message(db, "top", 300)
+
+        channel = Messages.get_messages_by_channel_id("channel", db=db)
+        assert [message.id for message in channel] == ["top", "parent"]
+
+        pages = read_pages(
+            lambda **cursor: Messages.get_messages_by_parent_id(
+                "channel", "parent", db=db, **cursor
+            ),
+            limit=2,
+        )
+        # The parent message closes the last page of its thread
+        assert pages == [["reply-3", "reply-2"], ["reply-1", "reply-0"], ["parent"]]
+
+
+class TestChannelCounters:
+    @staticmethod
+    def setup_channel(db):
+        db.add(Channel(id="channel", user_id="alice", name="general"))
+        db.commit()
+        for user_id in ("alice", "bob"):
+            Channels.join_channel("channel", user_id, db=db)
+
+    @staticmethod
+    def get_state(db) -> tuple[int, dict[str, int]]:
+        db.expire_all()
+        channel = db.get(Channel, "channel")
+        unread = {
+            member.user_id: member.unread_count
+            for member in db.query(ChannelMember).filter_by(channel_id="channel")
+        }
+        return channel.last_message_at, unread
+
+    def test_insert_counts_top_level_messages_from_others(self, db):
+        self.setup_channel(db)
+
+        Messages.insert_new_message(MessageForm(content="1"), "channel", "alice", db=db)
+        second = Messages.insert_new_message(
+            MessageForm(content="2"), "channel", "alice", db=db
+        )
+        reply = Messages.insert_new_message(
+            MessageForm(content="reply", parent_id=second.id), "channel", "bob", db=db
+        )
+
+        last_message_at, unread = self.get_state(db)
+        assert last_message_at == reply.created_at
+        assert unread == {"alice": 0, "bob": 2}
+
+    def test_read_resets_and_delete_undoes_only_unread(self, db):
+        self.setup_channel(db)
+        first = Messages.insert_new_message(
+            MessageForm(content="1"), "channel", "alice", db=db
+        )
+
+        Channels.update_member_last_read_at("channel", "bob", db=db)
+        assert self.get_state(db)[1]["bob"] == 0
+
+        second = Messages.insert_new_message(
+            MessageForm(content="2"), "channel", "alice", db=db
+        )
+        assert self.get_state(db) == (second.created_at, {"alice": 0, "bob": 1})
+
+        # Already read, so the unread count stays
+        Messages.delete_message_by_id(first.id, db=db)
+        assert self.get_state(db) == (second.created_at, {"alice": 0, "bob": 1})
+
+        Messages.delete_message_by_id(second.id, db=db)
+        assert self.get_state(db) == (None, {"alice": 0, "bob": 0})
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from open_webui.utils.model_cache import ModelListCache
+
+
+class FakeRedis:
+    """The string commands the model list cache uses, in memory."""
+
+    def __init__(self):
+        self.values: dict[str, str] = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, 0)) + 1)
+        return int(self.values[key])
+
+
+class FakeCache:
+    def __init__(self):
+        self.clears = 0
+
+    async def clear(self):
+        self.clears += 1
+
+
+class FakeConnection:
+    def __init__(self):
+        self.requests = 0
+
+    async def get_models(self):
+        self.requests += 1
+        await asyncio.sleep(0.01)
+        return {"models": [{"model": f"llama3:{self.requests}"}]}
+
+
+class TestModelListCache:
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_request(self):
+        cache = ModelListCache(ttl=60)
+        connection = FakeConnection()
+
+        results = await asyncio.gather(
+            *[cache.get("http://ollama", connection.get_models) for _ in range(50)]
+        )
+
+        assert connection.requests == 1
+        assert all(result == results[0] for result in results)
+
+        # Every caller gets a copy it may modify
+        results[0]["models"].clear()
+        assert (await cache.get("http://ollama", connection.get_models))["models"]
+        assert connection.requests == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_drops_lists(self):
+        cache = ModelListCache(ttl=60)
+        connection = FakeConnection()
+
+        await cache.get("http://ollama", connection.get_models)
+        await cache.invalidate()
+        result = await cache.get("http://ollama", connection.get_models)
+
+        assert connection.requests == 2
+        assert result["models"][0]["model"] == "llama3:2"
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self):
+        cache = ModelListCache(ttl=60)
+        attempts = []
+
+        async def fail():
+            attempts.append(1)
+            return None
+
+        assert await cache.get("http://ollama", fail) is None
+        assert await cache.get("http://ollama", fail) is None
+        assert len(attempts) == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_reaches_other_workers_through_redis(self):
+        redis = FakeRedis()
+        workers = [ModelListCache(ttl=60, redis=redis) for _ in range(2)]
+        merged_lists = FakeCache()
+        workers[1].register(merged_lists)
+        connection = FakeConnection()
+
+        for worker in workers:
+            await worker.get("http://ollama", connection.get_models)
+        assert connection.requests == 2
+
+        await workers[0].invalidate()
+        result = await workers[1].get("http://ollama", connection.get_models)
+
+        assert result["models"][0]["model"] == "llama3:3"
+        assert merged_lists.clears == 1
+        # Seen once, then served from the cache again
+        await workers[1].get("http://ollama", connection.get_models)
+        assert connection.requests == 3
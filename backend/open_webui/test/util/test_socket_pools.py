@@ -0,0 +1,136 @@
+import pytest
+
+from open_webui.socket.utils import (
+    RedisSessionPool,
+    RedisUsagePool,
+    SessionPool,
+    UsagePool,
+)
+
+
+class FakeRedis:
+    """The hash and sorted set commands the Redis pools use, in memory."""
+
+    def __init__(self):
+        self.hashes: dict[str, dict] = {}
+        self.sorted_sets: dict[str, dict] = {}
+
+    async def hget(self, name, key):
+        return self.hashes.get(name, {}).get(key)
+
+    async def hmget(self, name, keys):
+        return [self.hashes.get(name, {}).get(key) for key in keys]
+
+    async def hset(self, name, key, value):
+        self.hashes.setdefault(name, {})[key] = value
+
+    async def hdel(self, name, key):
+        return int(self.hashes.get(name, {}).pop(key, None) is not None)
+
+    def pipeline(self):
+        redis = self
+
+        class Pipeline:
+            def __init__(self):
+                self.commands = []
+
+            def __getattr__(self, command):
+                return lambda *args: self.commands.append((command, args))
+
+            async def execute(self):
+                return [
+                    await getattr(redis, command)(*args)
+                    for command, args in self.commands
+                ]
+
+        return Pipeline()
+
+    @staticmethod
+    def _in_range(score, min, max) -> bool:
+        def bound(value):
+            value = str(value)
+            if value.startswith("("):
+                return float(value[1:]), True
+            return float(value), False
+
+        (low, low_open), (high, high_open) = bound(min), bound(max)
+        return (score > low if low_open else score >= low) and (
+            score < high if high_open else score <= high
+        )
+
+    async def zadd(self, name, mapping):
+        self.sorted_sets.setdefault(name, {}).update(mapping)
+
+    async def zrangebyscore(self, name, min, max):
+        members = self.sorted_sets.get(name, {})
+        return [
+            member
+            for member, score in sorted(members.items(), key=lambda item: item[1])
+            if self._in_range(score, min, max)
+        ]
+
+    async def zremrangebyscore(self, name, min, max):
+        members = self.sorted_sets.get(name, {})
+        expired = [m for m, s in members.items() if self._in_range(s, min, max)]
+        for member in expired:
+            del members[member]
+        return len(expired)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def session_pool(request):
+    if request.param == "memory":
+        return SessionPool()
+    return RedisSessionPool("sessions", FakeRedis())
+
+
+@pytest.fixture(params=["memory", "redis"])
+def usage_pool(request):
+    if request.param == "memory":
+        return UsagePool()
+    return RedisUsagePool("usage", FakeRedis())
+
+
+class TestSessionPool:
+    @pytest.mark.asyncio
+    async def test_set_get_and_delete(self, session_pool):
+        user = {"id": "user", "name": "User"}
+        await session_pool.set("sid", user)
+
+        assert await session_pool.get("sid") == user
+        assert await session_pool.get("missing", {}) == {}
+
+        assert await session_pool.delete("sid") == user
+        assert await session_pool.delete("sid") is None
+        assert await session_pool.get("sid") is None
+
+    @pytest.mark.asyncio
+    async def test_get_many_keeps_order_and_gaps(self, session_pool):
+        await session_pool.set("a", {"id": "a"})
+        await session_pool.set("c", {"id": "c"})
+
+        assert await session_pool.get_many(["c", "b", "a"]) == [
+            {"id": "c"},
+            None,
+            {"id": "a"},
+        ]
+        assert await session_pool.get_many([]) == []
+
+
+class TestUsagePool:
+    @pytest.mark.asyncio
+    async def test_models_in_use_since(self, usage_pool):
+        await usage_pool.touch("old", 100)
+        await usage_pool.touch("new", 200)
+        await usage_pool.touch("old", 300)
+
+        assert sorted(await usage_pool.get_models_in_use(200)) == ["new", "old"]
+        assert await usage_pool.get_models_in_use(250) == ["old"]
+
+    @pytest.mark.asyncio
+    async def test_cleanup_removes_only_entries_before(self, usage_pool):
+        await usage_pool.touch("expired", 100)
+        await usage_pool.touch("boundary", 200)
+
+        assert await usage_pool.cleanup(200) == 1
+        assert await usage_pool.get_models_in_use(0) == ["boundary"]
@@ -0,0 +1,55 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("opentelemetry.exporter.otlp.proto.http")
+
+from open_webui.utils.telemetry import metrics
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    async def get(self, key):
+        return self.store.get(key)
+
+
+async def refresh_once(app):
+    task = asyncio.create_task(metrics.periodic_user_counts_refresh(app))
+    await asyncio.sleep(0.05)
+    task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_one_replica_counts_users_for_all(monkeypatch):
+    queries = []
+
+    def count_users():
+        queries.append(1)
+        return {"total": 10, "active": 2, "active_today": 5}
+
+    monkeypatch.setattr(metrics, "_count_users", count_users)
+    monkeypatch.setattr(metrics, "_user_counts", {})
+
+    redis = FakeRedis()
+    replicas = [
+        SimpleNamespace(state=SimpleNamespace(redis=redis, instance_id=str(idx)))
+        for idx in range(3)
+    ]
+
+    assert metrics._observe_user_count("total") == []
+
+    for app in replicas:
+        await refresh_once(app)
+
+    assert len(queries) == 1
+    assert [o.value for o in metrics._observe_user_count("total")] == [10]
+    assert [o.value for o in metrics._observe_user_count("active_today")] == [5]
@@ -0,0 +1,51 @@
+import time
+
+import pytest
+
+from open_webui.models import users
+from open_webui.models.users import UserActivityBuffer, Users
+
+
+class FakeRedis:
+    """The sorted set reads of the activity buffer, counting round trips."""
+
+    def __init__(self, scores: dict[str, float]):
+        self.scores = scores
+        self.calls = 0
+
+    def zmscore(self, name, members):
+        self.calls += 1
+        return [self.scores.get(member) for member in members]
+
+
+@pytest.fixture
+def activity(db, monkeypatch):
+    now = int(time.time())
+    for user_id, last_active_at in [("db-active", now), ("db-idle", now - 3600)]:
+        Users.insert_new_user(user_id, user_id, f"{user_id}@example.com")
+        Users.update_user_by_id(user_id, {"last_active_at": last_active_at})
+
+    buffer = UserActivityBuffer()
+    buffer._redis = FakeRedis({"redis-active": now, "redis-idle": now - 3600})
+    monkeypatch.setattr(users, "USER_ACTIVITY", buffer)
+    return buffer
+
+
+class TestUsersActive:
+    def test_one_redis_round_trip_for_all_users(self, activity):
+        user_ids = ["redis-active", "redis-idle", "db-active", "db-idle", "missing"]
+
+        assert Users.is_users_active(user_ids) == {
+            "redis-active": True,
+            "redis-idle": False,
+            "db-active": True,
+            "db-idle": False,
+            "missing": False,
+        }
+        assert activity._redis.calls == 1
+
+    def test_activity_of_this_process_counts_before_it_is_flushed(self, activity):
+        activity.record("db-idle")
+
+        assert Users.is_user_active("db-idle")
+        assert not Users.is_user_active("redis-idle")
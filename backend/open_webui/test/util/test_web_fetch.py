@@ -0,0 +1,98 @@
+import socket
+import time
+
+import pytest
+from aiohttp import web
+
+from open_webui.retrieval.web import cache as cache_module
+from open_webui.retrieval.web import utils as web_utils
+from open_webui.retrieval.web.cache import WebSearchCache
+from open_webui.retrieval.web.utils import SafeResolver, SafeWebBaseLoader
+
+
+def addr_info(*ips: str) -> list:
+    return [
+        (socket.AF_INET6 if ":" in ip else socket.AF_INET, 0, 0, "", (ip, 0))
+        for ip in ips
+    ]
+
+
+@pytest.fixture
+def resolutions(monkeypatch):
+    """Hostnames passed to getaddrinfo, which answers 93.184.216.34."""
+    monkeypatch.setattr(web_utils, "_dns_cache", {})
+
+    calls = []
+
+    def getaddrinfo(hostname, port):
+        calls.append(hostname)
+        return addr_info("93.184.216.34", "93.184.216.34", "2606:2800::1")
+
+    monkeypatch.setattr(web_utils.socket, "getaddrinfo", getaddrinfo)
+    return calls
+
+
+class TestDNSCache:
+    def test_resolution_is_cached_until_ttl(self, resolutions, monkeypatch):
+        now = time.monotonic()
+        monkeypatch.setattr(web_utils.time_module, "monotonic", lambda: now)
+
+        assert web_utils.resolve_hostname("example.com") == (
+            ["93.184.216.34"],
+            ["2606:2800::1"],
+        )
+        web_utils.resolve_hostname("example.com")
+        assert resolutions == ["example.com"]
+
+        monkeypatch.setattr(
+            web_utils.time_module,
+            "monotonic",
+            lambda: now + web_utils.DNS_CACHE_TTL + 1,
+        )
+        web_utils.resolve_hostname("example.com")
+        assert resolutions == ["example.com"] * 2
+
+    @pytest.mark.asyncio
+    async def test_resolver_connects_to_the_checked_addresses(self, monkeypatch):
+        monkeypatch.setattr(web_utils, "ENABLE_RAG_LOCAL_WEB_FETCH", False)
+        monkeypatch.setattr(web_utils, "_dns_cache", {})
+        web_utils._cache_resolution("public.test", addr_info("93.184.216.34"))
+        web_utils._cache_resolution("private.test", addr_info("10.0.0.1"))
+
+        resolved = await SafeResolver().resolve("public.test", 443)
+        assert [(r["host"], r["port"]) for r in resolved] == [("93.184.216.34", 443)]
+
+        with pytest.raises(OSError):
+            await SafeResolver().resolve("private.test", 443)
+
+
+class TestPageRevalidation:
+    @pytest.mark.asyncio
+    async def test_stale_page_is_revalidated(self, serve_app, monkeypatch):
+        requests = []
+
+        async def page(request: web.Request) -> web.Response:
+            requests.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return web.Response(status=304)
+            return web.Response(text="<p>Page</p>", headers={"ETag": '"v1"'})
+
+        app = web.Application()
+        app.router.add_get("/page", page)
+        url = f"{await serve_app(app)}/page"
+
+        page_cache = WebSearchCache(None, search_ttl=0, collection_ttl=0, fetch_ttl=60)
+        monkeypatch.setattr(web_utils, "WEB_SEARCH_CACHE", page_cache)
+        monkeypatch.setattr(web_utils, "ENABLE_RAG_LOCAL_WEB_FETCH", True)
+        loader = SafeWebBaseLoader(web_path=[url])
+
+        assert await loader.fetch_all([url]) == ["<p>Page</p>"]
+        # Fresh: served from the cache
+        assert await loader.fetch_all([url]) == ["<p>Page</p>"]
+        assert requests == [None]
+
+        now = time.time()
+        monkeypatch.setattr(cache_module.time, "time", lambda: now + 61)
+        # Stale: revalidated, and the 304 keeps the cached text
+        assert await loader.fetch_all([url]) == ["<p>Page</p>"]
+        assert requests == [None, '"v1"']
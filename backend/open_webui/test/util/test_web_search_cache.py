@@ -0,0 +1,108 @@
+import time
+
+import pytest
+
+from open_webui.retrieval.web import cache as cache_module
+from open_webui.retrieval.web.cache import WebSearchCache
+
+
+class FakeRedis:
+    """The string and sorted set commands the web search cache uses, in memory."""
+
+    def __init__(self):
+        self.values: dict[str, tuple[str, int]] = {}
+        self.sorted_sets: dict[str, dict] = {}
+
+    async def get(self, key):
+        entry = self.values.get(key)
+        return entry[0] if entry else None
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = (value, ex)
+
+    async def zadd(self, name, mapping):
+        self.sorted_sets.setdefault(name, {}).update(mapping)
+
+    async def zrangebyscore(self, name, min, max):
+        members = self.sorted_sets.get(name, {})
+        return [m for m, score in members.items() if min <= score <= max]
+
+    async def zrem(self, name, member):
+        return int(self.sorted_sets.get(name, {}).pop(member, None) is not None)
+
+
+def make_cache(redis=None, **kwargs) -> WebSearchCache:
+    kwargs = {"search_ttl": 60, "collection_ttl": 60, "fetch_ttl": 60, **kwargs}
+    return WebSearchCache(redis, **kwargs)
+
+
+class TestSearchResults:
+    def test_search_key_ignores_query_order_case_and_spacing(self):
+        cache = make_cache()
+        key = cache.get_search_key("engine", ["Open  WebUI", "python"], ["3"])
+
+        assert cache.get_search_key("engine", ["python", "open webui "], ["3"]) == key
+        assert cache.get_search_key("engine", ["open webui", "python"], ["5"]) != key
+        assert cache.get_search_key("other", ["open webui", "python"], ["3"]) != key
+
+    @pytest.mark.asyncio
+    async def test_memory_entries_expire(self, monkeypatch):
+        cache = make_cache(search_ttl=10)
+        now = time.time()
+        monkeypatch.setattr(cache_module.time, "time", lambda: now)
+
+        await cache.set_search_results("engine", "query", [{"link": "a"}])
+        assert await cache.get_search_results("engine", " QUERY") == [{"link": "a"}]
+
+        monkeypatch.setattr(cache_module.time, "time", lambda: now + 11)
+        assert await cache.get_search_results("engine", "query") is None
+
+    @pytest.mark.asyncio
+    async def test_disabled_when_ttl_is_zero(self):
+        cache = make_cache(search_ttl=0)
+
+        await cache.set_search_results("engine", "query", [{"link": "a"}])
+        assert await cache.get_search_results("engine", "query") is None
+
+    @pytest.mark.asyncio
+    async def test_response_never_outlives_its_collections(self):
+        redis = FakeRedis()
+        cache = make_cache(redis, search_ttl=600, collection_ttl=60)
+
+        await cache.set_response("plain", {"docs": []})
+        await cache.set_response("indexed", {"collection_names": ["web-search-1"]})
+
+        assert redis.values[cache._key("response", "plain")][1] == 600
+        assert redis.values[cache._key("response", "indexed")][1] == 60
+        assert await cache.get_response("plain") == {"docs": []}
+
+
+class TestCollections:
+    @pytest.mark.asyncio
+    async def test_expired_collections_are_popped_once_from_redis(self, monkeypatch):
+        cache = make_cache(FakeRedis(), collection_ttl=10)
+        now = time.time()
+        monkeypatch.setattr(cache_module.time, "time", lambda: now)
+        await cache.register_collection("web-search-1")
+
+        assert await cache.pop_expired_collections() == []
+        monkeypatch.setattr(cache_module.time, "time", lambda: now + 10)
+        assert await cache.pop_expired_collections() == ["web-search-1"]
+        assert await cache.pop_expired_collections() == []
+
+    @pytest.mark.asyncio
+    async def test_file_registry_is_shared_between_workers(self, tmp_path, monkeypatch):
+        workers = [
+            make_cache(collection_ttl=10, registry_dir=str(tmp_path)) for _ in range(2)
+        ]
+        now = time.time()
+        monkeypatch.setattr(cache_module.time, "time", lambda: now)
+        await workers[0].register_collection("web-search-1")
+        await workers[1].register_collection("web-search-2")
+
+        monkeypatch.setattr(cache_module.time, "time", lambda: now + 10)
+        assert sorted(await workers[1].pop_expired_collections()) == [
+            "web-search-1",
+            "web-search-2",
+        ]
+        assert await workers[0].pop_expired_collections() == []
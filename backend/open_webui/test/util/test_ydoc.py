@@ -0,0 +1,66 @@
+import pycrdt as Y
+import pytest
+
+from open_webui.socket.utils import YdocManager
+
+
+def edit(ydoc: Y.Doc, text: str) -> bytes:
+    """Append text to the document and return the update it produced."""
+    before = ydoc.get_state()
+    content = ydoc.get("content", type=Y.Text)
+    content.insert(len(content), text)
+    return ydoc.get_update(before)
+
+
+def read(update: bytes, ydoc: Y.Doc = None) -> str:
+    ydoc = ydoc or Y.Doc()
+    ydoc.apply_update(update)
+    return str(ydoc.get("content", type=Y.Text))
+
+
+class TestYdocManager:
+    @pytest.mark.asyncio
+    async def test_updates_are_compacted_into_a_snapshot(self):
+        manager = YdocManager(compaction_threshold=3)
+        ydoc = Y.Doc()
+
+        for text in ["a", "b"]:
+            await manager.append_to_updates("note:1", edit(ydoc, text))
+        assert len(await manager.get_updates("note:1")) == 2
+
+        await manager.append_to_updates("note:1", edit(ydoc, "c"))
+        await manager.append_to_updates("note:1", edit(ydoc, "d"))
+
+        # The snapshot of the first three updates, then the one after it
+        updates = await manager.get_updates("note:1")
+        assert len(updates) == 2
+        assert read(updates[0]) == "abc"
+        assert read(await manager.get_state("note:1")) == "abcd"
+
+    @pytest.mark.asyncio
+    async def test_join_only_sends_missing_changes(self):
+        manager = YdocManager()
+        ydoc = Y.Doc()
+        await manager.append_to_updates("note:1", edit(ydoc, "x" * 1000))
+
+        client = Y.Doc()
+        client.apply_update(await manager.get_state("note:1"))
+        await manager.append_to_updates("note:1", edit(ydoc, "y"))
+
+        diff = await manager.get_state("note:1", client.get_state())
+        assert len(diff) < len(await manager.get_state("note:1")) / 10
+        assert read(diff, client) == "x" * 1000 + "y"
+
+    @pytest.mark.asyncio
+    async def test_last_session_leaving_clears_the_document(self):
+        manager = YdocManager()
+        await manager.append_to_updates("note:1", edit(Y.Doc(), "a"))
+        await manager.add_user("note:1", "sid-1")
+        await manager.add_user("note:1", "sid-2")
+
+        await manager.remove_user_from_all_documents("sid-1")
+        assert await manager.document_exists("note:1")
+        assert await manager.get_users("note:1") == ["sid-2"]
+
+        await manager.remove_user_from_all_documents("sid-2")
+        assert not await manager.document_exists("note:1")
@@ -0,0 +1,320 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+from open_webui.constants import ERROR_MESSAGES
+from open_webui.env import (
+    CHAT_MAX_CONCURRENT_TASKS,
+    CHAT_MAX_CONCURRENT_TASKS_PER_MODEL,
+    CHAT_MAX_CONCURRENT_TASKS_PER_USER,
+    CHAT_TASK_QUEUE_TIMEOUT,
+    REDIS_KEY_PREFIX,
+)
+from open_webui.socket.main import get_event_emitter
+
+log = logging.getLogger(__name__)
+
+# Seconds between admission attempts while tasks are queued, so that slots
+# released on other replicas are picked up
+ADMISSION_POLL_INTERVAL = 1
+
+# Seconds a Redis slot is held without being renewed; slots of a replica that
+# went away free up on their own
+ADMISSION_LEASE_TIMEOUT = 60
+
+# The hash tag keeps every slot set in one cluster slot for the script
+REDIS_ADMISSION_KEY_PREFIX = f"{REDIS_KEY_PREFIX}:{{admission}}"
+
+# KEYS: slot sets, ARGV: now, lease expiry, ticket id, limit per key.
+# Returns 0 when admitted, otherwise the index of the first full slot set.
+REDIS_ACQUIRE_SCRIPT = """
+local now = tonumber(ARGV[1])
+for i, key in ipairs(KEYS) do
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now)
+    if redis.call('ZCARD', key) >= tonumber(ARGV[i + 3]) then
+        return i
+    end
+end
+for _, key in ipairs(KEYS) do
+    redis.call('ZADD', key, ARGV[2], ARGV[3])
+end
+return 0
+"""
+
+
+class AdmissionTicket:
+    def __init__(
+        self,
+        user_id: str,
+        model_id: str,
+        on_position: Optional[Callable[[Optional[int]], Awaitable]] = None,
+    ):
+        self.id = str(uuid.uuid4())
+        self.user_id = user_id
+        self.model_id = model_id
+        self.on_position = on_position
+
+        # Names of the slot sets this ticket counts against, global first
+        self.limits: list[tuple[str, int]] = []
+        self.admitted = asyncio.Event()
+        self.position: Optional[int] = None
+        self.renewal: Optional[asyncio.Task] = None
+
+
+class AdmissionController:
+    """
+    Limits how many chat tasks run at once overall, per user and per model.
+
+    Tasks over a limit wait in a queue that takes turns between users, so one
+    user sending many requests cannot hold back everyone else. With Redis the
+    limits hold across all replicas, while each replica queues its own tasks.
+    """
+
+    def __init__(
+        self,
+        redis=None,
+        limit: int = CHAT_MAX_CONCURRENT_TASKS,
+        user_limit: int = CHAT_MAX_CONCURRENT_TASKS_PER_USER,
+        model_limits: Optional[dict] = None,
+        queue_timeout: int = CHAT_TASK_QUEUE_TIMEOUT,
+    ):
+        self._redis = redis
+        self.limit = limit
+        self.user_limit = user_limit
+        self.model_limits = (
+            CHAT_MAX_CONCURRENT_TASKS_PER_MODEL
+            if model_limits is None
+            else model_limits
+        )
+        self.queue_timeout = queue_timeout
+
+        # user_id -> queued tickets; users take turns in insertion order
+        self._queue: dict[str, deque[AdmissionTicket]] = {}
+        # slot set name -> ids of the tickets holding it, without Redis
+        self._slots: dict[str, set[str]] = {}
+
+        self._lock = asyncio.Lock()
+        self._poller: Optional[asyncio.Task] = None
+
+    def get_limits(self, user_id: str, model_id: str) -> list[tuple[str, int]]:
+        limits = []
+        if self.limit > 0:
+            limits.append(("global", self.limit))
+        if self.user_limit > 0:
+            limits.append((f"user:{user_id}", self.user_limit))
+
+        model_limit = self.model_limits.get(model_id, self.model_limits.get("*", 0))
+        if model_limit and int(model_limit) > 0:
+            limits.append((f"model:{model_id}", int(model_limit)))
+        return limits
+
+    def get_queue(self) -> list[AdmissionTicket]:
+        """Queued tickets in admission order, one per user per round."""
+        queues = list(self._queue.values())
+        order = []
+        for idx in range(max((len(queue) for queue in queues), default=0)):
+            order.extend(queue[idx] for queue in queues if idx < len(queue))
+        return order
+
+    ####################
+    # Slots
+    ####################
+
+    async def _try_acquire(self, ticket: AdmissionTicket) -> int:
+        """0 when the ticket got its slots, else the 1-based index of a full one."""
+        if self._redis:
+            now = time.time()
+            return int(
+                await self._redis.eval(
+                    REDIS_ACQUIRE_SCRIPT,
+                    len(ticket.limits),
+                    *[
+                        f"{REDIS_ADMISSION_KEY_PREFIX}:{name}"
+                        for name, _ in ticket.limits
+                    ],
+                    now,
+                    now + ADMISSION_LEASE_TIMEOUT,
+                    ticket.id,
+                    *[limit for _, limit in ticket.limits],
+                )
+            )
+
+        for idx, (name, limit) in enumerate(ticket.limits):
+            if len(self._slots.get(name, ())) >= limit:
+                return idx + 1
+        for name, _ in ticket.limits:
+            self._slots.setdefault(name, set()).add(ticket.id)
+        return 0
+
+    async def _release_slots(self, ticket: AdmissionTicket):
+        if self._redis:
+            pipe = self._redis.pipeline()
+            for name, _ in ticket.limits:
+                pipe.zrem(f"{REDIS_ADMISSION_KEY_PREFIX}:{name}", ticket.id)
+            await pipe.execute()
+            return
+
+        for name, _ in ticket.limits:
+            slots = self._slots.get(name)
+            if slots is not None:
+                slots.discard(ticket.id)
+                if not slots:
+                    del self._slots[name]
+
+    async def _renew(self, ticket: AdmissionTicket):
+        while True:
+            await asyncio.sleep(ADMISSION_LEASE_TIMEOUT / 3)
+            try:
+                pipe = self._redis.pipeline()
+                for name, _ in ticket.limits:
+                    pipe.zadd(
+                        f"{REDIS_ADMISSION_KEY_PREFIX}:{name}",
+                        {ticket.id: time.time() + ADMISSION_LEASE_TIMEOUT},
+                        xx=True,
+                    )
+                await pipe.execute()
+            except Exception as e:
+                log.debug(f"Failed to renew admission of {ticket.id}: {e}")
+
+    ####################
+    # Queue
+    ####################
+
+    def _dequeue(self, ticket: AdmissionTicket, rotate: bool = False):
+        queue = self._queue.get(ticket.user_id)
+        if queue is None or ticket not in queue:
+            return
+
+        queue.remove(ticket)
+        if not queue:
+            del self._queue[ticket.user_id]
+        elif rotate:
+            # The user had a turn, their next ticket waits behind other users
+            del self._queue[ticket.user_id]
+            self._queue[ticket.user_id] = queue
+
+    async def _dispatch(self):
+        notifications = []
+        async with self._lock:
+            for ticket in self.get_queue():
+                full = await self._try_acquire(ticket)
+                if full == 0:
+                    if ticket not in self._queue.get(ticket.user_id, ()):
+                        # Cancelled while the slots were being taken
+                        await self._release_slots(ticket)
+                        continue
+                    self._dequeue(ticket, rotate=True)
+                    ticket.admitted.set()
+                elif self.limit > 0 and full == 1:
+                    # Nothing else can start until a task finishes
+                    break
+
+            for position, ticket in enumerate(self.get_queue(), start=1):
+                if ticket.position != position:
+                    ticket.position = position
+                    notifications.append((ticket, position))
+
+        for ticket, position in notifications:
+            await self._notify(ticket, position)
+
+    async def _poll(self):
+        while self._queue:
+            await asyncio.sleep(ADMISSION_POLL_INTERVAL)
+            try:
+                await self._dispatch()
+            except Exception as e:
+                log.exception(f"Error admitting queued tasks: {e}")
+        self._poller = None
+
+    async def _notify(self, ticket: AdmissionTicket, position: Optional[int]):
+        if ticket.on_position is None:
+            return
+        try:
+            await ticket.on_position(position)
+        except Exception as e:
+            log.debug(f"Failed to send queue position of {ticket.id}: {e}")
+
+    ####################
+    # API
+    ####################
+
+    async def acquire(
+        self,
+        user_id: str,
+        model_id: str,
+        on_position: Optional[Callable[[Optional[int]], Awaitable]] = None,
+    ) -> AdmissionTicket:
+        """
+        Wait until the task may run. on_position is called with the place in
+        the queue whenever it changes, and with None once the task is admitted.
+        Pair with release.
+        """
+        ticket = AdmissionTicket(user_id, model_id, on_position)
+        ticket.limits = self.get_limits(user_id, model_id)
+        if not ticket.limits:
+            return ticket
+
+        self._queue.setdefault(user_id, deque()).append(ticket)
+        if self._redis and self._poller is None:
+            self._poller = asyncio.create_task(self._poll())
+
+        try:
+            await self._dispatch()
+            if not ticket.admitted.is_set():
+                log.info(f"Chat task of user {user_id} queued for model {model_id}")
+                try:
+                    await asyncio.wait_for(
+                        ticket.admitted.wait(),
+                        timeout=self.queue_timeout if self.queue_timeout > 0 else None,
+                    )
+                except asyncio.TimeoutError:
+                    if not ticket.admitted.is_set():
+                        self._dequeue(ticket)
+                        raise Exception(ERROR_MESSAGES.SERVER_BUSY)
+        except BaseException:
+            if ticket.admitted.is_set():
+                await self._release_slots(ticket)
+            else:
+                self._dequeue(ticket)
+            raise
+
+        if ticket.position is not None:
+            await self._notify(ticket, None)
+        if self._redis:
+            ticket.renewal = asyncio.create_task(self._renew(ticket))
+        return ticket
+
+    async def release(self, ticket: AdmissionTicket):
+        if ticket.renewal is not None:
+            ticket.renewal.cancel()
+            ticket.renewal = None
+
+        if not ticket.admitted.is_set():
+            return
+        ticket.admitted.clear()
+
+        await self._release_slots(ticket)
+        if self._queue:
+            await self._dispatch()
+
+
+def get_queue_position_emitter(request_info):
+    """Show the queue position of a chat task as a status of its message."""
+    event_emitter = get_event_emitter(request_info, update_db=False)
+
+    async def emit_queue_position(position: Optional[int]):
+        if position is None:
+            data = {"action": "queue", "description": "", "done": True, "hidden": True}
+        else:
+            data = {
+                "action": "queue",
+                "position": position,
+                "description": "Waiting in queue, position {{position}}",
+                "done": False,
+            }
+        await event_emitter({"type": "status", "data": data})
+
+    return emit_queue_position
@@ -0,0 +1,183 @@
+import logging
+import math
+import os
+from typing import Optional
+
+import numpy as np
+from pydub import AudioSegment
+from pydub.silence import detect_silence
+
+log = logging.getLogger(__name__)
+
+# Whisper models work on 16 kHz mono input, so decoding straight to that
+# format is both the smallest and the only representation we ever need.
+PCM_SAMPLE_RATE = 16000
+PCM_SAMPLE_WIDTH = 2
+
+CHUNK_FORMAT = "mp3"
+CHUNK_BITRATE = "32k"
+
+# Headroom for container overhead and encoder variance when estimating the
+# encoded size of a chunk from its duration.
+CHUNK_SIZE_SAFETY_FACTOR = 0.9
+
+MIN_CHUNK_MS = 5 * 1000
+SILENCE_SEARCH_WINDOW_MS = 30 * 1000
+MIN_SILENCE_LEN_MS = 500
+
+
+def load_audio_pcm(file_path: str) -> AudioSegment:
+    """Decode an audio file once into 16 kHz mono 16-bit PCM."""
+    audio = AudioSegment.from_file(file_path)
+    return (
+        audio.set_frame_rate(PCM_SAMPLE_RATE)
+        .set_channels(1)
+        .set_sample_width(PCM_SAMPLE_WIDTH)
+    )
+
+
+def audio_to_float32(audio: AudioSegment) -> np.ndarray:
+    """Convert a 16-bit PCM segment into the float32 array faster-whisper accepts."""
+    samples = np.array(audio.get_array_of_samples(), dtype=np.float32)
+    return samples / float(1 << (8 * audio.sample_width - 1))
+
+
+def get_max_chunk_duration_ms(max_bytes: int, bitrate: str = CHUNK_BITRATE) -> int:
+    """Longest chunk duration whose encoded size stays below max_bytes."""
+    bits_per_second = int(bitrate.lower().rstrip("k")) * 1000
+    duration_ms = max_bytes * 8 / bits_per_second * 1000 * CHUNK_SIZE_SAFETY_FACTOR
+    return max(int(duration_ms), MIN_CHUNK_MS)
+
+
+def find_split_points(
+    audio: AudioSegment,
+    target_ms: int,
+    window_ms: int = SILENCE_SEARCH_WINDOW_MS,
+    min_silence_len: int = MIN_SILENCE_LEN_MS,
+    silence_thresh: Optional[float] = None,
+) -> list[int]:
+    """
+    Return the offsets (in ms) at which the audio should be cut so that no
+    chunk is longer than target_ms.
+
+    Each cut is placed in the middle of the longest silence found in the
+    window just before the target duration, falling back to a hard cut when
+    the window contains no silence. Only the window is scanned, so the cost
+    is linear in the number of chunks rather than in the audio length.
+    """
+    duration_ms = len(audio)
+    if duration_ms <= target_ms:
+        return []
+
+    if silence_thresh is None:
+        silence_thresh = audio.dBFS - 16 if audio.dBFS != -math.inf else -50
+
+    window_ms = min(window_ms, target_ms // 2)
+
+    points = []
+    start = 0
+    while duration_ms - start > target_ms:
+        end = start + target_ms
+        window_start = end - window_ms
+
+        silences = detect_silence(
+            audio[window_start:end],
+            min_silence_len=min_silence_len,
+            silence_thresh=silence_thresh,
+            seek_step=10,
+        )
+
+        if silences:
+            silence_start, silence_end = max(silences, key=lambda s: s[1] - s[0])
+            cut = window_start + (silence_start + silence_end) // 2
+        else:
+            cut = end
+
+        points.append(cut)
+        start = cut
+
+    return points
+
+
+def convert_audio_to_mp3(file_path: str) -> Optional[str]:
+    """Convert an audio file to mp3 next to it, for APIs that only take mp3 or wav."""
+    try:
+        output_path = os.path.splitext(file_path)[0] + ".mp3"
+        audio = AudioSegment.from_file(file_path)
+        audio.export(output_path, format="mp3")
+        log.info(f"Converted {file_path} to {output_path}")
+        return output_path
+    except Exception as e:
+        log.error(f"Error converting audio file: {e}")
+        return None
+
+
+def split_audio_segments(
+    audio: AudioSegment, target_ms: int, **kwargs
+) -> list[AudioSegment]:
+    """Split a decoded segment on silence into chunks no longer than target_ms."""
+    bounds = [0, *find_split_points(audio, target_ms, **kwargs), len(audio)]
+    return [audio[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+def export_audio_chunks(
+    chunks: list[AudioSegment],
+    base_path: str,
+    max_bytes: int,
+    format: str = CHUNK_FORMAT,
+    bitrate: str = CHUNK_BITRATE,
+) -> list[str]:
+    """
+    Encode every chunk exactly once and return the written file paths.
+    Raises if an encoded chunk still exceeds max_bytes.
+    """
+    chunk_paths = []
+    try:
+        for i, chunk in enumerate(chunks):
+            chunk_path = f"{base_path}_chunk_{i}.{format}"
+            chunk.export(chunk_path, format=format, bitrate=bitrate)
+            chunk_paths.append(chunk_path)
+
+            if os.path.getsize(chunk_path) > max_bytes:
+                raise Exception("Audio chunk cannot be reduced below max file size.")
+    except Exception:
+        for chunk_path in chunk_paths:
+            if os.path.isfile(chunk_path):
+                os.remove(chunk_path)
+        raise
+
+    return chunk_paths
+
+
+def prepare_audio_chunk_files(
+    file_path: str, max_bytes: int, conversion_required: bool = False
+) -> list[str]:
+    """
+    Produce upload-ready chunk files for a remote transcription engine.
+
+    Files that are already in a supported format and under max_bytes are
+    returned untouched. Everything else is decoded once to 16 kHz mono PCM,
+    split on silence at the duration that fits max_bytes and encoded once.
+    """
+    if not conversion_required and os.path.getsize(file_path) <= max_bytes:
+        return [file_path]
+
+    audio = load_audio_pcm(file_path)
+    chunks = split_audio_segments(
+        audio, get_max_chunk_duration_ms(max_bytes, CHUNK_BITRATE)
+    )
+
+    log.debug(f"Split {file_path} ({len(audio)}ms) into {len(chunks)} chunk(s)")
+    return export_audio_chunks(chunks, os.path.splitext(file_path)[0], max_bytes)
+
+
+def prepare_audio_chunk_arrays(
+    file_path: str, num_chunks: int, min_chunk_ms: int = 60 * 1000
+) -> list[np.ndarray]:
+    """
+    Decode once and split on silence into roughly num_chunks in-memory
+    float32 arrays, ready to be fed to a local faster-whisper model.
+    """
+    audio = load_audio_pcm(file_path)
+    target_ms = max(math.ceil(len(audio) / max(num_chunks, 1)), min_chunk_ms)
+    return [audio_to_float32(chunk) for chunk in split_audio_segments(audio, target_ms)]
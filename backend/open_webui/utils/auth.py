@@ -349,10 +349,8 @@ async def get_current_user(
                     current_span.set_attribute("client.user.role", user.role)
                     current_span.set_attribute("client.auth.type", "jwt")
 
-                # Refresh the user's last active timestamp asynchronously
-                # to prevent blocking the request
-                if background_tasks:
-                    background_tasks.add_task(Users.update_last_active_by_id, user.id)
+                # Only recorded in memory, written out in bulk periodically
+                Users.update_last_active_by_id(user.id)
             return user
         else:
             raise HTTPException(
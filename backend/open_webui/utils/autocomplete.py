@@ -0,0 +1,97 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from open_webui.env import AUTOCOMPLETE_GENERATION_CACHE_TTL
+
+
+def get_autocomplete_context_key(
+    model_id: str, type: Optional[str], messages: Optional[list[dict]]
+) -> str:
+    """Suggestions are only reused for the same model, completion type and chat history."""
+    return hashlib.sha256(
+        json.dumps([model_id, type, messages], sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def get_autocomplete_text(res: dict) -> Optional[str]:
+    """The suggestion in a task model response, parsed the same way as in the frontend."""
+    try:
+        content = res["choices"][0]["message"]["content"] or ""
+    except (KeyError, IndexError, TypeError):
+        return None
+
+    start, end = content.find("{"), content.rfind("}")
+    if start == -1 or end == -1:
+        return content
+
+    try:
+        return json.loads(content[start : end + 1]).get("text") or ""
+    except Exception:
+        return content
+
+
+class AutocompleteCache:
+    """
+    Recent autocompletions of each user. A suggestion keeps being served
+    while the user types along it: as long as the new text extends the prompt
+    it was generated for and is still a prefix of prompt + suggestion, the
+    rest of the suggestion is returned without calling the task model.
+    """
+
+    def __init__(
+        self,
+        ttl: int = AUTOCOMPLETE_GENERATION_CACHE_TTL,
+        max_entries: int = 8,
+        max_users: int = 1000,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_users = max_users
+
+        # user id -> [(expires at, context key, prompt, completed texts)]
+        self._entries: OrderedDict[str, list[tuple[float, str, str, list[str]]]] = (
+            OrderedDict()
+        )
+
+    def get(self, user_id: str, context_key: str, prompt: str) -> Optional[str]:
+        """The rest of a cached suggestion that prompt follows, if any."""
+        if not self.ttl or not prompt:
+            return None
+
+        now = time.monotonic()
+        entries = [entry for entry in self._entries.get(user_id, []) if entry[0] > now]
+        if not entries:
+            self._entries.pop(user_id, None)
+            return None
+        self._entries[user_id] = entries
+
+        for _, key, cached_prompt, texts in reversed(entries):
+            if key != context_key or not prompt.startswith(cached_prompt):
+                continue
+            for text in texts:
+                if len(text) > len(prompt) and text.startswith(prompt):
+                    return text[len(prompt) :]
+        return None
+
+    def set(self, user_id: str, context_key: str, prompt: str, suggestion: str):
+        if not self.ttl or not prompt or not suggestion.strip():
+            return
+
+        texts = [prompt + suggestion]
+        if not prompt[-1].isspace() and not suggestion[0].isspace():
+            # Models often leave out the space between the text and its
+            # continuation, which the user then types themselves
+            texts.append(f"{prompt} {suggestion}")
+
+        entries = self._entries.pop(user_id, [])
+        entries.append((time.monotonic() + self.ttl, context_key, prompt, texts))
+        self._entries[user_id] = entries[-self.max_entries :]
+
+        while len(self._entries) > self.max_users:
+            self._entries.popitem(last=False)
+
+
+AUTOCOMPLETIONS = AutocompleteCache()
@@ -0,0 +1,151 @@
+import logging
+import random
+import time
+from typing import Optional
+
+from open_webui.env import (
+    OLLAMA_CIRCUIT_BREAKER_COOLDOWN,
+    OLLAMA_CIRCUIT_BREAKER_THRESHOLD,
+    OLLAMA_COLD_LOAD_PENALTY,
+    OLLAMA_LOADED_MODELS_REFRESH_INTERVAL,
+)
+
+log = logging.getLogger(__name__)
+
+
+class OllamaNode:
+    def __init__(self):
+        self.in_flight = 0
+        self.failures = 0
+        self.ejected_until = 0.0
+        # Models in memory on the node, as reported by /api/ps
+        self.loaded_models: set[str] = set()
+
+
+class OllamaLoadBalancer:
+    """
+    Picks the Ollama node a request for a model goes to.
+
+    Nodes are scored by their requests in flight from this process, plus a
+    penalty when the model is not loaded there yet, so requests stick to warm
+    nodes until those are clearly busier than a cold one. Nodes that fail
+    repeatedly are skipped for a cooldown, after which a single request is let
+    through to probe them.
+    """
+
+    def __init__(
+        self,
+        cold_load_penalty: int = OLLAMA_COLD_LOAD_PENALTY,
+        failure_threshold: int = OLLAMA_CIRCUIT_BREAKER_THRESHOLD,
+        cooldown: int = OLLAMA_CIRCUIT_BREAKER_COOLDOWN,
+        refresh_interval: int = OLLAMA_LOADED_MODELS_REFRESH_INTERVAL,
+    ):
+        self.cold_load_penalty = cold_load_penalty
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.refresh_interval = refresh_interval
+
+        # base url -> node state
+        self.nodes: dict[str, OllamaNode] = {}
+        self.loaded_models_updated_at = 0.0
+
+    def get_node(self, url: str) -> OllamaNode:
+        node = self.nodes.get(url)
+        if node is None:
+            node = self.nodes[url] = OllamaNode()
+        return node
+
+    def is_available(self, url: str) -> bool:
+        return self.get_node(url).ejected_until <= time.monotonic()
+
+    def needs_refresh(self) -> bool:
+        return time.monotonic() - self.loaded_models_updated_at >= self.refresh_interval
+
+    ####################
+    # Selection
+    ####################
+
+    def get_score(self, url: str, model: Optional[str]) -> int:
+        node = self.get_node(url)
+        score = node.in_flight
+        if model is not None and model not in node.loaded_models:
+            score += self.cold_load_penalty
+        return score
+
+    def select(self, candidates: dict[int, str], model: Optional[str] = None) -> int:
+        """
+        Index of the node to use among candidates, a mapping of url_idx to
+        base url. When every candidate is ejected they are all tried anyway,
+        so an outage surfaces as the backend's own error.
+        """
+        if not candidates:
+            raise ValueError("No Ollama nodes to select from")
+
+        available = {
+            idx: url for idx, url in candidates.items() if self.is_available(url)
+        }
+        if not available:
+            available = candidates
+
+        scores = {idx: self.get_score(url, model) for idx, url in available.items()}
+        lowest = min(scores.values())
+        url_idx = random.choice(
+            [idx for idx, score in scores.items() if score == lowest]
+        )
+
+        url = candidates[url_idx]
+        node = self.get_node(url)
+        if node.ejected_until:
+            # Half-open: hold the node back again until this probe reports
+            node.ejected_until = time.monotonic() + self.cooldown
+        if model is not None:
+            # Ollama loads the model for this request
+            node.loaded_models.add(model)
+        return url_idx
+
+    ####################
+    # Request tracking
+    ####################
+
+    def start_request(self, url: str):
+        self.get_node(url).in_flight += 1
+
+    def finish_request(self, url: str, failed: bool = False):
+        node = self.get_node(url)
+        node.in_flight = max(node.in_flight - 1, 0)
+        if failed:
+            self.record_failure(url)
+        else:
+            self.record_success(url)
+
+    def record_success(self, url: str):
+        node = self.get_node(url)
+        node.failures = 0
+        node.ejected_until = 0.0
+
+    def record_failure(self, url: str):
+        node = self.get_node(url)
+        node.failures += 1
+        if node.failures >= self.failure_threshold:
+            if node.failures == self.failure_threshold:
+                log.warning(
+                    f"Ollama node {url} failed {node.failures} times in a row, "
+                    f"skipping it for {self.cooldown}s"
+                )
+            node.ejected_until = time.monotonic() + self.cooldown
+
+    def set_loaded_models(self, loaded_models: dict[str, Optional[list[str]]]):
+        """
+        Update from /api/ps, given as base url -> model names. None marks a
+        node that could not be reached, which counts as a failure.
+        """
+        for url, models in loaded_models.items():
+            if models is None:
+                self.record_failure(url)
+            else:
+                self.get_node(url).loaded_models = set(models)
+                self.record_success(url)
+        self.loaded_models_updated_at = time.monotonic()
+
+
+OLLAMA_BALANCER = OllamaLoadBalancer()
@@ -2,12 +2,17 @@ import asyncio
 import json
 import logging
 import uuid
+from collections import deque
 from typing import Optional
 
 import aiohttp
 import websockets
 from pydantic import BaseModel
 
+from open_webui.env import (
+    CODE_INTERPRETER_JUPYTER_KERNEL_MAX_USES,
+    CODE_INTERPRETER_JUPYTER_KERNEL_POOL_SIZE,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +39,7 @@ class JupyterCodeExecuter:
         token: str = "",
         password: str = "",
         timeout: int = 60,
+        session: Optional[aiohttp.ClientSession] = None,
     ):
         """
         :param base_url: Jupyter server URL (e.g., "http://localhost:8888")
@@ -41,6 +47,7 @@ class JupyterCodeExecuter:
         :param token: Jupyter authentication token (optional)
         :param password: Jupyter password (optional)
         :param timeout: WebSocket timeout in seconds (default: 60s)
+        :param session: Signed in session to reuse, left open on exit (optional)
         """
         self.base_url = base_url
         self.code = code
@@ -50,9 +57,14 @@ class JupyterCodeExecuter:
         self.kernel_id = ""
         if self.base_url[-1] != "/":
             self.base_url += "/"
-        self.session = aiohttp.ClientSession(trust_env=True, base_url=self.base_url)
+        self.owns_session = session is None
+        self.session = session or aiohttp.ClientSession(
+            trust_env=True, base_url=self.base_url
+        )
         self.params = {}
         self.result = ResultModel()
+        # Set when the code raised or timed out, the kernel may be left unusable
+        self.failed = False
 
     async def __aenter__(self):
         return self
@@ -66,7 +78,8 @@ class JupyterCodeExecuter:
                     response.raise_for_status()
             except Exception as err:
                 logger.exception("close kernel failed, %s", err)
-        await self.session.close()
+        if self.owns_session:
+            await self.session.close()
 
     async def run(self) -> ResultModel:
         try:
@@ -186,21 +199,247 @@ class JupyterCodeExecuter:
                             result.append(data["text/plain"])
                     case "error":
                         stderr += "\n".join(message_data["content"]["traceback"])
+                        self.failed = True
                     case "status":
                         if message_data["content"]["execution_state"] == "idle":
                             break
 
             except asyncio.TimeoutError:
                 stderr += "\nExecution timed out."
+                self.failed = True
                 break
         self.result.stdout = stdout.strip()
         self.result.stderr = stderr.strip()
         self.result.result = "\n".join(result).strip() if result else ""
 
 
+# Clears the namespace of a pooled kernel between runs
+KERNEL_RESET_CODE = "%reset -f"
+
+
+class JupyterKernelPool:
+    """
+    Kernels started ahead of time on one Jupyter server, so that a run only
+    waits for the code itself. Taken kernels are replaced in the background.
+    A kernel is shut down after max_uses runs or a run that failed, and has
+    its namespace reset before it is handed out again otherwise.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        token: str = "",
+        password: str = "",
+        size: int = CODE_INTERPRETER_JUPYTER_KERNEL_POOL_SIZE,
+        max_uses: int = CODE_INTERPRETER_JUPYTER_KERNEL_MAX_USES,
+    ):
+        self.base_url = base_url if base_url.endswith("/") else f"{base_url}/"
+        self.token = token
+        self.password = password
+        self.size = size
+        self.max_uses = max_uses
+
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.params = {}
+
+        # (kernel id, runs served) of the kernels ready to be taken
+        self._idle: deque[tuple[str, int]] = deque()
+        self._starting = 0
+        # Kernels in use that go back to the pool after their run
+        self._returning = 0
+        self._tasks: set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+        self._closed = False
+
+    def get_executor(self, code: str = "", timeout: int = 60) -> JupyterCodeExecuter:
+        executor = JupyterCodeExecuter(
+            self.base_url,
+            code,
+            self.token,
+            self.password,
+            timeout,
+            session=self.session,
+        )
+        executor.params = self.params
+        return executor
+
+    async def sign_in(self):
+        async with self._lock:
+            if self.session is not None and not self.session.closed:
+                return
+
+            session = aiohttp.ClientSession(trust_env=True, base_url=self.base_url)
+            self.session = session
+            try:
+                executor = self.get_executor()
+                await executor.sign_in()
+                self.params = executor.params
+            except Exception:
+                self.session = None
+                await session.close()
+                raise
+
+    ####################
+    # Kernels
+    ####################
+
+    async def start_kernel(self) -> str:
+        await self.sign_in()
+        executor = self.get_executor()
+        await executor.init_kernel()
+        return executor.kernel_id
+
+    async def delete_kernel(self, kernel_id: str):
+        try:
+            async with self.session.delete(
+                f"api/kernels/{kernel_id}", params=self.params
+            ) as response:
+                response.raise_for_status()
+        except Exception as err:
+            logger.warning("close kernel failed, %s", err)
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _add_kernel(self):
+        try:
+            self._idle.append((await self.start_kernel(), 0))
+        except Exception as err:
+            logger.warning("start kernel failed, %s", err)
+        finally:
+            self._starting -= 1
+
+    def _refill(self):
+        if self._closed:
+            return
+        while len(self._idle) + self._starting + self._returning < self.size:
+            self._starting += 1
+            self._spawn(self._add_kernel())
+
+    async def _release(self, kernel_id: str, uses: int, failed: bool):
+        try:
+            if (
+                not failed
+                and not self._closed
+                and uses < self.max_uses
+                and len(self._idle) < self.size
+            ):
+                executor = self.get_executor(KERNEL_RESET_CODE)
+                executor.kernel_id = kernel_id
+                try:
+                    await executor.execute_code()
+                    if not executor.failed:
+                        self._idle.append((kernel_id, uses))
+                        return
+                except Exception as err:
+                    logger.warning("reset kernel failed, %s", err)
+
+            await self.delete_kernel(kernel_id)
+        finally:
+            if uses < self.max_uses:
+                self._returning -= 1
+            self._refill()
+
+    ####################
+    # API
+    ####################
+
+    async def execute(self, code: str, timeout: int = 60) -> ResultModel:
+        error = None
+        # A second attempt covers idle kernels culled by the server
+        for _ in range(2):
+            try:
+                if self._idle:
+                    kernel_id, uses = self._idle.popleft()
+                else:
+                    kernel_id, uses = await self.start_kernel(), 0
+                if uses + 1 < self.max_uses:
+                    self._returning += 1
+                self._refill()
+            except Exception as err:
+                logger.exception("execute code failed, %s", err)
+                return ResultModel(stderr=f"Error: {err}")
+
+            executor = self.get_executor(code, timeout)
+            executor.kernel_id = kernel_id
+            websocket_url, ws_headers = executor.init_ws()
+            try:
+                ws = await websockets.connect(
+                    websocket_url, additional_headers=ws_headers
+                )
+            except Exception as err:
+                error = err
+                self._spawn(self._release(kernel_id, uses + 1, True))
+                continue
+
+            try:
+                async with ws:
+                    await executor.execute_in_jupyter(ws)
+            except Exception as err:
+                logger.exception("execute code failed, %s", err)
+                executor.failed = True
+                executor.result.stderr = f"Error: {err}"
+
+            self._spawn(self._release(kernel_id, uses + 1, executor.failed))
+            return executor.result
+
+        logger.error("execute code failed, %s", error)
+        return ResultModel(stderr=f"Error: {error}")
+
+    async def close(self):
+        self._closed = True
+        # Let kernels being started or released settle, so none are left behind
+        current = asyncio.current_task()
+        while tasks := [task for task in self._tasks if task is not current]:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if self.session is not None:
+            while self._idle:
+                await self.delete_kernel(self._idle.popleft()[0])
+            await self.session.close()
+
+
+# (base url, token, password) -> kernel pool
+JUPYTER_KERNEL_POOLS: dict[tuple[str, str, str], JupyterKernelPool] = {}
+
+# Pools being closed after their credentials changed
+JUPYTER_KERNEL_POOL_CLOSE_TASKS: set[asyncio.Task] = set()
+
+
+def get_jupyter_kernel_pool(
+    base_url: str, token: str = "", password: str = ""
+) -> JupyterKernelPool:
+    key = (base_url, token, password)
+    pool = JUPYTER_KERNEL_POOLS.get(key)
+    if pool is not None:
+        return pool
+
+    for other_key in [k for k in JUPYTER_KERNEL_POOLS if k[0] == base_url]:
+        # Credentials changed, the kernels of the old pool are no longer ours
+        task = asyncio.create_task(JUPYTER_KERNEL_POOLS.pop(other_key).close())
+        JUPYTER_KERNEL_POOL_CLOSE_TASKS.add(task)
+        task.add_done_callback(JUPYTER_KERNEL_POOL_CLOSE_TASKS.discard)
+
+    pool = JUPYTER_KERNEL_POOLS[key] = JupyterKernelPool(base_url, token, password)
+    return pool
+
+
+async def close_jupyter_kernel_pools():
+    for pool in list(JUPYTER_KERNEL_POOLS.values()):
+        await pool.close()
+    JUPYTER_KERNEL_POOLS.clear()
+    await asyncio.gather(*JUPYTER_KERNEL_POOL_CLOSE_TASKS, return_exceptions=True)
+
+
 async def execute_code_jupyter(
     base_url: str, code: str, token: str = "", password: str = "", timeout: int = 60
 ) -> dict:
+    if CODE_INTERPRETER_JUPYTER_KERNEL_POOL_SIZE > 0:
+        pool = get_jupyter_kernel_pool(base_url, token or "", password or "")
+        result = await pool.execute(code, timeout)
+        return result.model_dump()
+
     async with JupyterCodeExecuter(
         base_url, code, token, password, timeout
     ) as executor:
@@ -0,0 +1,485 @@
+import asyncio
+import logging
+import socket
+import threading
+import time
+import uuid
+from typing import Optional
+
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+
+from open_webui.config import (
+    FILE_PROCESSING_ENGINE_CONCURRENCY,
+    FILE_PROCESSING_JOB_TIMEOUT,
+    FILE_PROCESSING_MAX_ATTEMPTS,
+    FILE_PROCESSING_MAX_JOBS_PER_USER,
+    FILE_PROCESSING_QUEUE,
+    FILE_PROCESSING_RETRY_BACKOFF,
+    FILE_PROCESSING_WORKERS,
+    STORAGE_PROVIDER,
+)
+from open_webui.env import INSTANCE_ID
+from open_webui.models.file_jobs import FileJobModel, FileJobs
+from open_webui.models.files import Files
+from open_webui.models.users import Users
+from open_webui.utils.file_status import init_file_status_events
+from open_webui.utils.misc import strict_match_mime_type
+
+log = logging.getLogger(__name__)
+
+# Seconds an idle worker waits before looking for jobs queued by other replicas
+POLL_INTERVAL = 2
+
+# Files below this size jump ahead of large documents
+SMALL_FILE_SIZE = 1024 * 1024
+
+# Upper bound for the exponential retry delay
+MAX_RETRY_BACKOFF = 15 * 60
+
+# Uploads kept in local storage can only be read on the host that received
+# them, so jobs are stamped with it and workers only claim their own. Shared
+# storage (s3, gcs, azure) lets any replica or `open-webui worker` claim them.
+HOSTNAME = socket.gethostname()
+CLAIM_HOSTNAME = HOSTNAME if STORAGE_PROVIDER == "local" else None
+
+
+class MemoryFileJobTable:
+    """
+    In-process stand-in for FileJobs, used when FILE_PROCESSING_QUEUE is
+    "memory". Jobs are lost on restart and are not shared between replicas.
+    """
+
+    def __init__(self):
+        self._jobs: dict[str, FileJobModel] = {}
+        self._lock = threading.Lock()
+
+    def insert_new_job(
+        self,
+        file_id: str,
+        user_id: str,
+        engine: str,
+        priority: int = 0,
+        data: Optional[dict] = None,
+        max_attempts: int = 3,
+        hostname: Optional[str] = None,
+    ) -> Optional[FileJobModel]:
+        now = int(time.time())
+        job = FileJobModel(
+            id=str(uuid.uuid4()),
+            file_id=file_id,
+            user_id=user_id,
+            engine=engine,
+            priority=priority,
+            status="queued",
+            max_attempts=max_attempts,
+            data=data,
+            hostname=hostname,
+            run_after=now,
+            created_at=now,
+            updated_at=now,
+        )
+        with self._lock:
+            self._jobs[job.id] = job
+        return job
+
+    def get_job_by_id(self, id: str) -> Optional[FileJobModel]:
+        return self._jobs.get(id)
+
+    def get_runnable_jobs(
+        self, limit: int = 50, hostname: Optional[str] = None
+    ) -> list[FileJobModel]:
+        now = int(time.time())
+        with self._lock:
+            jobs = [
+                job
+                for job in self._jobs.values()
+                if job.status == "queued"
+                and job.run_after <= now
+                and (hostname is None or job.hostname == hostname)
+            ]
+        jobs.sort(key=lambda job: (-job.priority, job.created_at))
+        return jobs[:limit]
+
+    def _get_running_counts(self) -> tuple[dict[str, int], dict[str, int]]:
+        by_user, by_engine = {}, {}
+        for job in self._jobs.values():
+            if job.status == "running":
+                by_user[job.user_id] = by_user.get(job.user_id, 0) + 1
+                by_engine[job.engine] = by_engine.get(job.engine, 0) + 1
+        return by_user, by_engine
+
+    def get_running_counts(self) -> tuple[dict[str, int], dict[str, int]]:
+        with self._lock:
+            return self._get_running_counts()
+
+    def _update(self, id: str, **updated) -> Optional[FileJobModel]:
+        job = self._jobs.get(id)
+        if job is None:
+            return None
+        job = job.model_copy(update={**updated, "updated_at": int(time.time())})
+        self._jobs[id] = job
+        return job
+
+    def claim_job(
+        self,
+        id: str,
+        worker_id: str,
+        max_jobs_per_user: Optional[int] = None,
+        max_jobs_per_engine: Optional[int] = None,
+    ) -> Optional[FileJobModel]:
+        with self._lock:
+            job = self._jobs.get(id)
+            if job is None or job.status != "queued":
+                return None
+
+            running_by_user, running_by_engine = self._get_running_counts()
+            if (
+                max_jobs_per_user
+                and running_by_user.get(job.user_id, 0) >= max_jobs_per_user
+            ) or (
+                max_jobs_per_engine
+                and running_by_engine.get(job.engine, 0) >= max_jobs_per_engine
+            ):
+                return None
+            return self._update(
+                id,
+                status="running",
+                attempts=job.attempts + 1,
+                locked_by=worker_id,
+                locked_at=int(time.time()),
+            )
+
+    def retry_job(self, id: str, run_after: int, error: str) -> bool:
+        with self._lock:
+            return (
+                self._update(
+                    id,
+                    status="queued",
+                    run_after=run_after,
+                    error=error,
+                    locked_by=None,
+                    locked_at=None,
+                )
+                is not None
+            )
+
+    def fail_job(self, id: str, error: str) -> bool:
+        with self._lock:
+            return (
+                self._update(
+                    id, status="failed", error=error, locked_by=None, locked_at=None
+                )
+                is not None
+            )
+
+    def delete_job_by_id(self, id: str) -> bool:
+        with self._lock:
+            self._jobs.pop(id, None)
+        return True
+
+    def touch_job_by_id(self, id: str) -> bool:
+        with self._lock:
+            return self._update(id, locked_at=int(time.time())) is not None
+
+    def requeue_stale_jobs(self, locked_before: int) -> int:
+        with self._lock:
+            stale = [
+                job.id
+                for job in self._jobs.values()
+                if job.status == "running" and (job.locked_at or 0) < locked_before
+            ]
+            for id in stale:
+                self._update(id, status="queued", locked_by=None, locked_at=None)
+        return len(stale)
+
+
+FILE_JOBS = FileJobs if FILE_PROCESSING_QUEUE == "database" else MemoryFileJobTable()
+
+# Set from enqueue so that workers in this process start without waiting for
+# the next poll
+_wakeup_event: Optional[asyncio.Event] = None
+_wakeup_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _wakeup_workers():
+    if _wakeup_event is None or _wakeup_loop is None:
+        return
+    try:
+        _wakeup_loop.call_soon_threadsafe(_wakeup_event.set)
+    except RuntimeError:
+        # Event loop already closed
+        pass
+
+
+####################
+# Producer
+####################
+
+
+def get_file_job_engine(request: Request, content_type: Optional[str]) -> str:
+    """The extraction engine a file will be processed with, for concurrency limits."""
+    stt_supported_content_types = getattr(
+        request.app.state.config, "STT_SUPPORTED_CONTENT_TYPES", []
+    )
+    if content_type and strict_match_mime_type(
+        stt_supported_content_types, content_type
+    ):
+        return "audio"
+    return request.app.state.config.CONTENT_EXTRACTION_ENGINE or "default"
+
+
+def get_file_job_priority(file_item) -> int:
+    size = (file_item.meta or {}).get("size") or 0
+    return 1 if size < SMALL_FILE_SIZE else 0
+
+
+def enqueue_file_processing(
+    request: Request,
+    file_item,
+    content_type: Optional[str],
+    file_path: str,
+    file_metadata: dict,
+    user,
+) -> Optional[FileJobModel]:
+    job = FILE_JOBS.insert_new_job(
+        file_item.id,
+        user.id,
+        engine=get_file_job_engine(request, content_type),
+        priority=get_file_job_priority(file_item),
+        data={
+            "content_type": content_type,
+            "file_path": file_path,
+            "metadata": file_metadata,
+        },
+        max_attempts=FILE_PROCESSING_MAX_ATTEMPTS,
+        hostname=HOSTNAME,
+    )
+    _wakeup_workers()
+    return job
+
+
+####################
+# Scheduling
+####################
+
+
+def select_next_jobs(
+    jobs: list[FileJobModel],
+    running_by_user: dict[str, int],
+    running_by_engine: dict[str, int],
+) -> list[FileJobModel]:
+    """
+    Order runnable jobs for claiming: higher priority first, then users with
+    the fewest jobs in flight so that one large upload cannot starve everyone
+    else, then age. Jobs whose user or engine is at its limit are skipped.
+    """
+    candidates = []
+    for job in jobs:
+        if running_by_user.get(job.user_id, 0) >= FILE_PROCESSING_MAX_JOBS_PER_USER:
+            continue
+
+        engine_limit = FILE_PROCESSING_ENGINE_CONCURRENCY.get(job.engine)
+        if engine_limit and running_by_engine.get(job.engine, 0) >= engine_limit:
+            continue
+
+        candidates.append(job)
+
+    return sorted(
+        candidates,
+        key=lambda job: (
+            -job.priority,
+            running_by_user.get(job.user_id, 0),
+            job.created_at,
+        ),
+    )
+
+
+def claim_next_job(worker_id: str) -> Optional[FileJobModel]:
+    jobs = FILE_JOBS.get_runnable_jobs(hostname=CLAIM_HOSTNAME)
+    if not jobs:
+        return None
+
+    # The counts only order the candidates, claim_job enforces the limits
+    running_by_user, running_by_engine = FILE_JOBS.get_running_counts()
+    for job in select_next_jobs(jobs, running_by_user, running_by_engine):
+        claimed = FILE_JOBS.claim_job(
+            job.id,
+            worker_id,
+            max_jobs_per_user=FILE_PROCESSING_MAX_JOBS_PER_USER,
+            max_jobs_per_engine=FILE_PROCESSING_ENGINE_CONCURRENCY.get(job.engine),
+        )
+        if claimed is not None:
+            return claimed
+    return None
+
+
+def get_retry_delay(attempts: int) -> int:
+    return min(
+        FILE_PROCESSING_RETRY_BACKOFF * 2 ** max(attempts - 1, 0), MAX_RETRY_BACKOFF
+    )
+
+
+####################
+# Workers
+####################
+
+
+def get_internal_request(app) -> Request:
+    # Processing reads config and embedding functions from app.state only
+    return Request(
+        {
+            "type": "http",
+            "asgi.version": "3.0",
+            "asgi.spec_version": "2.0",
+            "method": "POST",
+            "path": "/internal",
+            "query_string": b"",
+            "headers": Headers({}).raw,
+            "client": ("127.0.0.1", 12345),
+            "server": ("127.0.0.1", 80),
+            "scheme": "http",
+            "app": app,
+        }
+    )
+
+
+def is_retryable_error(e: Exception) -> bool:
+    """
+    Whether a later attempt may succeed. Files that cannot be processed, such
+    as an unsupported type or empty content, fail the same way every time.
+    process_file reports every failure as a 400, so the error it wraps decides.
+    """
+    seen = set()
+    while e is not None and id(e) not in seen:
+        seen.add(id(e))
+        if isinstance(e, ValueError):
+            return False
+        if (
+            isinstance(e, HTTPException)
+            and 400 <= e.status_code < 500
+            and e.status_code != 429
+            and e.__context__ is None
+        ):
+            return False
+        e = e.__cause__ or e.__context__
+    return True
+
+
+def run_file_job(app, job: FileJobModel):
+    # Imported here as the files router enqueues through this module
+    from open_webui.routers.files import process_file_by_content_type
+
+    user = Users.get_user_by_id(job.user_id)
+    if user is None:
+        raise Exception(f"User {job.user_id} not found")
+
+    data = job.data or {}
+    process_file_by_content_type(
+        get_internal_request(app),
+        job.file_id,
+        data.get("content_type"),
+        data.get("file_path"),
+        data.get("metadata") or {},
+        user,
+    )
+
+
+async def process_file_job(app, job: FileJobModel):
+    async def heartbeat():
+        while True:
+            await asyncio.sleep(max(FILE_PROCESSING_JOB_TIMEOUT // 3, 1))
+            await run_in_threadpool(FILE_JOBS.touch_job_by_id, job.id)
+
+    heartbeat_task = asyncio.create_task(heartbeat())
+    try:
+        await run_in_threadpool(run_file_job, app, job)
+        await run_in_threadpool(FILE_JOBS.delete_job_by_id, job.id)
+    except Exception as e:
+        error = str(e.detail) if hasattr(e, "detail") else str(e)
+
+        if job.attempts < job.max_attempts and is_retryable_error(e):
+            delay = get_retry_delay(job.attempts)
+            log.warning(
+                f"Error processing file {job.file_id} "
+                f"(attempt {job.attempts}/{job.max_attempts}), retrying in {delay}s: {error}"
+            )
+            await run_in_threadpool(
+                FILE_JOBS.retry_job, job.id, int(time.time()) + delay, error
+            )
+            await run_in_threadpool(
+                Files.update_file_data_by_id, job.file_id, {"status": "pending"}
+            )
+        else:
+            log.error(f"Error processing file {job.file_id}: {error}")
+            await run_in_threadpool(FILE_JOBS.fail_job, job.id, error)
+            await run_in_threadpool(
+                Files.update_file_data_by_id,
+                job.file_id,
+                {"status": "failed", "error": error},
+            )
+    finally:
+        heartbeat_task.cancel()
+
+
+async def file_processing_worker(app, worker_id: str):
+    while True:
+        try:
+            job = await run_in_threadpool(claim_next_job, worker_id)
+            if job is not None:
+                await process_file_job(app, job)
+                continue
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.exception(f"File processing worker {worker_id} failed: {e}")
+
+        if _wakeup_event is None:
+            await asyncio.sleep(POLL_INTERVAL)
+            continue
+
+        try:
+            await asyncio.wait_for(_wakeup_event.wait(), timeout=POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        _wakeup_event.clear()
+
+
+async def periodic_stale_file_job_requeue():
+    while True:
+        try:
+            requeued = await run_in_threadpool(
+                FILE_JOBS.requeue_stale_jobs,
+                int(time.time()) - FILE_PROCESSING_JOB_TIMEOUT,
+            )
+            if requeued:
+                log.warning(f"Requeued {requeued} stale file processing jobs")
+        except Exception as e:
+            log.exception(f"Error requeueing stale file processing jobs: {e}")
+        await asyncio.sleep(max(FILE_PROCESSING_JOB_TIMEOUT // 2, 1))
+
+
+async def run_file_processing_workers(app, workers: int = FILE_PROCESSING_WORKERS):
+    global _wakeup_event, _wakeup_loop
+
+    if workers <= 0:
+        if STORAGE_PROVIDER == "local":
+            log.warning(
+                "File processing workers are disabled, uploads received by "
+                f"{HOSTNAME} wait for `open-webui worker` on the same host"
+            )
+        return
+
+    _wakeup_event = asyncio.Event()
+    _wakeup_loop = asyncio.get_running_loop()
+    init_file_status_events(_wakeup_loop)
+
+    log.info(f"Starting {workers} file processing workers ({FILE_PROCESSING_QUEUE})")
+    await asyncio.gather(
+        periodic_stale_file_job_requeue(),
+        *[
+            file_processing_worker(app, f"{INSTANCE_ID}:{idx}")
+            for idx in range(workers)
+        ],
+    )
@@ -0,0 +1,135 @@
+import asyncio
+import json
+import logging
+from typing import Optional
+
+from open_webui.env import REDIS_KEY_PREFIX
+from open_webui.utils.redis import get_redis_client
+
+log = logging.getLogger(__name__)
+
+FILE_STATUS_CHANNEL = f"{REDIS_KEY_PREFIX}:files:status"
+
+# Upper bound of the backoff between reconnects of the Redis listener
+FILE_STATUS_LISTENER_MAX_RETRY_DELAY = 30
+
+# file_id -> queues of the streams waiting on it in this process
+_subscribers: dict[str, set[asyncio.Queue]] = {}
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def init_file_status_events(loop: asyncio.AbstractEventLoop):
+    """Remember the event loop that subscribers and socket emits live on."""
+    global _loop
+    _loop = loop
+
+
+def _deliver(event: dict):
+    for queue in list(_subscribers.get(event["file_id"], ())):
+        queue.put_nowait(event)
+
+
+def _emit_to_user(event: dict, user_id: str):
+    # Imported here as the socket module depends on the models publishing
+    from open_webui.socket.main import emit_to_users
+
+    asyncio.run_coroutine_threadsafe(
+        emit_to_users(
+            "events:file",
+            {"type": "file:status", "data": event},
+            [user_id],
+        ),
+        _loop,
+    )
+
+
+def publish_file_status(
+    file_id: str,
+    status: str,
+    error: Optional[str] = None,
+    user_id: Optional[str] = None,
+):
+    """
+    Announce a processing status transition. Safe to call from any thread.
+    Streams on every replica are reached through Redis when it is configured.
+    """
+    event = {"file_id": file_id, "status": status}
+    if error:
+        event["error"] = error
+
+    published = False
+    redis = get_redis_client()
+    if redis is not None:
+        try:
+            redis.publish(FILE_STATUS_CHANNEL, json.dumps(event))
+            published = True
+        except Exception as e:
+            log.debug(f"Failed to publish status of file {file_id}: {e}")
+
+    if _loop is None or _loop.is_closed():
+        return
+
+    if not published:
+        _loop.call_soon_threadsafe(_deliver, event)
+
+    if user_id:
+        try:
+            _emit_to_user(event, user_id)
+        except Exception as e:
+            log.debug(f"Failed to emit status of file {file_id}: {e}")
+
+
+def subscribe_file_status(file_id: str) -> asyncio.Queue:
+    """Must be called from the event loop; pair with unsubscribe_file_status."""
+    if _loop is None:
+        init_file_status_events(asyncio.get_running_loop())
+
+    queue = asyncio.Queue()
+    _subscribers.setdefault(file_id, set()).add(queue)
+    return queue
+
+
+def unsubscribe_file_status(file_id: str, queue: asyncio.Queue):
+    queues = _subscribers.get(file_id)
+    if queues is None:
+        return
+
+    queues.discard(queue)
+    if not queues:
+        _subscribers.pop(file_id, None)
+
+
+async def redis_file_status_listener(redis):
+    """
+    Deliver status events published by any replica to the streams of this
+    process. Reconnects when the connection to Redis drops, streams fall back
+    to reading the DB in the meantime.
+    """
+    delay = 1
+    while True:
+        pubsub = redis.pubsub()
+        try:
+            await pubsub.subscribe(FILE_STATUS_CHANNEL)
+            delay = 1
+
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                try:
+                    event = json.loads(message["data"])
+                    if event.get("file_id") in _subscribers:
+                        _deliver(event)
+                except Exception as e:
+                    log.exception(f"Error handling file status event: {e}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.warning(f"File status listener lost Redis, retrying in {delay}s: {e}")
+        finally:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, FILE_STATUS_LISTENER_MAX_RETRY_DELAY)
@@ -14,6 +14,7 @@ from typing import Optional
 from pathlib import Path
 
 from open_webui.storage.provider import Storage
+from open_webui.storage.images import IMAGE_STORE_URL_PATTERN, IMAGES
 
 from open_webui.models.chats import Chats
 from open_webui.models.files import Files
@@ -32,7 +33,10 @@ MARKDOWN_IMAGE_URL_PATTERN = re.compile(r"!\[(.*?)\]\((.+?)\)", re.IGNORECASE)
 
 def get_image_base64_from_url(url: str) -> Optional[str]:
     try:
-        if url.startswith("http"):
+        if IMAGE_STORE_URL_PATTERN.search(url):
+            # Content-addressed image from a saved chat
+            return IMAGES.get_data_url(url)
+        elif url.startswith("http"):
             # Download the image from the URL
             response = requests.get(url)
             response.raise_for_status()
@@ -2,95 +2,281 @@ import asyncio
 import json
 import logging
 import random
-import requests
-import aiohttp
 import urllib.parse
-import urllib.request
-from typing import Optional
+import uuid
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
 
-import websocket  # NOTE: websocket-client (https://github.com/websocket-client/websocket-client)
+import aiohttp
 from pydantic import BaseModel
 
 log = logging.getLogger(__name__)
 
 default_headers = {"User-Agent": "Mozilla/5.0"}
 
+# Terminal results kept for prompts whose completion arrives before the prompt
+# was registered by the coroutine that queued it
+FINISHED_PROMPTS_MAX = 256
 
-def queue_prompt(prompt, client_id, base_url, api_key):
-    log.info("queue_prompt")
-    p = {"prompt": prompt, "client_id": client_id}
-    data = json.dumps(p).encode("utf-8")
-    log.debug(f"queue_prompt data: {data}")
-    try:
-        req = urllib.request.Request(
-            f"{base_url}/prompt",
-            data=data,
-            headers={**default_headers, "Authorization": f"Bearer {api_key}"},
-        )
-        response = urllib.request.urlopen(req).read()
-        return json.loads(response)
-    except Exception as e:
-        log.exception(f"Error while queuing prompt: {e}")
-        raise e
-
-
-def get_image(filename, subfolder, folder_type, base_url, api_key):
-    log.info("get_image")
-    data = {"filename": filename, "subfolder": subfolder, "type": folder_type}
-    url_values = urllib.parse.urlencode(data)
-    req = urllib.request.Request(
-        f"{base_url}/view?{url_values}",
-        headers={**default_headers, "Authorization": f"Bearer {api_key}"},
-    )
-    with urllib.request.urlopen(req) as response:
-        return response.read()
+# Times a generation waits for a dropped websocket to come back
+MAX_RECONNECT_ATTEMPTS = 3
 
 
 def get_image_url(filename, subfolder, folder_type, base_url):
-    log.info("get_image")
     data = {"filename": filename, "subfolder": subfolder, "type": folder_type}
     url_values = urllib.parse.urlencode(data)
     return f"{base_url}/view?{url_values}"
 
 
-def get_history(prompt_id, base_url, api_key):
-    log.info("get_history")
+class ComfyUIPrompt:
+    def __init__(self, on_progress: Optional[Callable[[int, int], Awaitable]] = None):
+        self.done: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.on_progress = on_progress
 
-    req = urllib.request.Request(
-        f"{base_url}/history/{prompt_id}",
-        headers={**default_headers, "Authorization": f"Bearer {api_key}"},
-    )
-    with urllib.request.urlopen(req) as response:
-        return json.loads(response.read())
+    def finish(self, error: Optional[str] = None):
+        if self.done.done():
+            return
+        if error is None:
+            self.done.set_result(None)
+        else:
+            self.done.set_exception(Exception(error))
+
+
+class ComfyUIClient:
+    """
+    Asyncio client for one ComfyUI server. All prompts share a single
+    websocket, whose messages are routed to the waiting prompt by prompt_id.
+    """
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.client_id = str(uuid.uuid4())
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._connect_lock = asyncio.Lock()
+
+        self._prompts: dict[str, ComfyUIPrompt] = {}
+        self._finished: OrderedDict[str, Optional[str]] = OrderedDict()
+
+        # Replaced in COMFYUI_CLIENTS; closed once its last prompt finishes
+        self.retired = False
+
+    @property
+    def headers(self) -> dict:
+        headers = {**default_headers}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None and not self._ws.closed
+
+    async def connect(self):
+        async with self._connect_lock:
+            if self.connected:
+                return
+
+            if self._session is None or self._session.closed:
+                self._session = aiohttp.ClientSession(
+                    headers=self.headers, trust_env=True
+                )
 
+            ws_url = self.base_url.replace("http://", "ws://").replace(
+                "https://", "wss://"
+            )
+            self._ws = await self._session.ws_connect(
+                f"{ws_url}/ws?clientId={self.client_id}", heartbeat=30
+            )
+            self._reader = asyncio.create_task(self._read(self._ws))
+            log.info(f"Connected to ComfyUI websocket at {self.base_url}")
+
+    async def close(self):
+        if self._reader is not None:
+            self._reader.cancel()
+        if self._ws is not None:
+            await self._ws.close()
+        if self._session is not None:
+            await self._session.close()
+        self._ws = self._session = self._reader = None
+
+    async def _read(self, ws: aiohttp.ClientWebSocketResponse):
+        try:
+            async for msg in ws:
+                if msg.type == aiohttp.WSMsgType.TEXT:
+                    try:
+                        await self._handle_message(json.loads(msg.data))
+                    except Exception as e:
+                        log.debug(f"Error handling ComfyUI message: {e}")
+                elif msg.type == aiohttp.WSMsgType.ERROR:
+                    break
+                # Binary messages are previews
+        finally:
+            log.info(f"ComfyUI websocket at {self.base_url} closed")
+            for prompt in list(self._prompts.values()):
+                if not prompt.done.done():
+                    prompt.done.set_exception(ConnectionError("ComfyUI disconnected"))
+
+    async def _handle_message(self, message: dict):
+        message_type = message.get("type")
+        data = message.get("data") or {}
+        prompt_id = data.get("prompt_id")
+        if not prompt_id:
+            return
+
+        error = None
+        if message_type == "progress":
+            prompt = self._prompts.get(prompt_id)
+            if prompt is not None and prompt.on_progress is not None:
+                await prompt.on_progress(data.get("value", 0), data.get("max", 0))
+            return
+        elif message_type == "executing" and data.get("node") is None:
+            pass
+        elif message_type == "execution_success":
+            pass
+        elif message_type == "execution_error":
+            error = data.get("exception_message") or "ComfyUI execution failed"
+        elif message_type == "execution_interrupted":
+            error = "ComfyUI execution was interrupted"
+        else:
+            return
 
-def get_images(ws, workflow, client_id, base_url, api_key):
-    prompt_id = queue_prompt(workflow, client_id, base_url, api_key)["prompt_id"]
-    output_images = []
-    while True:
-        out = ws.recv()
-        if isinstance(out, str):
-            message = json.loads(out)
-            if message["type"] == "executing":
-                data = message["data"]
-                if data["node"] is None and data["prompt_id"] == prompt_id:
-                    break  # Execution is done
+        prompt = self._prompts.get(prompt_id)
+        if prompt is not None:
+            prompt.finish(error)
         else:
-            continue  # previews are binary data
+            self._finished[prompt_id] = error
+            while len(self._finished) > FINISHED_PROMPTS_MAX:
+                self._finished.popitem(last=False)
+
+    async def queue_prompt(self, workflow: dict) -> str:
+        log.debug(f"queue_prompt workflow: {workflow}")
+        async with self._session.post(
+            f"{self.base_url}/prompt",
+            json={"prompt": workflow, "client_id": self.client_id},
+        ) as response:
+            response.raise_for_status()
+            return (await response.json())["prompt_id"]
+
+    async def get_history(self, prompt_id: str) -> dict:
+        async with self._session.get(
+            f"{self.base_url}/history/{prompt_id}"
+        ) as response:
+            response.raise_for_status()
+            return (await response.json()).get(prompt_id) or {}
+
+    async def run(
+        self,
+        workflow: dict,
+        on_progress: Optional[Callable[[int, int], Awaitable]] = None,
+    ) -> dict:
+        """Queue a workflow and wait for it; returns its history entry."""
+        await self.connect()
+
+        prompt = ComfyUIPrompt(on_progress)
+        prompt_id = await self.queue_prompt(workflow)
+        self._prompts[prompt_id] = prompt
+        try:
+            if prompt_id in self._finished:
+                prompt.finish(self._finished.pop(prompt_id))
+
+            for attempt in range(MAX_RECONNECT_ATTEMPTS + 1):
+                try:
+                    await asyncio.shield(prompt.done)
+                    break
+                except ConnectionError:
+                    if attempt == MAX_RECONNECT_ATTEMPTS:
+                        raise
+
+                    prompt.done = asyncio.get_running_loop().create_future()
+                    await asyncio.sleep(2**attempt)
+                    await self.connect()
+
+                    # The prompt may have finished while the socket was down
+                    history = await self.get_history(prompt_id)
+                    if history.get("status", {}).get("completed"):
+                        break
+
+            return await self.get_history(prompt_id)
+        finally:
+            self._prompts.pop(prompt_id, None)
+            if self.retired and not self._prompts:
+                await self.close()
+
+
+# base_url -> client shared by every generation against that server
+COMFYUI_CLIENTS: dict[str, ComfyUIClient] = {}
+
+
+async def get_comfyui_client(base_url: str, api_key: Optional[str]) -> ComfyUIClient:
+    client = COMFYUI_CLIENTS.get(base_url)
+    if client is not None and client.api_key != (api_key or None):
+        # Configuration changed; generations still running keep the old client,
+        # which closes itself after the last of them
+        COMFYUI_CLIENTS.pop(base_url, None)
+        client.retired = True
+        if not client._prompts:
+            await client.close()
+        client = None
+
+    if client is None:
+        client = ComfyUIClient(base_url, api_key or None)
+        COMFYUI_CLIENTS[base_url] = client
+    return client
+
+
+def get_comfyui_progress_emitter(event_emitter: Optional[Callable]):
+    """Relay sampling progress to the chat as a status update."""
+    if event_emitter is None:
+        return None
+
+    last_percent = None
+
+    async def on_progress(value: int, max_value: int):
+        nonlocal last_percent
+        percent = int(value * 100 / max_value) if max_value else 0
+        if percent == last_percent:
+            return
+        last_percent = percent
+
+        await event_emitter(
+            {
+                "type": "status",
+                "data": {
+                    "action": "image_generation",
+                    "description": "Creating image",
+                    "progress": percent,
+                    "done": False,
+                },
+            }
+        )
+
+    return on_progress
 
-    history = get_history(prompt_id, base_url, api_key)[prompt_id]
-    for node_id in history["outputs"]:
-        node_output = history["outputs"][node_id]
+
+async def get_images(
+    workflow: dict,
+    base_url: str,
+    api_key: Optional[str],
+    event_emitter: Optional[Callable] = None,
+) -> dict:
+    client = await get_comfyui_client(base_url, api_key)
+    history = await client.run(workflow, get_comfyui_progress_emitter(event_emitter))
+
+    output_images = []
+    for node_id, node_output in history.get("outputs", {}).items():
         if node_id in workflow and workflow[node_id].get("class_type") in [
             "SaveImage",
             "PreviewImage",
         ]:
-            if "images" in node_output:
-                for image in node_output["images"]:
-                    url = get_image_url(
-                        image["filename"], image["subfolder"], image["type"], base_url
-                    )
-                    output_images.append({"url": url})
+            for image in node_output.get("images", []):
+                url = get_image_url(
+                    image["filename"], image["subfolder"], image["type"], base_url
+                )
+                output_images.append({"url": url})
     return {"data": output_images}
 
 
@@ -139,9 +325,12 @@ class ComfyUICreateImageForm(BaseModel):
 
 
 async def comfyui_create_image(
-    model: str, payload: ComfyUICreateImageForm, client_id, base_url, api_key
+    model: str,
+    payload: ComfyUICreateImageForm,
+    base_url: str,
+    api_key: Optional[str],
+    event_emitter: Optional[Callable] = None,
 ):
-    ws_url = base_url.replace("http://", "ws://").replace("https://", "wss://")
     workflow = json.loads(payload.workflow.workflow)
 
     for node in payload.workflow.nodes:
@@ -192,26 +381,12 @@ async def comfyui_create_image(
                 workflow[node_id]["inputs"][node.key] = node.value
 
     try:
-        ws = websocket.WebSocket()
-        headers = {"Authorization": f"Bearer {api_key}"}
-        ws.connect(f"{ws_url}/ws?clientId={client_id}", header=headers)
-        log.info("WebSocket connection established.")
-    except Exception as e:
-        log.exception(f"Failed to connect to WebSocket server: {e}")
-        return None
-
-    try:
-        log.info("Sending workflow to WebSocket server.")
         log.info(f"Workflow: {workflow}")
-        images = await asyncio.to_thread(
-            get_images, ws, workflow, client_id, base_url, api_key
-        )
+        images = await get_images(workflow, base_url, api_key, event_emitter)
     except Exception as e:
         log.exception(f"Error while receiving images: {e}")
         images = None
 
-    ws.close()
-
     return images
 
 
@@ -229,9 +404,12 @@ class ComfyUIEditImageForm(BaseModel):
 
 
 async def comfyui_edit_image(
-    model: str, payload: ComfyUIEditImageForm, client_id, base_url, api_key
+    model: str,
+    payload: ComfyUIEditImageForm,
+    base_url: str,
+    api_key: Optional[str],
+    event_emitter: Optional[Callable] = None,
 ):
-    ws_url = base_url.replace("http://", "ws://").replace("https://", "wss://")
     workflow = json.loads(payload.workflow.workflow)
 
     for node in payload.workflow.nodes:
@@ -291,24 +469,10 @@ async def comfyui_edit_image(
                 workflow[node_id]["inputs"][node.key] = node.value
 
     try:
-        ws = websocket.WebSocket()
-        headers = {"Authorization": f"Bearer {api_key}"}
-        ws.connect(f"{ws_url}/ws?clientId={client_id}", header=headers)
-        log.info("WebSocket connection established.")
-    except Exception as e:
-        log.exception(f"Failed to connect to WebSocket server: {e}")
-        return None
-
-    try:
-        log.info("Sending workflow to WebSocket server.")
         log.info(f"Workflow: {workflow}")
-        images = await asyncio.to_thread(
-            get_images, ws, workflow, client_id, base_url, api_key
-        )
+        images = await get_images(workflow, base_url, api_key, event_emitter)
     except Exception as e:
         log.exception(f"Error while receiving images: {e}")
         images = None
 
-    ws.close()
-
     return images
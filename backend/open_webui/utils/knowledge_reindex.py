@@ -0,0 +1,402 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+
+from open_webui.config import KNOWLEDGE_REINDEX_CONCURRENCY
+from open_webui.models.files import Files
+from open_webui.models.knowledge import Knowledges
+from open_webui.models.knowledge_reindex import (
+    KnowledgeReindexJobModel,
+    KnowledgeReindexJobResponse,
+    KnowledgeReindexJobs,
+)
+from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.vector.main import VectorDBBase
+from open_webui.routers.retrieval import ProcessFileForm, process_file
+from open_webui.socket.main import emit_to_users
+
+log = logging.getLogger(__name__)
+
+# job_id -> asyncio.Task, for jobs running in this process
+REINDEX_TASKS: dict[str, asyncio.Task] = {}
+
+# Seconds between heartbeats while a job is running
+REINDEX_HEARTBEAT_INTERVAL = 30
+
+# Seconds between progress events sent to the client
+REINDEX_PROGRESS_INTERVAL = 1
+
+# Items written to or deleted from the live collection per call when swapping
+REINDEX_SWAP_BATCH_SIZE = 500
+
+
+def get_shadow_collection_name(knowledge_id: str) -> str:
+    return f"{knowledge_id}-reindex"
+
+
+def supports_shadow_collections() -> bool:
+    """
+    Building into a shadow collection needs the vector DB to read its vectors
+    back to move them into the live collection, as none can rename collections.
+    Without it knowledge bases can only be rebuilt in place, and return no
+    search results until their files are indexed again.
+    """
+    return type(VECTOR_DB_CLIENT).get_items is not VectorDBBase.get_items
+
+
+def get_job_response(job: KnowledgeReindexJobModel) -> KnowledgeReindexJobResponse:
+    eta = None
+    finished = job.processed_files + job.failed_files
+    if job.status == "running" and job.started_at and finished > 0:
+        elapsed = max(int(time.time()) - job.started_at, 1)
+        eta = int((job.total_files - finished) * elapsed / finished)
+
+    return KnowledgeReindexJobResponse(
+        **job.model_dump(),
+        eta=eta,
+        stale=job.is_stale,
+        in_place=(job.data or {}).get("in_place", False),
+    )
+
+
+def create_reindex_job(
+    user_id: str, in_place: bool = False
+) -> Optional[KnowledgeReindexJobModel]:
+    knowledge_bases = []
+    total_files = 0
+    for knowledge_base in Knowledges.get_knowledge_bases():
+        file_ids = [file.id for file in Knowledges.get_files_by_id(knowledge_base.id)]
+        knowledge_bases.append(
+            {
+                "id": knowledge_base.id,
+                "file_ids": file_ids,
+                "status": "pending",
+                "done": [],
+                "failed": {},
+            }
+        )
+        total_files += len(file_ids)
+
+    return KnowledgeReindexJobs.insert_new_job(
+        user_id,
+        {"knowledge_bases": knowledge_bases, "in_place": in_place},
+        total_files,
+    )
+
+
+def start_reindex_job(request: Request, job: KnowledgeReindexJobModel, user) -> bool:
+    """Run a claimed job in the background of this process."""
+    task = REINDEX_TASKS.get(job.id)
+    if task is not None and not task.done():
+        return False
+
+    task = asyncio.create_task(KnowledgeReindexRunner(request, job, user).run())
+    REINDEX_TASKS[job.id] = task
+    task.add_done_callback(lambda _: REINDEX_TASKS.pop(job.id, None))
+    return True
+
+
+class KnowledgeReindexRunner:
+    """
+    Rebuild every knowledge base collection with a bounded pool of workers.
+
+    Each file is checkpointed in the job row as soon as it finishes, so a job
+    that was cancelled or lost its worker resumes where it stopped. Each
+    knowledge base is built into a shadow collection that replaces the live
+    one only once it is complete, so search keeps working on the old vectors
+    for the whole run and a new embedding model never has its vectors mixed
+    with the old ones (whose dimension may differ). Jobs created with in_place,
+    the only option for vector DBs that cannot read vectors back, rebuild the
+    live collections directly instead.
+    """
+
+    def __init__(self, request: Request, job: KnowledgeReindexJobModel, user):
+        self.request = request
+        self.job = job
+        self.user = user
+
+        self.data = job.data or {"knowledge_bases": []}
+        self.processed_files = job.processed_files
+        self.failed_files = job.failed_files
+
+        self.cancelled = False
+        self.use_shadow = not self.data.get("in_place", False)
+        self._last_progress_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def run(self):
+        if self.job.started_at is None:
+            self.job = KnowledgeReindexJobs.update_job_by_id(
+                self.job.id, {"started_at": int(time.time())}
+            )
+
+        heartbeat = asyncio.create_task(self._heartbeat())
+        try:
+            if self.use_shadow and not supports_shadow_collections():
+                raise Exception(
+                    "The vector database cannot rebuild knowledge bases without "
+                    "downtime, start an in-place reindex instead"
+                )
+
+            for knowledge_base in self.data["knowledge_bases"]:
+                if knowledge_base["status"] == "completed":
+                    continue
+                await self.reindex_knowledge_base(knowledge_base)
+                if self.cancelled:
+                    break
+
+            if self.cancelled:
+                await self.finish("cancelled")
+            else:
+                await self.finish("completed")
+        except Exception as e:
+            log.exception(f"Knowledge reindex job {self.job.id} failed: {e}")
+            await self.finish("failed", error=str(e))
+        finally:
+            heartbeat.cancel()
+
+    async def reindex_knowledge_base(self, knowledge_base: dict):
+        knowledge_id = knowledge_base["id"]
+        if Knowledges.get_knowledge_by_id(knowledge_id) is None:
+            knowledge_base["status"] = "completed"
+            await self.checkpoint(force=True)
+            return
+
+        if knowledge_base["status"] == "swapping":
+            # Interrupted while replacing the live collection, the shadow
+            # collection is complete
+            await run_in_threadpool(self._swap_collection, knowledge_base)
+            knowledge_base["status"] = "completed"
+            await self.checkpoint(force=True)
+            return
+
+        if self.use_shadow:
+            target_collection_name = get_shadow_collection_name(knowledge_id)
+            if knowledge_base["status"] == "pending":
+                # Left behind by an earlier job that did not finish
+                try:
+                    if VECTOR_DB_CLIENT.has_collection(
+                        collection_name=target_collection_name
+                    ):
+                        VECTOR_DB_CLIENT.delete_collection(
+                            collection_name=target_collection_name
+                        )
+                except Exception as e:
+                    log.error(
+                        f"Error deleting collection {target_collection_name}: {e}"
+                    )
+        else:
+            target_collection_name = knowledge_id
+            if knowledge_base["status"] == "pending":
+                # Rebuilt in place, but only emptied once even if the job
+                # gets resumed
+                try:
+                    if VECTOR_DB_CLIENT.has_collection(collection_name=knowledge_id):
+                        VECTOR_DB_CLIENT.delete_collection(collection_name=knowledge_id)
+                except Exception as e:
+                    log.error(f"Error deleting collection {knowledge_id}: {e}")
+
+        knowledge_base["status"] = "running"
+        await self.checkpoint(force=True)
+
+        done = set(knowledge_base["done"])
+        file_ids = [
+            file_id for file_id in knowledge_base["file_ids"] if file_id not in done
+        ]
+
+        semaphore = asyncio.Semaphore(max(KNOWLEDGE_REINDEX_CONCURRENCY, 1))
+
+        async def worker(file_id: str):
+            async with semaphore:
+                if self.cancelled or await self.is_cancel_requested():
+                    self.cancelled = True
+                    return
+                await self.reindex_file(knowledge_base, file_id, target_collection_name)
+
+        await asyncio.gather(*[worker(file_id) for file_id in file_ids])
+
+        if self.cancelled:
+            return
+
+        if self.use_shadow:
+            knowledge_base["status"] = "swapping"
+            await self.checkpoint(force=True)
+            await run_in_threadpool(self._swap_collection, knowledge_base)
+
+        knowledge_base["status"] = "completed"
+        await self.checkpoint(force=True)
+
+    async def reindex_file(
+        self, knowledge_base: dict, file_id: str, target_collection_name: str
+    ):
+        knowledge_id = knowledge_base["id"]
+        error = None
+        try:
+            if Files.get_file_by_id(file_id) is not None:
+                await run_in_threadpool(
+                    self._reindex_file, knowledge_id, file_id, target_collection_name
+                )
+        except Exception as e:
+            log.error(f"Error reindexing file {file_id} of {knowledge_id}: {e}")
+            error = str(e)
+
+        async with self._lock:
+            # A file that failed in an earlier run is counted again below
+            if knowledge_base["failed"].pop(file_id, None) is not None:
+                self.failed_files -= 1
+
+            if error is None:
+                knowledge_base["done"].append(file_id)
+                self.processed_files += 1
+            else:
+                knowledge_base["failed"][file_id] = error
+                self.failed_files += 1
+            await self.checkpoint()
+
+    def _reindex_file(
+        self, knowledge_id: str, file_id: str, target_collection_name: str
+    ):
+        # Chunks left behind by an interrupted attempt would be flagged as
+        # duplicates of the new ones
+        if VECTOR_DB_CLIENT.has_collection(collection_name=target_collection_name):
+            VECTOR_DB_CLIENT.delete(
+                collection_name=target_collection_name, filter={"file_id": file_id}
+            )
+
+        process_file(
+            self.request,
+            ProcessFileForm(
+                file_id=file_id,
+                collection_name=target_collection_name,
+                reuse_vectors=False,
+            ),
+            user=self.user,
+            db=None,
+        )
+
+    def _swap_collection(self, knowledge_base: dict):
+        """
+        Move the complete shadow collection into the live one. New chunks are
+        upserted next to the old ones before those are deleted, so the live
+        collection never goes empty. It is only dropped and recreated when the
+        embedding dimension changed, as it cannot hold the new vectors then.
+        Files that failed are left out, as they would be by an in-place rebuild.
+        """
+        knowledge_id = knowledge_base["id"]
+        shadow_collection_name = get_shadow_collection_name(knowledge_id)
+
+        if not VECTOR_DB_CLIENT.has_collection(collection_name=shadow_collection_name):
+            # Either no file was indexed, or a resumed job already swapped it
+            if not knowledge_base["done"] and VECTOR_DB_CLIENT.has_collection(
+                collection_name=knowledge_id
+            ):
+                VECTOR_DB_CLIENT.delete_collection(collection_name=knowledge_id)
+            items = []
+        else:
+            items = VECTOR_DB_CLIENT.get_items(shadow_collection_name, {})
+            if items is None:
+                # The shadow collection is kept, resuming retries the swap
+                raise Exception(f"Failed to read {shadow_collection_name}")
+
+        old_ids = []
+        if items and VECTOR_DB_CLIENT.has_collection(collection_name=knowledge_id):
+            live_items = VECTOR_DB_CLIENT.get_items(knowledge_id, {})
+            if live_items is None:
+                raise Exception(f"Failed to read {knowledge_id}")
+
+            if live_items and len(live_items[0].vector) != len(items[0].vector):
+                log.info(
+                    f"Embedding dimension of {knowledge_id} changed, recreating it"
+                )
+                VECTOR_DB_CLIENT.delete_collection(collection_name=knowledge_id)
+            else:
+                old_ids = [item.id for item in live_items]
+
+        for start in range(0, len(items), REINDEX_SWAP_BATCH_SIZE):
+            VECTOR_DB_CLIENT.upsert(
+                collection_name=knowledge_id,
+                items=[
+                    item.model_dump()
+                    for item in items[start : start + REINDEX_SWAP_BATCH_SIZE]
+                ],
+            )
+
+        new_ids = {item.id for item in items}
+        stale_ids = [id for id in old_ids if id not in new_ids]
+        for start in range(0, len(stale_ids), REINDEX_SWAP_BATCH_SIZE):
+            VECTOR_DB_CLIENT.delete(
+                collection_name=knowledge_id,
+                ids=stale_ids[start : start + REINDEX_SWAP_BATCH_SIZE],
+            )
+
+        if VECTOR_DB_CLIENT.has_collection(collection_name=shadow_collection_name):
+            VECTOR_DB_CLIENT.delete_collection(collection_name=shadow_collection_name)
+
+        for file_id in knowledge_base["done"]:
+            Files.update_file_metadata_by_id(file_id, {"collection_name": knowledge_id})
+
+    async def is_cancel_requested(self) -> bool:
+        job = KnowledgeReindexJobs.get_job_by_id(self.job.id)
+        return job is None or job.status == "cancelling"
+
+    async def checkpoint(self, force: bool = False):
+        self.job = (
+            KnowledgeReindexJobs.update_job_by_id(
+                self.job.id,
+                {
+                    "data": self.data,
+                    "processed_files": self.processed_files,
+                    "failed_files": self.failed_files,
+                },
+            )
+            or self.job
+        )
+
+        now = time.time()
+        if force or now - self._last_progress_at >= REINDEX_PROGRESS_INTERVAL:
+            self._last_progress_at = now
+            await self.emit_progress()
+
+    async def finish(self, status: str, error: Optional[str] = None):
+        self.job = (
+            KnowledgeReindexJobs.update_job_by_id(
+                self.job.id,
+                {
+                    "status": status,
+                    "data": self.data,
+                    "processed_files": self.processed_files,
+                    "failed_files": self.failed_files,
+                    "error": error,
+                    "finished_at": int(time.time()),
+                },
+            )
+            or self.job
+        )
+        log.info(
+            f"Knowledge reindex job {self.job.id} {status}: "
+            f"{self.processed_files} processed, {self.failed_files} failed"
+        )
+        await self.emit_progress()
+
+    async def emit_progress(self):
+        await emit_to_users(
+            "events:knowledge",
+            {
+                "type": "reindex:progress",
+                "data": get_job_response(self.job).model_dump(exclude={"data"}),
+            },
+            [self.job.user_id],
+        )
+
+    async def _heartbeat(self):
+        # Keeps the job from looking stale while a single large file is processed
+        while True:
+            await asyncio.sleep(REINDEX_HEARTBEAT_INTERVAL)
+            try:
+                KnowledgeReindexJobs.update_job_by_id(self.job.id, {})
+            except Exception as e:
+                log.debug(f"Knowledge reindex heartbeat failed: {e}")
@@ -0,0 +1,133 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from open_webui.env import MEMORY_INDEX_TTL, REDIS_KEY_PREFIX
+from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.vector.main import SearchResult, VectorItem
+
+log = logging.getLogger(__name__)
+
+REDIS_MEMORY_INDEX_KEY_PREFIX = f"{REDIS_KEY_PREFIX}:memory_index"
+
+
+class MemoryIndex:
+    """A user's memory vectors, normalized so that a dot product is the cosine similarity."""
+
+    def __init__(self, items: list[VectorItem]):
+        self.ids = [item.id for item in items]
+        self.documents = [item.text for item in items]
+        self.metadatas = [item.metadata for item in items]
+
+        matrix = np.asarray([item.vector for item in items], dtype=np.float32)
+        if matrix.size:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1
+            matrix /= norms
+        self.matrix = matrix
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def search(self, vector: list[float], limit: int = 1) -> SearchResult:
+        """
+        Top results for vector, with distances on the same 0 (worst) -> 1
+        (best) scale the vector DB clients return.
+        """
+        limit = min(limit or 0, len(self))
+        if limit <= 0:
+            return SearchResult(
+                ids=[[]], documents=[[]], metadatas=[[]], distances=[[]]
+            )
+
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        scores = self.matrix @ query
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+
+        return SearchResult(
+            ids=[[self.ids[idx] for idx in top]],
+            documents=[[self.documents[idx] for idx in top]],
+            metadatas=[[self.metadatas[idx] for idx in top]],
+            distances=[[float((1 + scores[idx]) / 2) for idx in top]],
+        )
+
+
+class MemoryIndexCache:
+    """
+    Memory indexes of recently active users, loaded from their vector DB
+    collection on first use and kept until the TTL runs out or invalidate is
+    called after a change. With Redis, invalidate bumps a per-user version
+    that every worker checks before serving its copy, so changes made through
+    any worker are seen right away; without it the TTL bounds how long other
+    workers may answer from an outdated copy.
+    """
+
+    def __init__(self, redis=None, ttl: int = MEMORY_INDEX_TTL, max_users: int = 1000):
+        self._redis = redis
+        self.ttl = ttl
+        self.max_users = max_users
+
+        # user id -> (expires at, version, index)
+        self._indexes: OrderedDict[str, tuple[float, Optional[str], MemoryIndex]] = (
+            OrderedDict()
+        )
+
+    async def get_version(self, user_id: str) -> Optional[str]:
+        if self._redis is None:
+            return None
+        return await self._redis.get(f"{REDIS_MEMORY_INDEX_KEY_PREFIX}:{user_id}")
+
+    def load(self, user_id: str) -> Optional[MemoryIndex]:
+        collection_name = f"user-memory-{user_id}"
+        if not VECTOR_DB_CLIENT.has_collection(collection_name):
+            return MemoryIndex([])
+
+        # None when the vector DB cannot read vectors back
+        items = VECTOR_DB_CLIENT.get_items(collection_name, {})
+        if items is None:
+            return None
+        return MemoryIndex(items)
+
+    async def get(self, user_id: str) -> Optional[MemoryIndex]:
+        """The user's memory index, or None when it cannot be built and the vector DB has to be searched."""
+        # Read before loading: an invalidation in between leaves this copy
+        # with an outdated version, so it is only reloaded once more
+        version = await self.get_version(user_id)
+
+        entry = self._indexes.get(user_id)
+        if entry is not None and time.monotonic() < entry[0] and entry[1] == version:
+            self._indexes.move_to_end(user_id)
+            return entry[2]
+
+        index = self.load(user_id)
+        if index is None:
+            self._indexes.pop(user_id, None)
+            return None
+
+        self._indexes[user_id] = (time.monotonic() + self.ttl, version, index)
+        self._indexes.move_to_end(user_id)
+        while len(self._indexes) > self.max_users:
+            self._indexes.popitem(last=False)
+
+        log.debug(f"Loaded {len(index)} memories for user {user_id}")
+        return index
+
+    async def invalidate(self, user_id: str):
+        self._indexes.pop(user_id, None)
+
+        if self._redis is not None:
+            # Copies older than the TTL are gone, so the version can expire
+            # with them and start over
+            key = f"{REDIS_MEMORY_INDEX_KEY_PREFIX}:{user_id}"
+            pipe = self._redis.pipeline()
+            pipe.incr(key)
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
@@ -27,6 +27,7 @@ from starlette.responses import Response, StreamingResponse, JSONResponse
 from open_webui.utils.misc import is_string_allowed
 from open_webui.models.oauth_sessions import OAuthSessions
 from open_webui.models.chats import Chats
+from open_webui.storage.images import externalize_images
 from open_webui.models.folders import Folders
 from open_webui.models.users import Users
 from open_webui.socket.main import (
@@ -39,6 +40,7 @@ from open_webui.routers.tasks import (
     generate_follow_ups,
     generate_image_prompt,
     generate_chat_tags,
+    generate_combined_tasks,
 )
 from open_webui.routers.retrieval import (
     process_web_search,
@@ -1904,6 +1906,47 @@ async def process_chat_payload(request, form_data, user, metadata, model):
     return form_data, metadata, events
 
 
+async def generate_combined_task_results(request, form_data: dict, user) -> dict:
+    """
+    Title, tags and follow-ups from a single task model call, keyed by
+    "title", "tags" and "follow_ups". Results that are missing or malformed
+    are left out so that those tasks fall back to their own calls.
+    """
+    try:
+        res = await generate_combined_tasks(request, form_data, user)
+    except Exception as e:
+        log.debug(f"Combined task generation failed: {e}")
+        return {}
+
+    if not isinstance(res, dict) or len(res.get("choices", [])) != 1:
+        return {}
+
+    response_message = res["choices"][0].get("message", {})
+    content = (
+        response_message.get("content")
+        or response_message.get("reasoning_content")
+        or ""
+    )
+
+    try:
+        result = json.loads(content[content.find("{") : content.rfind("}") + 1])
+    except Exception as e:
+        log.debug(f"Could not parse combined task response: {e}")
+        return {}
+
+    if not isinstance(result, dict):
+        return {}
+
+    results = {}
+    if isinstance(result.get("title"), str) and result["title"].strip():
+        results["title"] = result["title"].strip()
+    for key in ("tags", "follow_ups"):
+        value = result.get(key)
+        if isinstance(value, list) and all(isinstance(item, str) for item in value):
+            results[key] = value
+    return results
+
+
 async def process_chat_response(
     request, response, form_data, user, metadata, model, events, tasks
 ):
@@ -1956,73 +1999,52 @@ async def process_chat_response(
 
         if message and "model" in message:
             if tasks and messages:
-                if (
-                    TASKS.FOLLOW_UP_GENERATION in tasks
-                    and tasks[TASKS.FOLLOW_UP_GENERATION]
-                ):
-                    res = await generate_follow_ups(
-                        request,
-                        {
-                            "model": message["model"],
-                            "messages": messages,
-                            "message_id": metadata["message_id"],
-                            "chat_id": metadata["chat_id"],
-                        },
-                        user,
-                    )
-
-                    if res and isinstance(res, dict):
-                        if len(res.get("choices", [])) == 1:
-                            response_message = res.get("choices", [])[0].get(
-                                "message", {}
-                            )
-
-                            follow_ups_string = response_message.get(
-                                "content"
-                            ) or response_message.get("reasoning_content", "")
-                        else:
-                            follow_ups_string = ""
-
-                        follow_ups_string = follow_ups_string[
-                            follow_ups_string.find("{") : follow_ups_string.rfind("}")
-                            + 1
-                        ]
-
-                        try:
-                            follow_ups = json.loads(follow_ups_string).get(
-                                "follow_ups", []
-                            )
-                            await event_emitter(
-                                {
-                                    "type": "chat:message:follow_ups",
-                                    "data": {
-                                        "follow_ups": follow_ups,
-                                    },
-                                }
-                            )
+                # Titles and tags are only kept for saved chats
+                is_temp_chat = metadata.get("chat_id", "").startswith("local:")
 
-                            if not metadata.get("chat_id", "").startswith("local:"):
-                                Chats.upsert_message_to_chat_by_id_and_message_id(
-                                    metadata["chat_id"],
-                                    metadata["message_id"],
-                                    {
-                                        "followUps": follow_ups,
-                                    },
-                                )
+                combined_results = {}
+                if request.app.state.config.ENABLE_COMBINED_TASK_GENERATION:
+                    combined_tasks = []
+                    if (
+                        not is_temp_chat
+                        and tasks.get(TASKS.TITLE_GENERATION)
+                        and request.app.state.config.ENABLE_TITLE_GENERATION
+                    ):
+                        combined_tasks.append("title")
+                    if (
+                        not is_temp_chat
+                        and tasks.get(TASKS.TAGS_GENERATION)
+                        and request.app.state.config.ENABLE_TAGS_GENERATION
+                    ):
+                        combined_tasks.append("tags")
+                    if (
+                        tasks.get(TASKS.FOLLOW_UP_GENERATION)
+                        and request.app.state.config.ENABLE_FOLLOW_UP_GENERATION
+                    ):
+                        combined_tasks.append("follow_ups")
 
-                        except Exception as e:
-                            pass
+                    # A single task is generated with its own prompt as usual
+                    if len(combined_tasks) > 1:
+                        combined_results = await generate_combined_task_results(
+                            request,
+                            {
+                                "model": message["model"],
+                                "messages": messages,
+                                "message_id": metadata["message_id"],
+                                "chat_id": metadata["chat_id"],
+                                "tasks": combined_tasks,
+                            },
+                            user,
+                        )
 
-                if not metadata.get("chat_id", "").startswith(
-                    "local:"
-                ):  # Only update titles and tags for non-temp chats
+                if not is_temp_chat:
                     if TASKS.TITLE_GENERATION in tasks:
                         user_message = get_last_user_message(messages)
                         if user_message and len(user_message) > 100:
                             user_message = user_message[:100] + "..."
 
-                        title = None
-                        if tasks[TASKS.TITLE_GENERATION]:
+                        title = combined_results.get("title")
+                        if title is None and tasks[TASKS.TITLE_GENERATION]:
                             res = await generate_title(
                                 request,
                                 {
@@ -2063,18 +2085,16 @@ async def process_chat_response(
                                 if not title:
                                     title = messages[0].get("content", user_message)
 
-                                Chats.update_chat_title_by_id(
-                                    metadata["chat_id"], title
-                                )
-
-                                await event_emitter(
-                                    {
-                                        "type": "chat:title",
-                                        "data": title,
-                                    }
-                                )
+                        if title is not None:
+                            Chats.update_chat_title_by_id(metadata["chat_id"], title)
 
-                        if title == None and len(messages) == 2:
+                            await event_emitter(
+                                {
+                                    "type": "chat:title",
+                                    "data": title,
+                                }
+                            )
+                        elif len(messages) == 2:
                             title = messages[0].get("content", user_message)
 
                             Chats.update_chat_title_by_id(metadata["chat_id"], title)
@@ -2087,11 +2107,66 @@ async def process_chat_response(
                             )
 
                     if TASKS.TAGS_GENERATION in tasks and tasks[TASKS.TAGS_GENERATION]:
-                        res = await generate_chat_tags(
+                        tags = combined_results.get("tags")
+                        if tags is None:
+                            res = await generate_chat_tags(
+                                request,
+                                {
+                                    "model": message["model"],
+                                    "messages": messages,
+                                    "chat_id": metadata["chat_id"],
+                                },
+                                user,
+                            )
+
+                            if res and isinstance(res, dict):
+                                if len(res.get("choices", [])) == 1:
+                                    response_message = res.get("choices", [])[0].get(
+                                        "message", {}
+                                    )
+
+                                    tags_string = response_message.get(
+                                        "content"
+                                    ) or response_message.get("reasoning_content", "")
+                                else:
+                                    tags_string = ""
+
+                                tags_string = tags_string[
+                                    tags_string.find("{") : tags_string.rfind("}") + 1
+                                ]
+
+                                try:
+                                    tags = json.loads(tags_string).get("tags", [])
+                                except Exception as e:
+                                    pass
+
+                        if tags is not None:
+                            try:
+                                Chats.update_chat_tags_by_id(
+                                    metadata["chat_id"], tags, user
+                                )
+
+                                await event_emitter(
+                                    {
+                                        "type": "chat:tags",
+                                        "data": tags,
+                                    }
+                                )
+                            except Exception as e:
+                                pass
+
+                if (
+                    TASKS.FOLLOW_UP_GENERATION in tasks
+                    and tasks[TASKS.FOLLOW_UP_GENERATION]
+                ):
+                    follow_ups = combined_results.get("follow_ups")
+                    if follow_ups is None:
+                        res = await generate_follow_ups(
                             request,
                             {
                                 "model": message["model"],
                                 "messages": messages,
+                                "message_id": metadata["message_id"],
                                 "chat_id": metadata["chat_id"],
                             },
                             user,
@@ -2103,30 +2178,48 @@ async def process_chat_response(
                                     "message", {}
                                 )
 
-                                tags_string = response_message.get(
+                                follow_ups_string = response_message.get(
                                     "content"
                                 ) or response_message.get("reasoning_content", "")
                             else:
-                                tags_string = ""
+                                follow_ups_string = ""
 
-                            tags_string = tags_string[
-                                tags_string.find("{") : tags_string.rfind("}") + 1
+                            follow_ups_string = follow_ups_string[
+                                follow_ups_string.find("{") : follow_ups_string.rfind(
+                                    "}"
+                                )
+                                + 1
                             ]
 
                             try:
-                                tags = json.loads(tags_string).get("tags", [])
-                                Chats.update_chat_tags_by_id(
-                                    metadata["chat_id"], tags, user
+                                follow_ups = json.loads(follow_ups_string).get(
+                                    "follow_ups", []
                                 )
+                            except Exception as e:
+                                pass
 
-                                await event_emitter(
+                    if follow_ups is not None:
+                        try:
+                            await event_emitter(
+                                {
+                                    "type": "chat:message:follow_ups",
+                                    "data": {
+                                        "follow_ups": follow_ups,
+                                    },
+                                }
+                            )
+
+                            if not is_temp_chat:
+                                Chats.upsert_message_to_chat_by_id_and_message_id(
+                                    metadata["chat_id"],
+                                    metadata["message_id"],
                                     {
-                                        "type": "chat:tags",
-                                        "data": tags,
-                                    }
+                                        "followUps": follow_ups,
+                                    },
                                 )
-                            except Exception as e:
-                                pass
+
+                        except Exception as e:
+                            pass
 
     event_emitter = None
     event_caller = None
@@ -2227,12 +2320,14 @@ async def process_chat_response(
                                 metadata["message_id"],
                                 {
                                     "role": "assistant",
-                                    "content": content,
+                                    "content": await externalize_images(content),
                                 },
                             )
 
                             # Send a webhook notification if the user is not active
-                            if not Users.is_user_active(user.id):
+                            if not await asyncio.to_thread(
+                                Users.is_user_active, user.id
+                            ):
                                 webhook_url = Users.get_user_webhook_url_by_id(user.id)
                                 if webhook_url:
                                     await post_webhook(
@@ -2756,9 +2851,7 @@ async def process_chat_response(
                     Chats.upsert_message_to_chat_by_id_and_message_id(
                         metadata["chat_id"],
                         metadata["message_id"],
-                        {
-                            **event,
-                        },
+                        await externalize_images(event),
                     )
 
                 async def stream_body_handler(response, form_data):
@@ -3133,8 +3226,10 @@ async def process_chat_response(
                                                 metadata["chat_id"],
                                                 metadata["message_id"],
                                                 {
-                                                    "content": serialize_content_blocks(
-                                                        content_blocks
+                                                    "content": await externalize_images(
+                                                        serialize_content_blocks(
+                                                            content_blocks
+                                                        )
                                                     ),
                                                 },
                                             )
@@ -3629,12 +3724,14 @@ async def process_chat_response(
                         metadata["chat_id"],
                         metadata["message_id"],
                         {
-                            "content": serialize_content_blocks(content_blocks),
+                            "content": await externalize_images(
+                                serialize_content_blocks(content_blocks)
+                            ),
                         },
                     )
 
                 # Send a webhook notification if the user is not active
-                if not Users.is_user_active(user.id):
+                if not await asyncio.to_thread(Users.is_user_active, user.id):
                     webhook_url = Users.get_user_webhook_url_by_id(user.id)
                     if webhook_url:
                         await post_webhook(
@@ -3667,7 +3764,9 @@ async def process_chat_response(
                         metadata["chat_id"],
                         metadata["message_id"],
                         {
-                            "content": serialize_content_blocks(content_blocks),
+                            "content": await externalize_images(
+                                serialize_content_blocks(content_blocks)
+                            ),
                         },
                     )
 
@@ -0,0 +1,136 @@
+import asyncio
+import copy
+import hashlib
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from open_webui.env import (
+    ENABLE_FORWARD_USER_INFO_HEADERS,
+    MODELS_CONNECTION_CACHE_TTL,
+    REDIS_KEY_PREFIX,
+)
+from open_webui.utils.redis import get_redis_client
+
+log = logging.getLogger(__name__)
+
+REDIS_MODEL_LISTS_VERSION_KEY = f"{REDIS_KEY_PREFIX}:model_lists:version"
+
+
+def get_model_list_cache_key(url: str, key: Optional[str] = None, user=None) -> str:
+    """
+    Lists are shared by everyone using the same connection and key, unless
+    user info is forwarded upstream and the list may depend on the user.
+    """
+    cache_key = url
+    if key:
+        cache_key += f":{hashlib.sha256(key.encode()).hexdigest()}"
+    if ENABLE_FORWARD_USER_INFO_HEADERS and user:
+        cache_key += f":{user.id}"
+    return cache_key
+
+
+class ModelListCache:
+    """
+    Upstream model lists, fetched once per connection and reused until the
+    TTL runs out or invalidate is called. Concurrent misses for a connection
+    wait on a single request. Callers get their own copy to modify.
+
+    With Redis, invalidate bumps a shared version that every worker checks
+    before serving its lists, so connection changes made through any worker
+    are seen right away; without it other workers refresh after the TTL.
+    """
+
+    def __init__(self, ttl: Optional[int] = MODELS_CONNECTION_CACHE_TTL, redis=None):
+        self.ttl = ttl
+        self._redis = redis
+
+        # cache key -> (expires at, model list)
+        self._lists: dict[str, tuple[float, Any]] = {}
+        self._pending: dict[str, asyncio.Task] = {}
+        # Bumped on invalidation so that fetches started before are not stored
+        self._generation = 0
+        # Last shared version seen, None without Redis
+        self._version: Optional[str] = None
+        # Caches built from these lists, cleared along with them
+        self._dependents: list = []
+
+    def register(self, cache):
+        """Clear cache (anything with an async clear) whenever the lists are invalidated."""
+        self._dependents.append(cache)
+
+    async def _get_version(self) -> Optional[str]:
+        if self._redis is None:
+            return None
+        try:
+            return await self._redis.get(REDIS_MODEL_LISTS_VERSION_KEY)
+        except Exception as e:
+            log.debug(f"Failed to read the model list version: {e}")
+            return self._version
+
+    async def _clear(self):
+        self._lists.clear()
+        self._pending.clear()
+        self._generation += 1
+        for cache in self._dependents:
+            await cache.clear()
+
+    async def _fetch(self, cache_key: str, fetch: Callable[[], Awaitable]):
+        generation = self._generation
+        try:
+            result = await fetch()
+            if result is not None and generation == self._generation:
+                self._lists[cache_key] = (
+                    time.monotonic() + self.ttl if self.ttl else float("inf"),
+                    result,
+                )
+            return result
+        finally:
+            if self._pending.get(cache_key) is asyncio.current_task():
+                del self._pending[cache_key]
+
+    async def get(self, cache_key: str, fetch: Callable[[], Awaitable]):
+        """The cached list for cache_key, calling fetch on a miss. Failures (None) are not cached."""
+        version = await self._get_version()
+        if version != self._version:
+            # Invalidated through another worker
+            self._version = version
+            await self._clear()
+
+        entry = self._lists.get(cache_key)
+        if entry is not None and time.monotonic() < entry[0]:
+            return copy.deepcopy(entry[1])
+
+        task = self._pending.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(cache_key, fetch))
+            self._pending[cache_key] = task
+
+        # Shielded so that a cancelled caller does not fail everyone waiting
+        return copy.deepcopy(await asyncio.shield(task))
+
+    async def invalidate(self):
+        """Drop cached model lists so that the next request sees the change."""
+        log.debug("Model list cache invalidated")
+        await self._clear()
+
+        if self._redis is not None:
+            try:
+                self._version = str(
+                    await self._redis.incr(REDIS_MODEL_LISTS_VERSION_KEY)
+                )
+            except Exception as e:
+                log.warning(f"Failed to invalidate model lists of other workers: {e}")
+
+
+MODEL_LISTS = ModelListCache(redis=get_redis_client(async_mode=True))
+
+
+async def send_model_list_request(
+    send_get_request: Callable[..., Awaitable], url: str, key=None, user=None
+):
+    """send_get_request of a connection for model lists, shared by all users of the connection."""
+    return await MODEL_LISTS.get(
+        get_model_list_cache_key(url, key, user),
+        lambda: send_get_request(url, key, user=user),
+    )
@@ -21,6 +21,7 @@ from open_webui.utils.plugin import (
     get_function_module_from_cache,
 )
 from open_webui.utils.access_control import has_access
+from open_webui.utils.model_cache import MODEL_LISTS
 
 
 from open_webui.config import (
@@ -79,6 +80,9 @@ async def get_all_base_models(request: Request, user: UserModel = None):
 
 
 async def get_all_models(request, refresh: bool = False, user: UserModel = None):
+    if refresh:
+        await MODEL_LISTS.invalidate()
+
     if (
         request.app.state.MODELS
         and request.app.state.BASE_MODELS
@@ -367,11 +371,29 @@ def get_filtered_models(models, user, db=None):
         user.role == "user"
         or (user.role == "admin" and not BYPASS_ADMIN_ACCESS_CONTROL)
     ) and not BYPASS_MODEL_ACCESS_CONTROL:
-        model_ids = [model["id"] for model in models if not model.get("arena")]
-        model_infos = {
-            model_info.id: model_info
-            for model_info in Models.get_models_by_ids(model_ids)
+        # model id -> (owner, access control). Custom models carry these from
+        # get_all_models, only the remaining ids are looked up.
+        model_access = {
+            model["id"]: (
+                model["info"].get("user_id"),
+                model["info"].get("access_control"),
+            )
+            for model in models
+            if not model.get("arena")
+            and (model.get("info") or {}).get("id") == model["id"]
+            and "user_id" in model["info"]
         }
+        model_ids = [
+            model["id"]
+            for model in models
+            if not model.get("arena") and model["id"] not in model_access
+        ]
+        if model_ids:
+            for model_info in Models.get_models_by_ids(model_ids):
+                model_access[model_info.id] = (
+                    model_info.user_id,
+                    model_info.access_control,
+                )
 
         filtered_models = []
         user_group_ids = {
@@ -390,15 +412,15 @@ def get_filtered_models(models, user, db=None):
                     filtered_models.append(model)
                 continue
 
-            model_info = model_infos.get(model["id"], None)
-            if model_info:
+            if model["id"] in model_access:
+                owner_id, access_control = model_access[model["id"]]
                 if (
                     (user.role == "admin" and BYPASS_ADMIN_ACCESS_CONTROL)
-                    or user.id == model_info.user_id
+                    or user.id == owner_id
                     or has_access(
                         user.id,
                         type="read",
-                        access_control=model_info.access_control,
+                        access_control=access_control,
                         user_group_ids=user_group_ids,
                     )
                 ):
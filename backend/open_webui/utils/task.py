@@ -260,6 +260,20 @@ def tags_generation_template(
     return template
 
 
+def combined_task_generation_template(
+    template: str, messages: list[dict], tasks: list[str], user: Optional[Any] = None
+) -> str:
+    # Output keys the model is asked for, e.g. "title", "tags"
+    template = template.replace("{{TASKS}}", ", ".join(f'"{task}"' for task in tasks))
+
+    prompt = get_last_user_message(messages)
+    template = replace_prompt_variable(template, prompt)
+    template = replace_messages_variable(template, messages)
+
+    template = prompt_template(template, user)
+    return template
+
+
 def image_prompt_generation_template(
     template: str, messages: list[dict], user: Optional[Any] = None
 ) -> str:
@@ -8,17 +8,25 @@ Metrics collected:
 
 * http.server.requests (counter)
 * http.server.duration (histogram, milliseconds)
+* webui.users.total, webui.users.active, webui.users.active.today (gauges)
 
 Attributes used: http.method, http.route, http.status_code
 
 If you wish to add more attributes (e.g. user-agent) you can, but beware of
 high-cardinality label sets.
+
+User counts come from the database. They are refreshed in the background by
+`periodic_user_counts_refresh` and the gauges only report the latest counts,
+so a slow database never holds up an export.
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
+import logging
 import time
-from typing import Dict, List, Sequence, Any
+from typing import Dict, List, Optional, Sequence, Any
 from base64 import b64encode
 
 from fastapi import FastAPI, Request
@@ -44,11 +52,71 @@ from open_webui.env import (
     OTEL_METRICS_BASIC_AUTH_PASSWORD,
     OTEL_METRICS_OTLP_SPAN_EXPORTER,
     OTEL_METRICS_EXPORTER_OTLP_INSECURE,
+    OTEL_METRICS_USER_COUNTS_INTERVAL,
+    REDIS_KEY_PREFIX,
 )
 from open_webui.models.users import Users
 
+log = logging.getLogger(__name__)
+
 _EXPORT_INTERVAL_MILLIS = 10_000  # 10 seconds
 
+_USER_COUNTS_REDIS_KEY = f"{REDIS_KEY_PREFIX}:metrics:users"
+
+# Latest counts for the user gauges, empty until the first refresh
+_user_counts: Dict[str, int] = {}
+
+
+def _count_users() -> Dict[str, int]:
+    # IMPORTANT: Use get_num_users() for efficient COUNT(*) query.
+    # Do NOT use len(get_users()["users"]) - it loads ALL user records into memory,
+    # causing connection pool exhaustion on high-latency databases (e.g., Aurora).
+    return {
+        "total": Users.get_num_users() or 0,
+        "active": Users.get_active_user_count() or 0,
+        "active_today": Users.get_num_users_active_today() or 0,
+    }
+
+
+async def periodic_user_counts_refresh(app) -> None:
+    """
+    Refresh the counts behind the user gauges. With Redis, only one replica
+    queries the database per interval and the others pick up its counts.
+    """
+    while True:
+        try:
+            redis = getattr(app.state, "redis", None)
+            if redis is None or await redis.set(
+                f"{_USER_COUNTS_REDIS_KEY}:lock",
+                app.state.instance_id,
+                nx=True,
+                ex=OTEL_METRICS_USER_COUNTS_INTERVAL,
+            ):
+                counts = await asyncio.to_thread(_count_users)
+                if redis is not None:
+                    await redis.set(
+                        _USER_COUNTS_REDIS_KEY,
+                        json.dumps(counts),
+                        ex=OTEL_METRICS_USER_COUNTS_INTERVAL * 3,
+                    )
+            else:
+                cached = await redis.get(_USER_COUNTS_REDIS_KEY)
+                counts = json.loads(cached) if cached else None
+
+            if counts:
+                _user_counts.update(counts)
+        except Exception as e:
+            log.exception(f"Error refreshing user counts for metrics: {e}")
+
+        await asyncio.sleep(OTEL_METRICS_USER_COUNTS_INTERVAL)
+
+
+def _observe_user_count(name: str) -> Sequence[metrics.Observation]:
+    value: Optional[int] = _user_counts.get(name)
+    if value is None:
+        return []
+    return [metrics.Observation(value=value)]
+
 
 def _build_meter_provider(resource: Resource) -> MeterProvider:
     """Return a configured MeterProvider."""
@@ -132,23 +200,12 @@ def setup_metrics(app: FastAPI, resource: Resource) -> None:
     def observe_active_users(
         options: metrics.CallbackOptions,
     ) -> Sequence[metrics.Observation]:
-        return [
-            metrics.Observation(
-                value=Users.get_active_user_count(),
-            )
-        ]
+        return _observe_user_count("active")
 
     def observe_total_registered_users(
         options: metrics.CallbackOptions,
     ) -> Sequence[metrics.Observation]:
-        # IMPORTANT: Use get_num_users() for efficient COUNT(*) query.
-        # Do NOT use len(get_users()["users"]) - it loads ALL user records into memory,
-        # causing connection pool exhaustion on high-latency databases (e.g., Aurora).
-        return [
-            metrics.Observation(
-                value=Users.get_num_users() or 0,
-            )
-        ]
+        return _observe_user_count("total")
 
     meter.create_observable_gauge(
         name="webui.users.total",
@@ -167,7 +224,7 @@ def setup_metrics(app: FastAPI, resource: Resource) -> None:
     def observe_users_active_today(
         options: metrics.CallbackOptions,
     ) -> Sequence[metrics.Observation]:
-        return [metrics.Observation(value=Users.get_num_users_active_today())]
+        return _observe_user_count("active_today")
 
     meter.create_observable_gauge(
         name="webui.users.active.today",
@@ -90,7 +90,9 @@ export class SocketIOCollaborationProvider {
 			document_id: this.documentId,
 			user_id: this.user?.id,
 			user_name: this.user?.name,
-			user_color: userColor
+			user_color: userColor,
+			// Lets the server send only what changed while we were disconnected
+			state_vector: Array.from(Y.encodeStateVector(this.doc))
 		});
 
 		// Set user awareness info
@@ -123,7 +125,7 @@ export class SocketIOCollaborationProvider {
 					if (data.state) {
 						const state = new Uint8Array(data.state);
 
-						if (state.length === 2 && state[0] === 0 && state[1] === 0) {
+						if (!data.diff && state.length === 2 && state[0] === 0 && state[1] === 0) {
 							// Empty state, check if we have content to initialize
 							// check if editor empty as well
 							// const editor = await getEditorInstance();